@@ -0,0 +1,161 @@
+"""
+A2A Hop Overhead Benchmark
+
+Measures the client-side overhead of one A2A `message/stream` hop against a
+local SSE server that answers immediately, so what remains is connection
+setup, authentication and parsing:
+
+- before: a new aiohttp.ClientSession per hop and a blocking ID token fetch
+  inside the event loop (the previous Pulse/Caller tools)
+- after: the shared client in app/core/a2a (one keep-alive pool per target,
+  ID tokens cached per audience)
+
+The token fetch is simulated with a blocking sleep of --token-ms (a real
+`fetch_id_token` call to the metadata server is typically 10-50 ms). Also
+reports the worst event-loop stall seen by a 5 ms ticker during the hops.
+
+Requires aiohttp and a2a-sdk. No network access is needed.
+
+Usage:
+    python benchmarks/latency/a2a_hop_benchmark.py [--hops 200] [--token-ms 20]
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+
+# Load the package directly from its files (importing the `app` package
+# would pull in the whole agent).
+_A2A = Path(__file__).resolve().parents[2] / "careflow-agent" / "app" / "core" / "a2a"
+_spec = importlib.util.spec_from_file_location("careflow_a2a", _A2A / "__init__.py", submodule_search_locations=[str(_A2A)])
+careflow_a2a = importlib.util.module_from_spec(_spec)
+sys.modules["careflow_a2a"] = careflow_a2a
+_spec.loader.exec_module(careflow_a2a)
+
+TICK_SECONDS = 0.005
+
+EVENTS = [
+    {"result": {"kind": "status-update", "final": False, "status": {"state": "working"}}},
+    {"result": {"kind": "status-update", "final": True, "taskId": "t1",
+                "status": {"state": "completed", "message": {"parts": [{"kind": "text", "text": "Call placed"}]}}}},
+]
+
+
+async def sse_handler(request: web.Request) -> web.StreamResponse:
+    await request.json()
+    response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+    await response.prepare(request)
+    for event in EVENTS:
+        await response.write(f"data: {json.dumps(event)}\n\n".encode())
+    await response.write_eof()
+    return response
+
+
+def payload(i: int) -> dict:
+    return careflow_a2a.rpc_request("message/stream", {
+        "message": {"messageId": f"m{i}", "kind": "message", "role": "user",
+                    "parts": [{"kind": "text", "text": "Call patient (ID: p1)"}]},
+    }, i)
+
+
+def blocking_token_fetch(token_ms: float) -> str:
+    time.sleep(token_ms / 1000)
+    return "header.eyJleHAiOiA0MTAyNDQ0ODAwfQ.signature"  # exp in 2100
+
+
+async def hop_before(url: str, i: int, token_ms: float) -> None:
+    headers = {"Content-Type": "application/json", "Accept": "text/event-stream"}
+    if token_ms:
+        headers["Authorization"] = f"Bearer {blocking_token_fetch(token_ms)}"
+    async with aiohttp.ClientSession() as session:
+        async with session.post(url, json=payload(i), headers=headers) as response:
+            async for line in response.content:
+                line = line.decode("utf-8").strip()
+                if line.startswith("data:"):
+                    data = json.loads(line[5:].strip())
+                    if data.get("result", {}).get("final"):
+                        return
+
+
+async def hop_after(client, url: str, i: int) -> None:
+    async for data in client.stream_rpc(url, payload(i)):
+        if data.get("result", {}).get("final"):
+            return
+
+
+class LoopLagProbe:
+    """Measures the worst delay of a periodic ticker on the running loop."""
+
+    def __init__(self):
+        self.max_lag = 0.0
+        self._task = None
+
+    async def _run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(TICK_SECONDS)
+            self.max_lag = max(self.max_lag, time.perf_counter() - start - TICK_SECONDS)
+
+    def __enter__(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    def __exit__(self, *exc):
+        self._task.cancel()
+
+
+async def measure(hop, hops: int):
+    samples = []
+    with LoopLagProbe() as probe:
+        for i in range(hops):
+            t0 = time.perf_counter()
+            await hop(i)
+            samples.append(time.perf_counter() - t0)
+            await asyncio.sleep(0)
+    p95 = statistics.quantiles(samples, n=20)[-1]
+    return statistics.median(samples) * 1000, p95 * 1000, probe.max_lag * 1000
+
+
+async def main(hops: int, token_ms: float):
+    app = web.Application()
+    app.router.add_post("/", sse_handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/"
+
+    client = careflow_a2a.A2AClient()
+    if token_ms:
+        # Treat the local target like a Cloud Run service and simulate the token fetch
+        careflow_a2a.client.needs_id_token = lambda _url: True
+        careflow_a2a.auth._fetch = lambda _audience: blocking_token_fetch(token_ms)
+
+    print(f"--- A2A hop overhead: {hops} sequential message/stream hops, token fetch {token_ms:.0f} ms ---")
+    print(f"{'client':>7} | {'p50':>8} | {'p95':>8} | {'max loop stall':>14}")
+    for name, hop in (
+        ("before", lambda i: hop_before(url, i, token_ms)),
+        ("after", lambda i: hop_after(client, url, i)),
+    ):
+        await hop(-1)  # warm-up (first connection, first token)
+        p50, p95, lag = await measure(hop, hops)
+        print(f"{name:>7} | {p50:>6.2f}ms | {p95:>6.2f}ms | {lag:>12.2f}ms")
+
+    await client.close()
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hops", type=int, default=200)
+    parser.add_argument("--token-ms", type=float, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.hops, args.token_ms))
@@ -0,0 +1,167 @@
+"""
+Clinical Write Path Benchmark (Firestore emulator)
+
+Records the same post-call assessments (patient risk + alert upsert +
+interaction log) through:
+
+- sequential: the previous path - patient read, patient update, active alert
+  query, alert add/update, interaction add (5 awaited round trips)
+- transaction: app_utils.clinical_record.record_assessment - one transaction
+  with a batched read of the patient and `alerts/active_{patientId}`
+
+and reports Firestore RPCs per assessment plus p50/p95 latency. Each
+patient is assessed several times so both alert creation and the append
+path are exercised.
+
+Requires google-cloud-firestore and a running emulator:
+
+    gcloud emulators firestore start --host-port=localhost:8086
+    export FIRESTORE_EMULATOR_HOST=localhost:8086
+
+Usage:
+    python benchmarks/latency/clinical_write_benchmark.py [--patients 50] [--rounds 3]
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+from google.cloud.firestore import AsyncClient, FieldFilter
+
+# Load the module directly from its file (importing the `app` package
+# would pull in the whole agent).
+_APP_UTILS = Path(__file__).resolve().parents[2] / "careflow-agent" / "app" / "app_utils"
+
+
+def _load(name: str):
+    spec = importlib.util.spec_from_file_location(name, _APP_UTILS / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+clinical_record = _load("clinical_record")
+
+RISKS = ["YELLOW", "RED", "GREEN"]
+
+# Firestore RPCs that cost a network round trip
+_RPCS = ("get_document", "batch_get_documents", "run_query", "begin_transaction", "commit", "rollback")
+
+
+class RpcCounter:
+    """Counts Firestore RPCs issued by a client."""
+
+    def __init__(self, db: AsyncClient):
+        self.count = 0
+        api = db._firestore_api
+        for name in _RPCS:
+            original = getattr(api, name, None)
+            if original is not None:
+                setattr(api, name, self._wrap(original))
+
+    def _wrap(self, original):
+        def counted(*args, **kwargs):
+            self.count += 1
+            return original(*args, **kwargs)
+        return counted
+
+
+async def seed(db: AsyncClient, hospital_id: str, patients: int):
+    sem = asyncio.Semaphore(50)
+
+    async def one(i: int):
+        async with sem:
+            await db.collection("patients").document(f"{hospital_id}_p{i:04d}").set({
+                "name": f"Patient {i}",
+                "hospitalId": hospital_id,
+                "status": "active",
+            })
+
+    await asyncio.gather(*(one(i) for i in range(patients)))
+
+
+async def sequential_assessment(db: AsyncClient, patient_id: str, risk: str, brief: str, summary: str):
+    """The previous update_patient_risk + create_alert + log_patient_interaction sequence."""
+    now = datetime.now(timezone.utc)
+    patient_ref = db.collection("patients").document(patient_id)
+    patient = (await patient_ref.get()).to_dict()
+    await patient_ref.update({"riskLevel": risk, "aiBrief": brief, "lastAssessedAt": now})
+
+    alerts_ref = db.collection("alerts")
+    active = await alerts_ref.where(filter=FieldFilter("patientId", "==", patient_id)) \
+        .where(filter=FieldFilter("status", "==", "active")).limit(1).get()
+    alert = {
+        "hospitalId": patient["hospitalId"],
+        "patientId": patient_id,
+        "patientName": patient["name"],
+        "priority": clinical_record.PRIORITY_MAP[risk],
+        "status": "active",
+        "trigger": f"Risk status: {risk}",
+        "aiBrief": brief,
+        "updatedAt": now,
+    }
+    if active:
+        alert = clinical_record.merge_alert(active[0].to_dict(), alert, now)
+        await alerts_ref.document(active[0].id).update(alert)
+    else:
+        await alerts_ref.add({**alert, "createdAt": now})
+
+    await patient_ref.collection("interactions").add({
+        "timestamp": now, "type": "call_summary", "sender": "ai", "content": summary,
+    })
+
+
+async def transactional_assessment(db: AsyncClient, patient_id: str, risk: str, brief: str, summary: str):
+    await clinical_record.record_assessment(
+        db, patient_id, risk, brief, trigger=f"Risk status: {risk}", interaction_summary=summary,
+    )
+
+
+async def run(name, assess, db, counter, hospital_id, patients, rounds):
+    latencies = []
+    start_rpcs = counter.count
+    for r in range(rounds):
+        risk = RISKS[r % len(RISKS)]
+        for i in range(patients):
+            start = time.perf_counter()
+            await assess(db, f"{hospital_id}_p{i:04d}", risk, f"Round {r} observation", f"Round {r} call summary")
+            latencies.append(time.perf_counter() - start)
+
+    n = len(latencies)
+    p95 = statistics.quantiles(latencies, n=20)[-1] if n > 1 else latencies[0]
+    rpcs = (counter.count - start_rpcs) / n
+    print(f"{name:>12} | {n:>5} | {rpcs:>8.1f} | {statistics.median(latencies) * 1000:>6.1f}ms | {p95 * 1000:>6.1f}ms")
+    return rpcs, p95
+
+
+async def main(patients, rounds):
+    if not os.environ.get("FIRESTORE_EMULATOR_HOST"):
+        sys.exit("FIRESTORE_EMULATOR_HOST is not set - start the Firestore emulator first.")
+
+    db = AsyncClient(project="careflow-bench")
+    counter = RpcCounter(db)
+    run_id = uuid.uuid4().hex[:6]
+    seq_hospital, txn_hospital = f"bench_{run_id}_seq", f"bench_{run_id}_txn"
+    await seed(db, seq_hospital, patients)
+    await seed(db, txn_hospital, patients)
+
+    print(f"--- Clinical write benchmark ({patients} patients x {rounds} assessments) ---")
+    print(f"{'path':>12} | {'calls':>5} | {'RPCs/call':>8} | {'p50':>8} | {'p95':>8}")
+    seq_rpcs, seq_p95 = await run("sequential", sequential_assessment, db, counter, seq_hospital, patients, rounds)
+    txn_rpcs, txn_p95 = await run("transaction", transactional_assessment, db, counter, txn_hospital, patients, rounds)
+    print(f"\nRound trips: {seq_rpcs:.1f} -> {txn_rpcs:.1f} per assessment; p95 {seq_p95 / txn_p95:.1f}x faster")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--patients", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.patients, args.rounds))
@@ -0,0 +1,120 @@
+"""
+MCP Toolbox Client Benchmark
+
+Compares the previous synchronous toolbox integration with the async one
+used by the Pulse agent (app/tools/mcp__tool_loader.py):
+
+- cold start: how long startup is blocked loading the "patient_tools"
+  toolset (ToolboxSyncClient at import time vs. a background load with
+  ToolboxClient), and when the tools become available
+- per-tool latency: p50/p95 of repeated invocations of one tool, plus the
+  worst event-loop stall seen by a 10 ms ticker while they run (a sync tool
+  blocks the loop for the whole HTTP round trip)
+
+Requires toolbox-core and a running MCP Toolbox:
+
+    export MCP_TOOLBOX_URL=http://127.0.0.1:5000
+
+Usage:
+    python benchmarks/latency/mcp_toolbox_benchmark.py [--tool list_collections] [--iterations 50]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from toolbox_core import ToolboxClient, ToolboxSyncClient
+
+TOOLBOX_URL = os.environ.get("MCP_TOOLBOX_URL", "http://127.0.0.1:5000")
+TOOLSET = "patient_tools"
+TICK_SECONDS = 0.01
+
+
+class LoopLagProbe:
+    """Measures the worst delay of a periodic ticker on the running loop."""
+
+    def __init__(self):
+        self.max_lag = 0.0
+        self._task = None
+
+    async def _run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(TICK_SECONDS)
+            self.max_lag = max(self.max_lag, time.perf_counter() - start - TICK_SECONDS)
+
+    def __enter__(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    def __exit__(self, *exc):
+        self._task.cancel()
+
+
+def _summary(samples):
+    p95 = statistics.quantiles(samples, n=20)[-1] if len(samples) > 1 else samples[0]
+    return statistics.median(samples) * 1000, p95 * 1000
+
+
+def _pick(tools, name):
+    for tool in tools:
+        if tool.__name__ == name:
+            return tool
+    raise SystemExit(f"Tool {name!r} not in toolset {TOOLSET}: {[t.__name__ for t in tools]}")
+
+
+async def bench_sync(tool_name, iterations):
+    start = time.perf_counter()
+    client = ToolboxSyncClient(TOOLBOX_URL)
+    tools = client.load_toolset(TOOLSET)
+    blocked = time.perf_counter() - start
+    tool = _pick(tools, tool_name)
+
+    samples = []
+    with LoopLagProbe() as probe:
+        for _ in range(iterations):
+            await asyncio.sleep(0)  # let the ticker run between calls
+            t0 = time.perf_counter()
+            tool()
+            samples.append(time.perf_counter() - t0)
+    client.close()
+    return blocked, blocked, samples, probe.max_lag
+
+
+async def bench_async(tool_name, iterations):
+    start = time.perf_counter()
+    client = ToolboxClient(TOOLBOX_URL)
+    load = asyncio.get_running_loop().create_task(client.load_toolset(TOOLSET))
+    blocked = time.perf_counter() - start
+    tools = await load
+    ready = time.perf_counter() - start
+    tool = _pick(tools, tool_name)
+
+    samples = []
+    with LoopLagProbe() as probe:
+        for _ in range(iterations):
+            t0 = time.perf_counter()
+            await tool()
+            samples.append(time.perf_counter() - t0)
+    await client.close()
+    return blocked, ready, samples, probe.max_lag
+
+
+async def main(tool_name, iterations):
+    print(f"--- MCP toolbox benchmark ({TOOLBOX_URL}, tool {tool_name}, {iterations} calls) ---")
+    print(f"{'client':>6} | {'startup blocked':>15} | {'tools ready':>11} | {'p50':>8} | {'p95':>8} | {'max loop stall':>14}")
+    for name, bench in (("sync", bench_sync), ("async", bench_async)):
+        blocked, ready, samples, lag = await bench(tool_name, iterations)
+        p50, p95 = _summary(samples)
+        print(f"{name:>6} | {blocked * 1000:>13.1f}ms | {ready * 1000:>9.1f}ms | {p50:>6.1f}ms | {p95:>6.1f}ms | "
+              f"{lag * 1000:>12.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tool", default="list_collections")
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.tool, args.iterations))
@@ -0,0 +1,155 @@
+"""
+Schedule Loader Benchmark (Firestore emulator)
+
+Seeds synthetic hospitals of increasing size into the Firestore emulator and
+compares, per patient count:
+
+- sequential: the previous fetch_daily_schedule loop (2N+1 awaited round trips)
+- batched: app_utils.schedule_loader.load_schedule (concurrent lookups)
+- batched+index: same, with completion read from the slot index document
+  (one read) instead of one interactions query per patient
+
+Requires google-cloud-firestore and a running emulator:
+
+    gcloud emulators firestore start --host-port=localhost:8086
+    export FIRESTORE_EMULATOR_HOST=localhost:8086
+
+Usage:
+    python benchmarks/latency/schedule_loader_benchmark.py [--sizes 50 100 250 500] [--concurrency 20]
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from google.cloud.firestore import AsyncClient, FieldFilter, Query
+
+# Load the modules directly from their files (importing the `app` package
+# would pull in the whole agent).
+_APP_UTILS = Path(__file__).resolve().parents[2] / "careflow-agent" / "app" / "app_utils"
+
+
+def _load(name: str):
+    spec = importlib.util.spec_from_file_location(name, _APP_UTILS / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+schedule_loader = _load("schedule_loader")
+slot_index = _load("slot_index")
+
+SCHEDULE_HOUR = 8
+SLOT = "2026-01-27_08"
+
+
+async def seed(db: AsyncClient, hospital_id: str, patients: int, index: bool):
+    """Create `patients` active patients with 3 past interactions; every other one contacted for SLOT."""
+    now = datetime.now(timezone.utc)
+    sem = asyncio.Semaphore(50)
+
+    async def one(i: int):
+        async with sem:
+            contacted = i % 2 == 0
+            patient_id = f"{hospital_id}_p{i:04d}"
+            ref = db.collection("patients").document(patient_id)
+            data = {
+                "name": f"Patient {i}",
+                "hospitalId": hospital_id,
+                "status": "active",
+                "scheduleHour": SCHEDULE_HOUR,
+                "preferredLanguage": "en-US",
+                "contact": {"phone": f"+1555{i:07d}"},
+            }
+            await ref.set(data)
+            for d in range(3):
+                await ref.collection("interactions").add({
+                    "timestamp": now - timedelta(days=d + 1),
+                    "type": "call_summary",
+                    "aiBrief": f"Day -{d + 1} check-in",
+                    "riskLevel": "GREEN",
+                    "scheduleSlot": f"2026-01-{26 - d:02d}_08",
+                })
+            if contacted:
+                await ref.collection("interactions").add({
+                    "timestamp": now,
+                    "type": "call_summary",
+                    "scheduleSlot": SLOT,
+                })
+            if index:
+                state = slot_index.STATE_COMPLETED if contacted else slot_index.retry_state(1)
+                await slot_index.set_patient_state(db, patient_id, SLOT, state, hospital_id=hospital_id)
+
+    await asyncio.gather(*(one(i) for i in range(patients)))
+
+
+async def sequential_load(db: AsyncClient, hospital_id: str):
+    """The previous fetch_daily_schedule access pattern."""
+    query = db.collection("patients") \
+        .where(filter=FieldFilter("hospitalId", "==", hospital_id)) \
+        .where(filter=FieldFilter("status", "==", "active")) \
+        .where(filter=FieldFilter("scheduleHour", "==", SCHEDULE_HOUR))
+    results = []
+    async for doc in query.stream():
+        interactions_ref = db.collection(f"patients/{doc.id}/interactions")
+        done = await interactions_ref.where(filter=FieldFilter("scheduleSlot", "==", SLOT)).limit(1).get()
+        history = [
+            h.to_dict()
+            async for h in interactions_ref.order_by("timestamp", direction=Query.DESCENDING).limit(3).stream()
+        ]
+        results.append((doc.id, bool(done), history))
+    return results
+
+
+async def indexed_load(db: AsyncClient, hospital_id: str, concurrency: int):
+    states = await slot_index.read_slot_states(db, hospital_id, SLOT)
+    return await schedule_loader.load_schedule(
+        db, SCHEDULE_HOUR, hospital_id, SLOT, concurrency,
+        completed_ids=slot_index.done_patient_ids(states),
+    )
+
+
+async def timed(coro):
+    start = time.perf_counter()
+    result = await coro
+    return time.perf_counter() - start, result
+
+
+async def main(sizes, concurrency):
+    if not os.environ.get("FIRESTORE_EMULATOR_HOST"):
+        sys.exit("FIRESTORE_EMULATOR_HOST is not set - start the Firestore emulator first.")
+
+    db = AsyncClient(project="careflow-bench")
+    run_id = uuid.uuid4().hex[:6]
+
+    print(f"--- Schedule loader benchmark (concurrency {concurrency}) ---")
+    print(f"{'patients':>8} | {'sequential':>11} | {'batched':>9} | {'batched+index':>13} | speedup")
+    for n in sizes:
+        plain, indexed = f"bench_{run_id}_{n}", f"bench_{run_id}_{n}_indexed"
+        await seed(db, plain, n, index=False)
+        await seed(db, indexed, n, index=True)
+
+        seq_s, seq = await timed(sequential_load(db, plain))
+        bat_s, bat = await timed(schedule_loader.load_schedule(db, SCHEDULE_HOUR, plain, SLOT, concurrency))
+        idx_s, idx = await timed(indexed_load(db, indexed, concurrency))
+
+        # Same answer from every strategy
+        assert sorted((pid, done) for pid, done, _ in seq) == sorted((p.id, p.completed) for p in bat)
+        assert sum(p.completed for p in idx) == sum(p.completed for p in bat)
+
+        print(f"{n:>8} | {seq_s * 1000:>9.0f}ms | {bat_s * 1000:>7.0f}ms | {idx_s * 1000:>11.0f}ms | "
+              f"{seq_s / idx_s:5.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 100, 250, 500])
+    parser.add_argument("--concurrency", type=int, default=schedule_loader.SCHEDULE_LOAD_CONCURRENCY)
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.concurrency))
@@ -0,0 +1,110 @@
+"""
+Session Store Soak Test
+
+Simulates N post-call audits against the Pulse agent's session store: each
+call creates a session and appends a CALL_COMPLETE message carrying an
+inline WAV plus an agent reply, exactly what the Runner writes. Process RSS
+is sampled along the way, for:
+
+- baseline: plain InMemorySessionService, no eviction (the previous
+  CareFlowAgentExecutor setup)
+- memory / sqlite: app_utils.session_store.EvictingSessionService over the
+  in-memory or SQLite backend
+
+Requires google-adk. No LLM or network access is needed.
+
+Usage:
+    python benchmarks/latency/session_soak_benchmark.py [--calls 1000] [--audio-kb 256] [--max-sessions 100]
+"""
+
+import argparse
+import asyncio
+import gc
+import importlib.util
+import os
+import resource
+import tempfile
+from pathlib import Path
+
+from google.adk.artifacts import FileArtifactService, InMemoryArtifactService
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService
+from google.adk.sessions.sqlite_session_service import SqliteSessionService
+from google.genai import types as genai_types
+
+# Load the module directly from its file (importing the `app` package
+# would pull in the whole agent).
+_APP_UTILS = Path(__file__).resolve().parents[2] / "careflow-agent" / "app" / "app_utils"
+_spec = importlib.util.spec_from_file_location("session_store", _APP_UTILS / "session_store.py")
+session_store = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(session_store)
+
+APP, USER = "careflow_pulse_agent", "a2a_caller"
+SAMPLES = 10
+
+
+def rss_mb() -> float:
+    """Current resident set size (Linux), falling back to the peak."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def simulate_call(service, index: int, audio: bytes) -> None:
+    session = await service.create_session(app_name=APP, user_id=USER, session_id=f"call-{index}")
+    await service.append_event(session, Event(
+        author="user",
+        invocation_id=f"inv-{index}",
+        content=genai_types.Content(role="user", parts=[
+            genai_types.Part.from_text(text=f"CALL_COMPLETE for patient p{index}. Analyze the attached audio."),
+            genai_types.Part.from_bytes(data=audio, mime_type="audio/wav"),
+        ]),
+    ))
+    await service.append_event(session, Event(
+        author="careflow_pulse_agent",
+        invocation_id=f"inv-{index}",
+        content=genai_types.Content(role="model", parts=[
+            genai_types.Part.from_text(text="Assessment recorded: GREEN, no red flags heard."),
+        ]),
+    ))
+
+
+async def soak(name, service, calls: int, audio_kb: int) -> None:
+    every = max(1, calls // SAMPLES)
+    samples = []
+    for i in range(calls):
+        # Fresh bytes per call, as each CALL_COMPLETE decodes its own WAV
+        await simulate_call(service, i, os.urandom(audio_kb * 1024))
+        if (i + 1) % every == 0:
+            gc.collect()
+            samples.append(rss_mb())
+    growth = samples[-1] - samples[len(samples) // 2]
+    print(f"{name:>8} | " + " ".join(f"{s:>6.0f}" for s in samples) + f" | {growth:>+8.1f}")
+
+
+async def main(calls: int, audio_kb: int, max_sessions: int):
+    print(f"--- Session soak: {calls} calls, {audio_kb} KB audio each, max {max_sessions} sessions ---")
+    print(f"{'store':>8} | RSS MB every {max(1, calls // SAMPLES)} calls" + " " * 38 + "| 2nd-half growth")
+    with tempfile.TemporaryDirectory() as tmp:
+        stores = (
+            ("memory", session_store.EvictingSessionService(
+                InMemorySessionService(), InMemoryArtifactService(), max_sessions=max_sessions)),
+            ("sqlite", session_store.EvictingSessionService(
+                SqliteSessionService(os.path.join(tmp, "sessions.db")), FileArtifactService(os.path.join(tmp, "artifacts")),
+                max_sessions=max_sessions)),
+            # Unbounded last, so its growth does not inflate the others' baseline
+            ("baseline", InMemorySessionService()),
+        )
+        for name, service in stores:
+            await soak(name, service, calls, audio_kb)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--audio-kb", type=int, default=256)
+    parser.add_argument("--max-sessions", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(main(args.calls, args.audio_kb, args.max_sessions))
@@ -0,0 +1,150 @@
+"""
+TTS Coalescing Micro-Benchmark
+
+Replays synthetic LLM token streams through the Caller Agent's TTSShaper and
+compares it with the previous one-frame-per-chunk behaviour:
+
+- frames per turn (WebSocket sends / TTS requests)
+- bytes on the wire
+- added latency per character (time a character waits in the shaper)
+- first-frame delay relative to the first LLM chunk
+
+No network or API keys needed.
+
+Usage:
+    python benchmarks/latency/tts_coalescing_benchmark.py [--turns 50] [--latency-ms 250]
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import random
+import statistics
+import time
+from pathlib import Path
+
+# Load the shaper directly from its file (it is dependency-free; importing the
+# `app` package would pull in the whole agent).
+_SHAPER_PATH = (
+    Path(__file__).resolve().parents[2]
+    / "caller-agent" / "app" / "app_utils" / "tts_shaper.py"
+)
+_spec = importlib.util.spec_from_file_location("tts_shaper", _SHAPER_PATH)
+tts_shaper = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(tts_shaper)
+
+RESPONSES = [
+    "Hello Maria, this is Sarah from the CareFlow team at Riverside Hospital. "
+    "I'm calling to check in after your discharge on Monday. Is now a good time to talk?",
+    "Thank you. Have you been able to pick up your new prescriptions from the pharmacy, "
+    "including the furosemide 40 mg and the metoprolol 25 mg?",
+    "I understand. Swelling in your ankles can be a sign of fluid build-up, so I'd like "
+    "to ask a few more questions. Have you gained more than 2.5 kilograms since you went home?",
+    "That's really helpful, thank you. I'm going to share this with your care team right away, "
+    "and a nurse will call you back within the hour.",
+    "You're welcome. Please remember to weigh yourself every morning. Take care, goodbye! [HANGUP]",
+]
+
+
+def chunk_text(text: str, rng: random.Random):
+    """Split text the way a streaming LLM does (2-6 chars per chunk)."""
+    i = 0
+    while i < len(text):
+        n = rng.randint(2, 6)
+        yield text[i:i + n]
+        i += n
+
+
+async def llm_stream(text: str, rng: random.Random, arrivals: list):
+    """Emit chunks with realistic inter-token gaps, recording arrival times."""
+    for chunk in chunk_text(text, rng):
+        await asyncio.sleep(max(0.0, rng.gauss(0.018, 0.008)))
+        arrivals.append((time.perf_counter(), len(chunk)))
+        yield chunk
+
+
+def per_char_times(events):
+    """Expand [(t, n_chars)] into one timestamp per character."""
+    times = []
+    for t, n in events:
+        times.extend([t] * n)
+    return times
+
+
+async def run_turn(text: str, seed: int, latency_ms: int):
+    rng = random.Random(seed)
+
+    # Baseline: one frame per chunk
+    arrivals = []
+    baseline_frames = 0
+    baseline_bytes = 0
+    async for chunk in llm_stream(text, rng, arrivals):
+        if "[HANGUP]" in chunk or "[[END_CALL_SIGNAL]]" in chunk:
+            continue
+        baseline_frames += 1
+        baseline_bytes += len(json.dumps({"type": "text", "token": chunk, "last": False}))
+    baseline_frames += 1  # explicit end-of-turn frame
+
+    # Shaped
+    rng = random.Random(seed)
+    arrivals = []
+    emitted = []
+    shaped_frames = 0
+    shaped_bytes = 0
+    shaper = tts_shaper.TTSShaper(max_latency_ms=latency_ms)
+    last_sent = False
+    async for segment in shaper.shape(llm_stream(text, rng, arrivals)):
+        emitted.append((time.perf_counter(), len(segment.text)))
+        shaped_frames += 1
+        shaped_bytes += len(json.dumps(segment.to_message()))
+        last_sent = segment.last
+    if not last_sent:
+        shaped_frames += 1
+
+    # Per-character wait (markers are stripped, so align on the shorter list)
+    arrived = per_char_times(arrivals)
+    sent = per_char_times(emitted)
+    waits = [(s - a) * 1000 for a, s in zip(arrived, sent)]
+    first_frame_delay = (emitted[0][0] - arrivals[0][0]) * 1000 if emitted else 0.0
+
+    return {
+        "baseline_frames": baseline_frames,
+        "shaped_frames": shaped_frames,
+        "baseline_bytes": baseline_bytes,
+        "shaped_bytes": shaped_bytes,
+        "waits": waits,
+        "first_frame_delay": first_frame_delay,
+    }
+
+
+def pct(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+async def main(turns: int, latency_ms: int):
+    print(f"--- TTS coalescing benchmark ({turns} turns, max latency {latency_ms} ms) ---")
+    results = [
+        await run_turn(RESPONSES[i % len(RESPONSES)], seed=i, latency_ms=latency_ms)
+        for i in range(turns)
+    ]
+
+    waits = [w for r in results for w in r["waits"]]
+    first = [r["first_frame_delay"] for r in results]
+
+    print(f"Frames/turn   : {statistics.mean(r['baseline_frames'] for r in results):6.1f} -> "
+          f"{statistics.mean(r['shaped_frames'] for r in results):6.1f}")
+    print(f"Bytes/turn    : {statistics.mean(r['baseline_bytes'] for r in results):6.0f} -> "
+          f"{statistics.mean(r['shaped_bytes'] for r in results):6.0f}")
+    print(f"Added latency : p50 {pct(waits, 50):.0f} ms, p95 {pct(waits, 95):.0f} ms, "
+          f"max {max(waits):.0f} ms (per character)")
+    print(f"First frame   : p50 {pct(first, 50):.0f} ms, p95 {pct(first, 95):.0f} ms after first chunk")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--latency-ms", type=int, default=tts_shaper.DEFAULT_MAX_LATENCY_MS)
+    args = parser.parse_args()
+    asyncio.run(main(args.turns, args.latency_ms))
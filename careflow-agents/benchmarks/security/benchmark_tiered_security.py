@@ -1,13 +1,12 @@
 
+import argparse
 import asyncio
 import time
 import os
 import sys
 import statistics
 import logging
-
-# Ensure we can import from the app
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from types import SimpleNamespace
 
 from dotenv import load_dotenv
 
@@ -17,7 +16,13 @@ load_dotenv()
 # Configure logging to show only critical errors during bench
 logging.basicConfig(level=logging.ERROR)
 
-from app.core.security.model_armor import ModelArmorClient
+# Import core.security directly (importing the `app` package would pull in the whole agent)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../caller-agent/app")))
+
+from core.security import model_armor
+from core.security.verdict_cache import verdict_cache
+
+ModelArmorClient = model_armor.ModelArmorClient
 
 ITERATIONS = 50
 TEST_PROMPT = "The patient John Doe (ID: 12345) has a history of hypertension and is taking Lisinopril."
@@ -76,11 +81,100 @@ def print_stats(name: str, latencies: list):
     print(f"     Min: {min(latencies):.2f} ms")
     print(f"     Max: {max(latencies):.2f} ms")
 
+# =============================================================================
+# EVENT-LOOP LAG UNDER CONCURRENT CALLS (fake backend, no credentials needed)
+# =============================================================================
+
+FAKE_LATENCY_S = 0.25
+CONCURRENT_CALLS = 50
+TICK_S = 0.01
+
+
+class FakeModelArmorBackend:
+    """Stands in for the synchronous gRPC client: blocks for FAKE_LATENCY_S per call."""
+
+    def sanitize_user_prompt(self, request=None, timeout=None):
+        time.sleep(FAKE_LATENCY_S)
+        return SimpleNamespace(sanitization_result=SimpleNamespace(
+            invocation_result=_fake_types.InvocationResult.SUCCESS,
+            filter_match_state=_fake_types.FilterMatchState.NO_MATCH_FOUND,
+        ))
+
+
+_fake_types = SimpleNamespace(
+    ModelArmorClient=lambda client_options=None: FakeModelArmorBackend(),
+    DataItem=lambda text: SimpleNamespace(text=text),
+    SanitizeUserPromptRequest=lambda **kw: SimpleNamespace(**kw),
+    InvocationResult=SimpleNamespace(SUCCESS=SimpleNamespace(name="SUCCESS")),
+    FilterMatchState=SimpleNamespace(MATCH_FOUND=2, NO_MATCH_FOUND=1),
+)
+
+
+class InlineModelArmorClient(ModelArmorClient):
+    """Previous behaviour: the blocking call runs directly on the event loop."""
+
+    async def _invoke(self, method, request):
+        return method(request=request, timeout=self.timeout)
+
+
+async def _measure_lag(stop: asyncio.Event, lags: list):
+    """Sleep TICK_S repeatedly and record how late each wake-up is."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK_S)
+        lags.append((time.perf_counter() - start - TICK_S) * 1000)
+
+
+async def benchmark_event_loop_lag(client_cls) -> dict:
+    client = client_cls(template_path="projects/bench/locations/us/templates/fake")
+    verdict_cache.clear()
+
+    lags: list = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(_measure_lag(stop, lags))
+
+    start = time.perf_counter()
+    # Distinct texts so the verdict cache does not coalesce the calls
+    results = await asyncio.gather(*[
+        client.scan_prompt(f"{TEST_PROMPT} (call {i})") for i in range(CONCURRENT_CALLS)
+    ])
+    wall = (time.perf_counter() - start) * 1000
+
+    stop.set()
+    await ticker
+    return {
+        "wall_ms": wall,
+        "lag_p95_ms": statistics.quantiles(lags, n=20)[18] if len(lags) > 1 else (lags or [0])[0],
+        "lag_max_ms": max(lags or [0]),
+        "errors": sum(1 for r in results if r.get("error")),
+    }
+
+
+async def main_event_loop_lag():
+    print(f"🚀 Event-loop lag: {CONCURRENT_CALLS} concurrent prompt scans, "
+          f"fake backend {FAKE_LATENCY_S * 1000:.0f} ms/call, "
+          f"pool size {model_armor.MODEL_ARMOR_MAX_CONCURRENCY}")
+    print("----------------------------------------")
+    os.environ.pop("MODEL_ARMOR_DISABLED", None)
+    model_armor.modelarmor_v1 = _fake_types
+    model_armor.MODEL_ARMOR_TIMEOUT_SECONDS = 60  # measure queueing, not deadlines
+
+    for label, cls in (("Inline (blocking)", InlineModelArmorClient), ("Pooled (offloaded)", ModelArmorClient)):
+        stats = await benchmark_event_loop_lag(cls)
+        print(f"  {label}:")
+        print(f"     Wall time: {stats['wall_ms']:.0f} ms")
+        print(f"     Loop lag P95: {stats['lag_p95_ms']:.1f} ms, Max: {stats['lag_max_ms']:.1f} ms")
+        if stats["errors"]:
+            print(f"     ⚠️ {stats['errors']} calls failed")
+
+
 async def main():
     print("🚀 Starting Security Latency Benchmark...")
     print("----------------------------------------")
     
     client = ModelArmorClient()
+    # Measure raw API latency, not verdict cache hits
+    verdict_cache.ttl_seconds = 0
     
     if not client.client:
         print("❌ ModelArmor Client could not be initialized (Missing credentials or package).")
@@ -105,4 +199,11 @@ async def main():
         print(f"   Recommendation: Use Tier 1 for Voice Agent (save {overhead_diff:.2f}ms).")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Model Armor benchmarks")
+    parser.add_argument(
+        "--event-loop-lag",
+        action="store_true",
+        help="Compare event-loop lag (inline vs pooled) against a fake backend",
+    )
+    args = parser.parse_args()
+    asyncio.run(main_event_loop_lag() if args.event_loop_lag else main())
@@ -0,0 +1,161 @@
+"""
+Streaming Sanitizer Benchmark
+
+Replays synthetic caller transcripts (with injected PHI and benign clinical
+values) through the Caller Agent's StreamingSanitizer and reports:
+
+- recall: share of injected identifiers that never reach TTS
+- false positives: benign clinical values that were altered
+- hold time per released span (added latency on the speaking path)
+- Model Armor requests per turn, versus one trailing blocking call before
+
+Model Armor is simulated with a fixed round-trip delay. No network or API keys needed.
+
+Usage:
+    python benchmarks/security/streaming_sanitizer_benchmark.py [--turns 200] [--ma-latency-ms 120]
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import logging
+import random
+import statistics
+import time
+from pathlib import Path
+
+# Load the sanitizer directly from its file (it is dependency-free; importing
+# the `app` package would pull in the whole agent).
+_SANITIZER_PATH = (
+    Path(__file__).resolve().parents[2]
+    / "caller-agent" / "app" / "core" / "security" / "streaming_sanitizer.py"
+)
+_spec = importlib.util.spec_from_file_location("streaming_sanitizer", _SANITIZER_PATH)
+streaming_sanitizer = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(streaming_sanitizer)
+
+# Per-span redaction warnings would drown the report
+logging.getLogger(streaming_sanitizer.__name__).setLevel(logging.ERROR)
+
+PHI = {
+    "ssn": ["123-45-6789", "987-65-4321"],
+    "phone": ["(555) 123-4567", "555-987-6543", "+1 555 222 3333"],
+    "email": ["maria.lopez@example.com", "j.smith+care@mail.example.org"],
+    "mrn": ["MRN 0048213", "MRN: 7712093"],
+    "dob": ["03/14/1956", "11/02/1948"],
+    "card": ["4111 1111 1111 1111"],
+}
+
+BENIGN = ["40 mg", "25 mg", "120/80", "2.5 kg", "98.6 degrees", "3 times a day", "7 days", "8/10"]
+
+TEMPLATES = [
+    "Thank you for confirming. I have your date of birth as {dob}, is that right?",
+    "Your furosemide dose is {benign} and your blood pressure last week was {benign2}.",
+    "If anything changes, the nurse line is {phone}, and you can also email {email}.",
+    "For our records your file is {mrn}, and the pain you rated at {benign} is noted.",
+    "I can't take payment details like {card} over the phone, I'm sorry.",
+    "Please don't read out your social security number, {ssn} is not something we need.",
+    "You've gained {benign} since discharge; please weigh yourself {benign2} and call us.",
+]
+
+
+def make_turn(rng: random.Random):
+    """Build one synthetic turn; returns (text, injected_phi, benign_values)."""
+    parts, phi, benign = [], [], []
+    for template in rng.sample(TEMPLATES, k=3):
+        values = {}
+        for kind in PHI:
+            values[kind] = rng.choice(PHI[kind])
+        values["benign"], values["benign2"] = rng.sample(BENIGN, k=2)
+        for field, value in values.items():
+            if "{" + field + "}" in template:
+                (benign if field.startswith("benign") else phi).append(value)
+        parts.append(template.format(**values))
+    return " ".join(parts), phi, benign
+
+
+class FakeModelArmor:
+    """Async stand-in for ModelArmorClient.sanitize_response."""
+
+    def __init__(self, latency_ms: float):
+        self.latency = latency_ms / 1000
+        self.calls = 0
+
+    async def sanitize_response(self, text: str):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return {"is_blocked": False, "redactions_applied": []}
+
+
+async def llm_stream(text: str, rng: random.Random, arrivals: dict):
+    """Emit 2-6 char chunks with realistic inter-token gaps."""
+    i = 0
+    while i < len(text):
+        n = rng.randint(2, 6)
+        await asyncio.sleep(max(0.0, rng.gauss(0.004, 0.002)))
+        arrivals[i + n] = time.perf_counter()
+        yield text[i:i + n]
+        i += n
+
+
+async def run_turn(seed: int, ma_latency_ms: float, batch_spans: int):
+    rng = random.Random(seed)
+    text, phi, benign = make_turn(rng)
+
+    client = FakeModelArmor(ma_latency_ms)
+    sanitizer = streaming_sanitizer.StreamingSanitizer(client, batch_spans=batch_spans)
+    arrivals = {}
+    output = []
+    async for span in sanitizer.sanitize(llm_stream(text, rng, arrivals)):
+        output.append(span)
+    last_chunk_at = max(arrivals.values())
+    spoken_done_at = time.perf_counter()
+    await sanitizer.finalize()
+
+    spoken = "".join(output)
+    return {
+        "phi_total": len(phi),
+        "phi_leaked": sum(1 for value in phi if value in spoken),
+        "benign_total": len(benign),
+        "benign_altered": sum(1 for value in benign if value not in spoken),
+        "hold_ms": sanitizer.hold_times_ms,
+        "tail_ms": (spoken_done_at - last_chunk_at) * 1000,
+        "ma_calls": client.calls,
+    }
+
+
+def pct(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+async def main(turns: int, ma_latency_ms: float, batch_spans: int):
+    print(f"--- Streaming sanitizer benchmark ({turns} turns, Model Armor {ma_latency_ms:.0f} ms, "
+          f"{batch_spans} spans/batch) ---")
+    results = [await run_turn(i, ma_latency_ms, batch_spans) for i in range(turns)]
+
+    phi_total = sum(r["phi_total"] for r in results)
+    phi_leaked = sum(r["phi_leaked"] for r in results)
+    benign_total = sum(r["benign_total"] for r in results)
+    benign_altered = sum(r["benign_altered"] for r in results)
+    holds = [h for r in results for h in r["hold_ms"]]
+    tails = [r["tail_ms"] for r in results]
+
+    print(f"PHI recall       : {(phi_total - phi_leaked) / phi_total:.1%} "
+          f"({phi_leaked} of {phi_total} identifiers leaked)")
+    print(f"False positives  : {benign_altered / benign_total:.1%} "
+          f"({benign_altered} of {benign_total} clinical values altered)")
+    print(f"Span hold time   : p50 {pct(holds, 50):.0f} ms, p95 {pct(holds, 95):.0f} ms, max {max(holds):.0f} ms")
+    print(f"End-of-turn wait : {ma_latency_ms:.0f} ms blocking audit -> "
+          f"p50 {pct(tails, 50):.1f} ms, p95 {pct(tails, 95):.1f} ms")
+    print(f"MA calls/turn    : 1 (after speaking) -> "
+          f"{statistics.mean(r['ma_calls'] for r in results):.1f} (in background while speaking)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--ma-latency-ms", type=float, default=120)
+    parser.add_argument("--batch-spans", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.turns, args.ma_latency_ms, args.batch_spans))
@@ -20,9 +20,9 @@ Version: 2.0.0
 import asyncio
 import json
 import logging
+from contextlib import aclosing
 from typing import Any, AsyncGenerator, Dict, List, Optional
 
-import aiohttp
 from fastapi import WebSocket
 from langchain_core.messages import (
     AIMessage,
@@ -35,17 +35,21 @@ from langgraph.prebuilt import create_react_agent
 from langgraph.checkpoint.memory import MemorySaver
 
 from a2a.types import AgentCard
-from google.auth.transport.requests import Request as GoogleRequest
-from google.oauth2 import id_token
-import google.auth
 
 # Internal imports - modular structure
-from .config import PUBLIC_URL
+from .config import (
+    PUBLIC_URL,
+    STREAMING_SANITIZER_BATCH_SPANS,
+    STREAMING_SANITIZER_ENFORCE,
+)
+from .app_utils.agent_card_registry import AgentCardRegistry
 from .app_utils.config_loader import load_config, get_a2a_server_urls
 from .app_utils.conversation_relay import SessionData
+from .app_utils.greeting_cache import greeting_cache
 from .app_utils.llm import ModelConfig, get_model
 from .app_utils.prompts.system_prompts import CALLER_SYSTEM_PROMPT
 from .core.security.model_armor import ModelArmorClient
+from .core.security.streaming_sanitizer import StreamingSanitizer
 from .tools import call_patient, end_call, create_a2a_tools
 
 
@@ -66,6 +70,26 @@ logger = logging.getLogger(__name__)
 
 model_armor_client = ModelArmorClient()
 
+# Background audit tasks (kept referenced until done)
+_background_tasks: set = set()
+
+
+def _spawn_background(coro) -> None:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def _log_output_audit(sanitizer: StreamingSanitizer, session_id: str) -> None:
+    """Wait for the turn's Model Armor batches off the speaking path and log the outcome."""
+    summary = await sanitizer.finalize()
+    if summary["blocked"]:
+        logger.error(f"🚨 Model Armor BLOCKED response for session {session_id}")
+    elif summary["ma_redactions"] or summary["local_redactions"] or summary["ma_errors"]:
+        logger.warning(f"🔒 PHI handling for session {session_id}: {summary}")
+    else:
+        logger.info("✅ Model Armor output scan passed (no PHI detected)")
+
 
 # =============================================================================
 # CALLER AGENT CLASS
@@ -85,7 +109,11 @@ class CallerAgent:
         memory: Conversation state persistence
         a2a_servers: List of A2A server URLs for inter-agent communication
         agent_cards: Cached AgentCard metadata from A2A servers
-        ws: Active WebSocket connection (if in call)
+        card_registry: TTL-refreshed source of agent_cards (loaded at startup)
+    
+    A single instance (one compiled graph, one model client) is shared by
+    every live call. Per-call state (WebSocket, SessionData) lives in
+    `app_utils.call_sessions.CallSession` and is passed in explicitly.
     """
     
     def __init__(self, system_message: str, a2a_servers: Optional[List[str]] = None):
@@ -101,7 +129,12 @@ class CallerAgent:
         self.memory = MemorySaver()
         self.a2a_servers = a2a_servers or []
         self.agent_cards: List[AgentCard] = []
-        self.ws: Optional[WebSocket] = None
+        self.card_registry = AgentCardRegistry(self.a2a_servers, cards=self.agent_cards)
+        self._system_message_cache = self.system_message
+        self._system_message_section = ""
+        
+        # Greeting pre-generation uses the model directly (no tools)
+        greeting_cache.configure(self.model, self.system_message.content)
         
         # Build the ReAct agent with tools
         a2a_tools = create_a2a_tools(
@@ -117,98 +150,35 @@ class CallerAgent:
         )
     
     async def init(self) -> None:
-        """Initialize agent by loading A2A server agent cards."""
-        await self._load_agent_cards()
+        """Load A2A agent cards (no-op once the registry has loaded)."""
+        await self.card_registry.ensure_loaded()
     
-    def set_ws_channel(self, ws: WebSocket) -> None:
+    def get_system_message(self) -> SystemMessage:
         """
-        Set the active WebSocket channel for voice communication.
+        System prompt including the remote-agent section.
         
-        Args:
-            ws: FastAPI WebSocket connection
+        Built from the immutable base prompt and the registry's cached
+        section; rebuilt only when the cards change.
         """
-        self.ws = ws
-    
-    # -------------------------------------------------------------------------
-    # A2A Server Integration
-    # -------------------------------------------------------------------------
+        section = self.card_registry.prompt_section
+        if self._system_message_section != section:
+            self._system_message_cache = SystemMessage(
+                content=self.system_message.content + section
+            )
+            self._system_message_section = section
+        return self._system_message_cache
     
-    async def _load_agent_cards(self) -> None:
+    def release_session(self, session_id: str) -> None:
         """
-        Load agent cards from all configured A2A servers.
+        Drop checkpointed graph state for a finished call.
         
-        Fetches agent metadata to understand available capabilities
-        and update system message with available remote agents.
+        Args:
+            session_id: The call's thread id (CallSession.session_id)
         """
-        logger.info("Loading agent cards from A2A servers...")
-        
-        async def fetch_card(server_url: str) -> Optional[dict]:
-            try:
-                from urllib.parse import urljoin
-                url = urljoin(server_url, "/.well-known/agent-card.json")
-                
-                # OIDC Authentication for Cloud Run
-                headers = {"Accept": "application/json"}
-                if "run.app" in server_url:
-                    try:
-                        # Fetch ID token for the target service
-                        # We use the base server_url as audience
-                        auth_req = GoogleRequest()
-                        token = id_token.fetch_id_token(auth_req, server_url)
-                        headers["Authorization"] = f"Bearer {token}"
-                        logger.info(f"🔑 Generated OIDC token for {server_url}")
-                    except Exception as e:
-                        logger.warning(f"Failed to generate ID token for {server_url} (continuing without auth): {e}")
-
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url, headers=headers) as resp:
-                        if resp.ok:
-                            return await resp.json()
-                        logger.error(f"Failed to fetch card from {url}: {resp.status}")
-                        return None
-            except Exception as e:
-                logger.error(f"Error fetching agent card from {server_url}: {e}")
-                return None
-        
-        # Fetch all cards in parallel
-        tasks = [fetch_card(url) for url in self.a2a_servers]
-        results = await asyncio.gather(*tasks)
-        
-        self.agent_cards = [
-            AgentCard.model_validate(card)
-            for card in results if card is not None
-        ]
-        
-        logger.info(f"Loaded {len(self.agent_cards)} agent cards")
-        
-        # Update system message with available agents
-        if self.agent_cards:
-            self._append_agent_info_to_system_message()
-    
-    def _append_agent_info_to_system_message(self) -> None:
-        """Append available agent information to system message."""
-        formatted_cards = []
-        
-        for i, card in enumerate(self.agent_cards):
-            skills_str = "    None specified"
-            if card.skills:
-                skills = [
-                    f"    • {skill.name}: {skill.description}"
-                    + (f"\n      Examples: {', '.join(skill.examples)}" if skill.examples else "")
-                    for skill in card.skills
-                ]
-                skills_str = "\n".join(skills)
-            
-            server_url = self.a2a_servers[i] if i < len(self.a2a_servers) else 'Unknown'
-            formatted_cards.append(
-                f"{i + 1}. {card.name or 'Unnamed Agent'}\n"
-                f"   Server URL: {server_url}\n"
-                f"   Description: {card.description or 'No description'}\n"
-                f"   Skills:\n{skills_str}"
-            )
-        
-        agents_info = "\n\nAvailable Remote Agents:\n" + "\n\n".join(formatted_cards)
-        self.system_message.content += agents_info
+        try:
+            self.memory.delete_thread(session_id)
+        except Exception as e:
+            logger.debug(f"Could not release thread {session_id}: {e}")
     
     # -------------------------------------------------------------------------
     # A2A Response Extraction
@@ -258,17 +228,19 @@ class CallerAgent:
     
     async def send_ws_message(
         self,
+        ws: Optional[WebSocket],
         text: Optional[str] = None,
         source: Optional[str] = None
     ) -> None:
         """
-        Send a message through the WebSocket channel.
+        Send a message through a call's WebSocket channel.
         
         Args:
+            ws: The call's WebSocket connection
             text: Text content to speak via TTS
             source: Audio source URL to play
         """
-        if not self.ws:
+        if not ws:
             logger.warning("WebSocket not connected")
             return
         
@@ -291,7 +263,7 @@ class CallerAgent:
             }
         
         if message:
-            await self.ws.send_text(json.dumps(message))
+            await ws.send_text(json.dumps(message))
     
     # -------------------------------------------------------------------------
     # Message Streaming
@@ -316,7 +288,7 @@ class CallerAgent:
             Response text chunks
         """
         try:
-            session_id = session_data.call_sid or 'default-session'
+            session_id = session_data.session_id or session_data.call_sid or 'default-session'
             
             # Convert conversation history to LangChain format
             messages: List[BaseMessage] = []
@@ -330,6 +302,7 @@ class CallerAgent:
             
             # Play typing indicator sound (Disabled to avoid Media Not Found errors)
             # await self.send_ws_message(
+            #     ws,
             #     source=f"https://{PUBLIC_URL}/public/keyboard-typing.mp3"
             # )
             
@@ -351,8 +324,7 @@ class CallerAgent:
             # Stream from agent
             streams = self.agent.astream_events(
                 {
-                    "messages": [self.system_message] + messages
-                    if self.system_message else messages,
+                    "messages": [self.get_system_message()] + messages,
                 },
                 config={
                     "configurable": {"thread_id": session_id},
@@ -363,35 +335,37 @@ class CallerAgent:
             
             full_response = ''
             
-            async for stream in streams:
-                if stream.get('event') in ('on_chat_model_stream', 'on_llm_stream'):
-                    data = stream.get('data')
-                    if not isinstance(data, dict):
-                        continue
-                    
-                    chunk = data.get('chunk')
-                    if not isinstance(chunk, AIMessageChunk):
-                        continue
-                    
-                    content = chunk.content
-                    if content and isinstance(content, str):
-                        full_response += content
-                        yield content
+            async def llm_chunks() -> AsyncGenerator[str, None]:
+                async for stream in streams:
+                    if stream.get('event') in ('on_chat_model_stream', 'on_llm_stream'):
+                        data = stream.get('data')
+                        if not isinstance(data, dict):
+                            continue
+                        
+                        chunk = data.get('chunk')
+                        if not isinstance(chunk, AIMessageChunk):
+                            continue
+                        
+                        content = chunk.content
+                        if content and isinstance(content, str):
+                            yield content
             
-            # --- MODEL ARMOR OUTPUT SCAN (Audit & Sanitize) ---
-            # NOTE: We audit the full response for PII/PHI to ensure compliance.
-            # While chunks are streamed for low latency, this audit provides a safety trail.
-            logger.info("🔍 Model Armor auditing caller response for PII/PHI...")
-            sanitization_result = await model_armor_client.sanitize_response(full_response)
+            # --- MODEL ARMOR OUTPUT GUARD (windowed, streaming) ---
+            # Each sentence/clause passes a local PHI filter before release;
+            # released text is batched to Model Armor in the background and a
+            # blocked verdict suppresses the rest of the turn.
+            sanitizer = StreamingSanitizer(
+                model_armor_client,
+                batch_spans=STREAMING_SANITIZER_BATCH_SPANS,
+                enforce=STREAMING_SANITIZER_ENFORCE,
+            )
+            async with aclosing(sanitizer.sanitize(llm_chunks())) as spans:
+                async for span in spans:
+                    full_response += span
+                    yield span
             
-            if sanitization_result.get("is_blocked"):
-                logger.error("🚨 Model Armor BLOCKED entire response - critical safety issue detected")
-            elif sanitization_result.get("redactions_applied"):
-                redacted = sanitization_result.get("redactions_applied", [])
-                logger.warning(f"🔒 Model Armor detected PHI/Sensitive data: {', '.join(redacted)}")
-            else:
-                logger.info("✅ Model Armor output scan passed (no PHI detected)")
-            # --------------------------------------------------
+            _spawn_background(_log_output_audit(sanitizer, session_id))
+            # ------------------------------------------------------
 
             logger.info(f"Agent response for session {session_id}: {full_response[:100]}...")
             
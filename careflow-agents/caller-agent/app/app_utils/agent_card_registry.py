@@ -0,0 +1,222 @@
+"""
+CareFlow Pulse - Agent Card Registry
+
+Cached A2A agent cards for the Caller Agent's remote agents.
+
+Cards are fetched once at startup and refreshed in the background on a TTL,
+using ETag / If-None-Match so an unchanged card costs a 304 and no parsing.
+The "Available Remote Agents" prompt section is rebuilt only when a card
+actually changes, so no network call sits on the path of an incoming call.
+
+Author: CareFlow Pulse Team
+Version: 1.0.0
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import urljoin
+
+import aiohttp
+from a2a.types import AgentCard
+
+from ..config import AGENT_CARD_TTL_SECONDS
+from ..core.a2a import a2a_client, audience_for, needs_id_token
+
+logger = logging.getLogger(__name__)
+
+CARD_PATH = "/.well-known/agent-card.json"
+FETCH_TIMEOUT_SECONDS = 10
+
+
+# =============================================================================
+# AGENT CARD REGISTRY
+# =============================================================================
+
+class AgentCardRegistry:
+    """
+    TTL-refreshed cache of remote A2A agent cards.
+
+    The `cards` list is updated in place (never rebound) because the A2A
+    tools hold a reference to it. On a failed refresh the last good card for
+    that server is kept.
+
+    Attributes:
+        servers: Configured A2A server URLs (fetch order)
+        ttl_seconds: Background refresh interval
+        cards: Loaded AgentCards, in server order
+        prompt_section: Formatted "Available Remote Agents" block
+    """
+
+    def __init__(
+        self,
+        servers: List[str],
+        cards: Optional[List[AgentCard]] = None,
+        ttl_seconds: int = AGENT_CARD_TTL_SECONDS,
+    ):
+        self.servers = list(servers)
+        self.ttl_seconds = ttl_seconds
+        self.cards: List[AgentCard] = cards if cards is not None else []
+        self.prompt_section: str = ""
+
+        self._by_server: Dict[str, AgentCard] = {}
+        self._etags: Dict[str, str] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._loaded = False
+        self._last_refresh: Optional[float] = None
+        self._fetches = 0
+        self._not_modified = 0
+        self._failures = 0
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Load cards once and start the background refresh loop."""
+        await self.ensure_loaded()
+        if self._refresh_task is None and self.servers and self.ttl_seconds > 0:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """Stop background refresh."""
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+    async def ensure_loaded(self) -> None:
+        """Perform the initial load if it has not happened yet."""
+        if not self._loaded:
+            await self.refresh()
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.ttl_seconds)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Agent card refresh failed: {e}")
+
+    # -------------------------------------------------------------------------
+    # Fetching
+    # -------------------------------------------------------------------------
+
+    async def refresh(self) -> bool:
+        """
+        Revalidate every server's card.
+
+        Returns:
+            True if any card changed (and the prompt section was rebuilt)
+        """
+        results = await asyncio.gather(*[self._fetch(url) for url in self.servers])
+        changed = any(results)
+
+        if changed or not self._loaded:
+            self.cards[:] = [self._by_server[url] for url in self.servers if url in self._by_server]
+            self.prompt_section = self._build_prompt_section()
+            logger.info(f"Loaded {len(self.cards)} agent cards")
+
+        self._loaded = True
+        self._last_refresh = time.time()
+        return changed
+
+    async def _fetch(self, server_url: str) -> bool:
+        """Fetch one card with If-None-Match. Returns True if it changed."""
+        url = urljoin(server_url, CARD_PATH)
+        headers = {"Accept": "application/json"}
+
+        etag = self._etags.get(server_url)
+        if etag and server_url in self._by_server:
+            headers["If-None-Match"] = etag
+
+        # OIDC Authentication for Cloud Run (cached, shared with the A2A tools)
+        if needs_id_token(server_url):
+            try:
+                token = await a2a_client.tokens.get(audience_for(server_url))
+                headers["Authorization"] = f"Bearer {token}"
+            except Exception as e:
+                logger.warning(f"Failed to generate ID token for {server_url} (continuing without auth): {e}")
+
+        self._fetches += 1
+        try:
+            async with a2a_client.session(url).get(
+                url, headers=headers, timeout=aiohttp.ClientTimeout(total=FETCH_TIMEOUT_SECONDS)
+            ) as resp:
+                if resp.status == 304:
+                    self._not_modified += 1
+                    return False
+                if not resp.ok:
+                    self._failures += 1
+                    logger.error(f"Failed to fetch card from {url}: {resp.status}")
+                    return False
+
+                card = AgentCard.model_validate(await resp.json())
+                if resp.headers.get("ETag"):
+                    self._etags[server_url] = resp.headers["ETag"]
+        except Exception as e:
+            self._failures += 1
+            logger.error(f"Error fetching agent card from {server_url}: {e}")
+            return False
+
+        previous = self._by_server.get(server_url)
+        self._by_server[server_url] = card
+        return previous is None or previous.model_dump() != card.model_dump()
+
+    # -------------------------------------------------------------------------
+    # Prompt Section
+    # -------------------------------------------------------------------------
+
+    def _build_prompt_section(self) -> str:
+        """Format the loaded cards for the system prompt."""
+        if not self.cards:
+            return ""
+
+        formatted_cards = []
+        servers = [url for url in self.servers if url in self._by_server]
+
+        for i, card in enumerate(self.cards):
+            skills_str = "    None specified"
+            if card.skills:
+                skills = [
+                    f"    • {skill.name}: {skill.description}"
+                    + (f"\n      Examples: {', '.join(skill.examples)}" if skill.examples else "")
+                    for skill in card.skills
+                ]
+                skills_str = "\n".join(skills)
+
+            formatted_cards.append(
+                f"{i + 1}. {card.name or 'Unnamed Agent'}\n"
+                f"   Server URL: {servers[i]}\n"
+                f"   Description: {card.description or 'No description'}\n"
+                f"   Skills:\n{skills_str}"
+            )
+
+        return "\n\nAvailable Remote Agents:\n" + "\n\n".join(formatted_cards)
+
+    # -------------------------------------------------------------------------
+    # Metrics
+    # -------------------------------------------------------------------------
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Snapshot of cache counters."""
+        return {
+            "cards": len(self.cards),
+            "servers": len(self.servers),
+            "ttlSeconds": self.ttl_seconds,
+            "lastRefresh": self._last_refresh,
+            "fetches": self._fetches,
+            "notModified": self._not_modified,
+            "failures": self._failures,
+        }
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = ['AgentCardRegistry']
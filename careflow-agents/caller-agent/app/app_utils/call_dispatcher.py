@@ -0,0 +1,193 @@
+"""
+CareFlow Pulse - Batch Call Dispatcher
+
+Backs the `dispatch_calls` A2A skill: Pulse sends many structured patient
+briefs in one request and the Caller starts the Twilio calls itself, with
+no LLM turn per patient.
+
+Each brief is validated (CallBrief); invalid or repeated patients are
+rejected without a call. Valid ones are started through the same path as
+the `call_patient` tool (dedup, greeting prefetch, status callbacks), paced
+by a process-wide limiter so the Twilio number never exceeds
+OUTBOUND_CALLS_PER_SECOND across concurrent batches. One acceptance result
+per patient is yielded as soon as it is known.
+
+Author: CareFlow Pulse Team
+Version: 1.0.0
+"""
+
+import time
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from pydantic import ValidationError
+
+from ..config import DISPATCH_CALLS_MAX_BATCH, OUTBOUND_CALLS_PER_SECOND
+from ..schemas.a2a_schemas import CallBrief, DispatchCallsRequest
+from ..tools.twilio_tool import CALL_DUPLICATE, CALL_STARTED, CallStart, start_patient_call
+
+logger = logging.getLogger(__name__)
+
+SKILL_ID = "dispatch_calls"
+
+ACCEPTED = "accepted"
+DUPLICATE = "duplicate"
+REJECTED = "rejected"
+FAILED = "failed"
+
+
+class CallRateLimiter:
+    """Spaces call starts at least 1/`rate` seconds apart (no limit if rate <= 0)."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+@dataclass
+class CallAcceptance:
+    """Per-patient result streamed back to the requester."""
+    patient_id: Optional[str]
+    status: str  # "accepted" | "duplicate" | "rejected" | "failed"
+    call_sid: Optional[str] = None
+    detail: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "patientId": self.patient_id,
+            "status": self.status,
+            "callSid": self.call_sid,
+            "detail": self.detail,
+        }
+
+
+def _validation_detail(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in e['loc'])}: {e['msg']}" for e in error.errors()
+    )
+
+
+class CallDispatcher:
+    """Validates `dispatch_calls` batches and starts their calls under a CPS limit."""
+
+    def __init__(
+        self,
+        calls_per_second: float = OUTBOUND_CALLS_PER_SECOND,
+        max_batch: int = DISPATCH_CALLS_MAX_BATCH,
+        start_call: Callable[..., Awaitable[CallStart]] = start_patient_call,
+    ):
+        self.max_batch = max_batch
+        self.limiter = CallRateLimiter(calls_per_second)
+        self.start_call = start_call
+        self.stats = {"batches": 0, "patients": 0, ACCEPTED: 0, DUPLICATE: 0, REJECTED: 0, FAILED: 0}
+
+    def validate(self, data: Dict[str, Any]) -> tuple[DispatchCallsRequest, List[CallBrief], List[CallAcceptance]]:
+        """
+        Split a request into valid briefs and rejections.
+
+        Raises:
+            ValueError: If the request itself is malformed or too large
+        """
+        try:
+            request = DispatchCallsRequest.model_validate(data)
+        except ValidationError as e:
+            raise ValueError(f"Invalid dispatch_calls request: {_validation_detail(e)}") from None
+        if len(request.patients) > self.max_batch:
+            raise ValueError(f"Batch of {len(request.patients)} patients exceeds the limit of {self.max_batch}")
+
+        briefs: List[CallBrief] = []
+        rejected: List[CallAcceptance] = []
+        seen = set()
+        for raw in request.patients:
+            patient_id = raw.get("patientId") if isinstance(raw, dict) else None
+            try:
+                brief = CallBrief.model_validate(raw)
+            except ValidationError as e:
+                rejected.append(CallAcceptance(patient_id, REJECTED, detail=_validation_detail(e)))
+                continue
+            if brief.patient_id in seen:
+                rejected.append(CallAcceptance(brief.patient_id, REJECTED, detail="Patient listed twice in batch"))
+                continue
+            seen.add(brief.patient_id)
+            briefs.append(brief)
+        return request, briefs, rejected
+
+    async def dispatch(self, data: Dict[str, Any]) -> AsyncIterator[CallAcceptance]:
+        """
+        Start the calls of a batch, yielding each patient's acceptance as it is known.
+
+        Rejections come first; started calls follow in completion order.
+
+        Raises:
+            ValueError: If the request itself is malformed or too large
+        """
+        request, briefs, rejected = self.validate(data)
+        self.stats["batches"] += 1
+        self.stats["patients"] += len(request.patients)
+        logger.info(
+            f"📋 dispatch_calls: {len(briefs)} calls to start, {len(rejected)} rejected"
+            f"{f' (slot {request.schedule_slot})' if request.schedule_slot else ''}"
+        )
+
+        for acceptance in rejected:
+            self.stats[REJECTED] += 1
+            yield acceptance
+
+        tasks = [asyncio.create_task(self._start(brief)) for brief in briefs]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                acceptance = await next_done
+                self.stats[acceptance.status] += 1
+                yield acceptance
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _start(self, brief: CallBrief) -> CallAcceptance:
+        await self.limiter.acquire()
+        result = await self.start_call(brief.brief, brief.patient_name, brief.patient_id, brief.patient_phone)
+        if result.status == CALL_STARTED:
+            return CallAcceptance(brief.patient_id, ACCEPTED, result.call_sid)
+        if result.status == CALL_DUPLICATE:
+            return CallAcceptance(
+                brief.patient_id, DUPLICATE, result.call_sid,
+                f"Call already in progress (initiated {result.elapsed_seconds}s ago)",
+            )
+        return CallAcceptance(brief.patient_id, FAILED, detail=result.detail)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "callsPerSecond": round(1 / self.limiter.interval, 2) if self.limiter.interval else None,
+            "maxBatch": self.max_batch,
+            **self.stats,
+        }
+
+
+# Process-wide dispatcher (one CPS budget for the Twilio number)
+call_dispatcher = CallDispatcher()
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    'SKILL_ID',
+    'CallAcceptance',
+    'CallDispatcher',
+    'CallRateLimiter',
+    'call_dispatcher',
+]
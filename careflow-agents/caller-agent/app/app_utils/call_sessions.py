@@ -0,0 +1,188 @@
+"""
+CareFlow Pulse - Call Session Registry
+
+Per-call state for concurrent ConversationRelay connections.
+
+Each live call gets its own lightweight `CallSession` (WebSocket, SessionData
+and a cancellation token) while every session shares the single compiled
+LangGraph agent and model client. This lets one Cloud Run instance serve many
+simultaneous patients without calls overwriting each other's channel.
+
+Author: CareFlow Pulse Team
+Version: 1.0.0
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from fastapi import WebSocket
+
+from ..config import MAX_CONCURRENT_CALLS
+from .conversation_relay import SessionData
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# CALL SESSION
+# =============================================================================
+
+@dataclass
+class CallSession:
+    """
+    State owned by a single live call.
+
+    Attributes:
+        session_id: Stable key for this call (Call SID when known at connect
+                    time, otherwise a generated id). Also used as the
+                    LangGraph thread id.
+        websocket: The call's ConversationRelay WebSocket
+        session_data: Conversation history and response tracking
+        cancel_event: Cancellation token for in-flight work on this call
+        patient_id: Patient identifier (outbound calls)
+        patient_name: Patient display name (outbound calls)
+        created_at: Monotonic timestamp when the session was opened
+    """
+    session_id: str
+    websocket: WebSocket
+    session_data: SessionData
+    cancel_event: asyncio.Event = field(default_factory=asyncio.Event)
+    patient_id: Optional[str] = None
+    patient_name: Optional[str] = None
+    created_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def call_sid(self) -> Optional[str]:
+        """Twilio Call SID (None until known)."""
+        return self.session_data.call_sid
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the session has been cancelled."""
+        return self.cancel_event.is_set()
+
+    def cancel(self) -> None:
+        """Signal all in-flight work for this call to stop."""
+        self.cancel_event.set()
+
+
+# =============================================================================
+# SESSION REGISTRY
+# =============================================================================
+
+class CallSessionRegistry:
+    """
+    Registry of live call sessions, keyed by session id and Call SID.
+
+    Attributes:
+        max_sessions: Maximum number of concurrent calls accepted
+    """
+
+    def __init__(self, max_sessions: int = MAX_CONCURRENT_CALLS):
+        self.max_sessions = max_sessions
+        self._sessions: Dict[str, CallSession] = {}
+        self._by_call_sid: Dict[str, str] = {}
+        self._peak = 0
+        self._opened_total = 0
+        self._rejected_total = 0
+
+    def open(
+        self,
+        websocket: WebSocket,
+        session_data: SessionData,
+        patient_id: Optional[str] = None,
+        patient_name: Optional[str] = None,
+    ) -> Optional[CallSession]:
+        """
+        Register a new call session.
+
+        Args:
+            websocket: Accepted WebSocket for the call
+            session_data: Fresh session state (call_sid may already be set)
+            patient_id: Patient identifier, if known
+            patient_name: Patient name, if known
+
+        Returns:
+            The new CallSession, or None if the instance is at capacity
+        """
+        if len(self._sessions) >= self.max_sessions:
+            self._rejected_total += 1
+            logger.warning(f"🚫 Call capacity reached ({self.max_sessions}) - rejecting connection")
+            return None
+
+        session_id = session_data.call_sid or f"ws-{uuid.uuid4()}"
+        session_data.session_id = session_id
+        session = CallSession(
+            session_id=session_id,
+            websocket=websocket,
+            session_data=session_data,
+            patient_id=patient_id,
+            patient_name=patient_name,
+        )
+
+        self._sessions[session_id] = session
+        if session_data.call_sid:
+            self._by_call_sid[session_data.call_sid] = session_id
+
+        self._opened_total += 1
+        self._peak = max(self._peak, len(self._sessions))
+        logger.info(f"📞 Call session opened: {session_id} ({len(self._sessions)} active)")
+        return session
+
+    def bind_call_sid(self, session: CallSession, call_sid: Optional[str]) -> None:
+        """
+        Associate a Call SID with a session (from the ConversationRelay setup message).
+
+        Args:
+            session: The session to update
+            call_sid: Twilio Call SID
+        """
+        if not call_sid:
+            return
+        session.session_data.call_sid = call_sid
+        self._by_call_sid[call_sid] = session.session_id
+
+    def get(self, key: str) -> Optional[CallSession]:
+        """Look up a session by session id or Call SID."""
+        session = self._sessions.get(key)
+        if session:
+            return session
+        session_id = self._by_call_sid.get(key)
+        return self._sessions.get(session_id) if session_id else None
+
+    def close(self, session: CallSession) -> None:
+        """Cancel and remove a session."""
+        session.cancel()
+        self._sessions.pop(session.session_id, None)
+        if session.call_sid:
+            self._by_call_sid.pop(session.call_sid, None)
+        logger.info(f"📴 Call session closed: {session.session_id} ({len(self._sessions)} active)")
+
+    def get_count(self) -> int:
+        """Number of live call sessions."""
+        return len(self._sessions)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Snapshot of concurrency counters."""
+        return {
+            "activeCalls": len(self._sessions),
+            "peakCalls": self._peak,
+            "maxCalls": self.max_sessions,
+            "openedTotal": self._opened_total,
+            "rejectedTotal": self._rejected_total,
+        }
+
+
+# Global registry instance
+call_sessions = CallSessionRegistry()
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = ['CallSession', 'CallSessionRegistry', 'call_sessions']
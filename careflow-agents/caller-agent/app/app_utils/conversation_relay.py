@@ -52,12 +52,14 @@ class SessionData:
         conversation: List of messages in the conversation
         current_response: Response being streamed (for interruption handling)
         interrupted_at: Position where current response was interrupted
+        session_id: Stable per-call key used as the agent thread id
     """
     connected_at: str
     call_sid: Optional[str]
     conversation: List[ConversationMessage]
     current_response: Optional[str] = None
     interrupted_at: Optional[int] = None
+    session_id: Optional[str] = None
 
 
 # =============================================================================
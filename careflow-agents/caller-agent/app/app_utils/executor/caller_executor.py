@@ -10,13 +10,20 @@ Architecture:
     - Manages task lifecycle (submitted -> working -> completed)
     - Converts between A2A Message format and LangChain BaseMessage
     - Streams responses back via EventQueue
+    - Routes `dispatch_calls` batches (DataPart requests) straight to the
+      call dispatcher, without an LLM turn
+    - Records each skill's task latency for the agent card's latency
+      extension, and (if enabled) sends the expected remaining latency as a
+      working DataPart update {"latency": ms, "skill": id}
 
 Author: CareFlow Pulse Team
 Version: 1.0.0
 """
 
+import contextlib
 import logging
 import os
+import time
 import uuid
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Set
@@ -30,6 +37,7 @@ from a2a.types import (
     AgentCard,
     AgentProvider,
     AgentSkill,
+    DataPart,
     Message,
     Part,
     Role,
@@ -41,7 +49,9 @@ from a2a.types import (
 )
 
 from ...agent import CallerAgent
+from ..call_dispatcher import SKILL_ID as DISPATCH_CALLS_SKILL, CallDispatcher, call_dispatcher
 from ..conversation_relay import ConversationMessage, SessionData
+from ...core.a2a import SkillLatencyTracker, skill_latency
 from ...schemas.agent_card.v1.caller_card import caller_card
 
 
@@ -51,6 +61,9 @@ logger = logging.getLogger(__name__)
 # Service URL from environment (for Cloud Run deployment)
 SERVICE_URL = os.environ.get("SERVICE_URL", "http://localhost:8080/")
 
+# Skill served by the LangGraph agent (free-text requests)
+VOICE_CALL_SKILL = "voice_call_handling"
+
 
 # =============================================================================
 # MESSAGE HISTORY CACHE
@@ -77,14 +90,23 @@ class CallerAgentExecutor(AgentExecutor):
         cancelled_tasks: Set of task IDs that have been cancelled
     """
     
-    def __init__(self, agent: CallerAgent):
+    def __init__(
+        self,
+        agent: CallerAgent,
+        dispatcher: CallDispatcher = call_dispatcher,
+        latency: SkillLatencyTracker = skill_latency
+    ):
         """
         Initialize the executor.
         
         Args:
             agent: CallerAgent instance to delegate execution to
+            dispatcher: Batch call dispatcher for the `dispatch_calls` skill
+            latency: Per-skill latency tracker behind the latency extension
         """
         self.agent = agent
+        self.dispatcher = dispatcher
+        self.latency = latency
         self.cancelled_tasks: Set[str] = set()
     
     async def cancel(self, context: RequestContext, event_queue: EventQueue) -> None:
@@ -110,6 +132,7 @@ class CallerAgentExecutor(AgentExecutor):
             context: Request context with message and task info
             event_queue: Queue for publishing A2A events
         """
+        started = time.monotonic()
         user_message = context.message
         current_task = context.current_task
         
@@ -133,6 +156,14 @@ class CallerAgentExecutor(AgentExecutor):
         # Publish working status
         await self._publish_working_status(event_queue, task_id, context_id)
         
+        # Batch dispatch skill: structured briefs, no LLM
+        dispatch_request = self._extract_skill_data(user_message, DISPATCH_CALLS_SKILL)
+        if dispatch_request is not None:
+            await self._publish_latency_update(event_queue, task_id, context_id, DISPATCH_CALLS_SKILL, started)
+            if await self._execute_dispatch_calls(event_queue, task_id, context_id, dispatch_request):
+                self.latency.record(DISPATCH_CALLS_SKILL, (time.monotonic() - started) * 1000)
+            return
+        
         # Extract message text
         message_text = self._extract_message_text(user_message)
         if not message_text:
@@ -143,11 +174,14 @@ class CallerAgentExecutor(AgentExecutor):
         session_data = self._build_session_data(context_id, user_message)
         langchain_messages = self._build_langchain_messages(context_id)
         
+        await self._publish_latency_update(event_queue, task_id, context_id, VOICE_CALL_SKILL, started)
+        
         try:
             # Execute agent
             final_response = await self._execute_agent(
                 task_id, context_id, message_text, langchain_messages
             )
+            self.latency.record(VOICE_CALL_SKILL, (time.monotonic() - started) * 1000)
             
             # Publish completion
             await self._publish_completion(
@@ -203,6 +237,14 @@ class CallerAgentExecutor(AgentExecutor):
                 text_parts.append(part.root.text)
         return "\n".join(text_parts).strip()
     
+    def _extract_skill_data(self, message: Message, skill_id: str) -> Optional[Dict[str, Any]]:
+        """Return the DataPart payload addressed to `skill_id`, if the message has one."""
+        for part in message.parts:
+            if part.root.kind == "data" and isinstance(part.root.data, dict):
+                if part.root.data.get("skill") == skill_id:
+                    return part.root.data
+        return None
+    
     def _build_session_data(self, context_id: str, message: Message) -> SessionData:
         """Build SessionData from message history."""
         # Update message history cache
@@ -257,7 +299,7 @@ class CallerAgentExecutor(AgentExecutor):
         history: List[BaseMessage]
     ) -> str:
         """Execute the LangGraph agent and collect response."""
-        messages = [self.agent.system_message] + history + [HumanMessage(content=message_text)]
+        messages = [self.agent.get_system_message()] + history + [HumanMessage(content=message_text)]
         
         streams = self.agent.agent.astream_events(
             {"messages": messages},
@@ -289,10 +331,104 @@ class CallerAgentExecutor(AgentExecutor):
         logger.info(f"Agent response: {final_response[:200]}...")
         return final_response
     
+    async def _execute_dispatch_calls(
+        self,
+        event_queue: EventQueue,
+        task_id: str,
+        context_id: str,
+        request: Dict[str, Any]
+    ) -> bool:
+        """
+        Run a `dispatch_calls` batch.
+        
+        Each patient's acceptance is published as a working status update
+        carrying a DataPart; the final update carries the batch summary.
+        
+        Returns:
+            False if the request was refused as malformed or too large
+        """
+        results: List[Dict[str, Any]] = []
+        try:
+            # aclosing: leaving early must cancel the batch's pending starts now, not at GC
+            async with contextlib.aclosing(self.dispatcher.dispatch(request)) as acceptances:
+                async for acceptance in acceptances:
+                    results.append(acceptance.to_dict())
+                    await self._publish_data_update(
+                        event_queue, task_id, context_id, acceptance.to_dict(), TaskState.working, final=False
+                    )
+                    if task_id in self.cancelled_tasks:
+                        logger.info(f"Task cancelled: {task_id}")
+                        break
+        except ValueError as e:
+            await self._publish_error(event_queue, task_id, context_id, str(e))
+            return False
+        
+        summary: Dict[str, Any] = {"skill": DISPATCH_CALLS_SKILL, "patients": len(results)}
+        for result in results:
+            summary[result["status"]] = summary.get(result["status"], 0) + 1
+        summary["results"] = results
+        await self._publish_data_update(
+            event_queue, task_id, context_id, summary, TaskState.completed, final=True,
+            text=f"Dispatched {summary.get('accepted', 0)}/{len(results)} calls",
+        )
+        return True
+    
     # -------------------------------------------------------------------------
     # Event Publishing
     # -------------------------------------------------------------------------
     
+    async def _publish_latency_update(
+        self,
+        event_queue: EventQueue,
+        task_id: str,
+        context_id: str,
+        skill: str,
+        started: float
+    ) -> None:
+        """Send the expected remaining latency of this task, if latency updates are enabled."""
+        if not self.latency.task_updates:
+            return
+        remaining = self.latency.expected_remaining_ms(skill, (time.monotonic() - started) * 1000)
+        if remaining is None:
+            return
+        await self._publish_data_update(
+            event_queue, task_id, context_id, {"latency": remaining, "skill": skill}, TaskState.working, final=False
+        )
+    
+    async def _publish_data_update(
+        self,
+        event_queue: EventQueue,
+        task_id: str,
+        context_id: str,
+        data: Dict[str, Any],
+        state: TaskState,
+        final: bool,
+        text: Optional[str] = None
+    ) -> None:
+        """Publish a status update carrying structured data (and optional text)."""
+        parts = [Part(root=DataPart(kind="data", data=data))]
+        if text:
+            parts.append(Part(root=TextPart(kind="text", text=text)))
+        update = TaskStatusUpdateEvent(
+            kind="status-update",
+            taskId=task_id,
+            contextId=context_id,
+            status=TaskStatus(
+                state=state,
+                message=Message(
+                    kind="message",
+                    role=Role.agent,
+                    messageId=str(uuid.uuid4()),
+                    parts=parts,
+                    taskId=task_id,
+                    contextId=context_id,
+                ),
+                timestamp=datetime.now().isoformat(),
+            ),
+            final=final,
+        )
+        await event_queue.enqueue_event(update)
+    
     async def _publish_initial_task(
         self,
         event_queue: EventQueue,
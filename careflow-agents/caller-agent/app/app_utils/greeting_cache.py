@@ -0,0 +1,316 @@
+"""
+CareFlow Pulse - Greeting Pre-generation Cache
+
+Speculative opening lines for outbound calls.
+
+`call_patient` already knows who is being called and why several seconds
+before the patient picks up. The greeting is generated while the phone
+rings and parked here, keyed by patient_id and aliased to the Call SID once
+Twilio returns it. When the call's WebSocket connects, the greeting is
+streamed immediately instead of waiting for model time-to-first-token; on a
+miss the server falls back to live generation.
+
+Author: CareFlow Pulse Team
+Version: 1.0.0
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from ..core.security.streaming_sanitizer import redact_phi
+from ..config import (
+    GREETING_CACHE_TTL_SECONDS,
+    GREETING_PREFETCH_ENABLED,
+    GREETING_WAIT_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Number of latency samples kept for percentiles
+LATENCY_WINDOW = 500
+
+
+# =============================================================================
+# PROMPT BUILDERS (shared with the live greeting path)
+# =============================================================================
+
+def build_outbound_context(
+    patient_name: str,
+    patient_id: Optional[str],
+    call_context: Optional[str] = None,
+) -> str:
+    """System instruction injected at the start of an outbound call."""
+    system_instruction = (
+        f"URGENT CONTEXT: You are now connected with patient {patient_name} "
+        f"(ID: {patient_id})."
+    )
+    if call_context:
+        system_instruction += f"\nSpecific Instructions:\n{call_context}"
+    system_instruction += "\n\nThe patient has just picked up. Start the interview."
+    return system_instruction
+
+
+def build_greeting_prompt(patient_name: str) -> str:
+    """User-turn prompt asking the agent for its opening line."""
+    # CRITICAL: Tell the agent explicitly that this is LIVE - no tools needed!
+    return (
+        f"LIVE CALL ACTIVE with {patient_name}. "
+        "The patient just picked up the phone and can hear you NOW. "
+        "DO NOT use any tools - just speak directly! "
+        "Say your greeting to confirm you're speaking with the right person."
+    )
+
+
+# =============================================================================
+# CACHE ENTRY
+# =============================================================================
+
+@dataclass
+class GreetingEntry:
+    """A greeting being (or already) generated for one outbound call."""
+    patient_id: str
+    patient_name: str
+    task: "asyncio.Task[Optional[str]]"
+    call_sid: Optional[str] = None
+    created_at: float = field(default_factory=time.monotonic)
+
+
+# =============================================================================
+# GREETING CACHE
+# =============================================================================
+
+class GreetingCache:
+    """
+    Pre-generated greetings keyed by patient_id, aliased by Call SID.
+
+    Generation calls the chat model directly (no tools, no checkpointer) with
+    the agent's system prompt, so it never touches the shared graph state.
+
+    Attributes:
+        enabled: Whether prefetching is active
+        ttl_seconds: How long an unclaimed greeting is kept
+        wait_seconds: How long a connecting call waits for an in-flight greeting
+    """
+
+    def __init__(
+        self,
+        enabled: bool = GREETING_PREFETCH_ENABLED,
+        ttl_seconds: int = GREETING_CACHE_TTL_SECONDS,
+        wait_seconds: float = GREETING_WAIT_SECONDS,
+    ):
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.wait_seconds = wait_seconds
+
+        self._model: Any = None
+        self._system_prompt: str = ""
+        self._entries: Dict[str, GreetingEntry] = {}
+        self._by_call_sid: Dict[str, str] = {}
+
+        self._prefetched = 0
+        self._hits = 0
+        self._misses = 0
+        self._timeouts = 0
+        self._errors = 0
+        self._pickup_to_first_token: Dict[str, Deque[float]] = {
+            "cached": deque(maxlen=LATENCY_WINDOW),
+            "live": deque(maxlen=LATENCY_WINDOW),
+        }
+
+    def configure(self, model: Any, system_prompt: str) -> None:
+        """
+        Bind the chat model and base system prompt used for generation.
+
+        Args:
+            model: LangChain chat model (the agent's model instance)
+            system_prompt: The agent's system prompt
+        """
+        self._model = model
+        self._system_prompt = system_prompt
+
+    # -------------------------------------------------------------------------
+    # Producer side (call_patient)
+    # -------------------------------------------------------------------------
+
+    def prefetch(
+        self,
+        patient_id: str,
+        patient_name: str,
+        call_context: Optional[str] = None,
+    ) -> None:
+        """
+        Start generating the greeting for an outbound call.
+
+        Args:
+            patient_id: Patient identifier (cache key)
+            patient_name: Patient name
+            call_context: The brief passed to call_patient
+        """
+        if not self.enabled or self._model is None:
+            return
+
+        self._evict_expired()
+        self.discard(patient_id)
+
+        task = asyncio.create_task(self._generate(patient_id, patient_name, call_context))
+        self._entries[patient_id] = GreetingEntry(
+            patient_id=patient_id,
+            patient_name=patient_name,
+            task=task,
+        )
+        self._prefetched += 1
+        logger.info(f"🎤 Pre-generating greeting for {patient_name} ({patient_id})")
+
+    def alias(self, patient_id: str, call_sid: str) -> None:
+        """Associate the Twilio Call SID with a pending greeting."""
+        entry = self._entries.get(patient_id)
+        if entry:
+            entry.call_sid = call_sid
+            self._by_call_sid[call_sid] = patient_id
+
+    def discard(self, patient_id: str) -> None:
+        """Drop a greeting (e.g. the call could not be placed)."""
+        entry = self._entries.pop(patient_id, None)
+        if entry is None:
+            return
+        if entry.call_sid:
+            self._by_call_sid.pop(entry.call_sid, None)
+        if not entry.task.done():
+            entry.task.cancel()
+
+    async def _generate(
+        self,
+        patient_id: str,
+        patient_name: str,
+        call_context: Optional[str],
+    ) -> Optional[str]:
+        try:
+            response = await self._model.ainvoke([
+                SystemMessage(content=self._system_prompt),
+                SystemMessage(content=build_outbound_context(patient_name, patient_id, call_context)),
+                HumanMessage(content=build_greeting_prompt(patient_name)),
+            ])
+            text = response.content if isinstance(response.content, str) else ""
+            # Same local PHI pass the streamed path applies before release
+            text, _ = redact_phi(text)
+            return text.strip() or None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._errors += 1
+            logger.warning(f"Greeting pre-generation failed for {patient_id}: {e}")
+            return None
+
+    # -------------------------------------------------------------------------
+    # Consumer side (WebSocket connect)
+    # -------------------------------------------------------------------------
+
+    async def take(
+        self,
+        call_sid: Optional[str] = None,
+        patient_id: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Claim the greeting for a connecting call.
+
+        Waits up to `wait_seconds` for a greeting still being generated.
+
+        Args:
+            call_sid: Twilio Call SID (preferred key)
+            patient_id: Patient identifier (fallback key)
+
+        Returns:
+            Greeting text, or None on a miss (caller should generate live)
+        """
+        key = self._by_call_sid.get(call_sid) if call_sid else None
+        key = key or patient_id
+        entry = self._entries.get(key) if key else None
+
+        if entry is None or time.monotonic() - entry.created_at > self.ttl_seconds:
+            if entry is not None:
+                self.discard(entry.patient_id)
+            self._misses += 1
+            return None
+
+        self._entries.pop(entry.patient_id, None)
+        if entry.call_sid:
+            self._by_call_sid.pop(entry.call_sid, None)
+
+        try:
+            greeting = await asyncio.wait_for(asyncio.shield(entry.task), timeout=self.wait_seconds)
+        except asyncio.TimeoutError:
+            entry.task.cancel()
+            self._timeouts += 1
+            self._misses += 1
+            logger.info(f"⏱️ Greeting for {entry.patient_id} not ready after {self.wait_seconds}s - generating live")
+            return None
+
+        if not greeting:
+            self._misses += 1
+            return None
+
+        self._hits += 1
+        return greeting
+
+    def _evict_expired(self) -> None:
+        cutoff = time.monotonic() - self.ttl_seconds
+        for patient_id in [k for k, e in self._entries.items() if e.created_at < cutoff]:
+            self.discard(patient_id)
+
+    # -------------------------------------------------------------------------
+    # Metrics
+    # -------------------------------------------------------------------------
+
+    def record_pickup_to_first_token(self, seconds: float, cached: bool) -> None:
+        """Record latency from WebSocket connect to the first greeting token."""
+        self._pickup_to_first_token["cached" if cached else "live"].append(seconds)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Snapshot of hit/miss counters and pickup-to-first-token latency."""
+        latency = {}
+        for source, samples in self._pickup_to_first_token.items():
+            latency[source] = {
+                "count": len(samples),
+                "p50Ms": _percentile_ms(samples, 50),
+                "p95Ms": _percentile_ms(samples, 95),
+            }
+        return {
+            "enabled": self.enabled,
+            "pending": len(self._entries),
+            "prefetched": self._prefetched,
+            "hits": self._hits,
+            "misses": self._misses,
+            "timeouts": self._timeouts,
+            "errors": self._errors,
+            "pickupToFirstToken": latency,
+        }
+
+
+def _percentile_ms(samples: Deque[float], pct: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered: List[float] = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return round(ordered[index] * 1000, 1)
+
+
+# Global cache instance
+greeting_cache = GreetingCache()
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    'GreetingCache',
+    'build_greeting_prompt',
+    'build_outbound_context',
+    'greeting_cache',
+]
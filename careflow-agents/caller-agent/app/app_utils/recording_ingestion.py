@@ -0,0 +1,428 @@
+"""
+CareFlow Pulse - Recording Ingestion Pipeline
+
+Background subsystem that turns a Twilio "completed" status callback into a
+CALL_COMPLETE message for the Pulse Agent, with the call recording attached
+inline as a FilePart.
+
+The `/call-status` webhook only enqueues a job and acknowledges Twilio
+immediately (Twilio does not retry the callback, so a job is never dropped:
+when the queue is full it waits in an overflow list the workers drain
+first). A small pool of workers then:
+    1. Polls `Recordings.json` (with exponential backoff) until the recording
+       is finalized
+    2. Downloads the WAV
+    3. Forwards CALL_COMPLETE (+ audio) to Pulse via A2A
+
+Everything runs on aiohttp so the event loop (and every live
+ConversationRelay WebSocket on the instance) is never blocked.
+
+Author: CareFlow Pulse Team
+Version: 1.0.0
+"""
+
+import asyncio
+import base64
+import logging
+import os
+import random
+import time
+import uuid
+from collections import deque
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+from ..core.a2a import a2a_client
+from ..config import (
+    RECORDING_DRAIN_SECONDS,
+    RECORDING_INGESTION_WORKERS,
+    RECORDING_POLL_ATTEMPTS,
+    RECORDING_QUEUE_MAXSIZE,
+)
+
+logger = logging.getLogger(__name__)
+
+
+TWILIO_API_BASE = "https://api.twilio.com/2010-04-01"
+
+# Backoff schedule for recording polling / download retries (seconds)
+BACKOFF_BASE_SECONDS = 2.0
+BACKOFF_MAX_SECONDS = 15.0
+
+# Download attempts for the WAV itself (Twilio can 404 briefly after "completed")
+DOWNLOAD_ATTEMPTS = 3
+
+# Pulse may stream its full audio analysis back; cap how long a worker waits
+PULSE_FORWARD_TIMEOUT_SECONDS = 300
+
+
+# =============================================================================
+# PULSE HELPERS
+# =============================================================================
+
+def get_pulse_url() -> str:
+    """Return the Pulse Agent base URL (without a trailing /rpc)."""
+    pulse_url = os.environ.get("CAREFLOW_AGENT_URL", "http://localhost:8080")
+    if pulse_url.endswith("/rpc"):
+        pulse_url = pulse_url[:-4]
+    return pulse_url
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Exponential backoff with jitter for retry attempt `attempt` (1-indexed)."""
+    delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** (attempt - 1)))
+    return delay * random.uniform(0.8, 1.2)
+
+
+# =============================================================================
+# JOB DEFINITION
+# =============================================================================
+
+@dataclass
+class RecordingJob:
+    """
+    A completed call waiting for its recording to be ingested.
+
+    Attributes:
+        call_sid: Twilio Call SID
+        patient_id: Patient identifier (from status callback query params)
+        patient_name: Patient display name
+        enqueued_at: Monotonic timestamp when the job was queued
+    """
+    call_sid: str
+    patient_id: str
+    patient_name: str
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+# =============================================================================
+# INGESTION PIPELINE
+# =============================================================================
+
+class RecordingIngestionPipeline:
+    """
+    Bounded async worker pool for post-call recording ingestion.
+
+    Attributes:
+        workers: Number of concurrent worker tasks
+        max_queue_size: Queued jobs before new ones spill into the overflow list
+        poll_attempts: How many times to poll Recordings.json before giving up
+    """
+
+    def __init__(
+        self,
+        workers: int = RECORDING_INGESTION_WORKERS,
+        max_queue_size: int = RECORDING_QUEUE_MAXSIZE,
+        poll_attempts: int = RECORDING_POLL_ATTEMPTS,
+    ):
+        self.workers = max(1, workers)
+        self.max_queue_size = max_queue_size
+        self.poll_attempts = max(1, poll_attempts)
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._overflow: "deque[RecordingJob]" = deque()
+        self._worker_tasks: List[asyncio.Task] = []
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._draining = False
+
+        # Metrics
+        self._in_flight = 0
+        self._enqueued_total = 0
+        self._completed_total = 0
+        self._failed_total = 0
+        self._rejected_total = 0
+        self._overflow_total = 0
+        self._audio_attached_total = 0
+        self._last_job_seconds: Optional[float] = None
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the worker pool has been started."""
+        return bool(self._worker_tasks)
+
+    async def start(self) -> None:
+        """Create the shared HTTP session and spawn the worker tasks."""
+        if self.is_running:
+            return
+
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._session = aiohttp.ClientSession()
+        self._draining = False
+        self._worker_tasks = [
+            asyncio.create_task(self._worker(i), name=f"recording-worker-{i}")
+            for i in range(self.workers)
+        ]
+        logger.info(
+            f"🎙️ Recording ingestion started ({self.workers} workers, queue max {self.max_queue_size})"
+        )
+
+    async def stop(self, drain_seconds: float = RECORDING_DRAIN_SECONDS) -> None:
+        """
+        Stop accepting jobs, let the workers drain the queue, then cancel them.
+
+        Args:
+            drain_seconds: Longest time to wait for queued and in-flight jobs
+        """
+        self._draining = True
+        if self._queue and self.is_running and (self._queue.qsize() or self._in_flight):
+            logger.info(f"🎙️ Draining recording ingestion ({self._queue.qsize()} queued, {self._in_flight} in flight)")
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout=drain_seconds)
+            except asyncio.TimeoutError:
+                logger.warning(f"⚠️ Recording ingestion drain exceeded {drain_seconds}s")
+
+        for task in self._worker_tasks:
+            task.cancel()
+        if self._worker_tasks:
+            await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+        pending = (self._queue.qsize() if self._queue else 0) + len(self._overflow)
+        if pending:
+            logger.warning(f"⚠️ Recording ingestion stopped with {pending} job(s) still queued")
+        logger.info("🎙️ Recording ingestion stopped")
+
+    def submit(self, job: RecordingJob) -> bool:
+        """
+        Enqueue a job without waiting.
+
+        Args:
+            job: The completed call to ingest
+
+        Returns:
+            True if the job was queued (or held in overflow), False if the
+            pipeline is down
+        """
+        if not self._queue or not self.is_running or self._draining:
+            logger.error(f"❌ Recording ingestion not running - cannot queue {job.call_sid}")
+            self._rejected_total += 1
+            return False
+
+        self._enqueued_total += 1
+        if self._overflow or self._queue.full():
+            # Kept in arrival order; workers move it into the queue as slots free up
+            self._overflow.append(job)
+            self._overflow_total += 1
+            logger.warning(
+                f"⚠️ Recording queue full ({self.max_queue_size}) - {job.call_sid} held in overflow "
+                f"(depth: {len(self._overflow)})"
+            )
+            return True
+
+        self._queue.put_nowait(job)
+        logger.info(f"📥 Queued recording ingestion for {job.call_sid} (depth: {self._queue.qsize()})")
+        return True
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Snapshot of queue depth and throughput counters."""
+        return {
+            "queueDepth": self._queue.qsize() if self._queue else 0,
+            "maxQueueSize": self.max_queue_size,
+            "workers": self.workers,
+            "inFlight": self._in_flight,
+            "enqueuedTotal": self._enqueued_total,
+            "completedTotal": self._completed_total,
+            "failedTotal": self._failed_total,
+            "rejectedTotal": self._rejected_total,
+            "overflowDepth": len(self._overflow),
+            "overflowTotal": self._overflow_total,
+            "audioAttachedTotal": self._audio_attached_total,
+            "lastJobSeconds": self._last_job_seconds,
+        }
+
+    # -------------------------------------------------------------------------
+    # Worker Loop
+    # -------------------------------------------------------------------------
+
+    async def _worker(self, index: int) -> None:
+        """Pull jobs off the queue forever (until cancelled)."""
+        assert self._queue is not None
+        while True:
+            job = await self._queue.get()
+            if self._overflow:
+                # The slot just freed goes to the oldest overflow job; it is
+                # queued before this job's task_done so `join()` waits for it
+                self._queue.put_nowait(self._overflow.popleft())
+            self._in_flight += 1
+            try:
+                await self._process(job)
+                self._completed_total += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._failed_total += 1
+                logger.error(f"❌ Recording worker {index} failed for {job.call_sid}: {e}", exc_info=True)
+            finally:
+                self._in_flight -= 1
+                self._last_job_seconds = round(time.monotonic() - job.enqueued_at, 2)
+                self._queue.task_done()
+
+    async def _process(self, job: RecordingJob) -> None:
+        """Fetch the recording for one call and forward CALL_COMPLETE to Pulse."""
+        assert self._session is not None
+
+        instruction_text = (
+            f"CALL_COMPLETE: Interview with patient {job.patient_name} (ID: {job.patient_id}) finished. "
+            f"Call SID: {job.call_sid}. Analyze the audio."
+        )
+        # The Caller Agent owns Twilio credentials. We fetch the recording
+        # and attach it as a FilePart so the Pulse Agent's Gemini 3 receives
+        # text + audio in a single turn — exactly like eval.py does.
+        message_parts: List[Dict[str, Any]] = [{"text": instruction_text, "kind": "text"}]
+        audio_attached = False
+
+        acc_sid = os.environ.get("TWILIO_ACCOUNT_SID")
+        auth_token = os.environ.get("TWILIO_AUTH_TOKEN")
+
+        if acc_sid and auth_token:
+            auth = aiohttp.BasicAuth(acc_sid, auth_token)
+            try:
+                recording_sid = await self._poll_recording_sid(acc_sid, job.call_sid, auth)
+                if recording_sid:
+                    audio_bytes = await self._download_audio(acc_sid, recording_sid, auth)
+                    message_parts.append({
+                        "kind": "file",
+                        "file": {
+                            "bytes": base64.b64encode(audio_bytes).decode('utf-8'),
+                            "mimeType": "audio/wav"
+                        }
+                    })
+                    audio_attached = True
+                    logger.info(f"🎙️ Audio attached inline for {job.call_sid} ({len(audio_bytes)} bytes)")
+                else:
+                    logger.warning(f"⚠️ No recordings found yet for {job.call_sid}")
+                    message_parts.append({"text": f"\n[AUDIO_UNAVAILABLE: No recording found yet for Call SID {job.call_sid}. The recording may not be ready. Do NOT hallucinate an analysis — report that audio was unavailable.]", "kind": "text"})
+            except Exception as audio_err:
+                logger.error(f"❌ Audio pre-fetch failed for {job.call_sid}: {audio_err}")
+                message_parts.append({"text": f"\n[AUDIO_UNAVAILABLE: Failed to download recording for Call SID {job.call_sid}. Do NOT hallucinate an analysis — report that audio was unavailable.]", "kind": "text"})
+        else:
+            logger.warning("⚠️ Twilio credentials not available for audio fetch")
+            message_parts.append({"text": "\n[AUDIO_UNAVAILABLE: Twilio credentials not configured. Do NOT hallucinate an analysis — report that audio was unavailable.]", "kind": "text"})
+
+        if audio_attached:
+            self._audio_attached_total += 1
+            logger.info(f"✅ Sending CALL_COMPLETE + inline audio to Pulse Agent for {job.patient_name}")
+        else:
+            logger.warning(f"⚠️ Sending CALL_COMPLETE WITHOUT audio to Pulse Agent for {job.patient_name} (fallback mode)")
+
+        payload = {
+            "jsonrpc": "2.0",
+            "method": "message/stream",
+            "params": {
+                "message": {
+                    "messageId": str(uuid.uuid4()),
+                    "role": "user",
+                    "parts": message_parts,
+                    "metadata": {
+                        "task": "analyze_call_audio",
+                        "call_sid": job.call_sid,
+                        "source": "telephony_webhook",
+                        "audio_attached": audio_attached
+                    }
+                }
+            },
+            "id": f"evt-{job.call_sid}"
+        }
+        await self._forward_to_pulse(payload)
+
+    # -------------------------------------------------------------------------
+    # Twilio Recording Fetch
+    # -------------------------------------------------------------------------
+
+    async def _poll_recording_sid(
+        self,
+        acc_sid: str,
+        call_sid: str,
+        auth: aiohttp.BasicAuth
+    ) -> Optional[str]:
+        """
+        Poll Recordings.json until the call's recording reaches `completed`.
+
+        Returns:
+            The Recording SID, or None if it never became ready
+        """
+        assert self._session is not None
+        rec_url = f"{TWILIO_API_BASE}/Accounts/{acc_sid}/Calls/{call_sid}/Recordings.json"
+        timeout = aiohttp.ClientTimeout(total=15)
+
+        for attempt in range(self.poll_attempts):
+            if attempt > 0:
+                wait = _backoff_delay(attempt)
+                logger.info(f"⏳ Recording not ready, waiting {wait:.1f}s before retry #{attempt}...")
+                await asyncio.sleep(wait)
+
+            async with self._session.get(rec_url, auth=auth, timeout=timeout) as resp:
+                resp.raise_for_status()
+                recordings = (await resp.json()).get("recordings", [])
+
+            if recordings and recordings[0].get("status") == "completed":
+                return recordings[0]["sid"]
+            if recordings:
+                logger.info(f"📼 Recording found but status={recordings[0].get('status')}, waiting...")
+
+        return None
+
+    async def _download_audio(
+        self,
+        acc_sid: str,
+        recording_sid: str,
+        auth: aiohttp.BasicAuth
+    ) -> bytes:
+        """Download the WAV for a finalized recording (retrying transient 404s)."""
+        assert self._session is not None
+        audio_url = f"{TWILIO_API_BASE}/Accounts/{acc_sid}/Recordings/{recording_sid}.wav"
+        timeout = aiohttp.ClientTimeout(total=60)
+
+        last_status = None
+        for attempt in range(DOWNLOAD_ATTEMPTS):
+            if attempt > 0:
+                wait = _backoff_delay(attempt)
+                logger.info(f"⏳ Audio download retry #{attempt} in {wait:.1f}s...")
+                await asyncio.sleep(wait)
+
+            async with self._session.get(audio_url, auth=auth, timeout=timeout) as resp:
+                if resp.status == 200:
+                    return await resp.read()
+                last_status = resp.status
+                logger.warning(f"⚠️ Audio download attempt #{attempt}: HTTP {resp.status}")
+
+        raise RuntimeError(f"Audio download failed for {recording_sid} (last HTTP {last_status})")
+
+    # -------------------------------------------------------------------------
+    # Pulse Forwarding
+    # -------------------------------------------------------------------------
+
+    async def _forward_to_pulse(self, payload: Dict[str, Any]) -> None:
+        """
+        Stream the CALL_COMPLETE message to Pulse and drain the response.
+
+        Uses the shared A2A client (pooled connection, cached ID token);
+        `self._session` is only used for Twilio.
+        """
+        stream = a2a_client.stream_rpc(get_pulse_url(), payload, timeout=PULSE_FORWARD_TIMEOUT_SECONDS)
+        async with aclosing(stream) as events:
+            async for _ in events:
+                pass
+
+
+# Global pipeline instance (started/stopped by the server lifespan)
+recording_pipeline = RecordingIngestionPipeline()
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    'RecordingJob',
+    'RecordingIngestionPipeline',
+    'recording_pipeline',
+    'get_pulse_url',
+]
@@ -0,0 +1,299 @@
+"""
+CareFlow Pulse - TTS Text Shaping
+
+Streaming stage between `CallerAgent.stream_message` and the
+ConversationRelay socket.
+
+LLM chunks are a few characters each; sending every one as its own `text`
+frame costs a JSON encode + WebSocket send per chunk and gives the TTS
+engine fragments with no prosodic context. The shaper:
+
+- Coalesces chunks into clause/sentence segments, with a max-latency flush
+  so a slow model never leaves text sitting in the buffer.
+- Strips control markers (`[HANGUP]`, `[[END_CALL_SIGNAL]]`) with a small
+  state machine that handles markers split across chunk boundaries.
+- Sets `interruptible` / `preemptible` per segment (the farewell before a
+  hangup is not interruptible). The model writes the marker after the
+  farewell ("Goodbye, take care! [HANGUP]"), so a sentence that closes the
+  buffer is held until the next chunk, end of turn or the latency budget
+  decides whether a marker follows it.
+
+This module is dependency-free so it can be benchmarked standalone.
+
+Author: CareFlow Pulse Team
+Version: 1.0.0
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+CONTROL_MARKERS: Tuple[str, ...] = ("[HANGUP]", "[[END_CALL_SIGNAL]]")
+
+SENTENCE_ENDINGS = ".!?"
+CLAUSE_ENDINGS = ",;:"
+
+# Defaults (overridable per shaper)
+DEFAULT_MAX_LATENCY_MS = 250
+DEFAULT_MIN_CLAUSE_CHARS = 40
+DEFAULT_MAX_SEGMENT_CHARS = 240
+
+
+# =============================================================================
+# SEGMENT
+# =============================================================================
+
+@dataclass
+class TextSegment:
+    """
+    A unit of text sent to ConversationRelay as one `text` frame.
+
+    Attributes:
+        text: Text to speak
+        interruptible: Whether the caller's speech may interrupt playback
+        preemptible: Whether later frames may preempt this one
+        last: Whether this frame ends the agent's turn
+    """
+    text: str
+    interruptible: bool = True
+    preemptible: bool = False
+    last: bool = False
+
+    def to_message(self) -> Dict[str, Any]:
+        """ConversationRelay `text` message for this segment."""
+        return {
+            "type": "text",
+            "token": self.text,
+            "last": self.last,
+            "interruptible": self.interruptible,
+            "preemptible": self.preemptible,
+        }
+
+
+# =============================================================================
+# MARKER FILTER
+# =============================================================================
+
+class MarkerFilter:
+    """
+    Removes control markers from a character stream.
+
+    State is the held-back tail: text ending in a proper prefix of a marker
+    (e.g. "[HAN") is withheld until the next chunk decides whether it is a
+    marker or ordinary text.
+    """
+
+    def __init__(self, markers: Tuple[str, ...] = CONTROL_MARKERS):
+        self.markers = markers
+        self.triggered = False
+        self._held = ""
+
+    def feed(self, chunk: str) -> str:
+        """Return the marker-free text that is safe to emit."""
+        text = self._held + chunk
+        self._held = ""
+
+        if "[" not in text:
+            return text
+
+        for marker in self.markers:
+            if marker in text:
+                self.triggered = True
+                text = text.replace(marker, "")
+
+        # Hold back a trailing partial marker
+        start = text.find("[", max(0, len(text) - max(map(len, self.markers))))
+        while start != -1:
+            tail = text[start:]
+            if any(m.startswith(tail) for m in self.markers):
+                self._held = tail
+                return text[:start]
+            start = text.find("[", start + 1)
+        return text
+
+    def flush(self) -> str:
+        """Release any held text at end of stream (it was not a marker)."""
+        held, self._held = self._held, ""
+        return held
+
+
+# =============================================================================
+# TTS SHAPER
+# =============================================================================
+
+class TTSShaper:
+    """
+    Coalesces streamed LLM text into speakable segments.
+
+    Attributes:
+        max_latency_ms: Longest time text may wait in the buffer
+        min_clause_chars: Buffer size at which clause boundaries may flush
+        max_segment_chars: Hard cap; flushes at the last space beyond this
+        hangup_requested: Set once a control marker has been seen
+    """
+
+    def __init__(
+        self,
+        max_latency_ms: int = DEFAULT_MAX_LATENCY_MS,
+        min_clause_chars: int = DEFAULT_MIN_CLAUSE_CHARS,
+        max_segment_chars: int = DEFAULT_MAX_SEGMENT_CHARS,
+    ):
+        self.max_latency_ms = max_latency_ms
+        self.min_clause_chars = min_clause_chars
+        self.max_segment_chars = max_segment_chars
+
+        self._markers = MarkerFilter()
+        self._buffer = ""
+        self._buffer_since: Optional[float] = None
+
+    @property
+    def hangup_requested(self) -> bool:
+        return self._markers.triggered
+
+    # -------------------------------------------------------------------------
+    # Synchronous core
+    # -------------------------------------------------------------------------
+
+    def feed(self, chunk: str) -> List[TextSegment]:
+        """Add a chunk; return segments ready to send."""
+        text = self._markers.feed(chunk)
+        if not text:
+            return []
+        if not self._buffer:
+            self._buffer_since = time.monotonic()
+        self._buffer += text
+
+        segments = []
+        holding = False
+        while True:
+            cut = self._find_boundary(self._buffer)
+            closing = cut > 0 and not self._buffer[cut:].strip()
+            if closing and self._buffer[cut - 1] in SENTENCE_ENDINGS:
+                # A closing sentence may be the farewell before a marker: hold it
+                holding = True
+                cut = self._find_boundary(self._buffer[:cut])
+            if cut <= 0:
+                break
+            segments.append(self._segment(self._buffer[:cut]))
+            # Keep leading whitespace: segments concatenate back to the exact text
+            self._buffer = self._buffer[cut:]
+        if not self._buffer:
+            self._buffer_since = None
+        elif holding:
+            # Give the marker a full latency budget to arrive
+            self._buffer_since = time.monotonic()
+        return segments
+
+    def flush(self, last: bool = False) -> Optional[TextSegment]:
+        """Emit whatever is buffered (timer expiry or end of turn)."""
+        if last:
+            self._buffer += self._markers.flush()
+        text = self._buffer
+        self._buffer = ""
+        self._buffer_since = None
+        if not text.strip():
+            return None
+        segment = self._segment(text)
+        segment.last = last
+        return segment
+
+    def time_until_due(self) -> Optional[float]:
+        """Seconds until the buffer must be flushed (None if empty)."""
+        if self._buffer_since is None:
+            return None
+        elapsed = time.monotonic() - self._buffer_since
+        return max(0.0, self.max_latency_ms / 1000 - elapsed)
+
+    def _find_boundary(self, text: str) -> int:
+        """Index just past the last flushable boundary, or 0."""
+        best = 0
+        for i, ch in enumerate(text):
+            # Require trailing whitespace so "3.5" or "Dr." mid-token is not split early
+            if i + 1 >= len(text) or not text[i + 1].isspace():
+                continue
+            if ch in SENTENCE_ENDINGS:
+                best = i + 1
+            elif ch in CLAUSE_ENDINGS and i + 1 >= self.min_clause_chars:
+                best = i + 1
+
+        if not best and len(text) > self.max_segment_chars:
+            space = text.rfind(" ", 0, self.max_segment_chars)
+            best = space if space > 0 else self.max_segment_chars
+        return best
+
+    def _segment(self, text: str) -> TextSegment:
+        # The farewell that precedes a hangup should be heard in full
+        if self.hangup_requested:
+            return TextSegment(text=text, interruptible=False, preemptible=False)
+        return TextSegment(text=text)
+
+    # -------------------------------------------------------------------------
+    # Async stage
+    # -------------------------------------------------------------------------
+
+    async def shape(self, chunks: AsyncIterator[str]) -> AsyncIterator[TextSegment]:
+        """
+        Wrap a chunk stream, yielding segments.
+
+        The final segment of a normally completed stream has `last=True`;
+        if the buffer was empty at the end, no final segment is yielded and
+        the caller should close the turn with an empty `last` frame.
+
+        Args:
+            chunks: Async iterator of LLM text chunks
+        """
+        iterator = chunks.__aiter__()
+        pending: Optional[asyncio.Task] = None
+        try:
+            while True:
+                if pending is None:
+                    pending = asyncio.ensure_future(iterator.__anext__())
+
+                done, _ = await asyncio.wait({pending}, timeout=self.time_until_due())
+                if not done:
+                    segment = self.flush()
+                    if segment:
+                        yield segment
+                    continue
+
+                task, pending = pending, None
+                try:
+                    chunk = task.result()
+                except StopAsyncIteration:
+                    break
+
+                if chunk:
+                    for segment in self.feed(chunk):
+                        yield segment
+
+            segment = self.flush(last=True)
+            if segment:
+                yield segment
+        finally:
+            if pending is not None and not pending.done():
+                pending.cancel()
+                try:
+                    await pending
+                except (asyncio.CancelledError, StopAsyncIteration):
+                    pass
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    'CONTROL_MARKERS',
+    'MarkerFilter',
+    'TTSShaper',
+    'TextSegment',
+]
@@ -4,7 +4,7 @@ WebSocket Message Handlers for Twilio ConversationRelay
 This module handles all ConversationRelay message types for voice streaming:
 - setup: Initial connection with call metadata
 - prompt: User speech transcription (STT)
-- interrupt: User interrupted agent response
+- interrupt: User interrupted agent response (cancels in-flight generation)
 - dtmf: Keypad input (used for typing simulation)
 - error: ConversationRelay errors
 
@@ -12,15 +12,19 @@ Author: CareFlow Pulse Team
 Version: 2.0.0
 """
 
+import asyncio
 import json
 import logging
+from contextlib import aclosing
 from datetime import datetime
-from typing import Optional
+from typing import Awaitable, Optional
 
 import websockets
 from fastapi import WebSocket
 from starlette.websockets import WebSocketDisconnect
 
+from ..config import TTS_MAX_LATENCY_MS
+from .call_sessions import CallSession, call_sessions
 from .conversation_relay import (
     ConversationMessage,
     DTMFMessage,
@@ -31,62 +35,101 @@ from .conversation_relay import (
     SetupMessage,
     handle_interruption,
 )
+from .tts_shaper import TTSShaper, TextSegment
 
 
 logger = logging.getLogger(__name__)
 
 
 # =============================================================================
-# CONNECTION MANAGER
+# MESSAGE HANDLER
 # =============================================================================
 
-class ConnectionManager:
-    """Manages active WebSocket connections."""
+class MessageHandler:
+    """Handles all ConversationRelay message types for one call session."""
     
-    def __init__(self):
-        self.active_connections: dict[str, WebSocket] = {}
+    def __init__(self, agent, session: CallSession):
+        """
+        Initialize message handler for a call session.
+        
+        Args:
+            agent: The shared LangGraph agent instance
+            session: Per-call state (WebSocket, SessionData, cancellation token)
+        """
+        self.agent = agent
+        self.session = session
+        self.websocket: WebSocket = session.websocket
+        self.session_data: SessionData = session.session_data
+        self._generation: Optional[asyncio.Task] = None
     
-    def connect(self, websocket: WebSocket) -> str:
-        """Register a new connection and return its ID."""
-        connection_id = str(id(websocket))
-        self.active_connections[connection_id] = websocket
-        logger.info(f"New connection registered: {connection_id}")
-        return connection_id
+    # -------------------------------------------------------------------------
+    # Turn Management
+    # -------------------------------------------------------------------------
     
-    def disconnect(self, connection_id: str) -> None:
-        """Remove a connection by ID."""
-        if connection_id in self.active_connections:
-            del self.active_connections[connection_id]
-            logger.info(f"Connection removed: {connection_id}")
+    async def start_prompt(self, message: dict) -> None:
+        """
+        Start a new agent turn without blocking the receive loop.
+        
+        Any response still being generated is cancelled first; what had
+        already been streamed to TTS is kept in the conversation history.
+        
+        Args:
+            message: Raw prompt message from Twilio
+        """
+        await self.start_generation(self._run_prompt(message))
     
-    def get_count(self) -> int:
-        """Get the number of active connections."""
-        return len(self.active_connections)
-
-
-# Global connection manager instance
-connection_manager = ConnectionManager()
-
-
-# =============================================================================
-# MESSAGE HANDLER
-# =============================================================================
-
-class MessageHandler:
-    """Handles all ConversationRelay message types for a WebSocket session."""
+    async def start_generation(self, turn: Awaitable[None]) -> None:
+        """
+        Run an agent turn (a prompt's response or the opening greeting) as
+        the call's generation task, so `interrupt` and `prompt` frames keep
+        being read and can cancel it.
+        
+        Args:
+            turn: Coroutine streaming the turn to the WebSocket
+        """
+        await self.cancel_generation(record_partial=True)
+        self._generation = asyncio.create_task(turn)
     
-    def __init__(self, agent, websocket: WebSocket, session_data: SessionData):
+    async def cancel_generation(self, record_partial: bool = False) -> None:
         """
-        Initialize message handler for a WebSocket session.
+        Cancel the in-flight agent turn, if any.
         
         Args:
-            agent: The LangGraph agent instance
-            websocket: Active WebSocket connection
-            session_data: Session state for this call
+            record_partial: Save the streamed-so-far response to history
+                (used when a new prompt supersedes it without an interrupt)
         """
-        self.agent = agent
-        self.websocket = websocket
-        self.session_data = session_data
+        task = self._generation
+        self._generation = None
+        if task is None or task.done():
+            return
+        
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        
+        partial = self.session_data.current_response
+        if record_partial and partial and self.session_data.interrupted_at is None:
+            self.session_data.conversation.append(ConversationMessage(
+                role='assistant',
+                content=partial,
+                timestamp=datetime.now().isoformat(),
+                interrupted=True,
+                interrupted_at=len(partial)
+            ))
+            self.session_data.current_response = None
+        logger.info("⏹️ Cancelled in-flight generation")
+    
+    async def _run_prompt(self, message: dict) -> None:
+        """Generation task body: run one turn without taking down the reader."""
+        try:
+            await self.handle_prompt(message)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Already logged by handle_prompt; keep the call alive for the next turn
+            pass
     
     async def handle_setup(self, message: dict) -> None:
         """
@@ -104,7 +147,7 @@ class MessageHandler:
             custom_parameters=message.get('customParameters')
         )
         
-        self.session_data.call_sid = setup_msg.call_sid
+        call_sessions.bind_call_sid(self.session, setup_msg.call_sid)
         
         logger.info(f"Call setup - SID: {setup_msg.call_sid}, Direction: {setup_msg.direction}")
         if setup_msg.custom_parameters:
@@ -168,32 +211,28 @@ class MessageHandler:
         
         try:
             accumulated_response = ''
-            should_hangup = False
+            turn_closed = False
+            shaper = TTSShaper(max_latency_ms=TTS_MAX_LATENCY_MS)
             
-            # Stream agent response
-            async for chunk in self.agent.stream_message(prompt_msg.voice_prompt, self.session_data):
-                # Check connection state
-                if self.websocket.client_state.name != "CONNECTED":
-                    logger.info("WebSocket disconnected during streaming")
-                    return False
-                
-                if not chunk:
-                    continue
-                
-                # Check for hangup signal
-                if "[HANGUP]" in chunk or "[[END_CALL_SIGNAL]]" in chunk:
-                    logger.info("Agent requested call termination via signal")
-                    clean_chunk = chunk.replace("[HANGUP]", "").replace("[[END_CALL_SIGNAL]]", "").strip()
-                    if clean_chunk and self.websocket.client_state.name == "CONNECTED":
-                        await self.send_text_token(clean_chunk, last=False)
-                        accumulated_response += clean_chunk
-                    should_hangup = True
-                    continue
-                
-                # Send chunk to Twilio
-                if not should_hangup:
-                    await self.send_text_token(chunk, last=False)
-                    accumulated_response += chunk
+            # Stream agent response, coalesced into clause/sentence frames
+            # (aclosing: cancellation closes the LLM stream too)
+            async with aclosing(
+                shaper.shape(self.agent.stream_message(prompt_msg.voice_prompt, self.session_data))
+            ) as segments:
+                async for segment in segments:
+                    # Check connection state
+                    if self.websocket.client_state.name != "CONNECTED":
+                        logger.info("WebSocket disconnected during streaming")
+                        return False
+                    
+                    await self.send_segment(segment)
+                    accumulated_response += segment.text
+                    self.session_data.current_response = accumulated_response
+                    turn_closed = segment.last
+            
+            should_hangup = shaper.hangup_requested
+            if should_hangup:
+                logger.info("Agent requested call termination via signal")
             
             # Handle hangup after agent finishes
             if should_hangup:
@@ -211,12 +250,15 @@ class MessageHandler:
             
             self.session_data.current_response = None
             
-            # Mark end of turn
-            if self.websocket.client_state.name == "CONNECTED":
+            # Mark end of turn (unless the final segment already did)
+            if not turn_closed and self.websocket.client_state.name == "CONNECTED":
                 await self.send_text_token("", last=True)
             
             return True
             
+        except asyncio.CancelledError:
+            logger.info("Agent turn cancelled (barge-in or new prompt)")
+            raise
         except (websockets.exceptions.ConnectionClosed, WebSocketDisconnect):
             logger.info("Client disconnected during message processing")
             return False
@@ -224,10 +266,13 @@ class MessageHandler:
             logger.error(f"Error processing prompt: {e}", exc_info=True)
             raise
     
-    def handle_interrupt(self, message: dict) -> None:
+    async def handle_interrupt(self, message: dict) -> None:
         """
         Handle user interruption message.
         
+        Cancels the in-flight generation immediately, then records the
+        portion of the response the patient actually heard.
+        
         Args:
             message: Raw interrupt message from Twilio
         """
@@ -236,7 +281,9 @@ class MessageHandler:
             duration_until_interrupt_ms=message.get('durationUntilInterruptMs')
         )
         logger.info(f"User interrupted at: {interrupt_msg.utterance_until_interrupt}")
+        await self.cancel_generation()
         handle_interruption(interrupt_msg, self.session_data)
+        self.session_data.current_response = None
     
     def handle_dtmf(self, message: dict) -> None:
         """
@@ -276,3 +323,12 @@ class MessageHandler:
             "last": last
         }
         await self.websocket.send_text(json.dumps(message))
+    
+    async def send_segment(self, segment: TextSegment) -> None:
+        """
+        Send a shaped text segment (with per-segment interrupt flags).
+        
+        Args:
+            segment: Segment produced by the TTS shaper
+        """
+        await self.websocket.send_text(json.dumps(segment.to_message()))
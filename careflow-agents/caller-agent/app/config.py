@@ -127,6 +127,37 @@ SUPPORTS_LATENCY_TASK_UPDATES: bool = get_env_bool('SUPPORTS_LATENCY_TASK_UPDATE
 # Skill Latency Configuration
 SKILL_LATENCY: List[Dict[str, Any]] = get_env_json('SKILL_LATENCY', [])
 
+# A2A agent card cache refresh interval (seconds, 0 disables background refresh)
+AGENT_CARD_TTL_SECONDS: int = get_env_int('AGENT_CARD_TTL_SECONDS', 300)
+
+# Concurrency: live ConversationRelay calls served by one instance
+MAX_CONCURRENT_CALLS: int = get_env_int('MAX_CONCURRENT_CALLS', 50)
+
+# TTS shaping: max time streamed text waits to be coalesced into a segment
+TTS_MAX_LATENCY_MS: int = get_env_int('TTS_MAX_LATENCY_MS', 250)
+
+# Streaming output guard: spans per Model Armor batch, and whether a blocked
+# verdict stops the rest of the turn
+STREAMING_SANITIZER_BATCH_SPANS: int = get_env_int('STREAMING_SANITIZER_BATCH_SPANS', 3)
+STREAMING_SANITIZER_ENFORCE: bool = get_env_bool('STREAMING_SANITIZER_ENFORCE', True)
+
+# Greeting pre-generation (outbound calls)
+GREETING_PREFETCH_ENABLED: bool = get_env_bool('GREETING_PREFETCH_ENABLED', True)
+GREETING_CACHE_TTL_SECONDS: int = get_env_int('GREETING_CACHE_TTL_SECONDS', 180)
+GREETING_WAIT_SECONDS: int = get_env_int('GREETING_WAIT_SECONDS', 5)
+
+# Batch dispatch (`dispatch_calls` skill): outbound Twilio calls started per
+# second across all batches, and patients accepted per request
+OUTBOUND_CALLS_PER_SECOND: float = float(get_env_var('OUTBOUND_CALLS_PER_SECOND', '1'))
+DISPATCH_CALLS_MAX_BATCH: int = get_env_int('DISPATCH_CALLS_MAX_BATCH', 200)
+
+# Recording Ingestion (post-call audio fetch -> Pulse CALL_COMPLETE)
+RECORDING_INGESTION_WORKERS: int = get_env_int('RECORDING_INGESTION_WORKERS', 4)
+RECORDING_QUEUE_MAXSIZE: int = get_env_int('RECORDING_QUEUE_MAXSIZE', 200)
+RECORDING_POLL_ATTEMPTS: int = get_env_int('RECORDING_POLL_ATTEMPTS', 6)
+# On shutdown, how long queued recordings may keep the workers alive
+RECORDING_DRAIN_SECONDS: int = get_env_int('RECORDING_DRAIN_SECONDS', 8)
+
 # Validate API keys
 if not OPENAI_API_KEY and not GEMINI_API_KEY:
     raise ValueError(
@@ -151,4 +182,18 @@ __all__ = [
     'SUPPORTS_EXTENSION',
     'SUPPORTS_LATENCY_TASK_UPDATES',
     'SKILL_LATENCY',
+    'AGENT_CARD_TTL_SECONDS',
+    'MAX_CONCURRENT_CALLS',
+    'TTS_MAX_LATENCY_MS',
+    'STREAMING_SANITIZER_BATCH_SPANS',
+    'STREAMING_SANITIZER_ENFORCE',
+    'GREETING_PREFETCH_ENABLED',
+    'GREETING_CACHE_TTL_SECONDS',
+    'GREETING_WAIT_SECONDS',
+    'OUTBOUND_CALLS_PER_SECOND',
+    'DISPATCH_CALLS_MAX_BATCH',
+    'RECORDING_INGESTION_WORKERS',
+    'RECORDING_QUEUE_MAXSIZE',
+    'RECORDING_POLL_ATTEMPTS',
+    'RECORDING_DRAIN_SECONDS',
 ]
@@ -0,0 +1,22 @@
+from .auth import IdTokenAuth, IdTokenCache, audience_for, needs_id_token
+from .client import A2AClient, A2ARpcError, a2a_client, rpc_request
+from .latency import LATENCY_EXTENSION_URI, LatencyHistogram, SkillLatencyTracker, skill_latency
+from .sse import SSEParser, StreamIdleTimeout, iter_sse_data
+
+__all__ = [
+    'A2AClient',
+    'A2ARpcError',
+    'IdTokenAuth',
+    'IdTokenCache',
+    'LATENCY_EXTENSION_URI',
+    'LatencyHistogram',
+    'SSEParser',
+    'SkillLatencyTracker',
+    'StreamIdleTimeout',
+    'a2a_client',
+    'audience_for',
+    'iter_sse_data',
+    'needs_id_token',
+    'rpc_request',
+    'skill_latency',
+]
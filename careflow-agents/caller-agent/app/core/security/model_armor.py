@@ -1,6 +1,12 @@
 import os
+import asyncio
 import logging
+import weakref
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any, List
+
+from .verdict_cache import verdict_cache
 # Ensure google-cloud-modelarmor is installed
 try:
     from google.cloud import modelarmor_v1
@@ -9,6 +15,27 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Concurrency / deadline for Model Armor calls.
+# The gRPC client is synchronous, so calls run on a dedicated bounded pool
+# instead of the event loop (and instead of the default executor, which other
+# libraries share).
+MODEL_ARMOR_MAX_CONCURRENCY = int(os.environ.get("MODEL_ARMOR_MAX_CONCURRENCY", "16"))
+MODEL_ARMOR_TIMEOUT_SECONDS = float(os.environ.get("MODEL_ARMOR_TIMEOUT_SECONDS", "5"))
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Process-wide pool shared by every ModelArmorClient instance."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=MODEL_ARMOR_MAX_CONCURRENCY,
+            thread_name_prefix="model-armor",
+        )
+    return _executor
+
+
 class ModelArmorClient:
     """
     Client for interacting with Google Cloud Model Armor to secure AI interactions.
@@ -20,6 +47,12 @@ class ModelArmorClient:
     Template Configuration:
     - Uses MODEL_ARMOR_TEMPLATE from environment (e.g., projects/.../locations/us/templates/careflow-hipaa-prod)
     - Automatically handles regional endpoints (e.g., modelarmor.us.rep.googleapis.com)
+    
+    Concurrency:
+    - API calls run on a bounded thread pool (MODEL_ARMOR_MAX_CONCURRENCY) so they
+      never block the event loop
+    - Each call has a deadline (MODEL_ARMOR_TIMEOUT_SECONDS); a timeout fails closed
+    - Successful verdicts are cached by content hash (see verdict_cache.py)
     """
     def __init__(self, template_path: Optional[str] = None):
         """
@@ -29,6 +62,14 @@ class ModelArmorClient:
             template_path: Full template path (e.g., projects/X/locations/us/templates/Y)
                           If None, reads from MODEL_ARMOR_TEMPLATE env var
         """
+        self.timeout = MODEL_ARMOR_TIMEOUT_SECONDS
+        self.max_concurrency = MODEL_ARMOR_MAX_CONCURRENCY
+        # Keyed by the loop itself so a closed loop's entry goes with it
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.stats = {"calls": 0, "timeouts": 0, "in_flight": 0, "max_in_flight": 0}
+
         # Get template path from env or parameter
         self.template_name = template_path or os.environ.get("MODEL_ARMOR_TEMPLATE")
         
@@ -73,6 +114,42 @@ class ModelArmorClient:
             else:
                 logger.error("Model Armor template not configured")
 
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Concurrency limit for the running event loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def _invoke(self, method, request):
+        """
+        Run a blocking gRPC call on the Model Armor pool with a deadline.
+
+        Raises:
+            asyncio.TimeoutError: If the call (including queueing) exceeds the deadline
+        """
+        async def _call():
+            async with self._get_semaphore():
+                self.stats["in_flight"] += 1
+                self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self.stats["in_flight"])
+                try:
+                    loop = asyncio.get_running_loop()
+                    return await loop.run_in_executor(
+                        _get_executor(),
+                        functools.partial(method, request=request, timeout=self.timeout),
+                    )
+                finally:
+                    self.stats["in_flight"] -= 1
+
+        self.stats["calls"] += 1
+        try:
+            return await asyncio.wait_for(_call(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            raise
+
     async def scan_prompt(self, text: str) -> Dict[str, Any]:
         """
         Scan user prompt for prompt injection, jailbreak attempts, and adversarial inputs.
@@ -92,6 +169,11 @@ class ModelArmorClient:
             logger.error("Model Armor client not available - Fail-Closed: Blocking prompt")
             return {"is_blocked": True, "error": "Model Armor client not initialized"}
         
+        key = verdict_cache.key(self.template_name, "prompt", text)
+        return await verdict_cache.get_or_compute(key, lambda: self._scan_prompt_remote(text))
+
+    async def _scan_prompt_remote(self, text: str) -> Dict[str, Any]:
+        """Call Model Armor for a prompt verdict (uncached)."""
         try:
             # Create DataItem with text field
             data_item = modelarmor_v1.DataItem(text=text)
@@ -101,7 +183,7 @@ class ModelArmorClient:
                 user_prompt_data=data_item
             )
             
-            response = self.client.sanitize_user_prompt(request=request)
+            response = await self._invoke(self.client.sanitize_user_prompt, request)
             sanitization_result = response.sanitization_result
             
             # Check for API success
@@ -136,6 +218,9 @@ class ModelArmorClient:
             
             return result
             
+        except asyncio.TimeoutError:
+            logger.error(f"Model Armor prompt scan exceeded {self.timeout}s deadline - Fail-Closed: Blocking prompt")
+            return {"is_blocked": True, "error": "Model Armor deadline exceeded"}
         except Exception as e:
             logger.error(f"Model Armor Prompt Scan Error: {e} - Fail-Closed: Blocking prompt", exc_info=True)
             return {"is_blocked": True, "error": str(e)}
@@ -160,6 +245,11 @@ class ModelArmorClient:
             logger.error("Model Armor client not available - Fail-Closed: Blocking response")
             return {"is_blocked": True, "sanitized_text": "[REDACTED]", "error": "Model Armor client not initialized"}
         
+        key = verdict_cache.key(self.template_name, "response", text)
+        return await verdict_cache.get_or_compute(key, lambda: self._sanitize_response_remote(text))
+
+    async def _sanitize_response_remote(self, text: str) -> Dict[str, Any]:
+        """Call Model Armor for a response verdict (uncached)."""
         try:
             # Create DataItem with text field
             data_item = modelarmor_v1.DataItem(text=text)
@@ -169,7 +259,7 @@ class ModelArmorClient:
                 model_response_data=data_item
             )
             
-            response = self.client.sanitize_model_response(request=request)
+            response = await self._invoke(self.client.sanitize_model_response, request)
             sanitization_result = response.sanitization_result
             
             # Check for API success
@@ -208,6 +298,9 @@ class ModelArmorClient:
             
             return result
             
+        except asyncio.TimeoutError:
+            logger.error(f"Model Armor response sanitize exceeded {self.timeout}s deadline - Fail-Closed: Blocking response")
+            return {"is_blocked": True, "sanitized_text": "[REDACTED]", "error": "Model Armor deadline exceeded"}
         except Exception as e:
             logger.error(f"Model Armor Response Sanitize Error: {e} - Fail-Closed: Blocking response", exc_info=True)
             return {"is_blocked": True, "sanitized_text": "[REDACTED]", "error": str(e)}
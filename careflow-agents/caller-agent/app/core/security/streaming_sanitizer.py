@@ -0,0 +1,219 @@
+import re
+import time
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Local PHI patterns applied to every released span before it reaches TTS.
+# Kept deliberately narrow (structured identifiers only) so clinical values
+# such as "40 mg", "120/80" or "2.5 kg" are never touched.
+PHI_PATTERNS: List[Tuple[str, "re.Pattern[str]"]] = [
+    ("SSN", re.compile(r"\b\d{3}-\d{2}-\d{4}\b")),
+    ("CARD", re.compile(r"\b(?:\d{4}[ -]){3}\d{4}\b")),
+    ("PHONE", re.compile(r"(?:\+?1[\s.-]?)?(?:\(\d{3}\)\s?|\b\d{3}[\s.-])\d{3}[\s.-]\d{4}\b")),
+    ("EMAIL", re.compile(r"\b[\w.+-]+@[\w-]+(?:\.[\w-]+)+\b")),
+    ("MRN", re.compile(r"\bMRN[\s:#-]*\d{5,}\b", re.IGNORECASE)),
+    ("DOB", re.compile(r"\b(?:0?[1-9]|1[0-2])/(?:0?[1-9]|[12]\d|3[01])/(?:19|20)\d{2}\b")),
+]
+
+REDACTION = "[REDACTED]"
+SAFE_FALLBACK = " I'm sorry, I can't share that information over the phone."
+
+# Span boundaries: sentence or clause punctuation followed by whitespace.
+# Colons are excluded so labelled identifiers ("MRN: 1234567") stay in one span.
+_BOUNDARY = re.compile(r"[.!?,;](?=\s)")
+
+# Longest PHI match we must never split when force-releasing a long span
+_MAX_PATTERN_CHARS = 32
+
+# Model Armor batch outcomes across all turns, for GET /metrics
+_totals = {"batches": 0, "blocked": 0, "errors": 0}
+
+
+def get_metrics() -> Dict[str, Any]:
+    """Model Armor batches checked, blocked and failed (error/timeout) since startup."""
+    return dict(_totals)
+
+
+def redact_phi(text: str) -> Tuple[str, List[str]]:
+    """
+    Apply the local PHI patterns.
+
+    Returns:
+        (redacted_text, list of pattern names that matched)
+    """
+    matched = []
+    for name, pattern in PHI_PATTERNS:
+        text, count = pattern.subn(REDACTION, text)
+        if count:
+            matched.append(name)
+    return text, matched
+
+
+class StreamingSanitizer:
+    """
+    Windowed output guard for streamed LLM text.
+
+    Text is held only until the next sentence/clause boundary (or
+    `max_window_chars`), passed through the local PHI patterns, and released.
+    Released spans are batched to Model Armor in the background; if a batch
+    comes back blocked, the rest of the turn is suppressed and a safe
+    fallback is spoken instead. A batch that could not be checked (the client
+    reports an `error`, e.g. a deadline) is logged and counted but does not
+    suppress speech. Model Armor never sits on the release path,
+    so added latency per span is bounded by the window, not the round trip.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        batch_spans: int = 3,
+        max_window_chars: int = 160,
+        enforce: bool = True,
+    ):
+        """
+        Args:
+            client: ModelArmorClient (anything with `async sanitize_response(text)`)
+            batch_spans: Released spans per Model Armor request
+            max_window_chars: Longest text held back without a boundary
+            enforce: Stop the turn when Model Armor blocks a batch
+        """
+        self.client = client
+        self.batch_spans = batch_spans
+        self.max_window_chars = max_window_chars
+        self.enforce = enforce
+
+        self.blocked = False
+        self.local_redactions: List[str] = []
+        self.ma_redactions: List[str] = []
+        self.ma_errors = 0
+        self.hold_times_ms: List[float] = []
+
+        self._window = ""
+        self._window_since: Optional[float] = None
+        self._batch: List[str] = []
+        self._tasks: Set[asyncio.Task] = set()
+        self._batches_sent = 0
+
+    # -------------------------------------------------------------------------
+    # Stream
+    # -------------------------------------------------------------------------
+
+    async def sanitize(self, chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+        """Wrap a chunk stream, yielding locally-redacted spans."""
+        try:
+            async for chunk in chunks:
+                if not chunk:
+                    continue
+                if not self._window:
+                    self._window_since = time.perf_counter()
+                self._window += chunk
+
+                for span in self._take_spans():
+                    released = self._release(span)
+                    if released is None:
+                        yield SAFE_FALLBACK
+                        return
+                    yield released
+
+            if self._window:
+                span, self._window = self._window, ""
+                released = self._release(span)
+                if released is None:
+                    yield SAFE_FALLBACK
+                    return
+                yield released
+        finally:
+            # Audit whatever was released, even on barge-in
+            self._send_batch()
+            aclose = getattr(chunks, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    def _take_spans(self) -> List[str]:
+        spans = []
+        while True:
+            boundary = None
+            for match in _BOUNDARY.finditer(self._window):
+                boundary = match.end()
+            if boundary is None and len(self._window) > self.max_window_chars:
+                # No punctuation: release up to a space, keeping a tail long
+                # enough that a PHI pattern is never split across spans
+                limit = len(self._window) - _MAX_PATTERN_CHARS
+                space = self._window.rfind(" ", 0, max(limit, 0))
+                boundary = space if space > 0 else None
+            if not boundary:
+                return spans
+            spans.append(self._window[:boundary])
+            self._window = self._window[boundary:]
+
+    def _release(self, span: str) -> Optional[str]:
+        """Redact and release a span, or None if the turn has been blocked."""
+        if self.enforce and self.blocked:
+            return None
+
+        redacted, matched = redact_phi(span)
+        if matched:
+            self.local_redactions.extend(matched)
+            logger.warning(f"🔒 Local PHI filter redacted: {', '.join(matched)}")
+
+        if self._window_since is not None:
+            self.hold_times_ms.append((time.perf_counter() - self._window_since) * 1000)
+        self._window_since = time.perf_counter() if self._window else None
+
+        self._batch.append(redacted)
+        if len(self._batch) >= self.batch_spans:
+            self._send_batch()
+        return redacted
+
+    # -------------------------------------------------------------------------
+    # Model Armor (background)
+    # -------------------------------------------------------------------------
+
+    def _send_batch(self) -> None:
+        if not self._batch:
+            return
+        text, self._batch = "".join(self._batch), []
+        self._batches_sent += 1
+        _totals["batches"] += 1
+        task = asyncio.create_task(self._check(text))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _check(self, text: str) -> None:
+        try:
+            result = await self.client.sanitize_response(text)
+        except Exception as e:
+            result = {"is_blocked": True, "error": str(e)}
+        if result.get("error"):
+            # The client fails closed (`is_blocked` is set too); an unchecked
+            # batch is not a verdict, so the call keeps talking
+            self.ma_errors += 1
+            _totals["errors"] += 1
+            logger.warning(f"⚠️ Model Armor could not check streamed response: {result['error']}")
+        elif result.get("is_blocked"):
+            self.blocked = True
+            _totals["blocked"] += 1
+            logger.error("🚨 Model Armor BLOCKED streamed response - suppressing remainder of turn")
+        elif result.get("redactions_applied"):
+            self.ma_redactions.extend(result["redactions_applied"])
+            logger.warning(f"🔒 Model Armor detected PHI/Sensitive data: {', '.join(result['redactions_applied'])}")
+
+    async def finalize(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Wait for outstanding Model Armor batches (off the speaking path) and summarize."""
+        if self._tasks:
+            await asyncio.wait(set(self._tasks), timeout=timeout)
+        return self.summary()
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "blocked": self.blocked,
+            "local_redactions": list(self.local_redactions),
+            "ma_redactions": list(self.ma_redactions),
+            "ma_batches": self._batches_sent,
+            "ma_errors": self.ma_errors,
+            "pending_batches": len(self._tasks),
+            "max_hold_ms": round(max(self.hold_times_ms), 1) if self.hold_times_ms else 0.0,
+        }
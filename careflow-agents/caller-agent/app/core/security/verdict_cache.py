@@ -0,0 +1,140 @@
+import os
+import time
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+MODEL_ARMOR_CACHE_MAX_SIZE = int(os.environ.get("MODEL_ARMOR_CACHE_MAX_SIZE", "2048"))
+MODEL_ARMOR_CACHE_TTL_SECONDS = float(os.environ.get("MODEL_ARMOR_CACHE_TTL_SECONDS", "600"))
+
+CacheKey = Tuple[str, str, str]
+
+
+class VerdictCache:
+    """
+    LRU + TTL cache of Model Armor verdicts keyed by (template, direction, SHA-256 of text).
+
+    The same texts are scanned repeatedly (the last user turn on every ReAct
+    iteration, canned phrases on every call), so identical scans are served
+    from memory instead of another round trip.
+
+    Policy:
+    - Only successful verdicts are cached. Errors and fail-closed results are
+      never stored, so a transient outage is not replayed from cache.
+    - Expired entries are never served stale. An entry that expires while a
+      request is in flight is treated as a miss; if the refresh fails the
+      caller gets the client's fail-closed verdict.
+    - Concurrent scans of the same text share one in-flight call (single-flight).
+    """
+
+    def __init__(
+        self,
+        max_size: int = MODEL_ARMOR_CACHE_MAX_SIZE,
+        ttl_seconds: float = MODEL_ARMOR_CACHE_TTL_SECONDS,
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._in_flight: Dict[CacheKey, asyncio.Future] = {}
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0, "expired": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    @staticmethod
+    def key(template: Optional[str], direction: str, text: str) -> CacheKey:
+        """Build a cache key; the text itself is never stored."""
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return (template or "", direction, digest)
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        """Return a fresh cached verdict, or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, verdict = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            self.stats["expired"] += 1
+            return None
+        self._entries.move_to_end(key)
+        return dict(verdict)
+
+    def put(self, key: CacheKey, verdict: Dict[str, Any]) -> None:
+        """Store a successful verdict."""
+        if not self.enabled or verdict.get("error"):
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, dict(verdict))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    async def get_or_compute(
+        self,
+        key: CacheKey,
+        compute: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        """
+        Serve a verdict from cache, joining an identical in-flight scan if any.
+
+        Args:
+            key: Key from `VerdictCache.key`
+            compute: Coroutine factory performing the real scan
+        """
+        if not self.enabled:
+            return await compute()
+
+        cached = self.get(key)
+        if cached is not None:
+            self.stats["hits"] += 1
+            return cached
+
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self.stats["coalesced"] += 1
+            try:
+                return dict(await asyncio.shield(pending))
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The owning scan was cancelled; run our own
+                return await compute()
+
+        self.stats["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            verdict = await compute()
+            self.put(key, verdict)
+            future.set_result(verdict)
+            return verdict
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an exception with no waiters is not logged as unhandled
+            future.exception()
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"] + self.stats["coalesced"]
+        return {
+            **self.stats,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hit_rate": round((self.stats["hits"] + self.stats["coalesced"]) / lookups, 3) if lookups else None,
+        }
+
+
+# Process-wide cache shared by every ModelArmorClient
+verdict_cache = VerdictCache()
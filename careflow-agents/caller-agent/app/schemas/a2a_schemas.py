@@ -7,6 +7,8 @@ Author: CareFlow Pulse Team
 Version: 1.0.0
 """
 
+from typing import List, Optional
+
 from pydantic import BaseModel, Field
 
 
@@ -33,3 +35,44 @@ class WebhookInput(BaseModel):
     webhook_url: str = Field(
         description="Webhook URL for notifications"
     )
+
+
+class CallBrief(BaseModel):
+    """One patient in a `dispatch_calls` batch."""
+    
+    patient_id: str = Field(
+        alias="patientId",
+        min_length=1,
+        description="Unique identifier of the patient"
+    )
+    patient_name: str = Field(
+        alias="patientName",
+        min_length=1,
+        description="Name of the patient to call"
+    )
+    patient_phone: str = Field(
+        alias="patientPhone",
+        pattern=r"^\+[1-9]\d{6,14}$",
+        description="E.164 phone number (e.g., +15551234567)"
+    )
+    brief: str = Field(
+        min_length=1,
+        description="Clinical brief used as the call context"
+    )
+
+
+class DispatchCallsRequest(BaseModel):
+    """DataPart payload of a `dispatch_calls` request."""
+    
+    skill: str = Field(
+        default="dispatch_calls",
+        description="Skill ID; always dispatch_calls"
+    )
+    schedule_slot: Optional[str] = Field(
+        default=None,
+        alias="scheduleSlot",
+        description="Rounds slot the batch belongs to (for logging)"
+    )
+    patients: List[dict] = Field(
+        description="Patient briefs; each one is validated as a CallBrief"
+    )
@@ -10,6 +10,8 @@ from a2a.types import (
 )
 import os
 
+from app.core.a2a import skill_latency
+
 # Service URL from environment (for Cloud Run deployment)
 SERVICE_URL = os.environ.get("SERVICE_URL", "http://localhost:8080/")
 
@@ -27,8 +29,11 @@ caller_card = AgentCard(
     version="1.0.0",
     capabilities=AgentCapabilities(
         streaming=True,
-        pushNotifications=False,
+        pushNotifications=True,
         stateTransitionHistory=True,
+        # Measured p50/p90/p99 per skill; the served card is refreshed on
+        # every request by `skill_latency.apply` (card_modifier)
+        extensions=[skill_latency.extension(["voice_call_handling", "dispatch_calls"])],
     ),
     securitySchemes=None,
     security=None,
@@ -51,7 +56,24 @@ caller_card = AgentCard(
             ],
             inputModes=["text"],
             outputModes=["text", "task-status"],
-        )
+        ),
+        AgentSkill(
+            id="dispatch_calls",
+            name="Batch Call Dispatch",
+            description=(
+                "Start outbound calls for many patients in one request, without an LLM turn. "
+                "Send a DataPart {\"skill\": \"dispatch_calls\", \"scheduleSlot\": str, "
+                "\"patients\": [{\"patientId\", \"patientName\", \"patientPhone\" (E.164), \"brief\"}]}. "
+                "Calls are started under the Caller's outbound calls-per-second limit; one "
+                "status update per patient reports accepted, duplicate, rejected or failed."
+            ),
+            tags=["voice", "healthcare", "batch", "dispatch"],
+            examples=[
+                "Start the 08:00 rounds calls for 40 patients",
+            ],
+            inputModes=["application/json"],
+            outputModes=["application/json", "task-status"],
+        ),
     ],
     supportsAuthenticatedExtendedCard=False,
 )
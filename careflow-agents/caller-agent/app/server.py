@@ -16,6 +16,8 @@ Architecture:
 Endpoints:
     - POST /twiml: Twilio webhook returning TwiML for call handling
     - WS /ws: WebSocket endpoint for ConversationRelay voice streaming
+    - POST /call-status: Twilio status callback (queues recording ingestion)
+    - GET /metrics: Background subsystem metrics (queue depth, throughput)
     - /* : A2A protocol endpoints (mounted at root)
 
 Author: CareFlow Pulse Team
@@ -24,20 +26,18 @@ Version: 1.0.0
 
 import os
 import json
-import base64
+import asyncio
 import argparse
 import logging
-import aiohttp
-import requests as sync_requests
+import time
+from contextlib import aclosing, asynccontextmanager
 from datetime import datetime
-from typing import Optional
+from typing import AsyncIterator, Optional
 from urllib.parse import quote
-from requests.auth import HTTPBasicAuth
 
-from google.auth.transport.requests import Request as GoogleRequest
-from google.oauth2 import id_token
 import google.auth
 
+import httpx
 import uvicorn
 import websockets
 from fastapi import FastAPI, Request, Response, WebSocket
@@ -50,13 +50,36 @@ from starlette.websockets import WebSocketDisconnect
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
 from a2a.server.tasks import InMemoryTaskStore
+from a2a.server.tasks.inmemory_push_notification_config_store import InMemoryPushNotificationConfigStore
+from a2a.server.tasks.base_push_notification_sender import BasePushNotificationSender
 
 # Local imports
-from app.config import PUBLIC_URL, PORT
+from app.config import (
+    PUBLIC_URL,
+    PORT,
+    TTS_MAX_LATENCY_MS,
+    SUPPORTS_LATENCY_TASK_UPDATES,
+    SKILL_LATENCY,
+)
 from app.app_utils.conversation_relay import SessionData, ConversationMessage
-from app.app_utils.websocket_handlers import MessageHandler, connection_manager
+from app.app_utils.websocket_handlers import MessageHandler
+from app.app_utils.call_sessions import CallSession, call_sessions
+from app.app_utils.call_dispatcher import call_dispatcher
+from app.app_utils.greeting_cache import (
+    build_greeting_prompt,
+    build_outbound_context,
+    greeting_cache,
+)
 from app.app_utils.telemetry import setup_telemetry
+from app.app_utils.tts_shaper import TTSShaper
+from app.app_utils.recording_ingestion import (
+    RecordingJob,
+    get_pulse_url,
+    recording_pipeline,
+)
 from app.agent import agent
+from app.core.a2a import IdTokenAuth, a2a_client, skill_latency
+from app.core.security import streaming_sanitizer
 from app.app_utils.executor.caller_executor import CallerAgentExecutor
 from app.schemas.agent_card.v1.caller_card import caller_card
 
@@ -113,10 +136,32 @@ server_port = int(PORT)
 # FASTAPI APPLICATION SETUP
 # =============================================================================
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Start and stop background subsystems with the server.
+    
+    - A2A agent card registry (load once, TTL refresh in background)
+    - Recording ingestion worker pool (post-call audio -> Pulse)
+    - Shared A2A client (pooled connections, ID tokens) and the push
+      notification HTTP client, closed on shutdown
+    """
+    await agent.card_registry.start()
+    await recording_pipeline.start()
+    try:
+        yield
+    finally:
+        await recording_pipeline.stop()
+        await agent.card_registry.stop()
+        await push_http_client.aclose()
+        await a2a_client.close()
+
+
 app = FastAPI(
     title="CareFlow Caller Agent",
     description="Voice interface for patient communication via Twilio",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware for cross-origin requests
@@ -152,16 +197,34 @@ def setup_a2a() -> A2AStarletteApplication:
     Returns:
         Configured A2A Starlette application ready to be mounted.
     """
+    # Measured skill latency: advertised on the agent card, and sent as
+    # latency task updates when enabled
+    skill_latency.configure(task_updates=SUPPORTS_LATENCY_TASK_UPDATES, static=SKILL_LATENCY)
+
     executor = CallerAgentExecutor(agent)
     task_store = InMemoryTaskStore()
-    request_handler = DefaultRequestHandler(executor, task_store)
+
+    # Push notifications: a non-blocking `message/send` from Pulse returns the
+    # task ID at once and the finished task is POSTed to Pulse's webhook.
+    # Webhook requests carry a cached Cloud Run ID token.
+    push_config_store = InMemoryPushNotificationConfigStore()
+    push_sender = BasePushNotificationSender(push_http_client, push_config_store)
+
+    request_handler = DefaultRequestHandler(
+        agent_executor=executor,
+        task_store=task_store,
+        push_config_store=push_config_store,
+        push_sender=push_sender,
+    )
     
     return A2AStarletteApplication(
         agent_card=caller_card,
-        http_handler=request_handler
+        http_handler=request_handler,
+        card_modifier=skill_latency.apply,
     ).build()
 
 
+push_http_client = httpx.AsyncClient(auth=IdTokenAuth(a2a_client.tokens), timeout=10.0)
 a2a_app = setup_a2a()
 
 
@@ -192,6 +255,10 @@ async def twiml_endpoint(request: Request) -> Response:
         patient_id: Unique identifier for the patient
         context: Additional context for the call
     
+    Form Parameters (Twilio webhook):
+        CallSid: Twilio Call SID, forwarded to the WebSocket so the call
+                 session is keyed by it from the first frame
+    
     Returns:
         TwiML response configuring ConversationRelay with ElevenLabs TTS
     """
@@ -209,6 +276,13 @@ async def twiml_endpoint(request: Request) -> Response:
     patient_id = params.get("patient_id", "")
     context = params.get("context", "")
     
+    call_sid = None
+    try:
+        form = await request.form()
+        call_sid = form.get("CallSid")
+    except Exception:
+        pass
+    
     logger.info(f"⚓ Received TwiML request for {patient_name} (ID: {patient_id}) from {request.client.host}")
     
     # Build WebSocket URL with parameters
@@ -221,6 +295,8 @@ async def twiml_endpoint(request: Request) -> Response:
         query_parts.append(f"patient_id={quote(patient_id)}")
     if context:
         query_parts.append(f"context={quote(context)}")
+    if call_sid:
+        query_parts.append(f"call_sid={quote(call_sid)}")
     
     if query_parts:
         ws_url += "?" + "&".join(query_parts)
@@ -256,7 +332,9 @@ async def call_status_endpoint(request: Request):
     """
     Twilio Status Callback.
     Triggered when the call ends (completed).
-    Sends A2A message to CareFlow Agent (Pulse) to analyze the audio.
+    Queues the call for recording ingestion and acks Twilio immediately; the
+    ingestion workers send the A2A message to CareFlow Agent (Pulse) to
+    analyze the audio.
     """
     data = await request.form()
     call_sid = data.get("CallSid")
@@ -298,130 +376,18 @@ async def call_status_endpoint(request: Request):
             for k in to_remove:
                 _PROCESSED_CALLS.discard(k)
         
-        try:
-            import uuid
-            msg_id = str(uuid.uuid4())
-            
-            instruction_text = (
-                f"CALL_COMPLETE: Interview with patient {patient_name} (ID: {patient_id}) finished. "
-                f"Call SID: {call_sid}. Analyze the audio."
-            )
-            
-            # ─── APPROACH A: Fetch audio HERE and send it inline ───
-            # The Caller Agent owns Twilio credentials. We fetch the recording
-            # and attach it as a FilePart so the Pulse Agent's Gemini 3 receives
-            # text + audio in a single turn — exactly like eval.py does.
-            message_parts = [{"text": instruction_text, "kind": "text"}]
-            
-            acc_sid = os.environ.get("TWILIO_ACCOUNT_SID")
-            auth_token = os.environ.get("TWILIO_AUTH_TOKEN")
-            audio_attached = False
-            
-            if acc_sid and auth_token:
-                try:
-                    # 1. Find recordings for this call (with retry — Twilio may need time to finalize)
-                    import time as _time
-                    rec_url = f"https://api.twilio.com/2010-04-01/Accounts/{acc_sid}/Calls/{call_sid}/Recordings.json"
-                    
-                    recordings = []
-                    for attempt in range(4):  # Try up to 4 times (0s, 5s, 10s, 15s = ~30s total)
-                        if attempt > 0:
-                            wait = attempt * 5
-                            logger.info(f"⏳ Recording not ready, waiting {wait}s before retry #{attempt}...")
-                            _time.sleep(wait)
-                        
-                        rec_resp = sync_requests.get(rec_url, auth=HTTPBasicAuth(acc_sid, auth_token), timeout=15)
-                        rec_resp.raise_for_status()
-                        recordings = rec_resp.json().get("recordings", [])
-                        
-                        if recordings and recordings[0].get("status") == "completed":
-                            break
-                        elif recordings:
-                            logger.info(f"📼 Recording found but status={recordings[0].get('status')}, waiting...")
-                            recordings = []  # Not ready yet
-                    
-                    if recordings:
-                        # 2. Download the raw audio (with retry for 404)
-                        audio_dl_url = f"https://api.twilio.com/2010-04-01/Accounts/{acc_sid}/Recordings/{recordings[0]['sid']}.wav"
-                        
-                        audio_resp = None
-                        for dl_attempt in range(3):
-                            if dl_attempt > 0:
-                                _time.sleep(5)
-                                logger.info(f"⏳ Audio download retry #{dl_attempt}...")
-                            
-                            audio_resp = sync_requests.get(audio_dl_url, auth=HTTPBasicAuth(acc_sid, auth_token), timeout=60)
-                            if audio_resp.status_code == 200:
-                                break
-                            logger.warning(f"⚠️ Audio download attempt #{dl_attempt}: HTTP {audio_resp.status_code}")
-                        
-                        audio_resp.raise_for_status()
-                        
-                        # 3. Encode and attach as FilePart (same format as eval.py)
-                        audio_b64 = base64.b64encode(audio_resp.content).decode('utf-8')
-                        message_parts.append({
-                            "kind": "file",
-                            "file": {
-                                "bytes": audio_b64,
-                                "mimeType": "audio/wav"
-                            }
-                        })
-                        audio_attached = True
-                        logger.info(f"🎙️ Audio attached inline for {call_sid} ({len(audio_resp.content)} bytes)")
-                    else:
-                        logger.warning(f"⚠️ No recordings found yet for {call_sid}")
-                        message_parts.append({"text": f"\n[AUDIO_UNAVAILABLE: No recording found yet for Call SID {call_sid}. The recording may not be ready. Do NOT hallucinate an analysis — report that audio was unavailable.]", "kind": "text"})
-                except Exception as audio_err:
-                    logger.error(f"❌ Audio pre-fetch failed for {call_sid}: {audio_err}")
-                    message_parts.append({"text": f"\n[AUDIO_UNAVAILABLE: Failed to download recording for Call SID {call_sid}. Do NOT hallucinate an analysis — report that audio was unavailable.]", "kind": "text"})
-            else:
-                logger.warning("⚠️ Twilio credentials not available for audio fetch")
-                message_parts.append({"text": f"\n[AUDIO_UNAVAILABLE: Twilio credentials not configured. Do NOT hallucinate an analysis — report that audio was unavailable.]", "kind": "text"})
-            
-            if audio_attached:
-                logger.info(f"✅ Sending CALL_COMPLETE + inline audio to Pulse Agent for {patient_name}")
-            else:
-                logger.warning(f"⚠️ Sending CALL_COMPLETE WITHOUT audio to Pulse Agent for {patient_name} (fallback mode)")
-            # ─── END APPROACH A ───
-            
-            payload = {
-                "jsonrpc": "2.0",
-                "method": "message/stream",
-                "params": {
-                    "message": {
-                        "messageId": msg_id,
-                        "role": "user",
-                        "parts": message_parts,
-                        "metadata": {
-                            "task": "analyze_call_audio",
-                            "call_sid": call_sid,
-                            "source": "telephony_webhook",
-                            "audio_attached": audio_attached
-                        }
-                    }
-                },
-                "id": f"evt-{call_sid}"
-            }
-            
-            pulse_url = os.environ.get("CAREFLOW_AGENT_URL", "http://localhost:8080")
-            if pulse_url.endswith("/rpc"): pulse_url = pulse_url[:-4]
-            
-            headers = {"Content-Type": "application/json", "Accept": "text/event-stream"}
-            try:
-                if "run.app" in pulse_url:
-                    auth_req = GoogleRequest()
-                    token = id_token.fetch_id_token(auth_req, pulse_url)
-                    headers["Authorization"] = f"Bearer {token}"
-            except Exception as e:
-                logger.warning(f"Failed to generate OIDC token for Pulse: {e}")
-
-            async with aiohttp.ClientSession() as session:
-                async with session.post(pulse_url, json=payload, headers=headers) as resp:
-                    # Consume response to properly close connection
-                    await resp.read()
-                        
-        except Exception as e:
-            logger.error(f"❌ Error sending A2A record analysis: {e}")
+        # Ack Twilio immediately: recording polling, download and the Pulse
+        # hand-off run in the background ingestion worker pool.
+        queued = recording_pipeline.submit(RecordingJob(
+            call_sid=call_sid,
+            patient_id=patient_id,
+            patient_name=patient_name,
+        ))
+        if not queued:
+            # Only while the pipeline is stopped (a full queue spills to the
+            # overflow list); clear the key so a redelivery is processed
+            _PROCESSED_CALLS.discard(dedup_key)
+            return Response(status_code=503)
     
     # 3. Handle Failed States (busy, no-answer, failed)
     elif call_status in ["busy", "no-answer", "failed"]:
@@ -472,23 +438,13 @@ async def call_status_endpoint(request: Request):
                 "id": f"fail-{call_sid}"
             }
             
-            pulse_url = os.environ.get("CAREFLOW_AGENT_URL", "http://localhost:8080")
-            if pulse_url.endswith("/rpc"): pulse_url = pulse_url[:-4]
-            
-            headers = {"Content-Type": "application/json", "Accept": "text/event-stream"}
-            try:
-                if "run.app" in pulse_url:
-                    auth_req = GoogleRequest()
-                    token = id_token.fetch_id_token(auth_req, pulse_url)
-                    headers["Authorization"] = f"Bearer {token}"
-            except Exception as e:
-                logger.warning(f"Failed to generate OIDC token for Pulse (failure flow): {e}")
-
             # 1. Notify Pulse Agent first (fire-and-forget, but consume response)
-            async with aiohttp.ClientSession() as session:
-                async with session.post(pulse_url, json=payload, headers=headers) as resp:
-                    # Consume response to properly close connection
-                    await resp.read()
+            try:
+                async with aclosing(a2a_client.stream_rpc(get_pulse_url(), payload)) as events:
+                    async for _ in events:
+                        pass
+            except Exception as notify_err:
+                logger.warning(f"⚠️ Failed to notify Pulse of {call_status} for {call_sid}: {notify_err}")
             
             # 2. Schedule the background retry with INCREMENTED retry_count
             next_retry_count = retry_count + 1
@@ -511,6 +467,35 @@ async def call_status_endpoint(request: Request):
     return Response(status_code=200)
 
 
+# =============================================================================
+# OPERATIONAL METRICS
+# =============================================================================
+
+@app.get("/metrics")
+async def metrics_endpoint() -> dict:
+    """
+    Lightweight JSON metrics for background subsystems.
+    
+    Returns:
+        Queue depth and throughput counters for the recording pipeline,
+        live/peak call counts for the call session registry, and greeting
+        cache hit rate with pickup-to-first-token latency, A2A
+        connection pool / ID token cache counters, `dispatch_calls`
+        batch counters, Model Armor output checks (blocked vs failed),
+        and measured per-skill latency
+    """
+    return {
+        "a2aClient": a2a_client.get_metrics(),
+        "agentCards": agent.card_registry.get_metrics(),
+        "callDispatch": call_dispatcher.get_metrics(),
+        "callSessions": call_sessions.get_metrics(),
+        "greetingCache": greeting_cache.get_metrics(),
+        "outputGuard": streaming_sanitizer.get_metrics(),
+        "recordingIngestion": recording_pipeline.get_metrics(),
+        "skillLatency": skill_latency.get_metrics(),
+    }
+
+
 # =============================================================================
 # WEBSOCKET VOICE STREAMING ENDPOINT
 # =============================================================================
@@ -523,6 +508,11 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
     Handles the bidirectional voice communication between Twilio and our
     LangGraph-based conversational agent. Supports both inbound and outbound calls.
     
+    Each connection gets its own CallSession (WebSocket, SessionData and
+    cancellation token); the compiled agent is shared across all calls.
+    Connections beyond MAX_CONCURRENT_CALLS are closed with code 1013
+    (try again later).
+    
     Message Types Handled:
         - setup: Initial connection setup with call metadata
         - prompt: User speech transcription (STT result)
@@ -534,16 +524,6 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
         websocket: FastAPI WebSocket connection
     """
     await websocket.accept()
-    connection_id = connection_manager.connect(websocket)
-    
-    logger.info(f"New WebSocket connection established ({connection_manager.get_count()} active)")
-    
-    # Initialize session state
-    session_data = SessionData(
-        connected_at=datetime.now().isoformat(),
-        call_sid=None,
-        conversation=[]
-    )
     
     # Extract context from query parameters (outbound calls)
     params = websocket.query_params
@@ -551,37 +531,38 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
     patient_id = params.get("patient_id")
     call_context = params.get("context")
     
-    if patient_name:
-        # Outbound call - inject patient context
-        logger.info(f"Outbound call to {patient_name} (ID: {patient_id})")
-        system_instruction = (
-            f"URGENT CONTEXT: You are now connected with patient {patient_name} "
-            f"(ID: {patient_id})."
-        )
-        if call_context:
-            system_instruction += f"\nSpecific Instructions:\n{call_context}"
-        system_instruction += "\n\nThe patient has just picked up. Start the interview."
-        
-        session_data.conversation.append(ConversationMessage(
-            role='system',
-            content=system_instruction,
-            timestamp=datetime.now().isoformat()
-        ))
-    else:
-        # Inbound call - no patient context yet
-        logger.info("Inbound call - patient identity unknown")
-    
-    # Connect agent to this WebSocket
-    agent.set_ws_channel(websocket)
-    await agent.init()
+    # Initialize session state
+    session_data = SessionData(
+        connected_at=datetime.now().isoformat(),
+        call_sid=params.get("call_sid"),
+        conversation=[]
+    )
     
-    # IMPORTANT: For outbound calls, generate initial greeting immediately!
-    # The agent should speak FIRST when connecting to a patient
-    if patient_name:
-        await _send_initial_greeting(agent, websocket, session_data, patient_name)
+    session = call_sessions.open(
+        websocket, session_data, patient_id=patient_id, patient_name=patient_name
+    )
+    if session is None:
+        await websocket.close(code=1013, reason="Call capacity reached")
+        return
     
+    # Everything after a successful open runs under the finally below, so a
+    # cancellation at any point (shutdown, greeting) still frees the slot
     try:
-        await _handle_websocket_messages(websocket, session_data)
+        if patient_name:
+            # Outbound call - inject patient context
+            logger.info(f"Outbound call to {patient_name} (ID: {patient_id})")
+            system_instruction = build_outbound_context(patient_name, patient_id, call_context)
+            
+            session_data.conversation.append(ConversationMessage(
+                role='system',
+                content=system_instruction,
+                timestamp=datetime.now().isoformat()
+            ))
+        else:
+            # Inbound call - no patient context yet
+            logger.info("Inbound call - patient identity unknown")
+        
+        await _handle_websocket_messages(session, greet_patient=patient_name)
     except websockets.exceptions.ConnectionClosed as e:
         logger.info(f"WebSocket closed: {e.code} - {e.reason}")
     except WebSocketDisconnect:
@@ -590,100 +571,137 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
         logger.error(f"WebSocket error: {e}", exc_info=True)
     finally:
         # Cleanup
-        connection_manager.disconnect(connection_id)
-        if hasattr(agent, 'ws') and agent.ws == websocket:
-            agent.ws = None
-        logger.info(f"WebSocket connection cleaned up ({connection_manager.get_count()} active)")
+        call_sessions.close(session)
+        agent.release_session(session.session_id)
 
 
-async def _send_initial_greeting(agent, websocket: WebSocket, session_data: SessionData, patient_name: str) -> None:
+async def _send_initial_greeting(agent, session: CallSession, patient_name: str) -> None:
     """
-    Generate and send the initial greeting when an outbound call connects.
+    Send the initial greeting when an outbound call connects.
     
     The agent speaks FIRST when connecting to a patient - this is critical
     for natural conversation flow. Without this, there would be awkward silence
     until the patient says something.
     
+    The greeting pre-generated by `call_patient` while the phone was ringing
+    is used when available; otherwise it is generated live. It runs as the
+    call's first generation task, so an interrupt or an early prompt
+    cancels it like any other turn.
+    
     Args:
         agent: The LangGraph agent instance
-        websocket: Active WebSocket connection
-        session_data: Session state for this call
+        session: The call's session (WebSocket and session state)
         patient_name: Name of the patient for logging
     """
-    logger.info(f"🎤 Generating initial greeting for {patient_name}...")
+    websocket = session.websocket
+    session_data = session.session_data
     
     try:
-        # CRITICAL: Tell the agent explicitly that this is LIVE - no tools needed!
-        greeting_prompt = (
-            f"LIVE CALL ACTIVE with {patient_name}. "
-            "The patient just picked up the phone and can hear you NOW. "
-            "DO NOT use any tools - just speak directly! "
-            "Say your greeting to confirm you're speaking with the right person."
+        greeting = await greeting_cache.take(
+            call_sid=session.call_sid, patient_id=session.patient_id
         )
-        
-        # Stream the agent's greeting response
-        async for chunk in agent.stream_message(greeting_prompt, session_data):
-            if not chunk:
-                continue
-            
-            # Check for hangup signal (shouldn't happen on greeting, but safety first)
-            if "[HANGUP]" in chunk or "[[END_CALL_SIGNAL]]" in chunk:
-                continue
-            
-            # Send chunk to Twilio for TTS
+        if greeting and "[HANGUP]" not in greeting and "[[END_CALL_SIGNAL]]" not in greeting:
             if websocket.client_state.name == "CONNECTED":
-                text_message = {
-                    "type": "text",
-                    "token": chunk,
-                    "last": False
-                }
-                await websocket.send_json(text_message)
+                await websocket.send_json({"type": "text", "token": greeting, "last": True})
+                greeting_cache.record_pickup_to_first_token(
+                    time.monotonic() - session.created_at, cached=True
+                )
+                session_data.conversation.append(ConversationMessage(
+                    role='assistant',
+                    content=greeting,
+                    timestamp=datetime.now().isoformat()
+                ))
+                logger.info(f"✅ Pre-generated greeting sent to {patient_name}")
+            return
         
+        logger.info(f"🎤 Generating initial greeting for {patient_name}...")
+        greeting_prompt = build_greeting_prompt(patient_name)
+        first_token = True
+        accumulated = ''
+        # Tracked like a prompt response so an interrupt records what was heard
+        session_data.current_response = ''
+        session_data.interrupted_at = None
+        
+        # Stream the agent's greeting response, coalesced into clause/sentence frames
+        shaper = TTSShaper(max_latency_ms=TTS_MAX_LATENCY_MS)
+        async with aclosing(
+            shaper.shape(agent.stream_message(greeting_prompt, session_data))
+        ) as segments:
+            async for segment in segments:
+                # Send segment to Twilio for TTS
+                if websocket.client_state.name == "CONNECTED":
+                    await websocket.send_json(segment.to_message())
+                    accumulated += segment.text
+                    session_data.current_response = accumulated
+                    if first_token:
+                        greeting_cache.record_pickup_to_first_token(
+                            time.monotonic() - session.created_at, cached=False
+                        )
+                        first_token = False
+        
+        if accumulated:
+            session_data.conversation.append(ConversationMessage(
+                role='assistant',
+                content=accumulated,
+                timestamp=datetime.now().isoformat()
+            ))
+        session_data.current_response = None
         logger.info("✅ Initial greeting sent to patient")
         
+    except asyncio.CancelledError:
+        logger.info("Initial greeting cancelled (barge-in or early prompt)")
+        raise
     except Exception as e:
         logger.error(f"❌ Error sending initial greeting: {e}", exc_info=True)
 
 
-async def _handle_websocket_messages(websocket: WebSocket, session_data: SessionData) -> None:
+async def _handle_websocket_messages(session: CallSession, greet_patient: Optional[str] = None) -> None:
     """
     Main message handling loop for WebSocket connection.
     
     Processes incoming ConversationRelay messages and routes them
-    to appropriate handlers based on message type.
+    to appropriate handlers based on message type. Agent turns run in a
+    separate generation task so interrupts and new prompts are read (and
+    cancel the in-flight turn) while the agent is still talking.
     
     Args:
-        websocket: Active WebSocket connection
-        session_data: Current session state
+        session: The call's session (WebSocket and session state)
+        greet_patient: Outbound calls: patient name; the agent speaks FIRST,
+            with the greeting started as the first generation task
     """
-    handler = MessageHandler(agent, websocket, session_data)
+    websocket = session.websocket
+    handler = MessageHandler(agent, session)
     
-    while True:
-        data = await websocket.receive_text()
-        message = json.loads(data)
-        message_type = message.get('type')
-        
-        logger.debug(f"Received message type: {message_type}")
-        
-        if message_type == 'setup':
-            await handler.handle_setup(message)
-        
-        elif message_type == 'prompt':
-            should_continue = await handler.handle_prompt(message)
-            if not should_continue:
-                break
-        
-        elif message_type == 'interrupt':
-            handler.handle_interrupt(message)
-        
-        elif message_type == 'dtmf':
-            handler.handle_dtmf(message)
-        
-        elif message_type == 'error':
-            handler.handle_error(message)
+    try:
+        if greet_patient:
+            await handler.start_generation(_send_initial_greeting(agent, session, greet_patient))
         
-        else:
-            logger.warning(f"Unknown message type: {message_type}")
+        while True:
+            data = await websocket.receive_text()
+            message = json.loads(data)
+            message_type = message.get('type')
+            
+            logger.debug(f"Received message type: {message_type}")
+            
+            if message_type == 'setup':
+                await handler.handle_setup(message)
+            
+            elif message_type == 'prompt':
+                await handler.start_prompt(message)
+            
+            elif message_type == 'interrupt':
+                await handler.handle_interrupt(message)
+            
+            elif message_type == 'dtmf':
+                handler.handle_dtmf(message)
+            
+            elif message_type == 'error':
+                handler.handle_error(message)
+            
+            else:
+                logger.warning(f"Unknown message type: {message_type}")
+    finally:
+        await handler.cancel_generation()
 
 
 # =============================================================================
@@ -731,8 +749,8 @@ if __name__ == "__main__":
     args = parse_arguments()
     server_port = args.port or server_port
     
-    # Set environment variable for latency task updates support
+    # Config was read at import time; enable latency task updates directly
     if args.supportsLatencyTaskUpdates:
-        os.environ['SUPPORTS_LATENCY_TASK_UPDATES'] = 'true'
+        skill_latency.configure(task_updates=True)
     
     start_server()
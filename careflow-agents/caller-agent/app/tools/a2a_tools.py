@@ -8,19 +8,18 @@ Author: CareFlow Pulse Team
 Version: 1.0.0
 """
 
-import json
 import logging
 import uuid
+from contextlib import aclosing
 from typing import Any, Callable, Dict, List, Optional
 
 import aiohttp
-from google.auth.transport.requests import Request as GoogleRequest
-from google.oauth2 import id_token
 from a2a.types import AgentCard
 from langchain_core.tools import tool
 
 from ..schemas.tool_schemas import SendMessageInput, SubscribeInput, WebhookInput
 from ..core.security.model_armor import ModelArmorClient
+from ..core.a2a import a2a_client, rpc_request
 
 logger = logging.getLogger(__name__)
 
@@ -129,74 +128,38 @@ def create_a2a_tools(
             if task_id:
                 message_payload["taskId"] = task_id
             
-            rpc_request = {
-                "jsonrpc": "2.0",
-                "method": "message/stream",
-                "id": request_id,
-                "params": {"message": message_payload}
-            }
+            rpc = rpc_request("message/stream", {"message": message_payload}, request_id)
             
-            headers = {
-                "Content-Type": "application/json",
-                "Accept": "text/event-stream"
-            }
+            # Pooled connection; Cloud Run ID token comes from the shared cache
+            final_result = None
+            returned_task_id = None
+            try:
+                async with aclosing(a2a_client.stream_rpc(server_url, rpc)) as events:
+                    async for data in events:
+                        result = data.get("result") or {}
+                        if result.get("final"):
+                            final_result = extract_response_fn(result)
+                            returned_task_id = result.get("taskId")
+            except aiohttp.ClientResponseError as e:
+                return f"Error: {e.status} {e.message}"
             
-            # --- OIDC AUTHENTICATION ---
-            if "run.app" in server_url:
-                try:
-                    auth_req = GoogleRequest()
-                    # Determine audience (remove /rpc suffix if present)
-                    audience = server_url[:-4] if server_url.endswith("/rpc") else server_url
-                    # Remove trailing slash if present for cleaner audience match
-                    if audience.endswith("/"): audience = audience[:-1]
-                    
-                    token = id_token.fetch_id_token(auth_req, audience)
-                    headers["Authorization"] = f"Bearer {token}"
-                except Exception as e:
-                    logger.warning(f"Failed to generate OIDC token for {server_url}: {e}")
-            # ---------------------------
-
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    server_url,
-                    headers=headers,
-                    json=rpc_request
-                ) as response:
-                    if not response.ok:
-                        return f"Error: {response.status} {await response.text()}"
-                    
-                    # Process SSE response
-                    final_result = None
-                    returned_task_id = None
-                    
-                    async for line in response.content:
-                        line = line.decode('utf-8').strip()
-                        if line.startswith("data:"):
-                            try:
-                                data = json.loads(line[5:].strip())
-                                if data.get("result", {}).get("final"):
-                                    final_result = extract_response_fn(data["result"])
-                                    returned_task_id = data["result"].get("taskId")
-                            except json.JSONDecodeError:
-                                pass
-                    
-                    print(f"\n[CALLER -> CAREFLOW]: {message}")
-                    print(f"[CAREFLOW -> CALLER]: {final_result}\n")
-                    
-                    # --- MODEL ARMOR OUTPUT SCAN ---
-                    if final_result:
-                        logger.info(f"Model Armor scanning A2A response from {server_url}")
-                        output_scan = await model_armor_client.sanitize_response(final_result)
-                        if output_scan.get("is_blocked"):
-                            final_result = "[REDACTED] Clinical data blocked by security policy."
-                        else:
-                            final_result = output_scan.get("sanitized_text", final_result)
-                    # -------------------------------
-
-                    result = f"Response: {final_result}"
-                    if returned_task_id:
-                        result += f"\nTaskId: {returned_task_id}"
-                    return result
+            print(f"\n[CALLER -> CAREFLOW]: {message}")
+            print(f"[CAREFLOW -> CALLER]: {final_result}\n")
+            
+            # --- MODEL ARMOR OUTPUT SCAN ---
+            if final_result:
+                logger.info(f"Model Armor scanning A2A response from {server_url}")
+                output_scan = await model_armor_client.sanitize_response(final_result)
+                if output_scan.get("is_blocked"):
+                    final_result = "[REDACTED] Clinical data blocked by security policy."
+                else:
+                    final_result = output_scan.get("sanitized_text", final_result)
+            # -------------------------------
+
+            result = f"Response: {final_result}"
+            if returned_task_id:
+                result += f"\nTaskId: {returned_task_id}"
+            return result
                     
         except Exception as e:
             return f"Failed to send message: {str(e)}"
@@ -234,42 +197,19 @@ def create_a2a_tools(
         """
         try:
             request_id = int(uuid.uuid1().int >> 64)
-            rpc_request = {
-                "jsonrpc": "2.0",
-                "method": "tasks/pushNotificationConfig/set",
-                "id": request_id,
-                "params": {
-                    "taskId": task_id,
-                    "pushNotificationConfig": {
-                        "url": webhook_url,
-                        "format": "json"
-                    }
+            rpc = rpc_request("tasks/pushNotificationConfig/set", {
+                "taskId": task_id,
+                "pushNotificationConfig": {
+                    "url": webhook_url,
+                    "format": "json"
                 }
-            }
+            }, request_id)
             
-            headers = {"Content-Type": "application/json"}
-             
-            # --- OIDC AUTHENTICATION ---
-            if "run.app" in server_url:
-                try:
-                    auth_req = GoogleRequest()
-                    audience = server_url[:-4] if server_url.endswith("/rpc") else server_url
-                    if audience.endswith("/"): audience = audience[:-1]
-                    token = id_token.fetch_id_token(auth_req, audience)
-                    headers["Authorization"] = f"Bearer {token}"
-                except Exception as e:
-                    logger.warning(f"Failed to generate OIDC token for {server_url}: {e}")
-            # ---------------------------
-
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    server_url,
-                    headers=headers,
-                    json=rpc_request
-                ) as response:
-                    if not response.ok:
-                        return f"Error: {await response.text()}"
-                    return f"Webhook registered for task {task_id}"
+            try:
+                await a2a_client.post_rpc(server_url, rpc)
+            except aiohttp.ClientResponseError as e:
+                return f"Error: {e.status} {e.message}"
+            return f"Webhook registered for task {task_id}"
         except Exception as e:
             return f"Failed to register webhook: {str(e)}"
     
@@ -13,11 +13,13 @@ import logging
 import os
 import re
 import time
+from dataclasses import dataclass
 from typing import Dict, Optional
 from urllib.parse import quote
 
 from langchain_core.tools import tool
 
+from ..app_utils.greeting_cache import greeting_cache
 from ..config import PUBLIC_URL
 from ..schemas.tool_schemas import CallPatientInput, EndCallInput
 
@@ -64,32 +66,43 @@ def _extract_retry_count(message: str) -> int:
 
 
 # =============================================================================
-# TWILIO CALL TOOL
+# CALL START
 # =============================================================================
 
-@tool("call_patient", args_schema=CallPatientInput)
-async def call_patient(
+CALL_STARTED = "started"
+CALL_DUPLICATE = "duplicate"
+CALL_INVALID = "invalid"
+CALL_FAILED = "failed"
+
+
+@dataclass
+class CallStart:
+    """Outcome of asking Twilio for one outbound call."""
+    status: str  # "started" | "duplicate" | "invalid" | "failed"
+    call_sid: Optional[str] = None
+    detail: str = ""
+    elapsed_seconds: int = 0
+
+
+async def start_patient_call(
     message: str,
     patient_name: str,
     patient_id: str,
     patient_phone: Optional[str] = None,
-    expect_reply: bool = True
-) -> str:
+) -> CallStart:
     """
-    Initiate a phone call to a patient via Twilio.
-    
-    This tool creates a Twilio call that connects to our ConversationRelay
-    WebSocket endpoint, enabling real-time voice conversation.
-    
+    Create the Twilio call for a patient (dedup, greeting prefetch, status callbacks).
+
+    Shared by the `call_patient` tool and the `dispatch_calls` batch skill.
+
     Args:
         message: Context/instructions for the call
         patient_name: Patient's name for personalization
         patient_id: Patient's unique ID for tracking
         patient_phone: Phone number to call (falls back to TEST_PATIENT_PHONE)
-        expect_reply: Whether this is an interactive call
-    
+
     Returns:
-        Status message indicating call result
+        CallStart with the call SID, or why no call was created
     """
     try:
         from twilio.rest import Client
@@ -117,7 +130,7 @@ async def call_patient(
             missing.append("patient_phone/TEST_PATIENT_PHONE")
         
         if missing:
-            return f"Error: Missing configuration: {', '.join(missing)}"
+            return CallStart(CALL_INVALID, detail=f"Missing configuration: {', '.join(missing)}")
         
         # Extract retry count from message context
         retry_count = _extract_retry_count(message)
@@ -133,11 +146,7 @@ async def call_patient(
             if cached and (current_time - cached[0]) < CALL_DEDUP_WINDOW:
                 elapsed = int(current_time - cached[0])
                 logger.info(f"🚫 Duplicate call blocked for {patient_name} ({elapsed}s ago, SID: {cached[1]})")
-                return (
-                    f"SUCCESS: Call to {patient_name} is ALREADY IN PROGRESS "
-                    f"(initiated {elapsed}s ago, SID: {cached[1]}). DO NOT call again. "
-                    "Wait for patient response via WebSocket."
-                )
+                return CallStart(CALL_DUPLICATE, call_sid=cached[1], elapsed_seconds=elapsed)
             
             # Mark call as initiated (SID filled after Twilio creates it)
             _CALL_CACHE[patient_id] = (current_time, "pending")
@@ -145,6 +154,9 @@ async def call_patient(
         # Create Twilio call
         logger.info(f"Initiating call to {patient_name} ({to_number})")
         
+        # Start generating the greeting now so it is ready when the patient picks up
+        greeting_cache.prefetch(patient_id, patient_name, message)
+        
         # Build TwiML URL. Note: we ensure it starts with https:// if not present
         base_url = public_url if public_url.startswith("http") else f"https://{public_url}"
         
@@ -185,16 +197,65 @@ async def call_patient(
         # Update cache with actual SID
         async with _CALL_LOCK:
             _CALL_CACHE[patient_id] = (time.time(), call.sid)
+        greeting_cache.alias(patient_id, call.sid)
         
-        return (
-            f"SYSTEM: Call initiated (SID: {call.sid}). "
-            "Phone is ringing. DO NOT GENERATE TEXT yet. "
-            "Wait for ConversationRelay WebSocket connection."
-        )
+        return CallStart(CALL_STARTED, call_sid=call.sid)
         
     except Exception as e:
+        greeting_cache.discard(patient_id)
+        # Let a later attempt through the dedup window
+        async with _CALL_LOCK:
+            if _CALL_CACHE.get(patient_id, (0, ""))[1] == "pending":
+                del _CALL_CACHE[patient_id]
         logger.error(f"Twilio async call error: {e}")
-        return f"Failed to initiate call: {str(e)}"
+        return CallStart(CALL_FAILED, detail=str(e))
+
+
+# =============================================================================
+# TWILIO CALL TOOL
+# =============================================================================
+
+@tool("call_patient", args_schema=CallPatientInput)
+async def call_patient(
+    message: str,
+    patient_name: str,
+    patient_id: str,
+    patient_phone: Optional[str] = None,
+    expect_reply: bool = True
+) -> str:
+    """
+    Initiate a phone call to a patient via Twilio.
+    
+    This tool creates a Twilio call that connects to our ConversationRelay
+    WebSocket endpoint, enabling real-time voice conversation.
+    
+    Args:
+        message: Context/instructions for the call
+        patient_name: Patient's name for personalization
+        patient_id: Patient's unique ID for tracking
+        patient_phone: Phone number to call (falls back to TEST_PATIENT_PHONE)
+        expect_reply: Whether this is an interactive call
+    
+    Returns:
+        Status message indicating call result
+    """
+    result = await start_patient_call(message, patient_name, patient_id, patient_phone)
+    
+    if result.status == CALL_INVALID:
+        return f"Error: {result.detail}"
+    if result.status == CALL_DUPLICATE:
+        return (
+            f"SUCCESS: Call to {patient_name} is ALREADY IN PROGRESS "
+            f"(initiated {result.elapsed_seconds}s ago, SID: {result.call_sid}). DO NOT call again. "
+            "Wait for patient response via WebSocket."
+        )
+    if result.status == CALL_FAILED:
+        return f"Failed to initiate call: {result.detail}"
+    return (
+        f"SYSTEM: Call initiated (SID: {result.call_sid}). "
+        "Phone is ringing. DO NOT GENERATE TEXT yet. "
+        "Wait for ConversationRelay WebSocket connection."
+    )
 
 @tool("end_call", args_schema=EndCallInput)
 def end_call(reason: Optional[str] = "Conversation finished") -> str:
@@ -217,4 +278,9 @@ def end_call(reason: Optional[str] = "Conversation finished") -> str:
 # EXPORTS
 # =============================================================================
 
-__all__ = ['call_patient', 'end_call']
\ No newline at end of file
+__all__ = [
+    'CallStart',
+    'call_patient',
+    'end_call',
+    'start_patient_call',
+]
\ No newline at end of file
@@ -0,0 +1,144 @@
+"""
+CareFlow Pulse - Concurrent Call Load Test
+
+Simulates N simultaneous Twilio ConversationRelay calls against a running
+Caller Agent and reports per-call time-to-first-token (TTFT) and the peak
+number of live call sessions observed by the server.
+
+Each simulated call opens /ws with a unique call_sid, sends a `setup`
+message followed by one `prompt`, and waits for the first `text` token.
+
+Usage:
+    python tests/load_test/concurrent_calls.py --host localhost:8080 --calls 20
+
+Author: CareFlow Pulse Team
+Version: 1.0.0
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+from typing import List, Optional
+
+import aiohttp
+
+
+# =============================================================================
+# SIMULATED CALL
+# =============================================================================
+
+async def simulate_call(
+    session: aiohttp.ClientSession,
+    base_ws: str,
+    prompt: str,
+    timeout: float,
+) -> Optional[float]:
+    """
+    Run one simulated call and return its TTFT in seconds (None on failure).
+    """
+    call_sid = f"CA{uuid.uuid4().hex}"
+    url = f"{base_ws}/ws?call_sid={call_sid}"
+
+    try:
+        async with session.ws_connect(url, timeout=timeout) as ws:
+            await ws.send_str(json.dumps({
+                "type": "setup",
+                "sessionId": f"VX{uuid.uuid4().hex}",
+                "callSid": call_sid,
+                "from": "+15550000000",
+                "to": "+15551111111",
+                "direction": "inbound",
+            }))
+
+            started = time.perf_counter()
+            await ws.send_str(json.dumps({
+                "type": "prompt",
+                "voicePrompt": prompt,
+                "lang": "en-US",
+                "last": True,
+            }))
+
+            while True:
+                msg = await asyncio.wait_for(ws.receive(), timeout=timeout)
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    return None
+                data = json.loads(msg.data)
+                if data.get("type") == "text" and data.get("token"):
+                    return time.perf_counter() - started
+    except Exception as e:
+        print(f"  ✗ {call_sid}: {type(e).__name__}: {e}")
+        return None
+
+
+async def poll_peak_calls(
+    session: aiohttp.ClientSession,
+    base_http: str,
+    stop: asyncio.Event,
+) -> int:
+    """Poll /metrics while the test runs and return the highest activeCalls seen."""
+    peak = 0
+    while not stop.is_set():
+        try:
+            async with session.get(f"{base_http}/metrics") as resp:
+                body = await resp.json()
+                peak = max(peak, body.get("callSessions", {}).get("activeCalls", 0))
+        except Exception:
+            pass
+        await asyncio.sleep(0.2)
+    return peak
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def main(args: argparse.Namespace) -> None:
+    scheme = "wss" if args.tls else "ws"
+    http_scheme = "https" if args.tls else "http"
+    base_ws = f"{scheme}://{args.host}"
+    base_http = f"{http_scheme}://{args.host}"
+
+    print(f"📞 Launching {args.calls} concurrent calls against {base_ws}/ws")
+
+    async with aiohttp.ClientSession() as session:
+        stop = asyncio.Event()
+        poller = asyncio.create_task(poll_peak_calls(session, base_http, stop))
+
+        wall_start = time.perf_counter()
+        results = await asyncio.gather(*[
+            simulate_call(session, base_ws, args.prompt, args.timeout)
+            for _ in range(args.calls)
+        ])
+        wall = time.perf_counter() - wall_start
+
+        stop.set()
+        peak = await poller
+
+    ttfts = [r for r in results if r is not None]
+    print("\n=== Concurrent Call Results ===")
+    print(f"Calls succeeded : {len(ttfts)}/{args.calls}")
+    print(f"Wall time       : {wall:.2f}s")
+    print(f"Peak activeCalls: {peak}")
+    if ttfts:
+        print(f"TTFT p50        : {statistics.median(ttfts) * 1000:.0f} ms")
+        print(f"TTFT p95        : {_percentile(ttfts, 95) * 1000:.0f} ms")
+        print(f"TTFT max        : {max(ttfts) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent ConversationRelay call load test")
+    parser.add_argument("--host", default="localhost:8080", help="Caller Agent host[:port]")
+    parser.add_argument("--calls", type=int, default=20, help="Number of simultaneous calls")
+    parser.add_argument("--prompt", default="Hello, is this the CareFlow nurse line?")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-call timeout (seconds)")
+    parser.add_argument("--tls", action="store_true", help="Use wss/https")
+    asyncio.run(main(parser.parse_args()))
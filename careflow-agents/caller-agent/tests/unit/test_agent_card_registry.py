@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+
+from app.app_utils import agent_card_registry
+from app.app_utils.agent_card_registry import AgentCardRegistry
+
+SERVER = "http://localhost:8080"
+
+
+def _card(description="Post-discharge monitoring"):
+    return {
+        "name": "Pulse Agent",
+        "description": description,
+        "url": f"{SERVER}/",
+        "version": "1.0.0",
+        "capabilities": {"streaming": True},
+        "defaultInputModes": ["text"],
+        "defaultOutputModes": ["text"],
+        "skills": [{"id": "rounds", "name": "Rounds", "description": "Run patient rounds", "tags": []}],
+    }
+
+
+class FakeResponse:
+    def __init__(self, status, body=None, etag=None):
+        self.status = status
+        self.ok = status < 400
+        self.headers = {"ETag": etag} if etag else {}
+        self._body = body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def json(self):
+        return self._body
+
+
+class FakeServer:
+    """Serves the current card with an ETag and honours If-None-Match."""
+
+    def __init__(self):
+        self.card = _card()
+        self.version = 1
+        self.down = False
+        self.requests = []
+
+    def session(self, url):
+        return self
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(dict(headers or {}))
+        if self.down:
+            raise ConnectionError("connection refused")
+        etag = f'"v{self.version}"'
+        if (headers or {}).get("If-None-Match") == etag:
+            return FakeResponse(304)
+        return FakeResponse(200, self.card, etag)
+
+    def publish(self, card):
+        self.card = card
+        self.version += 1
+
+
+def _registry(monkeypatch, ttl_seconds=300):
+    server = FakeServer()
+    monkeypatch.setattr(agent_card_registry, "a2a_client", server)
+    return AgentCardRegistry([SERVER], ttl_seconds=ttl_seconds), server
+
+
+@pytest.mark.asyncio
+async def test_unchanged_card_is_revalidated_with_304(monkeypatch):
+    registry, server = _registry(monkeypatch)
+    await registry.ensure_loaded()
+    cards = registry.cards
+    prompt = registry.prompt_section
+
+    assert await registry.refresh() is False
+
+    assert server.requests[-1]["If-None-Match"] == '"v1"'
+    assert registry.cards is cards and cards[0].name == "Pulse Agent"
+    assert registry.prompt_section == prompt
+    assert registry.get_metrics()["notModified"] == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_ttl_picks_up_changed_card(monkeypatch):
+    registry, server = _registry(monkeypatch, ttl_seconds=0.05)
+    await registry.start()
+    cards = registry.cards
+    try:
+        server.publish(_card("Updated description"))
+        await asyncio.sleep(0.15)
+    finally:
+        await registry.stop()
+
+    # Updated in place: the A2A tools hold a reference to the list
+    assert cards is registry.cards
+    assert cards[0].description == "Updated description"
+    assert "Updated description" in registry.prompt_section
+
+
+@pytest.mark.asyncio
+async def test_fetch_error_keeps_last_good_card(monkeypatch):
+    registry, server = _registry(monkeypatch)
+    await registry.ensure_loaded()
+    prompt = registry.prompt_section
+
+    server.down = True
+    assert await registry.refresh() is False
+
+    assert [card.name for card in registry.cards] == ["Pulse Agent"]
+    assert registry.prompt_section == prompt
+    assert registry.get_metrics()["failures"] == 1
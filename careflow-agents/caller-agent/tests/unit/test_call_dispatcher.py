@@ -0,0 +1,84 @@
+import asyncio
+import contextlib
+import time
+
+import pytest
+
+from app.app_utils.call_dispatcher import CallDispatcher
+from app.tools.twilio_tool import CALL_DUPLICATE, CALL_FAILED, CALL_STARTED, CallStart
+
+
+def _patient(patient_id, phone="+15550000000"):
+    return {"patientId": patient_id, "patientName": f"Patient {patient_id}", "patientPhone": phone, "brief": "Check meds"}
+
+
+def _starter(outcomes=None):
+    started = []
+
+    async def start_call(message, patient_name, patient_id, patient_phone=None):
+        started.append((patient_id, time.monotonic()))
+        status = (outcomes or {}).get(patient_id, CALL_STARTED)
+        if status == CALL_FAILED:
+            return CallStart(CALL_FAILED, detail="Twilio 500")
+        if status == CALL_DUPLICATE:
+            return CallStart(CALL_DUPLICATE, call_sid="CA-old", elapsed_seconds=30)
+        return CallStart(CALL_STARTED, call_sid=f"CA-{patient_id}")
+
+    return started, start_call
+
+
+async def _collect(dispatcher, request):
+    return [a.to_dict() async for a in dispatcher.dispatch(request)]
+
+
+@pytest.mark.asyncio
+async def test_batch_reports_each_patient():
+    started, start_call = _starter({"P2": CALL_FAILED, "P3": CALL_DUPLICATE})
+    dispatcher = CallDispatcher(calls_per_second=0, start_call=start_call)
+
+    results = await _collect(dispatcher, {
+        "skill": "dispatch_calls",
+        "scheduleSlot": "2026-01-23_08",
+        "patients": [_patient("P1"), _patient("P2"), _patient("P3"), _patient("bad", phone="555"), _patient("P1")],
+    })
+
+    by_status = {}
+    for r in results:
+        by_status.setdefault(r["status"], []).append(r["patientId"])
+    assert by_status == {"rejected": ["bad", "P1"], "accepted": ["P1"], "failed": ["P2"], "duplicate": ["P3"]}
+    assert sorted(p for p, _ in started) == ["P1", "P2", "P3"]
+    assert dispatcher.get_metrics()["accepted"] == 1
+
+
+@pytest.mark.asyncio
+async def test_calls_are_paced_by_cps_limit():
+    started, start_call = _starter()
+    dispatcher = CallDispatcher(calls_per_second=20, start_call=start_call)
+
+    await _collect(dispatcher, {"skill": "dispatch_calls", "patients": [_patient(f"P{i}") for i in range(5)]})
+
+    times = sorted(t for _, t in started)
+    assert times[-1] - times[0] >= 4 * 0.05 * 0.9
+
+
+@pytest.mark.asyncio
+async def test_oversized_batch_is_refused():
+    _, start_call = _starter()
+    dispatcher = CallDispatcher(max_batch=2, start_call=start_call)
+
+    with pytest.raises(ValueError):
+        await _collect(dispatcher, {"skill": "dispatch_calls", "patients": [_patient(f"P{i}") for i in range(3)]})
+
+
+@pytest.mark.asyncio
+async def test_closing_the_batch_stops_pending_starts():
+    started, start_call = _starter()
+    dispatcher = CallDispatcher(calls_per_second=20, start_call=start_call)
+    request = {"skill": "dispatch_calls", "patients": [_patient(f"P{i}") for i in range(5)]}
+
+    async with contextlib.aclosing(dispatcher.dispatch(request)) as acceptances:
+        async for _ in acceptances:
+            break
+
+    await asyncio.sleep(0.3)
+    assert len(started) == 1
@@ -0,0 +1,101 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.app_utils.greeting_cache import GreetingCache
+
+GREETING = "Hello, this is Sarah from CareFlow. Am I speaking with Maria?"
+
+
+class FakeModel:
+    """Chat model that answers once `release` is set."""
+
+    def __init__(self, text=GREETING, ready=True):
+        self.text = text
+        self.release = asyncio.Event()
+        if ready:
+            self.release.set()
+        self.calls = 0
+        self.cancelled = False
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return SimpleNamespace(content=self.text)
+
+
+def _cache(model, **kwargs):
+    cache = GreetingCache(enabled=True, **kwargs)
+    cache.configure(model, "You are a nurse assistant.")
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_prefetched_greeting_is_claimed_by_call_sid():
+    model = FakeModel()
+    cache = _cache(model)
+
+    cache.prefetch("P1", "Maria", "Check medication")
+    cache.alias("P1", "CA1")
+
+    assert await cache.take(call_sid="CA1") == GREETING
+    # Claimed once: a reconnect generates live
+    assert await cache.take(call_sid="CA1") is None
+    assert await cache.take(patient_id="P1") is None
+    metrics = cache.get_metrics()
+    assert (metrics["prefetched"], metrics["hits"], metrics["misses"], metrics["pending"]) == (1, 1, 2, 0)
+    assert model.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_take_falls_back_to_patient_id():
+    cache = _cache(FakeModel())
+    cache.prefetch("P1", "Maria")
+
+    assert await cache.take(call_sid="CA-unknown", patient_id="P1") == GREETING
+
+
+@pytest.mark.asyncio
+async def test_take_after_timeout_generates_live():
+    model = FakeModel(ready=False)
+    cache = _cache(model, wait_seconds=0.05)
+    cache.prefetch("P1", "Maria")
+    cache.alias("P1", "CA1")
+
+    assert await cache.take(call_sid="CA1") is None
+    await asyncio.sleep(0)
+
+    assert model.cancelled
+    metrics = cache.get_metrics()
+    assert metrics["timeouts"] == 1 and metrics["misses"] == 1 and metrics["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_discard_cancels_generation_and_alias():
+    model = FakeModel(ready=False)
+    cache = _cache(model)
+    cache.prefetch("P1", "Maria")
+    cache.alias("P1", "CA1")
+    await asyncio.sleep(0)
+
+    cache.discard("P1")
+    await asyncio.sleep(0)
+
+    assert model.cancelled
+    assert await cache.take(call_sid="CA1") is None
+    assert cache.get_metrics()["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_expired_greeting_is_a_miss():
+    cache = _cache(FakeModel(), ttl_seconds=0)
+    cache.prefetch("P1", "Maria")
+    await asyncio.sleep(0.01)
+
+    assert await cache.take(patient_id="P1") is None
+    assert cache.get_metrics()["pending"] == 0
@@ -0,0 +1,113 @@
+import asyncio
+import gc
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.security import model_armor
+
+
+class FakeArmorAPI:
+    """Blocking gRPC stand-in that records how many calls overlap."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def _call(self, request, timeout):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return SimpleNamespace(
+            sanitization_result=SimpleNamespace(
+                invocation_result=FAKE_V1.InvocationResult.SUCCESS,
+                filter_match_state=0,
+            ),
+            model_response_data=None,
+        )
+
+    sanitize_user_prompt = _call
+    sanitize_model_response = _call
+
+
+FAKE_V1 = SimpleNamespace(
+    InvocationResult=SimpleNamespace(SUCCESS=SimpleNamespace(name="SUCCESS")),
+    FilterMatchState=SimpleNamespace(MATCH_FOUND=2),
+    DataItem=lambda text: text,
+    SanitizeUserPromptRequest=lambda **kwargs: kwargs,
+    SanitizeModelResponseRequest=lambda **kwargs: kwargs,
+    ModelArmorClient=lambda client_options=None: None,
+)
+
+
+def _client(monkeypatch, api):
+    monkeypatch.setattr(model_armor, "modelarmor_v1", FAKE_V1)
+    client = model_armor.ModelArmorClient(template_path="projects/p/locations/us/templates/t")
+    client.client = api
+    return client
+
+
+@pytest.mark.asyncio
+async def test_calls_are_bounded_per_client(monkeypatch):
+    api = FakeArmorAPI()
+    client = _client(monkeypatch, api)
+    client.max_concurrency = 2
+
+    results = await asyncio.gather(*(client._invoke(api.sanitize_user_prompt, {"n": i}) for i in range(6)))
+
+    assert len(results) == 6
+    assert api.max_active == 2
+    assert client.stats["max_in_flight"] == 2
+    assert client.stats["in_flight"] == 0
+
+
+def test_semaphore_is_per_loop_and_released_with_it(monkeypatch):
+    client = _client(monkeypatch, FakeArmorAPI())
+
+    async def semaphore():
+        return client._get_semaphore()
+
+    first = asyncio.run(semaphore())
+    second = asyncio.run(semaphore())
+    gc.collect()
+    assert first is not second
+    assert len(client._semaphores) == 0
+
+
+@pytest.mark.asyncio
+async def test_deadline_raises_timeout(monkeypatch):
+    api = FakeArmorAPI(delay=0.3)
+    client = _client(monkeypatch, api)
+    client.timeout = 0.05
+
+    with pytest.raises(asyncio.TimeoutError):
+        await client._invoke(api.sanitize_user_prompt, {})
+    assert client.stats["timeouts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_deadline_fails_closed(monkeypatch):
+    client = _client(monkeypatch, FakeArmorAPI(delay=0.3))
+    client.timeout = 0.05
+
+    prompt = await client.scan_prompt("deadline prompt")
+    response = await client.sanitize_response("deadline response")
+
+    assert prompt["is_blocked"] is True
+    assert response["is_blocked"] is True
+    assert response["sanitized_text"] == "[REDACTED]"
+
+
+@pytest.mark.asyncio
+async def test_missing_client_fails_closed(monkeypatch):
+    client = _client(monkeypatch, None)
+
+    assert (await client.scan_prompt("no client"))["is_blocked"] is True
+    assert (await client.sanitize_response("no client"))["sanitized_text"] == "[REDACTED]"
@@ -0,0 +1,181 @@
+import asyncio
+
+import pytest
+
+from app.app_utils import recording_ingestion
+from app.app_utils.recording_ingestion import RecordingIngestionPipeline, RecordingJob
+
+
+class FakeResponse:
+    def __init__(self, status=200, json=None, body=b""):
+        self.status = status
+        self._json = json or {}
+        self._body = body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise RuntimeError(f"HTTP {self.status}")
+
+    async def json(self):
+        return self._json
+
+    async def read(self):
+        return self._body
+
+
+class FakeSession:
+    """Twilio stand-in: answers each URL from a list of responses (last one repeats)."""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.requests = []
+
+    def get(self, url, auth=None, timeout=None):
+        self.requests.append(url)
+        for suffix, responses in self.routes.items():
+            if url.endswith(suffix):
+                return responses.pop(0) if len(responses) > 1 else responses[0]
+        raise AssertionError(f"unexpected GET {url}")
+
+    async def close(self):
+        pass
+
+
+def _job(call_sid="CA1"):
+    return RecordingJob(call_sid=call_sid, patient_id="P1", patient_name="Maria")
+
+
+def _pipeline(monkeypatch, session, **kwargs):
+    monkeypatch.setenv("TWILIO_ACCOUNT_SID", "AC1")
+    monkeypatch.setenv("TWILIO_AUTH_TOKEN", "token")
+    monkeypatch.setattr(recording_ingestion, "_backoff_delay", lambda attempt: 0)
+    pipeline = RecordingIngestionPipeline(**kwargs)
+    pipeline._session = session
+    forwarded = []
+
+    async def forward(payload):
+        forwarded.append(payload)
+
+    pipeline._forward_to_pulse = forward
+    return pipeline, forwarded
+
+
+@pytest.mark.asyncio
+async def test_full_queue_spills_to_overflow_instead_of_dropping():
+    pipeline = RecordingIngestionPipeline(workers=1, max_queue_size=2)
+    processed = []
+
+    async def process(job):
+        processed.append(job.call_sid)
+
+    pipeline._process = process
+    await pipeline.start()
+    # No await in between: the worker has not taken a job yet
+    for i in range(5):
+        assert pipeline.submit(_job(f"CA{i}"))
+    metrics = pipeline.get_metrics()
+    assert metrics["queueDepth"] == 2
+    assert metrics["overflowDepth"] == 3
+    assert metrics["overflowTotal"] == 3
+
+    await pipeline.stop(drain_seconds=2)
+
+    # Every job is processed, in arrival order
+    assert processed == [f"CA{i}" for i in range(5)]
+    metrics = pipeline.get_metrics()
+    assert metrics["enqueuedTotal"] == metrics["completedTotal"] == 5
+    assert metrics["rejectedTotal"] == 0
+    assert metrics["overflowDepth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_recording_attached_after_polling_until_completed(monkeypatch):
+    session = FakeSession({
+        "Recordings.json": [
+            FakeResponse(json={"recordings": [{"sid": "RE1", "status": "processing"}]}),
+            FakeResponse(json={"recordings": [{"sid": "RE1", "status": "completed"}]}),
+        ],
+        "RE1.wav": [FakeResponse(status=404), FakeResponse(body=b"RIFF")],
+    })
+    pipeline, forwarded = _pipeline(monkeypatch, session)
+
+    await pipeline._process(_job())
+
+    parts = forwarded[0]["params"]["message"]["parts"]
+    assert parts[1]["kind"] == "file"
+    assert forwarded[0]["params"]["message"]["metadata"]["audio_attached"] is True
+    assert len(session.requests) == 4
+
+
+@pytest.mark.asyncio
+async def test_exhausted_polling_forwards_without_audio(monkeypatch):
+    session = FakeSession({"Recordings.json": [FakeResponse(json={"recordings": []})]})
+    pipeline, forwarded = _pipeline(monkeypatch, session, poll_attempts=3)
+
+    await pipeline._process(_job())
+
+    assert len(session.requests) == 3
+    message = forwarded[0]["params"]["message"]
+    assert message["metadata"]["audio_attached"] is False
+    assert "AUDIO_UNAVAILABLE" in message["parts"][-1]["text"]
+
+
+@pytest.mark.asyncio
+async def test_exhausted_download_retries_forward_without_audio(monkeypatch):
+    session = FakeSession({
+        "Recordings.json": [FakeResponse(json={"recordings": [{"sid": "RE1", "status": "completed"}]})],
+        "RE1.wav": [FakeResponse(status=404)],
+    })
+    pipeline, forwarded = _pipeline(monkeypatch, session)
+
+    await pipeline._process(_job())
+
+    downloads = [url for url in session.requests if url.endswith(".wav")]
+    assert len(downloads) == recording_ingestion.DOWNLOAD_ATTEMPTS
+    message = forwarded[0]["params"]["message"]
+    assert message["metadata"]["audio_attached"] is False
+    assert "Failed to download" in message["parts"][-1]["text"]
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_queued_jobs():
+    pipeline = RecordingIngestionPipeline(workers=2, max_queue_size=10)
+    processed = []
+
+    async def process(job):
+        await asyncio.sleep(0.02)
+        processed.append(job.call_sid)
+
+    pipeline._process = process
+    await pipeline.start()
+    for i in range(5):
+        assert pipeline.submit(_job(f"CA{i}"))
+
+    stopping = asyncio.create_task(pipeline.stop(drain_seconds=2))
+    await asyncio.sleep(0)
+    assert not pipeline.submit(_job("CA-late"))
+    await stopping
+
+    assert sorted(processed) == [f"CA{i}" for i in range(5)]
+    assert pipeline.get_metrics()["completedTotal"] == 5
+    assert not pipeline.is_running
+
+
+@pytest.mark.asyncio
+async def test_stop_gives_up_after_drain_timeout():
+    pipeline = RecordingIngestionPipeline(workers=1, max_queue_size=10)
+    pipeline._process = lambda job: asyncio.sleep(30)
+    await pipeline.start()
+    pipeline.submit(_job("CA1"))
+    pipeline.submit(_job("CA2"))
+
+    await asyncio.wait_for(pipeline.stop(drain_seconds=0.05), 1)
+
+    assert not pipeline.is_running
+    assert pipeline.get_metrics()["completedTotal"] == 0
@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+
+from app.core.security import streaming_sanitizer
+from app.core.security.streaming_sanitizer import (
+    REDACTION,
+    SAFE_FALLBACK,
+    StreamingSanitizer,
+    redact_phi,
+)
+
+
+class FakeModelArmor:
+    def __init__(self, verdict=None, delay=0.0):
+        self.verdict = verdict or {"is_blocked": False, "redactions_applied": []}
+        self.delay = delay
+        self.texts = []
+
+    async def sanitize_response(self, text):
+        self.texts.append(text)
+        await asyncio.sleep(self.delay)
+        return dict(self.verdict)
+
+
+async def _chunks(text, size=4, gap=0.0):
+    for i in range(0, len(text), size):
+        await asyncio.sleep(gap)
+        yield text[i:i + size]
+
+
+async def _collect(sanitizer, stream):
+    return [span async for span in sanitizer.sanitize(stream)]
+
+
+def test_redact_phi_leaves_clinical_values():
+    text = "Take 40 mg twice daily, BP was 120/80 and weight 2.5 kg."
+    assert redact_phi(text) == (text, [])
+
+
+def test_redact_phi_patterns():
+    redacted, matched = redact_phi("Call 555-987-6543 or MRN: 7712093, born 03/14/1956.")
+    assert "555-987-6543" not in redacted
+    assert "7712093" not in redacted
+    assert "03/14/1956" not in redacted
+    assert set(matched) == {"PHONE", "MRN", "DOB"}
+
+
+@pytest.mark.asyncio
+async def test_identifier_split_across_chunks_is_redacted():
+    client = FakeModelArmor()
+    sanitizer = StreamingSanitizer(client)
+    spans = await _collect(sanitizer, _chunks("Your SSN is 123-45-6789. Goodbye.", size=3))
+    spoken = "".join(spans)
+    assert "123-45-6789" not in spoken
+    assert REDACTION in spoken
+    assert spoken.endswith("Goodbye.")
+
+
+@pytest.mark.asyncio
+async def test_releases_per_clause_and_batches_model_armor():
+    client = FakeModelArmor()
+    sanitizer = StreamingSanitizer(client, batch_spans=2)
+    spans = await _collect(sanitizer, _chunks("One. Two. Three. Four. Five."))
+    summary = await sanitizer.finalize()
+
+    assert len(spans) == 5
+    assert "".join(spans) == "One. Two. Three. Four. Five."
+    assert summary["ma_batches"] == 3
+    assert "".join(client.texts) == "One. Two. Three. Four. Five."
+
+
+@pytest.mark.asyncio
+async def test_blocked_verdict_stops_turn():
+    client = FakeModelArmor({"is_blocked": True})
+    sanitizer = StreamingSanitizer(client, batch_spans=1)
+    text = " ".join(f"Sentence {i}." for i in range(20))
+    spans = await _collect(sanitizer, _chunks(text, gap=0.005))
+
+    assert spans[-1] == SAFE_FALLBACK
+    assert len(spans) < 20
+    assert sanitizer.blocked
+
+
+@pytest.mark.asyncio
+async def test_model_armor_errors_do_not_stop_turn():
+    client = FakeModelArmor({"is_blocked": True, "error": "Model Armor deadline exceeded"})
+    sanitizer = StreamingSanitizer(client, batch_spans=1)
+    text = " ".join(f"Sentence {i}." for i in range(20))
+    spans = await _collect(sanitizer, _chunks(text, gap=0.005))
+    summary = await sanitizer.finalize()
+
+    assert "".join(spans) == text
+    assert not summary["blocked"]
+    assert summary["ma_errors"] == summary["ma_batches"] == 20
+    assert streaming_sanitizer.get_metrics()["errors"] >= 20
+
+
+@pytest.mark.asyncio
+async def test_model_armor_is_off_the_release_path():
+    client = FakeModelArmor(delay=0.5)
+    sanitizer = StreamingSanitizer(client, batch_spans=1)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await _collect(sanitizer, _chunks("Hello there. How are you today?"))
+    assert loop.time() - start < 0.25
+
+    summary = await sanitizer.finalize()
+    assert summary["pending_batches"] == 0
@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+
+from app.app_utils.tts_shaper import MarkerFilter, TTSShaper
+
+
+async def _chunks(parts, delay=0.0):
+    for part in parts:
+        if delay:
+            await asyncio.sleep(delay)
+        yield part
+
+
+# --- MarkerFilter ---
+
+def test_marker_filter_strips_marker_split_across_chunks():
+    f = MarkerFilter()
+    assert f.feed("Goodbye now. [HAN") == "Goodbye now. "
+    assert f.feed("GUP]") == ""
+    assert f.triggered
+
+
+def test_marker_filter_releases_non_marker_brackets():
+    f = MarkerFilter()
+    assert f.feed("Take [1") == "Take [1"
+    assert f.feed("tablet [") == "tablet "
+    assert f.feed("daily]") == "[daily]"
+    assert not f.triggered
+
+
+def test_marker_filter_double_bracket_marker():
+    f = MarkerFilter()
+    out = f.feed("Bye! [[END") + f.feed("_CALL_") + f.feed("SIGNAL]]")
+    assert out == "Bye! "
+    assert f.triggered
+
+
+# --- TTSShaper (sync core) ---
+
+def test_shaper_coalesces_to_sentences():
+    shaper = TTSShaper()
+    segments = []
+    for chunk in ["Hello", " Maria", ". How", " are you", " feeling today?", " Good"]:
+        segments += shaper.feed(chunk)
+    assert [s.text for s in segments] == ["Hello Maria.", " How are you feeling today?"]
+    final = shaper.flush(last=True)
+    assert final.text == " Good"
+    assert final.last
+
+
+def test_shaper_does_not_split_decimals():
+    shaper = TTSShaper()
+    assert shaper.feed("Your weight was 72.") == []
+    assert shaper.feed("5 kilograms. Thanks")[0].text == "Your weight was 72.5 kilograms."
+
+
+def test_shaper_clause_boundary_needs_min_length():
+    shaper = TTSShaper(min_clause_chars=20)
+    assert shaper.feed("Yes, ") == []
+    segments = shaper.feed("I took the medication this morning, ")
+    assert segments[0].text == "Yes, I took the medication this morning,"
+
+
+def test_shaper_hard_cap_without_punctuation():
+    shaper = TTSShaper(max_segment_chars=20)
+    segments = shaper.feed("one two three four five six seven")
+    assert segments
+    assert all(len(s.text) <= 20 for s in segments)
+
+
+def test_shaper_holds_closing_sentence_until_next_chunk():
+    shaper = TTSShaper()
+    assert shaper.feed("Thanks, Maria. ") == []
+    segments = shaper.feed("How are you? ")
+    assert [s.text for s in segments] == ["Thanks, Maria."]
+    assert shaper.flush().text == " How are you? "
+
+
+def test_shaper_farewell_before_hangup_not_interruptible():
+    shaper = TTSShaper()
+    # Real chunk order: the farewell is complete before the marker arrives
+    assert shaper.feed("Goodbye, take care! ") == []
+    assert shaper.feed("[HANGUP]") == []
+    segment = shaper.flush(last=True)
+    assert shaper.hangup_requested
+    assert segment.text == "Goodbye, take care! "
+    assert segment.interruptible is False
+    assert segment.to_message()["interruptible"] is False
+
+
+# --- TTSShaper.shape (async stage) ---
+
+@pytest.mark.asyncio
+async def test_shape_reduces_frame_count():
+    words = "Hi John. This is your care team. Did you take your pills?".split()
+    parts = [words[0]] + [" " + w for w in words[1:]]
+    shaper = TTSShaper()
+    segments = [s async for s in shaper.shape(_chunks(parts))]
+    assert len(segments) < len(parts)
+    assert "".join(s.text for s in segments) == "".join(parts)
+    assert segments[-1].last
+
+
+@pytest.mark.asyncio
+async def test_shape_flushes_on_latency_budget():
+    shaper = TTSShaper(max_latency_ms=50)
+    segments = []
+    async for segment in shaper.shape(_chunks(["slow ", "text ", "stream "], delay=0.08)):
+        segments.append(segment)
+    # Each word waits longer than the budget, so none are held until the end
+    assert len(segments) >= 2
+
+
+@pytest.mark.asyncio
+async def test_shape_farewell_before_hangup_not_interruptible():
+    shaper = TTSShaper()
+    parts = ["Goodbye", ", take care", "! ", "[HAN", "GUP]"]
+    segments = [s async for s in shaper.shape(_chunks(parts))]
+    assert [s.text for s in segments] == ["Goodbye, take care! "]
+    assert segments[0].interruptible is False
+    assert segments[0].last
@@ -0,0 +1,93 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.security.verdict_cache import VerdictCache
+
+
+def _counter(verdict):
+    calls = {"n": 0}
+
+    async def compute():
+        calls["n"] += 1
+        await asyncio.sleep(0.01)
+        return dict(verdict)
+
+    return calls, compute
+
+
+@pytest.mark.asyncio
+async def test_hit_after_first_scan():
+    cache = VerdictCache(max_size=10, ttl_seconds=60)
+    calls, compute = _counter({"is_blocked": False})
+    key = cache.key("tpl", "prompt", "hello")
+
+    assert await cache.get_or_compute(key, compute) == {"is_blocked": False}
+    assert await cache.get_or_compute(key, compute) == {"is_blocked": False}
+    assert calls["n"] == 1
+    assert cache.stats["hits"] == 1
+    assert cache.stats["misses"] == 1
+
+
+def test_key_separates_template_and_direction():
+    cache = VerdictCache()
+    assert cache.key("a", "prompt", "x") != cache.key("b", "prompt", "x")
+    assert cache.key("a", "prompt", "x") != cache.key("a", "response", "x")
+    assert "x" not in cache.key("a", "prompt", "x")[2]
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached():
+    cache = VerdictCache()
+    calls, compute = _counter({"is_blocked": True, "error": "timeout"})
+    key = cache.key("tpl", "prompt", "hello")
+
+    await cache.get_or_compute(key, compute)
+    await cache.get_or_compute(key, compute)
+    assert calls["n"] == 2
+
+
+@pytest.mark.asyncio
+async def test_expired_entry_is_not_served():
+    cache = VerdictCache(ttl_seconds=0.05)
+    calls, compute = _counter({"is_blocked": False})
+    key = cache.key("tpl", "prompt", "hello")
+
+    await cache.get_or_compute(key, compute)
+    time.sleep(0.06)
+    await cache.get_or_compute(key, compute)
+    assert calls["n"] == 2
+    assert cache.stats["expired"] == 1
+
+
+def test_lru_eviction():
+    cache = VerdictCache(max_size=2, ttl_seconds=60)
+    for text in ("a", "b", "c"):
+        cache.put(cache.key("tpl", "prompt", text), {"is_blocked": False})
+    assert cache.get(cache.key("tpl", "prompt", "a")) is None
+    assert cache.get(cache.key("tpl", "prompt", "c")) is not None
+    assert cache.stats["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_scans_share_one_call():
+    cache = VerdictCache()
+    calls, compute = _counter({"is_blocked": False})
+    key = cache.key("tpl", "prompt", "hello")
+
+    results = await asyncio.gather(*[cache.get_or_compute(key, compute) for _ in range(5)])
+    assert calls["n"] == 1
+    assert all(r == {"is_blocked": False} for r in results)
+    assert cache.stats["coalesced"] == 4
+
+
+@pytest.mark.asyncio
+async def test_returned_verdicts_are_copies():
+    cache = VerdictCache()
+    _, compute = _counter({"is_blocked": False})
+    key = cache.key("tpl", "prompt", "hello")
+
+    first = await cache.get_or_compute(key, compute)
+    first["is_blocked"] = True
+    assert (await cache.get_or_compute(key, compute))["is_blocked"] is False
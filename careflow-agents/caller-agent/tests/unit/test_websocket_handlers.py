@@ -0,0 +1,94 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.app_utils.call_sessions import CallSession
+from app.app_utils.conversation_relay import SessionData
+from app.app_utils.websocket_handlers import MessageHandler
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.client_state = SimpleNamespace(name="CONNECTED")
+        self.sent = []
+
+    async def send_text(self, text):
+        self.sent.append(json.loads(text))
+
+    async def send_json(self, data):
+        self.sent.append(data)
+
+    async def close(self, code=1000):
+        self.client_state.name = "DISCONNECTED"
+
+
+class SlowAgent:
+    """Streams one sentence, then stalls like a slow LLM or tool call."""
+
+    def __init__(self):
+        self.first_sent = asyncio.Event()
+        self.closed = False
+
+    async def stream_message(self, text, session_data):
+        try:
+            yield "Hello, this is CareFlow calling. "
+            self.first_sent.set()
+            await asyncio.sleep(30)
+            yield "This part is never spoken."
+        finally:
+            self.closed = True
+
+
+async def _first_frame(websocket):
+    while not any(m.get("token") for m in websocket.sent):
+        await asyncio.sleep(0.01)
+
+
+def _handler(agent):
+    websocket = FakeWebSocket()
+    session_data = SessionData(connected_at="", call_sid="CA1", conversation=[])
+    session = CallSession(session_id="CA1", websocket=websocket, session_data=session_data)
+    return MessageHandler(agent, session), websocket, session_data
+
+
+@pytest.mark.asyncio
+async def test_interrupt_cancels_in_flight_generation():
+    agent = SlowAgent()
+    handler, websocket, session_data = _handler(agent)
+
+    await handler.start_prompt({"type": "prompt", "voicePrompt": "Hi", "last": True})
+    await asyncio.wait_for(agent.first_sent.wait(), 1)
+    # The closing sentence is held for a possible hangup marker, then flushed
+    await asyncio.wait_for(_first_frame(websocket), 1)
+    task = handler._generation
+
+    await asyncio.wait_for(
+        handler.handle_interrupt({"type": "interrupt", "utteranceUntilInterrupt": "Hello, this is"}), 1
+    )
+
+    assert task.cancelled()
+    assert agent.closed
+    assert handler._generation is None
+    assert all("never" not in m.get("token", "") for m in websocket.sent)
+    spoken = [m for m in session_data.conversation if m.role == "assistant"]
+    assert spoken and spoken[-1].interrupted
+
+
+@pytest.mark.asyncio
+async def test_interrupt_cancels_greeting_turn():
+    handler, _, _ = _handler(SlowAgent())
+    greeting_started = asyncio.Event()
+
+    async def greeting():
+        greeting_started.set()
+        await asyncio.sleep(30)
+
+    await handler.start_generation(greeting())
+    await asyncio.wait_for(greeting_started.wait(), 1)
+    task = handler._generation
+
+    await asyncio.wait_for(handler.handle_interrupt({"type": "interrupt"}), 1)
+
+    assert task.cancelled()
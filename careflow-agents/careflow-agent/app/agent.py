@@ -36,9 +36,6 @@ from app.tools.schedule_tools import schedule_tools
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Initialize MCP tools immediately
-mcp__tool_loader.init_mcp_tools()
-
 AGENT_DESCRIPTION = "An AI agent that monitors post-hospitalization patients, analyzes symptoms, and generates alerts for healthcare coordinators."
 
 class CareFlowAgent(BaseAgent):
@@ -59,10 +56,12 @@ class CareFlowAgent(BaseAgent):
                 thinking_config=genai_types.ThinkingConfig(include_thoughts=True)
             ),
             instruction=CAREFLOW_SYSTEM_PROMPT,
-            # PASSING ALL TOOLS: A2A + MCP (Database) + Retry + Interaction Logger + Clinical Tools + Schedule Tools
-            tools=a2a_tools + mcp__tool_loader.all_tools + retry_tools + interaction_tools + clinical_tools + schedule_tools,
+            # PASSING ALL TOOLS: A2A + Retry + Interaction Logger + Clinical Tools + Schedule Tools
+            # (MCP database tools are appended once the toolbox has loaded)
+            tools=a2a_tools + retry_tools + interaction_tools + clinical_tools + schedule_tools,
             output_key="patient_monitoring"
         )
+        mcp__tool_loader.attach(assistant_agent)
         
         super().__init__(
             name=AGENT_NAME,
@@ -74,6 +73,8 @@ class CareFlowAgent(BaseAgent):
         """
         Core execution logic. Delegates to the internal LlmAgent.
         """
+        # Lazy MCP load: waits (bounded) for the toolset on the first runs only
+        await mcp__tool_loader.ensure_mcp_tools()
         async for event in self.assistant.run_async(ctx):
             yield event
 
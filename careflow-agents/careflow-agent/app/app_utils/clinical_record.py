@@ -0,0 +1,377 @@
+"""
+CareFlow Pulse - Clinical Assessment Record
+
+Commits a post-call assessment in one Firestore transaction:
+
+- patient risk fields (riskLevel, aiBrief, lastAssessedAt, lastCallSid)
+- the patient's active alert, upserted in place
+- the interaction log entry (patients/{id}/interactions)
+- the slot index entry, marked completed (when a schedule slot is given)
+
+The previous path awaited a patient read, a patient update, an alert query,
+an alert add/update and a separate interaction add: five sequential round
+trips, any of which could fail after the others had landed. Here the active
+alert lives at a deterministic document ID, `alerts/active_{patientId}`, so
+it is read alongside the patient instead of queried, and every write is
+committed together (begin + one batched read + commit).
+
+Each observation is appended to `alerts/{id}/updates`; the alert document
+itself only carries the latest brief, the last few triggers and updates and
+a rolling summary, so it stays constant-size however long the alert runs
+(it used to append every brief to `aiBrief` until the 1 MiB document limit).
+Readers page the full history from the subcollection.
+
+Alerts a nurse has moved out of "active" (in_progress / resolved) are copied
+to an auto-ID document before a new active alert is written, so the
+dashboard history is unchanged; the copy's updates are the ones between its
+`createdAt` and `archivedAt`. Active alerts created under a random ID by the
+previous path are folded into the deterministic document once and marked
+resolved.
+
+Author: CareFlow Pulse Team
+Version: 1.0.0
+"""
+
+import os
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from google.cloud.firestore import AsyncClient, FieldFilter, async_transactional
+
+logger = logging.getLogger(__name__)
+
+ALERTS_COLLECTION = "alerts"
+ACTIVE_ALERT_PREFIX = "active_"
+
+# Risk level -> alert priority. Levels outside this map update the patient
+# without touching alerts.
+PRIORITY_MAP = {
+    "RED": "critical",
+    "CRITICAL": "critical",
+    "YELLOW": "warning",
+    "WARNING": "warning",
+    "GREEN": "safe",
+    "SAFE": "safe",
+}
+
+UPDATES_SUBCOLLECTION = "updates"
+
+# Updates (and distinct triggers) kept inline on the alert document
+ALERT_RECENT_UPDATES = int(os.environ.get("ALERT_RECENT_UPDATES", "3"))
+
+# Brief length kept per inline update; the full text is in the subcollection
+RECENT_BRIEF_CHARS = 500
+
+TRIGGER_SEPARATOR = " | "
+
+_PRIORITY_RANK = {"safe": 0, "warning": 1, "critical": 2}
+
+
+def active_alert_id(patient_id: str) -> str:
+    """Document ID of a patient's active alert (e.g. "active_p_h1_001")."""
+    return f"{ACTIVE_ALERT_PREFIX}{patient_id}"
+
+
+def updates_path(alert_id: str) -> str:
+    """Collection path holding an alert's update history."""
+    return f"{ALERTS_COLLECTION}/{alert_id}/{UPDATES_SUBCOLLECTION}"
+
+
+# =============================================================================
+# DATA
+# =============================================================================
+
+@dataclass
+class AssessmentResult:
+    """Outcome of a committed assessment."""
+    patient_id: str
+    patient_name: str
+    risk_level: str
+    alert_id: Optional[str] = None
+    alert_created: bool = False
+    interaction_id: Optional[str] = None
+
+
+def merge_alert(
+    existing: Optional[Dict[str, Any]],
+    alert: Dict[str, Any],
+    now: datetime,
+) -> Dict[str, Any]:
+    """
+    Fold a new observation into an existing active alert.
+
+    The alert document keeps:
+    - aiBrief/brief: the latest observation only
+    - triggers/trigger: the last ALERT_RECENT_UPDATES distinct triggers
+    - recentUpdates: the last ALERT_RECENT_UPDATES updates, newest first,
+      briefs truncated to RECENT_BRIEF_CHARS
+    - updateCount, peakPriority and a one-line rolling summary
+
+    Priority only escalates to critical, never down.
+    """
+    existing = existing or {}
+    merged = dict(alert)
+
+    previous = existing.get("triggers")
+    if previous is None:
+        previous = [t for t in (existing.get("trigger") or "").split(TRIGGER_SEPARATOR) if t]
+    triggers = [t for t in previous if t != alert["trigger"]] + [alert["trigger"]]
+    merged["triggers"] = triggers[-ALERT_RECENT_UPDATES:]
+    merged["trigger"] = TRIGGER_SEPARATOR.join(merged["triggers"])
+
+    if alert["priority"] == "critical" or existing.get("priority") == "critical":
+        merged["priority"] = "critical"
+
+    peak = existing.get("peakPriority") or existing.get("priority") or merged["priority"]
+    if _PRIORITY_RANK.get(merged["priority"], 0) > _PRIORITY_RANK.get(peak, 0):
+        peak = merged["priority"]
+    merged["peakPriority"] = peak
+
+    entry = {
+        "timestamp": now,
+        "priority": alert["priority"],
+        "trigger": alert["trigger"],
+        "aiBrief": alert["aiBrief"][:RECENT_BRIEF_CHARS],
+    }
+    merged["recentUpdates"] = ([entry] + list(existing.get("recentUpdates") or []))[:ALERT_RECENT_UPDATES]
+    merged["updateCount"] = int(existing.get("updateCount", 1 if existing else 0)) + 1
+
+    since = existing.get("createdAt", now)
+    since_str = since.strftime("%Y-%m-%d %H:%M") if hasattr(since, "strftime") else str(since)
+    merged["summary"] = (
+        f"{merged['updateCount']} update(s) since {since_str} UTC, "
+        f"peak {peak}, latest {now.strftime('%H:%M')} UTC: {alert['trigger']}"
+    )
+    return merged
+
+
+# =============================================================================
+# TRANSACTION
+# =============================================================================
+
+async def apply_assessment(
+    transaction,
+    db: AsyncClient,
+    patient_id: str,
+    risk_level: str,
+    ai_brief: str,
+    trigger: Optional[str] = None,
+    call_sid: Optional[str] = None,
+    interaction_summary: Optional[str] = None,
+    schedule_slot: Optional[str] = None,
+    interaction_type: str = "call_summary",
+    patient_fields: Optional[Dict[str, Any]] = None,
+    alert_fields: Optional[Dict[str, Any]] = None,
+    update_patient_brief: bool = True,
+) -> Optional[AssessmentResult]:
+    """
+    Read the patient and active alert, then stage every write on `transaction`.
+
+    All reads happen before the first write, as Firestore transactions
+    require. Nothing is written when the patient does not exist.
+    `patient_fields` / `alert_fields` are merged into the patient update and
+    the alert document respectively. With `update_patient_brief=False` the
+    brief goes to the alert and interaction only, and the patient keeps its
+    last clinical summary (used for operational alerts such as max retries).
+
+    Returns:
+        The staged result, or None if the patient was not found
+    """
+    now = datetime.now(timezone.utc)
+    risk = risk_level.upper()
+    priority = PRIORITY_MAP.get(risk)
+
+    patient_ref = db.collection("patients").document(patient_id)
+    alert_ref = db.collection(ALERTS_COLLECTION).document(active_alert_id(patient_id))
+
+    # ---- Reads: patient + deterministic alert in one batched get ----
+    snapshots = {}
+    async for snap in db.get_all([patient_ref, alert_ref], transaction=transaction):
+        snapshots[snap.id] = snap
+
+    patient_snap = snapshots.get(patient_id)
+    if patient_snap is None or not patient_snap.exists:
+        return None
+
+    patient_data = patient_snap.to_dict() or {}
+    patient_name = patient_data.get("name", "Unknown Patient")
+    hospital_id = patient_data.get("hospitalId", "UNKNOWN")
+
+    existing_alert = None
+    archive_alert = None
+    legacy_alert_ref = None
+    if priority:
+        alert_snap = snapshots.get(alert_ref.id)
+        if alert_snap is not None and alert_snap.exists:
+            alert_data = alert_snap.to_dict() or {}
+            if alert_data.get("status") == "active":
+                existing_alert = alert_data
+            else:
+                # Handled or being handled by a nurse: keep it as history
+                archive_alert = alert_data
+        else:
+            # Active alert written under a random ID before deterministic IDs
+            legacy = await db.collection(ALERTS_COLLECTION) \
+                .where(filter=FieldFilter("patientId", "==", patient_id)) \
+                .where(filter=FieldFilter("status", "==", "active")) \
+                .limit(1) \
+                .get(transaction=transaction)
+            if legacy:
+                legacy_alert_ref = legacy[0].reference
+                existing_alert = legacy[0].to_dict()
+
+    # ---- Writes ----
+    patient_update = {
+        "riskLevel": risk,
+        "lastAssessedAt": now,
+    }
+    if update_patient_brief:
+        patient_update["aiBrief"] = ai_brief
+    if call_sid:
+        patient_update["lastCallSid"] = call_sid
+    transaction.update(patient_ref, {**patient_update, **(patient_fields or {})})
+
+    result = AssessmentResult(patient_id=patient_id, patient_name=patient_name, risk_level=risk)
+
+    if priority:
+        alert = {
+            "hospitalId": hospital_id,
+            "patientId": patient_id,
+            "patientName": patient_name,
+            "priority": priority,
+            "status": "active",
+            "trigger": trigger or f"Risk status: {risk_level}. Observation: {ai_brief[:50]}...",
+            "aiBrief": ai_brief,
+            "brief": ai_brief,
+            "callSid": call_sid,
+            "updatedAt": now,
+            **(alert_fields or {}),
+        }
+        alert = merge_alert(existing_alert, alert, now)
+
+        if archive_alert is not None:
+            transaction.set(db.collection(ALERTS_COLLECTION).document(), {
+                **archive_alert,
+                "updatesPath": archive_alert.get("updatesPath", updates_path(alert_ref.id)),
+                "archivedAt": now,
+            })
+        if legacy_alert_ref is not None:
+            transaction.update(legacy_alert_ref, {
+                "status": "resolved",
+                "supersededBy": alert_ref.id,
+                "updatedAt": now,
+            })
+
+        alert["createdAt"] = (existing_alert or {}).get("createdAt", now)
+        alert["updatesPath"] = updates_path(alert_ref.id)
+        transaction.set(alert_ref, alert)
+
+        # Full observation goes to the append-only history
+        update = {
+            "timestamp": now,
+            "priority": priority,
+            "riskLevel": risk,
+            "trigger": alert["triggers"][-1],
+            "aiBrief": ai_brief,
+            "callSid": call_sid,
+        }
+        transaction.set(alert_ref.collection(UPDATES_SUBCOLLECTION).document(), update)
+
+        result.alert_id = alert_ref.id
+        result.alert_created = existing_alert is None
+
+    if interaction_summary:
+        interaction_ref = patient_ref.collection("interactions").document()
+        interaction = {
+            "timestamp": now,
+            "type": interaction_type,
+            "sender": "ai",
+            "content": interaction_summary,
+            "aiBrief": ai_brief,
+            "riskLevel": risk,
+        }
+        if call_sid:
+            interaction["callSid"] = call_sid
+        if schedule_slot:
+            interaction["scheduleSlot"] = schedule_slot
+        transaction.set(interaction_ref, interaction)
+        result.interaction_id = interaction_ref.id
+
+    if schedule_slot:
+        from app.app_utils.slot_index import (
+            SLOTS_COLLECTION, STATE_COMPLETED, patient_state_update, slot_doc_id,
+        )
+        details = {"callSid": call_sid} if call_sid else {}
+        transaction.set(
+            db.collection(SLOTS_COLLECTION).document(slot_doc_id(hospital_id, schedule_slot)),
+            patient_state_update(patient_id, schedule_slot, STATE_COMPLETED, hospital_id, **details),
+            merge=True,
+        )
+
+    return result
+
+
+async def record_assessment(
+    db: AsyncClient,
+    patient_id: str,
+    risk_level: str,
+    ai_brief: str,
+    trigger: Optional[str] = None,
+    call_sid: Optional[str] = None,
+    interaction_summary: Optional[str] = None,
+    schedule_slot: Optional[str] = None,
+    interaction_type: str = "call_summary",
+    patient_fields: Optional[Dict[str, Any]] = None,
+    alert_fields: Optional[Dict[str, Any]] = None,
+    update_patient_brief: bool = True,
+) -> Optional[AssessmentResult]:
+    """
+    Commit patient risk, alert upsert and interaction log atomically.
+
+    The transaction is retried by the client on contention (e.g. a nurse
+    updating the same alert); either every write lands or none does.
+
+    Returns:
+        The committed result, or None if the patient was not found
+    """
+
+    @async_transactional
+    async def _commit(transaction):
+        return await apply_assessment(
+            transaction, db, patient_id, risk_level, ai_brief,
+            trigger=trigger,
+            call_sid=call_sid,
+            interaction_summary=interaction_summary,
+            schedule_slot=schedule_slot,
+            interaction_type=interaction_type,
+            patient_fields=patient_fields,
+            alert_fields=alert_fields,
+            update_patient_brief=update_patient_brief,
+        )
+
+    result = await _commit(db.transaction())
+    if result is not None:
+        logger.info(
+            f"✅ Assessment committed for {patient_id}: risk={result.risk_level}, "
+            f"alert={result.alert_id}, interaction={result.interaction_id}"
+        )
+    return result
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    'ACTIVE_ALERT_PREFIX',
+    'ALERT_RECENT_UPDATES',
+    'AssessmentResult',
+    'PRIORITY_MAP',
+    'active_alert_id',
+    'apply_assessment',
+    'merge_alert',
+    'record_assessment',
+    'updates_path',
+]
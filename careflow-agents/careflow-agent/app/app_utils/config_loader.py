@@ -33,6 +33,35 @@ HOSPITAL_ID: str = get_env_var('HOSPITAL_ID', 'HOSP001')
 # External Services
 CAREFLOW_CALLER_URL: str = get_env_var('CAREFLOW_CALLER_URL', 'http://localhost:8000')
 MCP_TOOLBOX_URL: str = get_env_var('MCP_TOOLBOX_URL', 'http://127.0.0.1:5000')
+# Deadline for loading the MCP toolset (runs in the background at startup)
+MCP_TOOLBOX_LOAD_TIMEOUT_SECONDS: float = float(get_env_var('MCP_TOOLBOX_LOAD_TIMEOUT_SECONDS', '10'))
+
+# Patient Rounds
+# "direct": deterministic fan-out dispatcher; "agent": legacy LLM-driven rounds
+ROUNDS_DISPATCH_MODE: str = get_env_var('ROUNDS_DISPATCH_MODE', 'direct')
+ROUNDS_MAX_CONCURRENCY: int = int(get_env_var('ROUNDS_MAX_CONCURRENCY', '5'))
+ROUNDS_PATIENT_TIMEOUT_SECONDS: float = float(get_env_var('ROUNDS_PATIENT_TIMEOUT_SECONDS', '120'))
+
+# Caller Dispatch
+# "async": non-blocking message/send, completion pushed to PULSE_WEBHOOK_URL;
+# "stream": hold a message/stream SSE connection until the Caller answers;
+# "batch": structured briefs sent ROUNDS_BATCH_SIZE at a time to the Caller's
+# dispatch_calls skill (no Caller LLM turn per patient)
+CALLER_DISPATCH_MODE: str = get_env_var('CALLER_DISPATCH_MODE', 'async')
+ROUNDS_BATCH_SIZE: int = int(get_env_var('ROUNDS_BATCH_SIZE', '50'))
+PULSE_WEBHOOK_URL: str = get_env_var('PULSE_WEBHOOK_URL', f"{SERVICE_URL.rstrip('/')}/a2a/task-updates")
+# Optional shared secret the Caller echoes in X-A2A-Notification-Token
+A2A_PUSH_TOKEN: Optional[str] = get_env_var('A2A_PUSH_TOKEN')
+
+# A2A latency extension: send working updates with the expected remaining
+# latency (p50/p90/p99 are always advertised on the agent card)
+SUPPORTS_LATENCY_TASK_UPDATES: bool = get_env_var('SUPPORTS_LATENCY_TASK_UPDATES', 'false').lower() == 'true'
+
+# Session Compaction (long rounds sessions)
+SESSION_COMPACTION_ENABLED: bool = get_env_var('SESSION_COMPACTION_ENABLED', 'true').lower() == 'true'
+SESSION_COMPACTION_TRIGGER_TOKENS: int = int(get_env_var('SESSION_COMPACTION_TRIGGER_TOKENS', '12000'))
+SESSION_COMPACTION_KEEP_STEPS: int = int(get_env_var('SESSION_COMPACTION_KEEP_STEPS', '6'))
+SESSION_COMPACTION_SUMMARY_LINES: int = int(get_env_var('SESSION_COMPACTION_SUMMARY_LINES', '60'))
 
 # API Keys
 GOOGLE_API_KEY: Optional[str] = get_env_var('GOOGLE_API_KEY')
@@ -49,6 +78,19 @@ __all__ = [
     'HOSPITAL_ID',
     'CAREFLOW_CALLER_URL',
     'MCP_TOOLBOX_URL',
+    'MCP_TOOLBOX_LOAD_TIMEOUT_SECONDS',
+    'ROUNDS_DISPATCH_MODE',
+    'ROUNDS_MAX_CONCURRENCY',
+    'ROUNDS_PATIENT_TIMEOUT_SECONDS',
+    'CALLER_DISPATCH_MODE',
+    'ROUNDS_BATCH_SIZE',
+    'PULSE_WEBHOOK_URL',
+    'A2A_PUSH_TOKEN',
+    'SUPPORTS_LATENCY_TASK_UPDATES',
+    'SESSION_COMPACTION_ENABLED',
+    'SESSION_COMPACTION_TRIGGER_TOKENS',
+    'SESSION_COMPACTION_KEEP_STEPS',
+    'SESSION_COMPACTION_SUMMARY_LINES',
     'GOOGLE_API_KEY',
     'OTLP_ENDPOINT',
     'DEPLOYMENT_ENV'
@@ -0,0 +1,172 @@
+"""
+CareFlow Pulse - Caller Dispatch Tracker
+
+In-flight patient handoffs sent to the Caller with a non-blocking
+`message/send` (CALLER_DISPATCH_MODE=async).
+
+The Caller answers the request with a task ID straight away; Pulse keeps
+no connection open while the Caller's agent places the call. When the
+Caller task finishes, its push notification sender POSTs the Task to
+PULSE_WEBHOOK_URL and `on_task_update` resolves the entry:
+
+- completed: the Caller placed the call. The slot index already says
+  "in-call"; the outcome still arrives later as CALL_COMPLETE.
+- failed / canceled / rejected: no call was placed. The patient goes back
+  to "pending" in the slot index so the slot's safety-net run retries it.
+
+Entries nobody resolves are dropped after DISPATCH_TTL_SECONDS (the slot
+index stale "in-call" rule covers those patients).
+
+Author: CareFlow Pulse Team
+Version: 1.0.0
+"""
+
+import os
+import time
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DISPATCH_TTL_SECONDS = int(os.environ.get("DISPATCH_TTL_SECONDS", "1800"))
+DISPATCH_MAX_TRACKED = int(os.environ.get("DISPATCH_MAX_TRACKED", "5000"))
+
+STATE_COMPLETED = "completed"
+FAILED_STATES = {"failed", "canceled", "rejected"}
+
+
+@dataclass
+class PendingDispatch:
+    """A patient handed to the Caller whose task has not finished yet."""
+    task_id: str
+    patient_id: Optional[str]
+    schedule_slot: Optional[str]
+    hospital_id: Optional[str]
+    sent_at: float
+
+
+async def _mark_pending(dispatch: PendingDispatch, reason: str) -> None:
+    """Put a patient whose Caller task failed back to pending in the slot index."""
+    if not dispatch.patient_id:
+        return
+    from app.app_utils.firestore_client import get_db
+    from app.app_utils.slot_index import STATE_PENDING, set_patient_state
+    await set_patient_state(
+        get_db(), dispatch.patient_id, dispatch.schedule_slot, STATE_PENDING,
+        hospital_id=dispatch.hospital_id, reason=reason, callerTaskId=dispatch.task_id,
+    )
+
+
+def _status_text(task: Dict[str, Any]) -> str:
+    parts = ((task.get("status") or {}).get("message") or {}).get("parts") or []
+    return " ".join(p.get("text", "") for p in parts if isinstance(p, dict)).strip()
+
+
+class DispatchTracker:
+    """Bounded map of Caller task ID -> pending patient handoff."""
+
+    def __init__(
+        self,
+        ttl_seconds: int = DISPATCH_TTL_SECONDS,
+        max_tracked: int = DISPATCH_MAX_TRACKED,
+        on_failed: Callable[[PendingDispatch, str], Awaitable[None]] = _mark_pending,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_tracked = max_tracked
+        self.on_failed = on_failed
+        self._pending: "OrderedDict[str, PendingDispatch]" = OrderedDict()
+        self._completion_seconds: List[float] = []
+        self.stats = {"dispatched": 0, "completed": 0, "failed": 0, "expired": 0, "unknownUpdates": 0}
+
+    def register(
+        self,
+        task_id: str,
+        patient_id: Optional[str],
+        schedule_slot: Optional[str] = None,
+        hospital_id: Optional[str] = None,
+    ) -> None:
+        """Track a dispatched Caller task until its completion is pushed."""
+        self._expire()
+        self._pending[task_id] = PendingDispatch(task_id, patient_id, schedule_slot, hospital_id, time.time())
+        self._pending.move_to_end(task_id)
+        self.stats["dispatched"] += 1
+        while len(self._pending) > self.max_tracked:
+            self._pending.popitem(last=False)
+            self.stats["expired"] += 1
+
+    async def on_task_update(self, task: Dict[str, Any]) -> Optional[str]:
+        """
+        Handle a Task pushed by the Caller.
+
+        Args:
+            task: Task JSON as sent by the A2A push notification sender
+
+        Returns:
+            The task state, or None if the payload is not a Task
+        """
+        task_id = task.get("id")
+        state = (task.get("status") or {}).get("state")
+        if not task_id or not state:
+            return None
+        if state != STATE_COMPLETED and state not in FAILED_STATES:
+            return state  # submitted / working: nothing to do yet
+
+        dispatch = self._pending.pop(task_id, None)
+        if dispatch is None:
+            self.stats["unknownUpdates"] += 1
+            logger.debug(f"Task update for untracked Caller task {task_id} ({state})")
+            return state
+
+        self._record_completion(time.time() - dispatch.sent_at)
+        detail = _status_text(task)
+        if state == STATE_COMPLETED:
+            self.stats["completed"] += 1
+            logger.info(f"📞 Caller task {task_id} for {dispatch.patient_id} completed: {detail[:200]}")
+        else:
+            self.stats["failed"] += 1
+            logger.warning(f"⚠️ Caller task {task_id} for {dispatch.patient_id} {state}: {detail[:200]}")
+            try:
+                await self.on_failed(dispatch, f"caller-task-{state}")
+            except Exception as e:
+                logger.error(f"❌ Could not reschedule {dispatch.patient_id} after Caller task {state}: {e}")
+        return state
+
+    def _record_completion(self, seconds: float) -> None:
+        self._completion_seconds.append(seconds)
+        if len(self._completion_seconds) > 1000:
+            del self._completion_seconds[:500]
+
+    def _expire(self) -> None:
+        cutoff = time.time() - self.ttl_seconds
+        while self._pending:
+            dispatch = next(iter(self._pending.values()))
+            if dispatch.sent_at >= cutoff:
+                break
+            self._pending.popitem(last=False)
+            self.stats["expired"] += 1
+
+    def get_metrics(self) -> Dict[str, Any]:
+        self._expire()
+        samples = sorted(self._completion_seconds)
+        return {
+            "inFlight": len(self._pending),
+            **self.stats,
+            "p50CompletionSeconds": round(samples[len(samples) // 2], 2) if samples else None,
+        }
+
+
+# Process-wide tracker shared by the dispatcher and the webhook
+dispatch_tracker = DispatchTracker()
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    'DispatchTracker',
+    'PendingDispatch',
+    'dispatch_tracker',
+]
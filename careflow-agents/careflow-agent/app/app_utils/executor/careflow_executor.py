@@ -3,6 +3,7 @@ import uuid
 CareFlow Pulse A2A Executor
 Handles execution requests from remote agents via A2A protocol.
 """
+import time
 import logging
 import base64
 from datetime import datetime
@@ -19,38 +20,48 @@ from a2a.types import (
     Role,
     Part,
     TextPart,
+    DataPart,
 )
 from google.genai import types as genai_types
 from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
-from google.adk.artifacts import InMemoryArtifactService
 
 from ...agent import root_agent, CareFlowAgent
 from ...core.security.model_armor import ModelArmorClient
 from ...plugins.model_armor_plugin import ModelArmorPlugin
+from ...plugins.session_compaction_plugin import SessionCompactionPlugin
+from ..session_store import get_session_services
+from ...core.a2a import SkillLatencyTracker, skill_latency
 
 logger = logging.getLogger(__name__)
 
+# Skill advertised on the Pulse agent card
+SKILL_ID = "patient_monitoring"
+
 class CareFlowAgentExecutor(AgentExecutor):
     """
     Executes tasks using the CareFlow Pulse Agent.
     """
-    def __init__(self, agent: CareFlowAgent):
+    def __init__(self, agent: CareFlowAgent, latency: SkillLatencyTracker = skill_latency):
         self.agent = agent
+        self.latency = latency
         self.cancelled_tasks: Set[str] = set()
         
         # Initialize ADK Runner once for the executor lifetime
         model_armor_client = ModelArmorClient()
         model_armor_plugin = ModelArmorPlugin(client=model_armor_client)
 
+        # Sessions are shared by all executors, evicted by TTL/size, and
+        # call audio is moved to the artifact service once processed
+        session_service, artifact_service = get_session_services()
+
         self.runner = Runner(
             app_name=self.agent.name,
             agent=self.agent,
-            session_service=InMemorySessionService(),
+            session_service=session_service,
             memory_service=InMemoryMemoryService(),
-            artifact_service=InMemoryArtifactService(),
-            plugins=[model_armor_plugin]
+            artifact_service=artifact_service,
+            plugins=[SessionCompactionPlugin(), model_armor_plugin]
         )
 
     async def cancel(self, context: RequestContext, event_queue: EventQueue) -> None:
@@ -60,6 +71,7 @@ class CareFlowAgentExecutor(AgentExecutor):
 
     async def execute(self, context: RequestContext, event_queue: EventQueue) -> None:
         logger.info("Executing CareFlow Agent Task")
+        started = time.monotonic()
         user_message: Optional[Message] = context.message
         currentTask = context.current_task
 
@@ -116,6 +128,9 @@ class CareFlowAgentExecutor(AgentExecutor):
         )
         await event_queue.enqueue_event(working_status)
 
+        # 3. Expected remaining latency (A2A latency extension)
+        await self._publish_latency_update(event_queue, taskId, contextId, started)
+
         try:
             session = await self.runner.session_service.get_session(
                 session_id=contextId,
@@ -162,6 +177,9 @@ class CareFlowAgentExecutor(AgentExecutor):
                 session_id=session.id,
                 new_message=input_content
             ):
+                # Each tool call: re-estimate from the time already spent
+                if event.get_function_calls():
+                    await self._publish_latency_update(event_queue, taskId, contextId, started)
                 if event.is_final_response() and event.content and event.content.parts:
                     # Collect regular text
                     response_text = "\n".join([p.text for p in event.content.parts if p.text and not getattr(p, 'thought', False)])
@@ -169,6 +187,7 @@ class CareFlowAgentExecutor(AgentExecutor):
                     thought_text = "\n".join([p.text for p in event.content.parts if p.text and getattr(p, 'thought', False)])
 
             final_text = response_text or "Task completed (no text response)."
+            self.latency.record(SKILL_ID, (time.monotonic() - started) * 1000)
 
             # 5. Publish final success status
             # We include thoughts in metadata for transparency/evals
@@ -219,3 +238,31 @@ class CareFlowAgentExecutor(AgentExecutor):
                 final=True,
             )
             await event_queue.enqueue_event(error_update)
+
+    async def _publish_latency_update(
+        self, event_queue: EventQueue, taskId: str, contextId: str, started: float
+    ) -> None:
+        """Send the expected remaining latency, if latency task updates are enabled."""
+        if not self.latency.task_updates:
+            return
+        remaining = self.latency.expected_remaining_ms(SKILL_ID, (time.monotonic() - started) * 1000)
+        if remaining is None:
+            return
+        await event_queue.enqueue_event(TaskStatusUpdateEvent(
+            kind="status-update",
+            taskId=taskId,
+            contextId=contextId,
+            status=TaskStatus(
+                state=TaskState.working,
+                message=Message(
+                    kind="message",
+                    role=Role.agent,
+                    messageId=str(uuid.uuid4()),
+                    parts=[Part(root=DataPart(kind="data", data={"latency": remaining, "skill": SKILL_ID}))],
+                    taskId=taskId,
+                    contextId=contextId,
+                ),
+                timestamp=datetime.now().isoformat(),
+            ),
+            final=False,
+        ))
@@ -0,0 +1,152 @@
+"""
+CareFlow Pulse - Firestore Data Access
+
+One long-lived Firestore AsyncClient per event loop, shared by every tool.
+
+Constructing an AsyncClient per tool call opens a new gRPC channel (auth +
+TLS handshake) each time. Clients here are created lazily on first use,
+reused for the life of the loop, and closed at app shutdown. gRPC channels
+are bound to the loop that created them, so background loops (e.g. tests or
+`asyncio.run` in scripts) get their own client.
+
+Every logical operation can be wrapped in `track()` to collect latency
+metrics, exposed through the server's GET /metrics.
+
+Author: CareFlow Pulse Team
+Version: 1.0.0
+"""
+
+import os
+import time
+import asyncio
+import inspect
+import logging
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+from google.cloud.firestore import AsyncClient
+
+logger = logging.getLogger(__name__)
+
+# Latency samples kept per operation for percentiles
+LATENCY_WINDOW = 500
+
+
+# =============================================================================
+# CLIENT LIFECYCLE
+# =============================================================================
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def get_db() -> AsyncClient:
+    """
+    Return the shared Firestore client for the running event loop.
+
+    Project and database come from GOOGLE_CLOUD_PROJECT / FIRESTORE_DATABASE.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        project_id = os.environ.get("GOOGLE_CLOUD_PROJECT", "careflow-478811")
+        database_id = os.environ.get("FIRESTORE_DATABASE", "careflow-db")
+        client = AsyncClient(project=project_id, database=database_id)
+        _clients[loop] = client
+        logger.info(f"🔌 Firestore client opened ({project_id}/{database_id})")
+    return client
+
+
+async def close_db() -> None:
+    """Close the running loop's client (call at app shutdown)."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    client = _clients.pop(loop, None)
+    if client is None:
+        return
+    try:
+        result = client.close()
+        if inspect.isawaitable(result):
+            await result
+        logger.info("🔌 Firestore client closed")
+    except Exception as e:
+        logger.warning(f"⚠️ Error closing Firestore client: {e}")
+
+
+# =============================================================================
+# OPERATION METRICS
+# =============================================================================
+
+class _OperationStats:
+    __slots__ = ("count", "errors", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.samples: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+
+_operations: Dict[str, _OperationStats] = {}
+
+
+@asynccontextmanager
+async def track(operation: str) -> AsyncIterator[None]:
+    """
+    Time a logical Firestore operation.
+
+    Usage:
+        async with track("schedule.load"):
+            ...
+    """
+    stats = _operations.get(operation)
+    if stats is None:
+        stats = _operations[operation] = _OperationStats()
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        stats.errors += 1
+        raise
+    finally:
+        stats.count += 1
+        stats.samples.append(time.perf_counter() - start)
+
+
+def _percentile_ms(samples: Deque[float], pct: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return round(ordered[index] * 1000, 1)
+
+
+def get_metrics() -> Dict[str, Any]:
+    """Per-operation call counts, errors and latency percentiles."""
+    return {
+        "clients": len(_clients),
+        "operations": {
+            name: {
+                "count": stats.count,
+                "errors": stats.errors,
+                "p50Ms": _percentile_ms(stats.samples, 50),
+                "p95Ms": _percentile_ms(stats.samples, 95),
+                "maxMs": round(max(stats.samples) * 1000, 1) if stats.samples else None,
+            }
+            for name, stats in sorted(_operations.items())
+        },
+    }
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    'close_db',
+    'get_db',
+    'get_metrics',
+    'track',
+]
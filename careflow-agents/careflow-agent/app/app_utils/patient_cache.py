@@ -0,0 +1,299 @@
+"""
+CareFlow Pulse - Patient Profile Cache
+
+In-process read-through cache of patient documents, keyed by patientId.
+
+During a slot the same patient documents are read over and over (schedule
+loads, pending-patient lookups, the safety-net run). Before a round starts
+the hospital is warmed: a Firestore snapshot listener (`on_snapshot`) on the
+hospital's patients delivers every document once and then pushes each
+change, so cached entries are refreshed or dropped as soon as the dashboard,
+the MCP toolbox or another instance writes them. Entries are bounded by an
+LRU (PATIENT_CACHE_SIZE).
+
+Consistency:
+- "cached" (default): reads are served from the cache when present.
+- "strong": every read goes to Firestore. Risk updates always read the
+  patient inside their transaction (see clinical_record.py) and never use
+  the cache; set PATIENT_CACHE_CONSISTENCY=strong to disable cached reads
+  everywhere.
+
+Listener callbacks run on the Firestore watch thread, so all state is
+guarded by a lock. If a listener's stream ends (the Watch closes itself on
+a non-retryable error) the hospital and its entries are dropped on the next
+read or warmup, so the following warm() subscribes again instead of the
+cache serving documents nobody updates any more.
+
+Author: CareFlow Pulse Team
+Version: 1.0.0
+"""
+
+import os
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from google.cloud import firestore
+from google.cloud.firestore import AsyncClient, FieldFilter
+
+logger = logging.getLogger(__name__)
+
+CONSISTENCY_CACHED = "cached"
+CONSISTENCY_STRONG = "strong"
+
+PATIENT_CACHE_SIZE = int(os.environ.get("PATIENT_CACHE_SIZE", "2000"))
+PATIENT_CACHE_CONSISTENCY = os.environ.get("PATIENT_CACHE_CONSISTENCY", CONSISTENCY_CACHED).lower()
+
+# How long warm() waits for the listener's initial snapshot
+WARM_TIMEOUT_SECONDS = float(os.environ.get("PATIENT_CACHE_WARM_TIMEOUT_SECONDS", "10"))
+
+PatientData = Dict[str, Any]
+
+
+class PatientCache:
+    """Size-bounded LRU of patient documents with listener invalidation."""
+
+    def __init__(self, max_size: int = PATIENT_CACHE_SIZE, consistency: str = PATIENT_CACHE_CONSISTENCY):
+        self.max_size = max(1, max_size)
+        self.consistency = consistency
+        self._entries: "OrderedDict[str, PatientData]" = OrderedDict()
+        self._members: Dict[str, Set[str]] = {}
+        self._watches: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._listener_client = None
+        self.hits = 0
+        self.misses = 0
+        self.strong_reads = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    # -------------------------------------------------------------------------
+    # Entries
+    # -------------------------------------------------------------------------
+
+    def _put(self, patient_id: str, data: PatientData) -> None:
+        with self._lock:
+            self._entries[patient_id] = data
+            self._entries.move_to_end(patient_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def peek(self, patient_id: str) -> Optional[PatientData]:
+        """Cached copy without touching LRU order or metrics."""
+        with self._lock:
+            data = self._entries.get(patient_id)
+            return dict(data) if data is not None else None
+
+    def invalidate(self, patient_id: str) -> None:
+        """Drop a patient (e.g. after this process wrote it)."""
+        with self._lock:
+            if self._entries.pop(patient_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    # -------------------------------------------------------------------------
+    # Reads
+    # -------------------------------------------------------------------------
+
+    async def get(
+        self,
+        db: AsyncClient,
+        patient_id: str,
+        consistency: Optional[str] = None,
+    ) -> Optional[PatientData]:
+        """
+        Read a patient through the cache.
+
+        Args:
+            db: Firestore AsyncClient
+            patient_id: Patient document ID
+            consistency: "cached" or "strong" (defaults to the cache's mode)
+
+        Returns:
+            A copy of the patient document, or None if it does not exist
+        """
+        consistency = consistency or self.consistency
+        if consistency == CONSISTENCY_STRONG:
+            self.strong_reads += 1
+        else:
+            with self._lock:
+                data = self._entries.get(patient_id)
+                if data is not None:
+                    self._entries.move_to_end(patient_id)
+                    self.hits += 1
+                    return dict(data)
+                self.misses += 1
+
+        snapshot = await db.collection("patients").document(patient_id).get()
+        if not snapshot.exists:
+            self.invalidate(patient_id)
+            return None
+        data = snapshot.to_dict()
+        self._put(patient_id, data)
+        return dict(data)
+
+    def hospital_patients(
+        self,
+        hospital_id: str,
+        schedule_hour: Optional[int] = None,
+    ) -> Optional[List[Tuple[str, PatientData]]]:
+        """
+        Active patients of a warmed hospital, optionally for one schedule hour.
+
+        Returns None when the hospital is not watched, the cache is in strong
+        mode, or some of its patients were evicted - callers then query
+        Firestore instead.
+        """
+        if self.consistency == CONSISTENCY_STRONG:
+            return None
+        with self._lock:
+            self._drop_if_closed(hospital_id)
+            members = self._members.get(hospital_id)
+            if members is None or hospital_id not in self._watches:
+                self.misses += 1
+                return None
+            if any(patient_id not in self._entries for patient_id in members):
+                self.misses += 1
+                return None
+            self.hits += 1
+            return [
+                (patient_id, dict(data))
+                for patient_id, data in ((pid, self._entries[pid]) for pid in sorted(members))
+                if data.get("status") == "active"
+                and (schedule_hour is None or data.get("scheduleHour") == schedule_hour)
+            ]
+
+    # -------------------------------------------------------------------------
+    # Warmup + listener
+    # -------------------------------------------------------------------------
+
+    def _client(self):
+        if self._listener_client is None:
+            project_id = os.environ.get("GOOGLE_CLOUD_PROJECT", "careflow-478811")
+            database_id = os.environ.get("FIRESTORE_DATABASE", "careflow-db")
+            self._listener_client = firestore.Client(project=project_id, database=database_id)
+        return self._listener_client
+
+    def _drop_if_closed(self, hospital_id: str) -> None:
+        """Forget a hospital whose listener stream has ended (lock held)."""
+        watch = self._watches.get(hospital_id)
+        if watch is None or getattr(watch, "is_active", True):
+            return
+        logger.warning(f"⚠️ Patient listener for {hospital_id} closed; dropping its cached patients")
+        del self._watches[hospital_id]
+        for patient_id in self._members.pop(hospital_id, set()):
+            if self._entries.pop(patient_id, None) is not None:
+                self.invalidations += 1
+
+    def _on_snapshot(self, hospital_id: str, ready: threading.Event):
+        def callback(docs, changes, read_time):
+            with self._lock:
+                members = self._members.setdefault(hospital_id, set())
+                for change in changes:
+                    doc = change.document
+                    if change.type.name == "REMOVED":
+                        members.discard(doc.id)
+                        if self._entries.pop(doc.id, None) is not None:
+                            self.invalidations += 1
+                        continue
+                    if change.type.name == "MODIFIED" and doc.id in self._entries:
+                        self.invalidations += 1
+                    members.add(doc.id)
+                    self._entries[doc.id] = doc.to_dict()
+                    self._entries.move_to_end(doc.id)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+            ready.set()
+        return callback
+
+    async def warm(self, hospital_id: str, timeout: float = WARM_TIMEOUT_SECONDS) -> bool:
+        """
+        Load a hospital's patients and keep them fresh with a snapshot listener.
+
+        Idempotent: an already-watched hospital returns immediately. Failures
+        are logged, never raised; reads then simply miss the cache.
+
+        Returns:
+            True once the hospital's initial snapshot is cached
+        """
+        if self.consistency == CONSISTENCY_STRONG:
+            return False
+        with self._lock:
+            self._drop_if_closed(hospital_id)
+            if hospital_id in self._watches:
+                return True
+
+        ready = threading.Event()
+        try:
+            query = self._client().collection("patients").where(
+                filter=FieldFilter("hospitalId", "==", hospital_id)
+            )
+            watch = query.on_snapshot(self._on_snapshot(hospital_id, ready))
+        except Exception as e:
+            logger.warning(f"⚠️ Patient cache warmup failed for {hospital_id}: {e}")
+            return False
+
+        with self._lock:
+            self._watches[hospital_id] = watch
+
+        if not await asyncio.to_thread(ready.wait, timeout):
+            logger.warning(f"⚠️ Patient cache warmup for {hospital_id} timed out after {timeout}s")
+            return False
+        logger.info(f"🔥 Patient cache warmed for {hospital_id} ({len(self._members.get(hospital_id, ()))} patients)")
+        return True
+
+    def close(self) -> None:
+        """Stop every listener and drop cached entries."""
+        with self._lock:
+            watches = list(self._watches.values())
+            self._watches.clear()
+            self._members.clear()
+            self._entries.clear()
+        for watch in watches:
+            try:
+                watch.unsubscribe()
+            except Exception as e:
+                logger.warning(f"⚠️ Error stopping patient listener: {e}")
+
+    # -------------------------------------------------------------------------
+    # Metrics
+    # -------------------------------------------------------------------------
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "consistency": self.consistency,
+                "size": len(self._entries),
+                "maxSize": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / lookups, 3) if lookups else None,
+                "strongReads": self.strong_reads,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "watchedHospitals": sorted(self._watches),
+            }
+
+
+# Process-wide cache shared by the tools and the server
+patient_cache = PatientCache()
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    'CONSISTENCY_CACHED',
+    'CONSISTENCY_STRONG',
+    'PatientCache',
+    'patient_cache',
+]
@@ -153,14 +153,26 @@ async def check_patient_already_called(
     # For now, we'll use Firestore directly since MCP doesn't have a 
     # subcollection query tool yet. This can be migrated to MCP later.
     try:
-        from google.cloud import firestore
+        from app.app_utils.firestore_client import get_db, track
+        from app.app_utils.slot_index import default_hospital_id, is_pending, read_slot_states
+        
+        db = get_db()
+        
+        # One read of the slot index answers this when the slot is indexed
+        async with track("slots.read"):
+            slot_states = await read_slot_states(db, default_hospital_id(), schedule_slot)
+        if slot_states is not None:
+            if not is_pending(slot_states.get(patient_id)):
+                logger.info(f"⏭️ Patient {patient_id} already called in slot {schedule_slot}. Skipping.")
+                return True
+            return False
         
-        db = firestore.AsyncClient(database="careflow-db")
         interactions_ref = db.collection("patients").document(patient_id).collection("interactions")
         
         # Query for an interaction with this schedule slot
         query = interactions_ref.where("scheduleSlot", "==", schedule_slot).limit(1)
-        docs = [doc async for doc in query.stream()]
+        async with track("interactions.check_slot"):
+            docs = [doc async for doc in query.stream()]
         
         if docs:
             logger.info(f"⏭️ Patient {patient_id} already called in slot {schedule_slot}. Skipping.")
@@ -191,17 +203,22 @@ async def mark_patient_call_initiated(
     """
     try:
         from google.cloud import firestore
+        from app.app_utils.firestore_client import get_db, track
+        from app.app_utils.slot_index import STATE_IN_CALL, set_patient_state
         
-        db = firestore.AsyncClient(database="careflow-db")
+        db = get_db()
         interactions_ref = db.collection("patients").document(patient_id).collection("interactions")
         
-        await interactions_ref.add({
-            "type": "call_attempt",
-            "scheduleSlot": schedule_slot,
-            "status": "initiated",
-            "callSid": call_sid,
-            "timestamp": firestore.SERVER_TIMESTAMP,
-        })
+        async with track("interactions.mark_initiated"):
+            await interactions_ref.add({
+                "type": "call_attempt",
+                "scheduleSlot": schedule_slot,
+                "status": "initiated",
+                "callSid": call_sid,
+                "timestamp": firestore.SERVER_TIMESTAMP,
+            })
+            details = {"callSid": call_sid} if call_sid else {}
+            await set_patient_state(db, patient_id, schedule_slot, STATE_IN_CALL, **details)
         
         logger.info(f"📝 Marked call initiated for patient {patient_id} in slot {schedule_slot}")
         return True
@@ -1,21 +1,402 @@
 """
 CareFlow Pulse - Patient Rounds Orchestration
 Handles scheduling triggers and retry logic for patient rounds.
+
+Rounds run in one of two modes (ROUNDS_DISPATCH_MODE):
+- "direct": a deterministic dispatcher loads the slot's pending patients,
+  renders each Caller brief from a template and fans the briefs out with a
+  concurrency cap and a per-patient timeout. The LLM is only involved later,
+  for the post-call audit.
+- "agent": the original behaviour, where the Pulse LLM iterates patients itself.
+
+With CALLER_DISPATCH_MODE=batch the direct dispatcher sends structured
+briefs, ROUNDS_BATCH_SIZE patients per request, to the Caller's
+`dispatch_calls` skill instead of one brief per request.
 """
 import os
 import json
+import time
 import logging
 import asyncio
+from collections import OrderedDict
+from contextlib import aclosing
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
 import uuid
 
 from a2a.types import Message, Role, Part, TextPart
 from a2a.server.agent_execution import RequestContext
 from a2a.server.events import EventQueue
 
+from app.app_utils.config_loader import (
+    CALLER_DISPATCH_MODE,
+    HOSPITAL_ID,
+    ROUNDS_BATCH_SIZE,
+    ROUNDS_DISPATCH_MODE,
+    ROUNDS_MAX_CONCURRENCY,
+    ROUNDS_PATIENT_TIMEOUT_SECONDS,
+)
+
 logger = logging.getLogger(__name__)
 
+# Reports kept for GET /rounds-report
+MAX_STORED_REPORTS = 20
+
+
+# =============================================================================
+# CALLER BRIEFS
+# =============================================================================
+
+def _format_list(items: Any, empty: str = "None documented") -> str:
+    if not items:
+        return empty
+    if isinstance(items, list):
+        return ", ".join(
+            str(i.get("name", i)) if isinstance(i, dict) else str(i) for i in items
+        )
+    return str(items)
+
+
+def _format_medications(medications: Any) -> str:
+    if not medications:
+        return "None documented"
+    rendered = []
+    for med in medications:
+        if isinstance(med, dict):
+            parts = [med.get("name"), med.get("dosage"), med.get("frequency")]
+            rendered.append(" ".join(str(p) for p in parts if p))
+        else:
+            rendered.append(str(med))
+    return "; ".join(rendered)
+
+
+def _format_history(history: List[Dict[str, Any]]) -> str:
+    if not history:
+        return "No history found"
+    return " | ".join(
+        f"{h.get('date', '?')[:10]} [{h.get('risk', 'UNKNOWN')}] {h.get('brief', '')}".strip()
+        for h in history
+    )
+
+
+def _clinical_goal(patient: Dict[str, Any]) -> str:
+    history = patient.get("recentHistory") or []
+    if not history:
+        return "Baseline teach-back of diagnosis, medications and red-flag symptoms"
+    last_risk = history[0].get("risk", "UNKNOWN")
+    if last_risk in ("RED", "YELLOW"):
+        return f"Re-assess concerns from the last {last_risk} interaction and check for worsening"
+    return "Confirm continued recovery and medication adherence"
+
+
+def build_patient_brief(patient: Dict[str, Any], hospital_id: str = HOSPITAL_ID) -> str:
+    """
+    Render the Caller handoff brief for one patient.
+
+    Mirrors the brief template in the system prompt so the Caller receives
+    the same shape of task whether rounds are LLM-driven or dispatched directly.
+
+    Args:
+        patient: Enriched patient record (as returned by fetch_daily_schedule)
+        hospital_id: Hospital identifier
+
+    Returns:
+        Brief text for send_remote_agent_task
+    """
+    plan = patient.get("dischargePlan") or {}
+    contact = patient.get("contact") or {}
+    appointment = patient.get("nextAppointment") or {}
+    history = patient.get("recentHistory") or []
+    language = (patient.get("preferredLanguage") or "en-US").split("-")[0]
+
+    red_flags = list(plan.get("criticalSymptoms") or []) + list(plan.get("warningSymptoms") or [])
+    appointment_text = (
+        appointment.get("date") if isinstance(appointment, dict) else appointment
+    ) or "None scheduled"
+
+    return "\n".join([
+        f"Interview Task: {patient.get('name')} (ID: {patient.get('id')}) at {contact.get('phone')}",
+        f"- Hospital: {hospital_id}",
+        f"- History Status: {'FOLLOW-UP CALL' if history else 'FIRST TIME CALL'}",
+        f"- Preferred Language: {language}",
+        f"- Primary Diagnosis: {plan.get('diagnosis') or 'Not documented'}",
+        f"- High-Alert Meds: {_format_medications(plan.get('medications'))}",
+        f"- Red Flags to Probe: {_format_list(red_flags)}",
+        f"- Next Appointment: {appointment_text}",
+        f"- Recent History: {_format_history(history)}",
+        f"- Clinical Goal: {_clinical_goal(patient)}",
+    ])
+
+
+def build_call_brief(patient: Dict[str, Any], hospital_id: str = HOSPITAL_ID) -> Dict[str, Any]:
+    """Structured brief for one patient of a `dispatch_calls` batch."""
+    contact = patient.get("contact") or {}
+    return {
+        "patientId": str(patient.get("id")),
+        "patientName": patient.get("name"),
+        "patientPhone": contact.get("phone"),
+        "brief": build_patient_brief(patient, hospital_id),
+    }
+
+
+# =============================================================================
+# ROUNDS REPORT
+# =============================================================================
+
+@dataclass
+class PatientDispatch:
+    """Outcome of handing one patient to the Caller."""
+    patient_id: str
+    status: str  # "dispatched" | "failed" | "timeout"
+    duration_seconds: float
+    detail: str = ""
+
+
+@dataclass
+class RoundsReport:
+    """Summary of one dispatcher run for a schedule slot."""
+    schedule_slot: str
+    concurrency: int
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    load_seconds: float = 0.0
+    total_seconds: float = 0.0
+    dispatches: List[PatientDispatch] = field(default_factory=list)
+
+    def count(self, status: str) -> int:
+        return sum(1 for d in self.dispatches if d.status == status)
+
+    @property
+    def patients_per_minute(self) -> float:
+        if not self.dispatches or self.total_seconds <= 0:
+            return 0.0
+        return len(self.dispatches) / self.total_seconds * 60
+
+    def to_dict(self) -> Dict[str, Any]:
+        durations = sorted(d.duration_seconds for d in self.dispatches)
+        return {
+            "scheduleSlot": self.schedule_slot,
+            "startedAt": self.started_at.isoformat(),
+            "concurrency": self.concurrency,
+            "patients": len(self.dispatches),
+            "dispatched": self.count("dispatched"),
+            "failed": self.count("failed"),
+            "timedOut": self.count("timeout"),
+            "loadSeconds": round(self.load_seconds, 2),
+            "totalSeconds": round(self.total_seconds, 2),
+            "patientsPerMinute": round(self.patients_per_minute, 1),
+            "maxPatientSeconds": round(durations[-1], 2) if durations else None,
+            "failures": [
+                {"patientId": d.patient_id, "status": d.status, "detail": d.detail}
+                for d in self.dispatches if d.status != "dispatched"
+            ],
+        }
+
+
+# Most recent reports by slot (oldest evicted first)
+rounds_reports: "OrderedDict[str, RoundsReport]" = OrderedDict()
+
+
+def _store_report(report: RoundsReport) -> None:
+    rounds_reports[report.schedule_slot] = report
+    rounds_reports.move_to_end(report.schedule_slot)
+    while len(rounds_reports) > MAX_STORED_REPORTS:
+        rounds_reports.popitem(last=False)
+
+
+# =============================================================================
+# DIRECT DISPATCHER
+# =============================================================================
+
+async def _load_pending_patients(schedule_hour: int, hospital_id: str) -> List[Dict[str, Any]]:
+    """Load the slot's patients and keep those not yet contacted."""
+    from app.tools.schedule_tools import load_enriched_schedule
+
+    schedule = await load_enriched_schedule(schedule_hour, hospital_id)
+    return [p for p in schedule["patients"] if p.get("completionStatus", "pending") == "pending"]
+
+
+async def _send_to_caller(brief: str, schedule_slot: str, hospital_id: str) -> str:
+    """
+    Hand a brief to the Caller.
+
+    In "async" dispatch mode this returns as soon as the Caller has accepted
+    the task; its completion is pushed back to the Pulse webhook. In
+    "stream" mode it waits on the SSE stream for the Caller's final answer.
+    """
+    from app.tools.a2a_tools import dispatch_remote_agent_task, send_remote_agent_task
+    if CALLER_DISPATCH_MODE == "async":
+        return await dispatch_remote_agent_task(brief, schedule_slot=schedule_slot, hospital_id=hospital_id)
+    return await send_remote_agent_task(brief)
+
+
+def _send_batch_to_caller(briefs: List[Dict[str, Any]], schedule_slot: str) -> AsyncIterator[Dict[str, Any]]:
+    from app.tools.a2a_tools import dispatch_call_batch
+    return dispatch_call_batch(briefs, schedule_slot=schedule_slot)
+
+
+async def _mark_in_call(patient_id: str, schedule_slot: str, hospital_id: str) -> None:
+    from app.app_utils.firestore_client import get_db
+    from app.app_utils.slot_index import STATE_IN_CALL, set_patient_state
+    await set_patient_state(get_db(), patient_id, schedule_slot, STATE_IN_CALL, hospital_id=hospital_id)
+
+
+async def _mark_pending(patient_id: str, schedule_slot: str, hospital_id: str, reason: str) -> None:
+    from app.app_utils.firestore_client import get_db
+    from app.app_utils.slot_index import STATE_PENDING, set_patient_state
+    await set_patient_state(get_db(), patient_id, schedule_slot, STATE_PENDING, hospital_id=hospital_id, reason=reason)
+
+
+async def dispatch_patient_rounds(
+    schedule_hour: int,
+    schedule_slot: str,
+    hospital_id: str = HOSPITAL_ID,
+    pending_patients: Optional[List[Dict[str, Any]]] = None,
+    concurrency: int = ROUNDS_MAX_CONCURRENCY,
+    patient_timeout: float = ROUNDS_PATIENT_TIMEOUT_SECONDS,
+    load_patients: Callable[[int, str], Awaitable[List[Dict[str, Any]]]] = _load_pending_patients,
+    send_task: Callable[[str, str, str], Awaitable[str]] = _send_to_caller,
+    mark_dispatched: Callable[[str, str, str], Awaitable[None]] = _mark_in_call,
+    mark_undispatched: Callable[[str, str, str, str], Awaitable[None]] = _mark_pending,
+    dispatch_mode: Optional[str] = None,
+    batch_size: int = ROUNDS_BATCH_SIZE,
+    send_batch: Callable[[List[Dict[str, Any]], str], AsyncIterator[Dict[str, Any]]] = _send_batch_to_caller,
+) -> RoundsReport:
+    """
+    Dispatch one schedule slot to the Caller without going through the LLM.
+
+    Args:
+        schedule_hour: The hour of rounds (8, 12, 20)
+        schedule_slot: The slot key (e.g., "2026-01-23_08")
+        hospital_id: Hospital to load patients for
+        pending_patients: Pre-loaded patients (skips the schedule query)
+        concurrency: Maximum briefs in flight to the Caller
+        patient_timeout: Seconds allowed per patient handoff
+        load_patients: Loader returning the slot's pending patients
+        send_task: Coroutine sending (brief, schedule_slot, hospital_id) to the Caller
+        mark_dispatched: Records a handed-off patient as in-call in the slot index
+        mark_undispatched: Puts a patient whose handoff never reached the
+            Caller back to pending (patient_id, schedule_slot, hospital_id, reason).
+            Timed-out or ambiguous handoffs stay in-call until the entry goes stale.
+        dispatch_mode: Overrides CALLER_DISPATCH_MODE ("batch" uses send_batch)
+        batch_size: Patients per `dispatch_calls` request in batch mode
+        send_batch: Async iterator of per-patient acceptances for a batch
+
+    Returns:
+        RoundsReport for the slot (also kept in `rounds_reports`)
+    """
+    from app.tools.a2a_tools import NOT_DELIVERED, handoff_not_delivered
+
+    report = RoundsReport(schedule_slot=schedule_slot, concurrency=concurrency)
+    started = time.perf_counter()
+
+    if pending_patients is None:
+        pending_patients = await load_patients(schedule_hour, hospital_id)
+    report.load_seconds = time.perf_counter() - started
+    logger.info(f"📋 Dispatching {len(pending_patients)} pending patients for {schedule_slot} (concurrency {concurrency})")
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def dispatch(patient: Dict[str, Any]) -> PatientDispatch:
+        patient_id = str(patient.get("id"))
+        async with semaphore:
+            t0 = time.perf_counter()
+            # In-call is written before the handoff: in async mode the
+            # Caller's failure push (which resets the patient to pending) can
+            # arrive before send_task returns, and must not be overwritten
+            await mark_dispatched(patient_id, schedule_slot, hospital_id)
+            try:
+                result = await asyncio.wait_for(
+                    send_task(build_patient_brief(patient, hospital_id), schedule_slot, hospital_id),
+                    timeout=patient_timeout,
+                )
+            except asyncio.TimeoutError:
+                # The Caller may already be dialling: the patient stays in-call
+                # and the slot index offers it again once the entry goes stale
+                logger.warning(f"⏱️ Caller handoff for {patient_id} timed out after {patient_timeout}s")
+                return PatientDispatch(patient_id, "timeout", time.perf_counter() - t0)
+            except Exception as e:
+                logger.error(f"❌ Caller handoff for {patient_id} failed: {e}")
+                if handoff_not_delivered(e):
+                    await mark_undispatched(patient_id, schedule_slot, hospital_id, "handoff-failed")
+                return PatientDispatch(patient_id, "failed", time.perf_counter() - t0, str(e))
+
+            elapsed = time.perf_counter() - t0
+            if result.startswith("ERROR"):
+                logger.warning(f"⚠️ Caller handoff for {patient_id} returned: {result}")
+                if result.startswith(NOT_DELIVERED):
+                    await mark_undispatched(patient_id, schedule_slot, hospital_id, "handoff-failed")
+                return PatientDispatch(patient_id, "failed", elapsed, result)
+            return PatientDispatch(patient_id, "dispatched", elapsed)
+
+    async def update_slot_index(mark: Callable[..., Awaitable[None]], patient_ids: List[str], *args: str) -> None:
+        # Best-effort: a failed index write is logged, never fails the batch
+        results = await asyncio.gather(
+            *(mark(pid, schedule_slot, hospital_id, *args) for pid in patient_ids),
+            return_exceptions=True,
+        )
+        for pid, result in zip(patient_ids, results):
+            if isinstance(result, Exception):
+                logger.error(f"❌ Slot index update for {pid} failed: {result}")
+
+    async def dispatch_batch(batch: List[Dict[str, Any]]) -> List[PatientDispatch]:
+        patient_ids = [str(p.get("id")) for p in batch]
+        outcomes: Dict[str, PatientDispatch] = {}
+        not_delivered = False
+        async with semaphore:
+            t0 = time.perf_counter()
+            # As for single handoffs, the whole batch is in-call before the
+            # request so no acceptance waits on a Firestore write
+            await update_slot_index(mark_dispatched, patient_ids)
+            try:
+                briefs = [build_call_brief(p, hospital_id) for p in batch]
+                async with aclosing(send_batch(briefs, schedule_slot)) as acceptances:
+                    async for acceptance in acceptances:
+                        patient_id = str(acceptance.get("patientId"))
+                        elapsed = time.perf_counter() - t0
+                        if acceptance.get("status") in ("accepted", "duplicate"):
+                            outcomes[patient_id] = PatientDispatch(patient_id, "dispatched", elapsed)
+                        else:
+                            detail = acceptance.get("detail") or acceptance.get("status", "")
+                            logger.warning(f"⚠️ Caller did not start a call for {patient_id}: {detail}")
+                            outcomes[patient_id] = PatientDispatch(patient_id, "failed", elapsed, detail)
+                missing_detail = "No acceptance from Caller"
+            except Exception as e:
+                logger.error(f"❌ Caller batch of {len(batch)} failed: {e}")
+                missing_detail = str(e) or type(e).__name__
+                not_delivered = not outcomes and handoff_not_delivered(e)
+        elapsed = time.perf_counter() - t0
+        dispatches = [
+            outcomes.get(pid) or PatientDispatch(pid, "failed", elapsed, missing_detail)
+            for pid in patient_ids
+        ]
+        # Patients the Caller turned down, or the whole batch if it never
+        # reached the Caller, go back to pending. Unacknowledged patients
+        # may be mid-dial and stay in-call until the entry goes stale.
+        await update_slot_index(mark_undispatched, [
+            d.patient_id for d in dispatches
+            if d.status == "failed" and (not_delivered or d.patient_id in outcomes)
+        ], "handoff-failed")
+        return dispatches
+
+    if (dispatch_mode or CALLER_DISPATCH_MODE) == "batch":
+        size = max(1, batch_size)
+        batches = [pending_patients[i:i + size] for i in range(0, len(pending_patients), size)]
+        results = await asyncio.gather(*(dispatch_batch(b) for b in batches))
+        report.dispatches = [d for batch_result in results for d in batch_result]
+    else:
+        report.dispatches = list(await asyncio.gather(*(dispatch(p) for p in pending_patients)))
+    report.total_seconds = time.perf_counter() - started
+    _store_report(report)
+
+    summary = report.to_dict()
+    logger.info(
+        f"✅ Rounds {schedule_slot}: {summary['dispatched']}/{summary['patients']} dispatched, "
+        f"{summary['failed']} failed, {summary['timedOut']} timed out in {summary['totalSeconds']}s "
+        f"({summary['patientsPerMinute']} patients/min)"
+    )
+    return report
+
 
 async def trigger_agent_rounds(
     root_agent,
@@ -26,6 +407,9 @@ async def trigger_agent_rounds(
 ):
     """
     Background task to trigger the agent to start patient rounds.
+
+    In "direct" dispatch mode the slot is handed to `dispatch_patient_rounds`
+    instead of the LLM.
     
     Args:
         root_agent: The CareFlowAgent instance
@@ -34,6 +418,22 @@ async def trigger_agent_rounds(
         retry_mode: If True, this is a retry call
         pending_patients: Optional list of specific patients to call (for retries)
     """
+    from app.app_utils.patient_cache import patient_cache
+
+    # Warm the hospital's patient profiles before the slot's schedule loads
+    await patient_cache.warm(HOSPITAL_ID)
+
+    if ROUNDS_DISPATCH_MODE == "direct":
+        try:
+            await dispatch_patient_rounds(
+                schedule_hour,
+                schedule_slot,
+                pending_patients=pending_patients,
+            )
+        except Exception as e:
+            logger.error(f"❌ Error dispatching rounds for {schedule_slot}: {e}", exc_info=True)
+        return
+
     try:
         # Construct the trigger message
         if retry_mode:
@@ -0,0 +1,156 @@
+"""
+CareFlow Pulse - Schedule Loader
+
+Batched loading of a schedule slot's patients with completion status and
+recent history.
+
+The per-patient lookups (slot interaction check + last-3 history) used to
+be awaited one patient at a time, i.e. 2N+1 sequential round trips. Here
+they run concurrently under a semaphore. When the caller already knows
+which patients are done (from the slot index, see slot_index.py) the
+per-patient completion query is skipped entirely.
+
+Author: CareFlow Pulse Team
+Version: 1.0.0
+"""
+
+import os
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from google.cloud.firestore import AsyncClient, FieldFilter, Query
+
+logger = logging.getLogger(__name__)
+
+# Maximum patients looked up in parallel
+SCHEDULE_LOAD_CONCURRENCY = int(os.environ.get("SCHEDULE_LOAD_CONCURRENCY", "20"))
+
+# Interactions summarized per patient
+HISTORY_LIMIT = 3
+
+
+# =============================================================================
+# DATA
+# =============================================================================
+
+@dataclass
+class ScheduledPatient:
+    """One patient in a schedule slot, with contact status and recent history."""
+    id: str
+    data: Dict[str, Any]
+    completed: bool
+    recent_history: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def history_entry(interaction: Dict[str, Any]) -> Dict[str, Any]:
+    """Summarize an interaction document for the recentHistory list."""
+    ts = interaction.get("timestamp")
+    return {
+        "date": ts.isoformat() if hasattr(ts, "isoformat") else str(ts),
+        "brief": interaction.get("aiBrief", "No summary available"),
+        "risk": interaction.get("riskLevel", "UNKNOWN"),
+        "type": interaction.get("type", "unknown"),
+    }
+
+
+# =============================================================================
+# LOADER
+# =============================================================================
+
+async def query_schedule_patients(
+    db: AsyncClient,
+    schedule_hour: int,
+    hospital_id: str,
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """(patientId, data) for the hospital's active patients at `schedule_hour`."""
+    query = db.collection("patients") \
+        .where(filter=FieldFilter("hospitalId", "==", hospital_id)) \
+        .where(filter=FieldFilter("status", "==", "active")) \
+        .where(filter=FieldFilter("scheduleHour", "==", schedule_hour))
+    return [(doc.id, doc.to_dict()) async for doc in query.stream()]
+
+
+async def load_schedule(
+    db: AsyncClient,
+    schedule_hour: int,
+    hospital_id: str,
+    schedule_slot: str,
+    concurrency: int = SCHEDULE_LOAD_CONCURRENCY,
+    completed_ids: Optional[Set[str]] = None,
+    history_for_completed: bool = True,
+    patients: Optional[List[Tuple[str, Dict[str, Any]]]] = None,
+) -> List[ScheduledPatient]:
+    """
+    Load all active patients for a slot with their completion status and history.
+
+    Args:
+        db: Firestore AsyncClient
+        schedule_hour: The hour slot (8, 12, 20)
+        hospital_id: The hospital ID
+        schedule_slot: Slot key used for completion (e.g. "2026-01-27_08")
+        concurrency: Maximum patients looked up in parallel
+        completed_ids: Patients known to be done for the slot. When given,
+            no completion queries are issued; when None, each patient's
+            interactions are checked.
+        history_for_completed: Also fetch history for completed patients
+        patients: The slot's (patientId, data) pairs when already known
+            (e.g. from the patient cache); skips the patients query
+
+    Returns:
+        Patients in query order; a patient whose completion check fails is
+        left out of this load
+    """
+    if patients is None:
+        patients = await query_schedule_patients(db, schedule_hour, hospital_id)
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def enrich(patient_id: str, data: Dict[str, Any]) -> Optional[ScheduledPatient]:
+        interactions_ref = db.collection("patients").document(patient_id).collection("interactions")
+
+        async with semaphore:
+            if completed_ids is not None:
+                completed = patient_id in completed_ids
+            else:
+                try:
+                    completed = bool(
+                        await interactions_ref
+                        .where(filter=FieldFilter("scheduleSlot", "==", schedule_slot))
+                        .limit(1)
+                        .get()
+                    )
+                except Exception as ex:
+                    # Unknown status: leave the patient to the next load rather than risk a second call
+                    logger.warning(f"Failed to check {patient_id} for {schedule_slot}, skipping: {ex}")
+                    return None
+            if completed and not history_for_completed:
+                return ScheduledPatient(patient_id, data, completed)
+            recent_history = await _fetch_history(interactions_ref, patient_id)
+
+        return ScheduledPatient(patient_id, data, completed, recent_history)
+
+    results = await asyncio.gather(*(enrich(patient_id, data) for patient_id, data in patients))
+    return [patient for patient in results if patient is not None]
+
+
+async def _fetch_history(interactions_ref, patient_id: str) -> List[Dict[str, Any]]:
+    try:
+        history_query = interactions_ref.order_by("timestamp", direction=Query.DESCENDING).limit(HISTORY_LIMIT)
+        return [history_entry(doc.to_dict()) async for doc in history_query.stream()]
+    except Exception as ex:
+        logger.warning(f"Failed to fetch history for {patient_id}: {ex}")
+        return []
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    'ScheduledPatient',
+    'history_entry',
+    'load_schedule',
+    'query_schedule_patients',
+]
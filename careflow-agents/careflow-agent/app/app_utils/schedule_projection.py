@@ -0,0 +1,193 @@
+"""
+CareFlow Pulse - Schedule Projection
+
+Compact, paged views of schedule payloads for the LLM.
+
+The schedule tools used to return the full enriched patient list (nested
+contact, dischargePlan, medications, assignedNurse, three history briefs per
+patient). All of it landed in the rounds session's Gemini context and was
+re-sent on every later ReAct step. Here each patient is projected onto a
+flat field whitelist with truncated history briefs, optionally encoded as a
+table (column names once, one row per patient), and served in pages the
+model pulls with a cursor. Each page reports its estimated token count.
+
+Author: CareFlow Pulse Team
+Version: 1.0.0
+"""
+
+import os
+import json
+import math
+import base64
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+ENCODING_JSON = "json"
+ENCODING_TABLE = "table"
+
+DEFAULT_FIELDS = (
+    "id", "name", "phone", "preferredLanguage", "completionStatus", "riskLevel",
+    "diagnosis", "medications", "redFlags", "nextAppointment", "history",
+)
+
+SCHEDULE_PROJECTION_FIELDS: List[str] = [
+    f.strip() for f in os.environ.get("SCHEDULE_PROJECTION_FIELDS", ",".join(DEFAULT_FIELDS)).split(",") if f.strip()
+]
+SCHEDULE_PAGE_SIZE = int(os.environ.get("SCHEDULE_PAGE_SIZE", "25"))
+SCHEDULE_HISTORY_BRIEF_CHARS = int(os.environ.get("SCHEDULE_HISTORY_BRIEF_CHARS", "160"))
+SCHEDULE_ENCODING = os.environ.get("SCHEDULE_ENCODING", ENCODING_JSON).lower()
+
+# Rough Gemini tokenizer ratio for English/JSON text
+CHARS_PER_TOKEN = 4
+
+
+# =============================================================================
+# FIELDS
+# =============================================================================
+
+def _plan(p: Dict[str, Any]) -> Dict[str, Any]:
+    return p.get("dischargePlan") or {}
+
+
+def _medications(p: Dict[str, Any]) -> str:
+    rendered = []
+    for med in _plan(p).get("medications") or []:
+        if isinstance(med, dict):
+            rendered.append(" ".join(str(med[k]) for k in ("name", "dosage", "frequency") if med.get(k)))
+        else:
+            rendered.append(str(med))
+    return "; ".join(rendered)
+
+
+def _red_flags(p: Dict[str, Any]) -> str:
+    plan = _plan(p)
+    return "; ".join(str(s) for s in list(plan.get("criticalSymptoms") or []) + list(plan.get("warningSymptoms") or []))
+
+
+def _appointment(p: Dict[str, Any]) -> Optional[str]:
+    appointment = p.get("nextAppointment")
+    if isinstance(appointment, dict):
+        appointment = appointment.get("date")
+    return str(appointment)[:16] if appointment else None
+
+
+def _truncate(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
+
+
+def _history(p: Dict[str, Any], brief_chars: int) -> List[str]:
+    return [
+        f"{str(h.get('date', '?'))[:10]} {h.get('risk', 'UNKNOWN')}: {_truncate(str(h.get('brief', '')), brief_chars)}"
+        for h in p.get("recentHistory") or []
+    ]
+
+
+# Field name -> extractor over an enriched patient record
+FIELD_GETTERS: Dict[str, Callable[[Dict[str, Any], int], Any]] = {
+    "id": lambda p, _: p.get("id"),
+    "name": lambda p, _: p.get("name"),
+    "phone": lambda p, _: (p.get("contact") or {}).get("phone"),
+    "preferredLanguage": lambda p, _: p.get("preferredLanguage", "en-US"),
+    "completionStatus": lambda p, _: p.get("completionStatus", "pending"),
+    "riskLevel": lambda p, _: p.get("riskLevel", "GREEN"),
+    "diagnosis": lambda p, _: _plan(p).get("diagnosis"),
+    "medications": lambda p, _: _medications(p),
+    "redFlags": lambda p, _: _red_flags(p),
+    "nextAppointment": lambda p, _: _appointment(p),
+    "assignedNurse": lambda p, _: (p.get("assignedNurse") or {}).get("name"),
+    "history": _history,
+}
+
+
+def resolve_fields(fields: Optional[Sequence[str]] = None) -> List[str]:
+    """Whitelisted field names, in order, keeping only known fields ("id" is always included)."""
+    selected = [f for f in (fields or SCHEDULE_PROJECTION_FIELDS) if f in FIELD_GETTERS]
+    return selected if "id" in selected else ["id"] + selected
+
+
+def project_patient(
+    patient: Dict[str, Any],
+    fields: Sequence[str],
+    brief_chars: int = SCHEDULE_HISTORY_BRIEF_CHARS,
+) -> Dict[str, Any]:
+    """Flatten one enriched patient record onto `fields`."""
+    return {name: FIELD_GETTERS[name](patient, brief_chars) for name in fields}
+
+
+# =============================================================================
+# PAGING
+# =============================================================================
+
+def encode_cursor(patient_id: str) -> str:
+    return base64.urlsafe_b64encode(patient_id.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[str]:
+    if not cursor:
+        return None
+    return base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+
+
+def page_of(items: List[Any], cursor: Optional[str], page_size: int, key: Callable[[Any], str]):
+    """
+    Keyset page over `items` ordered by `key` (the patient ID).
+
+    Returns:
+        (page, next_cursor) - next_cursor is None on the last page
+    """
+    ordered = sorted(items, key=key)
+    after = decode_cursor(cursor)
+    if after is not None:
+        ordered = [item for item in ordered if key(item) > after]
+    page = ordered[:max(1, page_size)]
+    next_cursor = encode_cursor(key(page[-1])) if len(ordered) > len(page) else None
+    return page, next_cursor
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def render_page(
+    patients: List[Dict[str, Any]],
+    total: int,
+    next_cursor: Optional[str],
+    fields: Optional[Sequence[str]] = None,
+    encoding: str = SCHEDULE_ENCODING,
+    brief_chars: int = SCHEDULE_HISTORY_BRIEF_CHARS,
+) -> str:
+    """
+    Serialize one page of enriched patients for the model.
+
+    The payload carries `total`, `nextCursor` (pass it back to get the next
+    page; null on the last page) and `tokens`, the page's estimated size.
+    """
+    fields = resolve_fields(fields)
+    rows = [project_patient(p, fields, brief_chars) for p in patients]
+    payload: Dict[str, Any] = {"total": total, "count": len(rows), "nextCursor": next_cursor}
+    if encoding == ENCODING_TABLE:
+        payload["columns"] = list(fields)
+        payload["rows"] = [[row[f] for f in fields] for row in rows]
+    else:
+        payload["patients"] = [{k: v for k, v in row.items() if v not in (None, "", [])} for row in rows]
+
+    body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+    payload["tokens"] = estimate_tokens(body)
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    'ENCODING_JSON',
+    'ENCODING_TABLE',
+    'SCHEDULE_PAGE_SIZE',
+    'decode_cursor',
+    'encode_cursor',
+    'estimate_tokens',
+    'page_of',
+    'project_patient',
+    'render_page',
+    'resolve_fields',
+]
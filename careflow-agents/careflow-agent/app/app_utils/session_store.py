@@ -0,0 +1,289 @@
+"""
+CareFlow Pulse - Session Store
+
+Bounded, optionally durable ADK session storage for CareFlowAgentExecutor.
+
+The executor used to keep every session forever in InMemorySessionService,
+including the base64 WAV attached to each CALL_COMPLETE, so memory grew
+until the container was OOM-killed, and everything was lost on restart.
+
+EvictingSessionService wraps any ADK session backend and:
+- evicts sessions idle for longer than SESSION_TTL_SECONDS, and the least
+  recently used ones beyond SESSION_MAX_SESSIONS (with their artifacts),
+- moves audio parts of incoming messages to the artifact service. The
+  running invocation still gets the audio inline; the stored event only
+  keeps a short text reference to the artifact.
+
+Backends (SESSION_BACKEND):
+- "memory": InMemorySessionService + InMemoryArtifactService (default)
+- "sqlite": SqliteSessionService at SESSION_DB_PATH + FileArtifactService
+  at ARTIFACT_DIR, so sessions survive a restart on a single node
+
+Author: CareFlow Pulse Team
+Version: 1.0.0
+"""
+
+import os
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from google.adk.artifacts import BaseArtifactService, FileArtifactService, InMemoryArtifactService
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, InMemorySessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+from google.adk.sessions.sqlite_session_service import SqliteSessionService
+from google.genai import types as genai_types
+
+logger = logging.getLogger(__name__)
+
+BACKEND_MEMORY = "memory"
+BACKEND_SQLITE = "sqlite"
+
+SESSION_BACKEND = os.environ.get("SESSION_BACKEND", BACKEND_MEMORY).lower()
+SESSION_DB_PATH = os.environ.get("SESSION_DB_PATH", "sessions.db")
+ARTIFACT_DIR = os.environ.get("ARTIFACT_DIR", "artifacts")
+SESSION_TTL_SECONDS = int(os.environ.get("SESSION_TTL_SECONDS", str(12 * 3600)))
+SESSION_MAX_SESSIONS = int(os.environ.get("SESSION_MAX_SESSIONS", "500"))
+
+AUDIO_ARTIFACT_PREFIX = "call_audio"
+
+SessionKey = Tuple[str, str, str]
+
+
+def _audio_filename(event: Event, index: int, mime_type: str) -> str:
+    extension = mime_type.split("/")[-1].split(";")[0].strip() or "bin"
+    return f"{AUDIO_ARTIFACT_PREFIX}_{event.id}_{index}.{extension}"
+
+
+class EvictingSessionService(BaseSessionService):
+    """
+    Session service with TTL / size eviction and audio offloading.
+
+    Delegates storage to `inner`; only keeps an access-ordered index of
+    session keys, so its own footprint is constant per session.
+    """
+
+    def __init__(
+        self,
+        inner: BaseSessionService,
+        artifact_service: Optional[BaseArtifactService] = None,
+        ttl_seconds: int = SESSION_TTL_SECONDS,
+        max_sessions: int = SESSION_MAX_SESSIONS,
+    ):
+        self.inner = inner
+        self.artifact_service = artifact_service
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self._last_access: "OrderedDict[SessionKey, float]" = OrderedDict()
+        self._primed_apps: set = set()
+        self.evictions = 0
+        self.audio_offloaded = 0
+        self.audio_bytes_offloaded = 0
+
+    # =========================================================================
+    # EVICTION
+    # =========================================================================
+
+    def _touch(self, key: SessionKey, at: Optional[float] = None) -> None:
+        self._last_access[key] = at if at is not None else time.time()
+        self._last_access.move_to_end(key)
+
+    async def _prime(self, app_name: str) -> None:
+        """Index sessions already in a durable backend (e.g. after a restart)."""
+        if app_name in self._primed_apps:
+            return
+        self._primed_apps.add(app_name)
+        existing = await self.inner.list_sessions(app_name=app_name)
+        for session in sorted(existing.sessions, key=lambda s: s.last_update_time):
+            key = (session.app_name, session.user_id, session.id)
+            if key not in self._last_access:
+                self._touch(key, session.last_update_time)
+        if existing.sessions:
+            logger.info(f"🗂️ Indexed {len(existing.sessions)} stored sessions for {app_name}")
+
+    async def _evict(self) -> None:
+        cutoff = time.time() - self.ttl_seconds
+        victims = []
+        while self._last_access:
+            key, last = next(iter(self._last_access.items()))
+            if last >= cutoff and len(self._last_access) <= self.max_sessions:
+                break
+            self._last_access.popitem(last=False)
+            victims.append(key)
+
+        for app_name, user_id, session_id in victims:
+            await self.inner.delete_session(app_name=app_name, user_id=user_id, session_id=session_id)
+            if self.artifact_service:
+                for filename in await self.artifact_service.list_artifact_keys(
+                    app_name=app_name, user_id=user_id, session_id=session_id
+                ):
+                    await self.artifact_service.delete_artifact(
+                        app_name=app_name, user_id=user_id, session_id=session_id, filename=filename
+                    )
+        if victims:
+            self.evictions += len(victims)
+            logger.info(f"🧹 Evicted {len(victims)} sessions ({len(self._last_access)} kept)")
+
+    # =========================================================================
+    # SESSION SERVICE
+    # =========================================================================
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        await self._prime(app_name)
+        session = await self.inner.create_session(
+            app_name=app_name, user_id=user_id, state=state, session_id=session_id
+        )
+        self._touch((app_name, user_id, session.id))
+        await self._evict()
+        return session
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        await self._prime(app_name)
+        await self._evict()
+        session = await self.inner.get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, config=config
+        )
+        if session:
+            self._touch((app_name, user_id, session_id))
+        return session
+
+    async def list_sessions(self, *, app_name: str, user_id: Optional[str] = None) -> ListSessionsResponse:
+        return await self.inner.list_sessions(app_name=app_name, user_id=user_id)
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        self._last_access.pop((app_name, user_id, session_id), None)
+        await self.inner.delete_session(app_name=app_name, user_id=user_id, session_id=session_id)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        stored = await self._offload_audio(session, event)
+        appended = await self.inner.append_event(session, stored)
+        self._touch((session.app_name, session.user_id, session.id))
+
+        if stored is not event and session.events and session.events[-1] is appended:
+            # The running invocation still needs to hear the audio
+            session.events[-1] = event
+            return event
+        return appended
+
+    # =========================================================================
+    # AUDIO
+    # =========================================================================
+
+    async def _offload_audio(self, session: Session, event: Event) -> Event:
+        """
+        Copy of `event` with inline audio replaced by artifact references.
+
+        Returns `event` itself when it carries no audio (or there is no
+        artifact service), so ordinary events are never copied.
+        """
+        if not self.artifact_service or event.partial or not event.content or not event.content.parts:
+            return event
+        if not any(p.inline_data and (p.inline_data.mime_type or "").startswith("audio/") for p in event.content.parts):
+            return event
+
+        stored = event.model_copy(deep=False)
+        parts = []
+        for index, part in enumerate(event.content.parts):
+            blob = part.inline_data
+            if not (blob and (blob.mime_type or "").startswith("audio/")):
+                parts.append(part)
+                continue
+            filename = _audio_filename(event, index, blob.mime_type)
+            version = await self.artifact_service.save_artifact(
+                app_name=session.app_name,
+                user_id=session.user_id,
+                session_id=session.id,
+                filename=filename,
+                artifact=part,
+            )
+            size = len(blob.data or b"")
+            self.audio_offloaded += 1
+            self.audio_bytes_offloaded += size
+            parts.append(genai_types.Part.from_text(
+                text=f"[Call audio stored as artifact '{filename}' (version {version}, {blob.mime_type}, {size} bytes)]"
+            ))
+        stored.content = genai_types.Content(role=event.content.role, parts=parts)
+        return stored
+
+    # =========================================================================
+    # METRICS
+    # =========================================================================
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "backend": type(self.inner).__name__,
+            "sessions": len(self._last_access),
+            "maxSessions": self.max_sessions,
+            "ttlSeconds": self.ttl_seconds,
+            "evictions": self.evictions,
+            "audioOffloaded": self.audio_offloaded,
+            "audioBytesOffloaded": self.audio_bytes_offloaded,
+        }
+
+
+def create_session_services(backend: str = SESSION_BACKEND) -> Tuple[EvictingSessionService, BaseArtifactService]:
+    """
+    Build the session and artifact services for the configured backend.
+
+    Returns:
+        (session_service, artifact_service)
+    """
+    if backend == BACKEND_SQLITE:
+        os.makedirs(os.path.dirname(os.path.abspath(SESSION_DB_PATH)), exist_ok=True)
+        inner: BaseSessionService = SqliteSessionService(SESSION_DB_PATH)
+        artifact_service: BaseArtifactService = FileArtifactService(ARTIFACT_DIR)
+    elif backend == BACKEND_MEMORY:
+        inner = InMemorySessionService()
+        artifact_service = InMemoryArtifactService()
+    else:
+        raise ValueError(f"Unknown SESSION_BACKEND {backend!r} (expected '{BACKEND_MEMORY}' or '{BACKEND_SQLITE}')")
+
+    logger.info(
+        f"🗂️ Session store: {backend} (ttl {SESSION_TTL_SECONDS}s, max {SESSION_MAX_SESSIONS} sessions)"
+    )
+    return EvictingSessionService(inner, artifact_service), artifact_service
+
+
+_services: Optional[Tuple[EvictingSessionService, BaseArtifactService]] = None
+
+
+def get_session_services() -> Tuple[EvictingSessionService, BaseArtifactService]:
+    """Process-wide session and artifact services, shared by all executors."""
+    global _services
+    if _services is None:
+        _services = create_session_services()
+    return _services
+
+
+def get_metrics() -> Dict[str, Any]:
+    return _services[0].get_metrics() if _services else {"backend": SESSION_BACKEND, "sessions": 0}
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    'BACKEND_MEMORY',
+    'BACKEND_SQLITE',
+    'EvictingSessionService',
+    'create_session_services',
+    'get_metrics',
+    'get_session_services',
+]
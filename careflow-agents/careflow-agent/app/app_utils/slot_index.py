@@ -0,0 +1,179 @@
+"""
+CareFlow Pulse - Slot Completion Index
+
+One document per hospital schedule slot, `/slots/{hospitalId}_{slot}`,
+mapping each patient touched in that slot to its call state:
+
+    pending | in-call | completed | failed | retry-<n>
+
+Writers update a single map entry with a merged set, which is atomic and
+creates the document on first use. Readers answer "who is still pending
+for this slot" with one document read instead of one interactions query
+per patient. Patients absent from the map have not been touched yet and
+are pending.
+
+Every interaction writer updates the index: `update_patient_risk` and
+`log_interaction_subcollection` write the slot entry in the same
+transaction or batch as the interaction, and the MCP Toolbox's
+`log_patient_interaction` (which cannot) is not loaded by the agent (see
+mcp__tool_loader.py). Slots without an index document fall back to the
+`scheduleSlot` interactions query.
+
+Author: CareFlow Pulse Team
+Version: 1.0.0
+"""
+
+import os
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Set
+
+from google.cloud.firestore import AsyncClient, SERVER_TIMESTAMP
+
+logger = logging.getLogger(__name__)
+
+SLOTS_COLLECTION = "slots"
+
+STATE_PENDING = "pending"
+STATE_IN_CALL = "in-call"
+STATE_COMPLETED = "completed"
+STATE_FAILED = "failed"
+
+# A call still "in-call" after this long is treated as pending again (the
+# Caller never reported back), so the safety-net run picks the patient up.
+IN_CALL_STALE_SECONDS = int(os.environ.get("SLOT_IN_CALL_STALE_SECONDS", "600"))
+
+SlotStates = Dict[str, Dict[str, Any]]
+
+
+def default_hospital_id() -> str:
+    return os.environ.get("HOSPITAL_ID", "HOSP001")
+
+
+def slot_doc_id(hospital_id: str, schedule_slot: str) -> str:
+    """Document ID for a hospital's slot (e.g. "HOSP001_2026-01-23_08")."""
+    return f"{hospital_id}_{schedule_slot}"
+
+
+def retry_state(retry_count: int) -> str:
+    return f"retry-{retry_count}"
+
+
+# =============================================================================
+# WRITE
+# =============================================================================
+
+def patient_state_update(
+    patient_id: str,
+    schedule_slot: str,
+    state: str,
+    hospital_id: str,
+    **details: Any,
+) -> Dict[str, Any]:
+    """Merge payload setting one patient's entry (also used inside transactions)."""
+    return {
+        "hospitalId": hospital_id,
+        "scheduleSlot": schedule_slot,
+        "updatedAt": SERVER_TIMESTAMP,
+        "patients": {patient_id: {"state": state, "updatedAt": datetime.now(timezone.utc), **details}},
+    }
+
+
+async def set_patient_state(
+    db: AsyncClient,
+    patient_id: str,
+    schedule_slot: Optional[str],
+    state: str,
+    hospital_id: Optional[str] = None,
+    **details: Any,
+) -> None:
+    """
+    Record a patient's state for a slot.
+
+    Best-effort: a failed index write is logged, never raised, so it cannot
+    break the interaction or call flow that triggered it.
+
+    Args:
+        db: Firestore AsyncClient
+        patient_id: Patient document ID
+        schedule_slot: Slot key (no-op if None)
+        state: One of the STATE_* values or retry_state(n)
+        hospital_id: Hospital owning the slot (defaults to HOSPITAL_ID)
+        **details: Extra fields stored on the patient's entry (e.g. callSid)
+    """
+    if not schedule_slot:
+        return
+    hospital_id = hospital_id or default_hospital_id()
+    try:
+        await db.collection(SLOTS_COLLECTION).document(slot_doc_id(hospital_id, schedule_slot)).set(
+            patient_state_update(patient_id, schedule_slot, state, hospital_id, **details),
+            merge=True,
+        )
+    except Exception as e:
+        logger.warning(f"⚠️ Could not update slot index for {patient_id} in {schedule_slot}: {e}")
+
+
+# =============================================================================
+# READ
+# =============================================================================
+
+async def read_slot_states(
+    db: AsyncClient,
+    hospital_id: str,
+    schedule_slot: str,
+) -> Optional[SlotStates]:
+    """
+    Read a slot's patient states in one document read.
+
+    Returns:
+        {patientId: entry} map, or None if the slot has no index document
+        yet (callers then fall back to querying interactions).
+    """
+    snapshot = await db.collection(SLOTS_COLLECTION).document(slot_doc_id(hospital_id, schedule_slot)).get()
+    if not snapshot.exists:
+        return None
+    return (snapshot.to_dict() or {}).get("patients", {})
+
+
+def is_pending(entry: Optional[Dict[str, Any]], now: Optional[datetime] = None) -> bool:
+    """Whether a patient with this index entry still needs a call in the slot."""
+    if not entry:
+        return True
+    state = entry.get("state", STATE_PENDING)
+    if state == STATE_PENDING or state.startswith("retry-"):
+        return True
+    if state == STATE_IN_CALL:
+        updated_at = entry.get("updatedAt")
+        if isinstance(updated_at, datetime):
+            now = now or datetime.now(timezone.utc)
+            return (now - updated_at).total_seconds() > IN_CALL_STALE_SECONDS
+    return False
+
+
+def done_patient_ids(states: Optional[SlotStates]) -> Optional[Set[str]]:
+    """Patients that no longer need a call, or None when the slot is not indexed."""
+    if states is None:
+        return None
+    now = datetime.now(timezone.utc)
+    return {patient_id for patient_id, entry in states.items() if not is_pending(entry, now)}
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    'IN_CALL_STALE_SECONDS',
+    'STATE_COMPLETED',
+    'STATE_FAILED',
+    'STATE_IN_CALL',
+    'STATE_PENDING',
+    'default_hospital_id',
+    'done_patient_ids',
+    'is_pending',
+    'patient_state_update',
+    'read_slot_states',
+    'retry_state',
+    'set_patient_state',
+    'slot_doc_id',
+]
@@ -0,0 +1,138 @@
+import os
+import json
+import time
+import base64
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+from google.auth.transport.requests import Request as GoogleRequest
+from google.oauth2 import id_token
+
+logger = logging.getLogger(__name__)
+
+# Refresh in the background this long before a token expires...
+A2A_TOKEN_REFRESH_AHEAD_SECONDS = float(os.environ.get("A2A_TOKEN_REFRESH_AHEAD_SECONDS", "300"))
+# ...and never hand out a token closer than this to its expiry
+A2A_TOKEN_EXPIRY_MARGIN_SECONDS = float(os.environ.get("A2A_TOKEN_EXPIRY_MARGIN_SECONDS", "60"))
+
+# Used when a token's `exp` claim cannot be read
+DEFAULT_TOKEN_LIFETIME_SECONDS = 3600.0
+
+
+def needs_id_token(url: str) -> bool:
+    """Cloud Run services (`*.run.app`) require an OIDC ID token."""
+    return "run.app" in url
+
+
+def audience_for(url: str) -> str:
+    """Token audience for an A2A URL: the service root, without `/rpc` or a trailing slash."""
+    audience = url[:-4] if url.endswith("/rpc") else url
+    return audience.rstrip("/")
+
+
+def token_expiry(token: str) -> float:
+    """Expiry (epoch seconds) from a JWT's `exp` claim. The signature is not checked."""
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return time.time() + DEFAULT_TOKEN_LIFETIME_SECONDS
+
+
+def _fetch(audience: str) -> str:
+    return id_token.fetch_id_token(GoogleRequest(), audience)
+
+
+class IdTokenCache:
+    """
+    Google ID tokens per audience, reused until shortly before they expire.
+
+    `fetch_id_token` is a blocking HTTP call, so it always runs in a worker
+    thread. A token inside the refresh window is still served while a
+    background task replaces it; concurrent misses share one fetch.
+    """
+
+    def __init__(
+        self,
+        refresh_ahead_seconds: float = A2A_TOKEN_REFRESH_AHEAD_SECONDS,
+        expiry_margin_seconds: float = A2A_TOKEN_EXPIRY_MARGIN_SECONDS,
+    ):
+        self.refresh_ahead_seconds = refresh_ahead_seconds
+        self.expiry_margin_seconds = expiry_margin_seconds
+        self._tokens: Dict[str, Tuple[str, float]] = {}
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.stats = {"hits": 0, "misses": 0, "refreshes": 0, "failures": 0}
+
+    async def get(self, audience: str) -> str:
+        """Return a valid ID token for `audience`, fetching one if needed."""
+        entry = self._tokens.get(audience)
+        now = time.time()
+        if entry and entry[1] - now > self.expiry_margin_seconds:
+            self.stats["hits"] += 1
+            if entry[1] - now <= self.refresh_ahead_seconds and audience not in self._in_flight:
+                self.stats["refreshes"] += 1
+                self._start_fetch(audience)
+            return entry[0]
+
+        self.stats["misses"] += 1
+        task = self._in_flight.get(audience) or self._start_fetch(audience)
+        return await asyncio.shield(task)
+
+    def _start_fetch(self, audience: str) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(self._fetch(audience))
+        self._in_flight[audience] = task
+        return task
+
+    async def _fetch(self, audience: str) -> str:
+        try:
+            token = await asyncio.to_thread(_fetch, audience)
+            self._tokens[audience] = (token, token_expiry(token))
+            return token
+        except Exception as e:
+            self.stats["failures"] += 1
+            logger.warning(f"Failed to fetch ID token for {audience}: {e}")
+            raise
+        finally:
+            self._in_flight.pop(audience, None)
+
+    def invalidate(self, audience: Optional[str] = None) -> None:
+        if audience is None:
+            self._tokens.clear()
+        else:
+            self._tokens.pop(audience, None)
+
+    async def close(self) -> None:
+        for task in list(self._in_flight.values()):
+            task.cancel()
+        self._in_flight.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {"audiences": len(self._tokens), **self.stats}
+
+
+class IdTokenAuth(httpx.Auth):
+    """
+    httpx auth attaching a cached ID token to requests for Cloud Run URLs.
+
+    Used by clients the A2A SDK drives itself (e.g. the push notification
+    sender), so their requests share the IdTokenCache of the A2A client.
+    The audience is the target's origin.
+    """
+
+    def __init__(self, tokens: IdTokenCache):
+        self.tokens = tokens
+
+    async def async_auth_flow(self, request: httpx.Request):
+        url = str(request.url)
+        if needs_id_token(url):
+            parts = urlsplit(url)
+            try:
+                token = await self.tokens.get(f"{parts.scheme}://{parts.netloc}")
+                request.headers["Authorization"] = f"Bearer {token}"
+            except Exception as e:
+                logger.warning(f"Continuing without ID token for {url}: {e}")
+        yield request
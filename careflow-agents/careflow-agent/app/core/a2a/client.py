@@ -0,0 +1,242 @@
+import os
+import uuid
+import logging
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Dict, Optional
+from urllib.parse import urljoin, urlsplit
+
+import aiohttp
+from a2a.types import AgentCard
+
+from .auth import IdTokenCache, audience_for, needs_id_token
+from .sse import iter_sse_data
+
+logger = logging.getLogger(__name__)
+
+A2A_POOL_SIZE = int(os.environ.get("A2A_POOL_SIZE", "32"))
+A2A_KEEPALIVE_SECONDS = float(os.environ.get("A2A_KEEPALIVE_SECONDS", "60"))
+A2A_CONNECT_TIMEOUT_SECONDS = float(os.environ.get("A2A_CONNECT_TIMEOUT_SECONDS", "10"))
+# `stream_task` defaults: max silence between SSE chunks, and the whole stream
+A2A_STREAM_IDLE_TIMEOUT_SECONDS = float(os.environ.get("A2A_STREAM_IDLE_TIMEOUT_SECONDS", "60"))
+A2A_STREAM_TIMEOUT_SECONDS = float(os.environ.get("A2A_STREAM_TIMEOUT_SECONDS", "180"))
+
+CARD_PATH = "/.well-known/agent-card.json"
+
+
+class A2ARpcError(Exception):
+    """
+    JSON-RPC error object returned by a remote agent.
+
+    `mid_stream` is set when the error arrived after other stream events,
+    i.e. once the remote agent had already started on the request.
+    """
+
+    def __init__(self, error: Dict[str, Any], mid_stream: bool = False):
+        self.code = error.get("code")
+        self.mid_stream = mid_stream
+        self.message = error.get("message") or "Unknown error"
+        self.data = error.get("data")
+        super().__init__(f"{self.code}: {self.message}")
+
+
+def rpc_request(method: str, params: Dict[str, Any], request_id: Any = None) -> Dict[str, Any]:
+    """JSON-RPC 2.0 envelope for an A2A call."""
+    return {
+        "jsonrpc": "2.0",
+        "method": method,
+        "id": request_id if request_id is not None else str(uuid.uuid4()),
+        "params": params,
+    }
+
+
+class A2AClient:
+    """
+    Shared HTTP client for A2A hops between the agents.
+
+    - one keep-alive aiohttp session (connection pool) per target origin,
+      created on first use and reused for every later call
+    - Cloud Run ID tokens from an IdTokenCache
+    - SSE responses parsed by `iter_sse_data`
+
+    Callers never close the sessions; `close()` runs at server shutdown.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = A2A_POOL_SIZE,
+        keepalive_seconds: float = A2A_KEEPALIVE_SECONDS,
+        tokens: Optional[IdTokenCache] = None,
+    ):
+        self.pool_size = pool_size
+        self.keepalive_seconds = keepalive_seconds
+        self.tokens = tokens or IdTokenCache()
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+        self.stats = {"requests": 0, "errors": 0, "sessionsOpened": 0}
+
+    # =========================================================================
+    # CONNECTIONS
+    # =========================================================================
+
+    def session(self, url: str) -> aiohttp.ClientSession:
+        """Pooled session for the origin of `url`."""
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        session = self._sessions.get(origin)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit_per_host=self.pool_size,
+                    keepalive_timeout=self.keepalive_seconds,
+                ),
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=A2A_CONNECT_TIMEOUT_SECONDS),
+            )
+            self._sessions[origin] = session
+            self.stats["sessionsOpened"] += 1
+        return session
+
+    async def headers(self, url: str, stream: bool = False) -> Dict[str, str]:
+        """Request headers, with an ID token for Cloud Run targets."""
+        headers = {
+            "Content-Type": "application/json",
+            "Accept": "text/event-stream" if stream else "application/json",
+        }
+        if needs_id_token(url):
+            try:
+                headers["Authorization"] = f"Bearer {await self.tokens.get(audience_for(url))}"
+            except Exception as e:
+                logger.warning(f"Continuing without ID token for {url}: {e}")
+        return headers
+
+    @staticmethod
+    def _timeout(timeout: Optional[float]) -> Dict[str, Any]:
+        # Without an explicit timeout the session default (connect timeout only) applies
+        return {"timeout": aiohttp.ClientTimeout(total=timeout)} if timeout else {}
+
+    async def close(self) -> None:
+        for session in self._sessions.values():
+            if not session.closed:
+                await session.close()
+        self._sessions.clear()
+        await self.tokens.close()
+
+    # =========================================================================
+    # CALLS
+    # =========================================================================
+
+    async def get_agent_card(self, server_url: str) -> Optional[AgentCard]:
+        """Fetch a server's agent card, or None if it is unavailable."""
+        url = urljoin(server_url, CARD_PATH)
+        self.stats["requests"] += 1
+        try:
+            async with self.session(url).get(url, headers=await self.headers(server_url)) as response:
+                if not response.ok:
+                    self.stats["errors"] += 1
+                    return None
+                return AgentCard.model_validate(await response.json())
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"Error fetching card from {server_url}: {e}")
+            return None
+
+    async def post_rpc(
+        self,
+        url: str,
+        payload: Dict[str, Any],
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        POST a JSON-RPC request and return the decoded JSON body.
+
+        Raises:
+            aiohttp.ClientResponseError: On a non-2xx response
+        """
+        self.stats["requests"] += 1
+        try:
+            async with self.session(url).post(
+                url,
+                json=payload,
+                headers=await self.headers(url),
+                **self._timeout(timeout),
+            ) as response:
+                response.raise_for_status()
+                return await response.json(content_type=None)
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+
+    async def stream_rpc(
+        self,
+        url: str,
+        payload: Dict[str, Any],
+        timeout: Optional[float] = None,
+        idle_timeout: Optional[float] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        POST a streaming JSON-RPC request (e.g. `message/stream`) and yield each SSE event.
+
+        Raises:
+            aiohttp.ClientResponseError: On a non-2xx response
+            StreamIdleTimeout: If the stream is silent for `idle_timeout` seconds
+        """
+        self.stats["requests"] += 1
+        try:
+            async with self.session(url).post(
+                url,
+                json=payload,
+                headers=await self.headers(url, stream=True),
+                **self._timeout(timeout),
+            ) as response:
+                if not response.ok:
+                    raise aiohttp.ClientResponseError(
+                        response.request_info, (), status=response.status, message=response.reason or ""
+                    )
+                async for event in iter_sse_data(response, idle_timeout):
+                    yield event
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+
+    async def stream_task(
+        self,
+        url: str,
+        payload: Dict[str, Any],
+        timeout: Optional[float] = A2A_STREAM_TIMEOUT_SECONDS,
+        idle_timeout: Optional[float] = A2A_STREAM_IDLE_TIMEOUT_SECONDS,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield the `result` of each event of a `message/stream` call as it arrives.
+
+        Intermediate events (e.g. `working` status updates) are yielded too;
+        iteration ends after the result marked `final: true`, or when the
+        server closes the stream.
+
+        Raises:
+            A2ARpcError: If an event carries a JSON-RPC error
+            aiohttp.ClientResponseError: On a non-2xx response
+            StreamIdleTimeout: If the stream is silent for `idle_timeout` seconds
+            asyncio.TimeoutError: If the stream outlives `timeout` seconds
+        """
+        stream = self.stream_rpc(url, payload, timeout=timeout, idle_timeout=idle_timeout)
+        started = False
+        async with aclosing(stream) as events:
+            async for event in events:
+                if event.get("error"):
+                    raise A2ARpcError(event["error"], mid_stream=started)
+                result = event.get("result")
+                if result is None:
+                    continue
+                started = True
+                yield result
+                if isinstance(result, dict) and result.get("final"):
+                    return
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "pools": len(self._sessions),
+            **self.stats,
+            "idTokens": self.tokens.get_metrics(),
+        }
+
+
+# Process-wide client shared by tools, webhooks and workers
+a2a_client = A2AClient()
@@ -0,0 +1,239 @@
+import os
+import time
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from a2a.types import AgentCard, AgentExtension
+
+logger = logging.getLogger(__name__)
+
+LATENCY_EXTENSION_URI = "https://github.com/twilio-labs/a2a-latency-extension"
+
+# Samples older than one to two windows no longer count
+A2A_LATENCY_WINDOW_SECONDS = float(os.environ.get("A2A_LATENCY_WINDOW_SECONDS", "900"))
+# Below this many samples a skill advertises its static latency (if any)
+A2A_LATENCY_MIN_SAMPLES = int(os.environ.get("A2A_LATENCY_MIN_SAMPLES", "20"))
+
+ADVERTISED_PERCENTILES = (("p50", 0.50), ("p90", 0.90), ("p99", 0.99))
+
+# 2**5 sub-buckets per power of two: at most ~3% relative error
+_SUB_BUCKET_BITS = 5
+_SUB_BUCKETS = 1 << _SUB_BUCKET_BITS
+
+
+def _bucket(ms: int) -> int:
+    if ms < 2 * _SUB_BUCKETS:
+        return ms
+    shift = ms.bit_length() - _SUB_BUCKET_BITS - 1
+    return shift * _SUB_BUCKETS + (ms >> shift)
+
+
+def _bucket_range(index: int) -> Tuple[int, int]:
+    if index < 2 * _SUB_BUCKETS:
+        return index, index
+    shift = index // _SUB_BUCKETS - 1
+    mantissa = index - shift * _SUB_BUCKETS
+    return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """
+    Log-linear (HDR-style) histogram of millisecond latencies.
+
+    Values up to 64ms are counted exactly; above that each power of two is
+    split into 32 buckets, so recording is O(1), memory stays a few hundred
+    counters whatever the sample count, and percentiles are within ~3%.
+    """
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.max = 0
+
+    def record(self, ms: float) -> None:
+        value = max(0, int(round(ms)))
+        index = _bucket(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.max = max(self.max, value)
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """Add another histogram's samples to this one."""
+        for index, n in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + n
+        self.count += other.count
+        self.max = max(self.max, other.max)
+        return self
+
+    def percentile(self, q: float, above_ms: float = 0) -> Optional[int]:
+        """
+        Value at quantile `q` (0-1), or None if there are no samples.
+
+        With `above_ms`, only samples slower than that are considered, i.e.
+        the latency distribution of requests already running that long.
+        """
+        buckets = sorted(
+            (i, n) for i, n in self.counts.items() if _bucket_range(i)[1] > above_ms
+        )
+        total = sum(n for _, n in buckets)
+        if not total:
+            return None
+        rank = max(1, int(q * total + 0.5))
+        seen = 0
+        for index, n in buckets:
+            seen += n
+            if seen >= rank:
+                low, high = _bucket_range(index)
+                return min((low + high) // 2, self.max)
+        return self.max
+
+
+class SkillLatencyTracker:
+    """
+    Measured latency of each A2A skill, published through the latency extension.
+
+    Executors `record()` how long each task took. The agent card served at
+    /.well-known/agent-card.json is rebuilt per request (`card_modifier`)
+    with live p50/p90/p99 values, and `expected_remaining_ms()` gives the
+    estimate sent in latency task updates.
+
+    Samples are kept in a current and a previous window of `window_seconds`,
+    so the numbers follow the last 15-30 minutes of traffic.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = A2A_LATENCY_WINDOW_SECONDS,
+        min_samples: int = A2A_LATENCY_MIN_SAMPLES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.window_seconds = window_seconds
+        self.min_samples = min_samples
+        self.clock = clock
+        self.task_updates = False
+        self.static: Dict[str, Dict[str, float]] = {}
+        self._windows: Dict[str, Tuple[LatencyHistogram, LatencyHistogram]] = {}
+        self._window_start = clock()
+
+    def configure(
+        self,
+        task_updates: Optional[bool] = None,
+        static: Optional[Iterable[Dict[str, Any]]] = None,
+    ) -> None:
+        """
+        Set whether latency task updates are sent, and the static fallback.
+
+        Args:
+            task_updates: Advertise and send latency task updates
+            static: Entries like {"skill": "id", "p50": ms, "p90": ms, "p99": ms},
+                advertised until a skill has `min_samples` measurements
+        """
+        if task_updates is not None:
+            self.task_updates = task_updates
+        if static is not None:
+            self.static = {
+                entry["skill"]: {k: v for k, v in entry.items() if k != "skill"}
+                for entry in static
+                if isinstance(entry, dict) and entry.get("skill")
+            }
+
+    def record(self, skill: str, ms: float) -> None:
+        """Record how long a task of `skill` took, in milliseconds."""
+        self._rotate()
+        if skill not in self._windows:
+            self._windows[skill] = (LatencyHistogram(), LatencyHistogram())
+        self._windows[skill][0].record(ms)
+
+    def histogram(self, skill: str) -> LatencyHistogram:
+        """Samples of the current and previous window, merged."""
+        self._rotate()
+        current, previous = self._windows.get(skill, (LatencyHistogram(), LatencyHistogram()))
+        return LatencyHistogram().merge(current).merge(previous)
+
+    def percentiles(self, skill: str) -> Optional[Dict[str, float]]:
+        """Advertised p50/p90/p99 of a skill (measured, else static, else None)."""
+        histogram = self.histogram(skill)
+        if histogram.count >= max(1, self.min_samples):
+            return {name: histogram.percentile(q) for name, q in ADVERTISED_PERCENTILES}
+        return self.static.get(skill)
+
+    def expected_remaining_ms(self, skill: str, elapsed_ms: float = 0) -> Optional[int]:
+        """
+        Median remaining time of a task of `skill` that has run `elapsed_ms`.
+
+        Uses the measured tasks that took longer than `elapsed_ms`; falls back
+        to the advertised p50 if there are too few.
+        """
+        histogram = self.histogram(skill)
+        if histogram.count >= max(1, self.min_samples):
+            median = histogram.percentile(0.5, above_ms=elapsed_ms)
+            if median is not None:
+                return max(0, int(median - elapsed_ms))
+        p50 = (self.static.get(skill) or {}).get("p50")
+        if p50 is None:
+            return None
+        return max(0, int(p50 - elapsed_ms))
+
+    def extension(self, skill_ids: Iterable[str]) -> AgentExtension:
+        """
+        Latency extension for an agent card.
+
+        `skillLatency` keeps the extension's flat shape (the slowest skill's
+        percentiles); `skills` carries the per-skill breakdown.
+        """
+        skills = {}
+        for skill in skill_ids:
+            values = self.percentiles(skill)
+            if values:
+                skills[skill] = values
+        params: Dict[str, Any] = {"supportsLatencyTaskUpdates": self.task_updates}
+        if skills:
+            params["skillLatency"] = max(skills.values(), key=lambda v: v.get("p50") or 0)
+            params["skills"] = skills
+        return AgentExtension(
+            uri=LATENCY_EXTENSION_URI,
+            description=(
+                "Measured task latency per skill (milliseconds). With "
+                "supportsLatencyTaskUpdates, working status updates carry a "
+                "DataPart {\"latency\": expected remaining ms}."
+            ),
+            params=params,
+        )
+
+    def apply(self, card: AgentCard) -> AgentCard:
+        """Copy of `card` with a fresh latency extension (A2A `card_modifier`)."""
+        card = card.model_copy(deep=True)
+        others: List[AgentExtension] = [
+            e for e in (card.capabilities.extensions or []) if e.uri != LATENCY_EXTENSION_URI
+        ]
+        card.capabilities.extensions = others + [self.extension(s.id for s in card.skills)]
+        return card
+
+    def _rotate(self) -> None:
+        now = self.clock()
+        elapsed = now - self._window_start
+        if elapsed < self.window_seconds:
+            return
+        if elapsed >= 2 * self.window_seconds:
+            self._windows.clear()
+        else:
+            self._windows = {
+                skill: (LatencyHistogram(), current)
+                for skill, (current, _) in self._windows.items()
+            }
+        self._window_start = now
+
+    def get_metrics(self) -> Dict[str, Any]:
+        metrics: Dict[str, Any] = {"taskUpdates": self.task_updates}
+        for skill in sorted(set(self._windows) | set(self.static)):
+            histogram = self.histogram(skill)
+            metrics[skill] = {
+                "samples": histogram.count,
+                "maxMs": histogram.max if histogram.count else None,
+                **{name: histogram.percentile(q) for name, q in ADVERTISED_PERCENTILES},
+            }
+        return metrics
+
+
+# Process-wide tracker fed by the A2A executor and read by the agent card
+skill_latency = SkillLatencyTracker()
@@ -0,0 +1,131 @@
+import re
+import json
+import codecs
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# SSE lines end with CRLF, LF or a lone CR
+_LINE_END = re.compile(r"\r\n|\r|\n")
+
+
+class StreamIdleTimeout(TimeoutError):
+    """No bytes arrived on an SSE stream within the idle timeout."""
+
+
+class SSEParser:
+    """
+    Incremental Server-Sent Events parser.
+
+    Bytes are fed in whatever chunks the transport delivers; a line, a
+    multi-byte UTF-8 character or a multi-line `data:` event may be split
+    across any number of chunks. Each complete event's `data` is decoded as
+    JSON and returned from `feed()`/`close()`. Comments, other fields and
+    payloads that are not valid JSON are skipped.
+    """
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._pending: List[str] = []
+        self._data: List[str] = []
+        self.stats = {"bytes": 0, "events": 0, "skipped": 0}
+
+    def feed(self, chunk: bytes) -> List[Dict[str, Any]]:
+        """Consume a chunk and return the events it completes."""
+        self.stats["bytes"] += len(chunk)
+        text = self._decoder.decode(chunk)
+        if "\n" not in text and "\r" not in text:
+            self._pending.append(text)
+            return []
+        self._pending.append(text)
+        return self._drain(final=False)
+
+    def close(self) -> List[Dict[str, Any]]:
+        """End of stream: return the events still buffered (an unterminated last event included)."""
+        self._pending.append(self._decoder.decode(b"", final=True))
+        events = self._drain(final=True)
+        event = self._dispatch()
+        if event is not None:
+            events.append(event)
+        return events
+
+    def _drain(self, final: bool) -> List[Dict[str, Any]]:
+        buffer = "".join(self._pending)
+        self._pending.clear()
+
+        events = []
+        start = 0
+        for match in _LINE_END.finditer(buffer):
+            # A CR at the end of the buffer may be the first half of a CRLF
+            if match.group() == "\r" and match.end() == len(buffer) and not final:
+                break
+            event = self._line(buffer[start:match.start()])
+            if event is not None:
+                events.append(event)
+            start = match.end()
+
+        rest = buffer[start:]
+        if final:
+            if rest:
+                event = self._line(rest)
+                if event is not None:
+                    events.append(event)
+        elif rest:
+            self._pending.append(rest)
+        return events
+
+    def _line(self, line: str) -> Optional[Dict[str, Any]]:
+        if not line:
+            return self._dispatch()
+        if line.startswith(":"):
+            return None
+        field, _, value = line.partition(":")
+        if field == "data":
+            self._data.append(value[1:] if value.startswith(" ") else value)
+        return None
+
+    def _dispatch(self) -> Optional[Dict[str, Any]]:
+        if not self._data:
+            return None
+        raw = "\n".join(self._data)
+        self._data.clear()
+        try:
+            event = json.loads(raw)
+        except json.JSONDecodeError:
+            self.stats["skipped"] += 1
+            logger.debug(f"Skipping non-JSON SSE payload: {raw[:200]}")
+            return None
+        self.stats["events"] += 1
+        return event
+
+
+async def iter_sse_data(response, idle_timeout: Optional[float] = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield the JSON payload of each Server-Sent Event in an aiohttp response.
+
+    Reads raw chunks (`iter_any`) rather than lines, so events are not
+    limited by aiohttp's line-length cap and are yielded as soon as their
+    terminating blank line arrives.
+
+    Raises:
+        StreamIdleTimeout: If no chunk arrives for `idle_timeout` seconds
+    """
+    parser = SSEParser()
+    chunks = response.content.iter_any().__aiter__()
+    while True:
+        try:
+            if idle_timeout:
+                chunk = await asyncio.wait_for(chunks.__anext__(), idle_timeout)
+            else:
+                chunk = await chunks.__anext__()
+        except StopAsyncIteration:
+            break
+        except asyncio.TimeoutError:
+            raise StreamIdleTimeout(f"No SSE data for {idle_timeout:g}s") from None
+        for event in parser.feed(chunk):
+            yield event
+
+    for event in parser.close():
+        yield event
@@ -0,0 +1,261 @@
+"""
+CareFlow Pulse - Session Compaction Plugin
+
+A round runs inside one ADK session (`rounds-{slot}`): every tool call,
+tool result and Caller response is appended to it, and each later LLM step
+re-sends the whole transcript, so cost and latency grow quadratically over
+a round.
+
+Before each model call this plugin bounds what is sent:
+- the opening user message (the round trigger) is kept,
+- the last SESSION_COMPACTION_KEEP_STEPS model steps (with their tool
+  results) are kept verbatim,
+- everything in between is replaced by a rolling summary, one line per tool
+  call / result / reply, truncated, capped at SESSION_COMPACTION_SUMMARY_LINES,
+- except the patient roster: the latest result of each schedule / pending
+  page (ROSTER_TOOLS) is appended to the summary verbatim, so the model
+  still knows which patients the round covers.
+
+The session itself is not modified; only the outgoing request is. Requests
+under SESSION_COMPACTION_TRIGGER_TOKENS are left untouched, so short
+sessions (e.g. a single post-call audit) are unaffected. Context size per
+step, before and after compaction, is recorded on the current trace span
+and exposed through get_metrics().
+"""
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, Collection, Dict, List, Optional, Set, Tuple
+
+from google.adk.plugins import BasePlugin
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types as genai_types
+from opentelemetry import trace
+
+from app.app_utils.config_loader import (
+    SESSION_COMPACTION_ENABLED,
+    SESSION_COMPACTION_KEEP_STEPS,
+    SESSION_COMPACTION_SUMMARY_LINES,
+    SESSION_COMPACTION_TRIGGER_TOKENS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Rough Gemini tokenizer ratio for text / JSON
+CHARS_PER_TOKEN = 4
+
+# Characters kept per summarized item
+SUMMARY_ITEM_CHARS = 160
+
+# Sessions tracked for GET /metrics
+MAX_TRACKED_SESSIONS = 50
+
+SUMMARY_HEADER = "[Earlier steps of this session, summarized to save context]"
+ROSTER_HEADER = "[Latest patient roster pages, verbatim]"
+
+# Tools returning pages of the round's patients (never clipped)
+ROSTER_TOOLS = frozenset({"fetch_daily_schedule", "get_pending_patients"})
+
+
+# =============================================================================
+# SIZE
+# =============================================================================
+
+def _part_chars(part: genai_types.Part) -> int:
+    if part.text:
+        return len(part.text)
+    if part.function_call:
+        return len(part.function_call.name or "") + len(json.dumps(part.function_call.args or {}, default=str))
+    if part.function_response:
+        return len(part.function_response.name or "") + len(json.dumps(part.function_response.response or {}, default=str))
+    return 0
+
+
+def estimate_tokens(contents: List[genai_types.Content]) -> int:
+    """Estimated prompt tokens for text, tool calls and tool results (media excluded)."""
+    chars = sum(_part_chars(part) for content in contents for part in (content.parts or []))
+    return chars // CHARS_PER_TOKEN
+
+
+# =============================================================================
+# COMPACTION
+# =============================================================================
+
+def _clip(text: str) -> str:
+    text = " ".join(str(text).split())
+    return text if len(text) <= SUMMARY_ITEM_CHARS else text[:SUMMARY_ITEM_CHARS - 1] + "…"
+
+
+def _describe(content: genai_types.Content, skip: Collection[int] = ()) -> List[str]:
+    lines = []
+    for index, part in enumerate(content.parts or []):
+        if getattr(part, "thought", False) or index in skip:
+            continue
+        if part.function_call:
+            args = json.dumps(part.function_call.args or {}, default=str, separators=(",", ":"))
+            lines.append(f"- called {part.function_call.name}({_clip(args)})")
+        elif part.function_response:
+            result = json.dumps(part.function_response.response or {}, default=str, separators=(",", ":"))
+            lines.append(f"  -> {part.function_response.name}: {_clip(result)}")
+        elif part.text:
+            who = "agent" if content.role == "model" else "user"
+            lines.append(f"- {who}: {_clip(part.text)}")
+    return lines
+
+
+def _latest_roster_pages(contents: List[genai_types.Content]) -> Set[Tuple[int, int]]:
+    """(content, part) positions of the latest result of each roster page, keyed by tool and cursor."""
+    cursors: Dict[str, Any] = {}
+    latest: Dict[Tuple[str, Any], Tuple[int, int]] = {}
+    for i, content in enumerate(contents):
+        for j, part in enumerate(content.parts or []):
+            if part.function_call and part.function_call.name in ROSTER_TOOLS:
+                call_id = part.function_call.id or part.function_call.name
+                cursors[call_id] = (part.function_call.args or {}).get("cursor")
+            elif part.function_response and part.function_response.name in ROSTER_TOOLS:
+                name = part.function_response.name
+                latest[(name, cursors.get(part.function_response.id or name))] = (i, j)
+    return set(latest.values())
+
+
+def _roster_page(response: genai_types.FunctionResponse) -> str:
+    # Tools return the page as a JSON string, wrapped by ADK as {"result": ...}
+    result = (response.response or {}).get("result")
+    if not isinstance(result, str):
+        result = json.dumps(response.response or {}, default=str, separators=(",", ":"))
+    return f"{response.name}: {result}"
+
+
+def compact_contents(
+    contents: List[genai_types.Content],
+    keep_steps: int = SESSION_COMPACTION_KEEP_STEPS,
+    summary_lines: int = SESSION_COMPACTION_SUMMARY_LINES,
+) -> Optional[List[genai_types.Content]]:
+    """
+    Replace the middle of a transcript with a rolling summary.
+
+    The kept window starts at a model step, so every function call stays
+    next to its function response. Roster pages that only appear in the
+    summarized part are carried over in full after the summary lines.
+
+    Returns:
+        The compacted contents, or None if there is nothing to compact
+    """
+    if len(contents) < 3:
+        return None
+
+    model_steps = [i for i, c in enumerate(contents) if i > 0 and c.role == "model"]
+    if len(model_steps) <= keep_steps:
+        return None
+    start = model_steps[-keep_steps] if keep_steps > 0 else len(contents)
+    if start <= 1:
+        return None
+
+    roster = sorted(pos for pos in _latest_roster_pages(contents) if pos[0] < start)
+    lines = [
+        line
+        for i in range(1, start)
+        for line in _describe(contents[i], skip={j for ci, j in roster if ci == i})
+    ]
+    omitted = max(0, len(lines) - summary_lines)
+    if omitted:
+        lines = [f"- ({omitted} earlier items omitted)"] + lines[-summary_lines:]
+    if roster:
+        lines += [ROSTER_HEADER] + [_roster_page(contents[i].parts[j].function_response) for i, j in roster]
+
+    summary = genai_types.Content(
+        role="user",
+        parts=[genai_types.Part.from_text(text="\n".join([SUMMARY_HEADER] + lines))],
+    )
+    return [contents[0], summary] + list(contents[start:])
+
+
+# =============================================================================
+# METRICS
+# =============================================================================
+
+_sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_totals = {"steps": 0, "compactedSteps": 0, "tokensBefore": 0, "tokensSent": 0}
+
+
+def _record(session_id: str, before: int, sent: int) -> Dict[str, Any]:
+    stats = _sessions.pop(session_id, None) or {"steps": 0, "compactedSteps": 0, "maxTokens": 0, "maxSentTokens": 0}
+    stats["steps"] += 1
+    stats["compactedSteps"] += int(sent < before)
+    stats["lastTokens"] = before
+    stats["lastSentTokens"] = sent
+    stats["maxTokens"] = max(stats["maxTokens"], before)
+    stats["maxSentTokens"] = max(stats["maxSentTokens"], sent)
+    _sessions[session_id] = stats
+    while len(_sessions) > MAX_TRACKED_SESSIONS:
+        _sessions.popitem(last=False)
+
+    _totals["steps"] += 1
+    _totals["compactedSteps"] += int(sent < before)
+    _totals["tokensBefore"] += before
+    _totals["tokensSent"] += sent
+    return stats
+
+
+def get_metrics() -> Dict[str, Any]:
+    """Per-session context size per step (estimated tokens) and totals."""
+    return {
+        "enabled": SESSION_COMPACTION_ENABLED,
+        "triggerTokens": SESSION_COMPACTION_TRIGGER_TOKENS,
+        **_totals,
+        "sessions": dict(_sessions),
+    }
+
+
+# =============================================================================
+# PLUGIN
+# =============================================================================
+
+class SessionCompactionPlugin(BasePlugin):
+    """
+    ADK Plugin that keeps per-step LLM context bounded in long sessions.
+    """
+    def __init__(
+        self,
+        trigger_tokens: int = SESSION_COMPACTION_TRIGGER_TOKENS,
+        keep_steps: int = SESSION_COMPACTION_KEEP_STEPS,
+        summary_lines: int = SESSION_COMPACTION_SUMMARY_LINES,
+        enabled: bool = SESSION_COMPACTION_ENABLED,
+    ):
+        super().__init__(name="session_compaction")
+        self.trigger_tokens = trigger_tokens
+        self.keep_steps = keep_steps
+        self.summary_lines = summary_lines
+        self.enabled = enabled
+
+    async def before_model_callback(self, callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+        """
+        Compacts the outgoing request when it exceeds the trigger size and records its size.
+        """
+        contents = llm_request.contents or []
+        before = estimate_tokens(contents)
+        sent = before
+
+        if self.enabled and before > self.trigger_tokens:
+            compacted = compact_contents(contents, self.keep_steps, self.summary_lines)
+            if compacted is not None:
+                llm_request.contents = compacted
+                sent = estimate_tokens(compacted)
+                logger.info(
+                    f"🗜️ Compacted context for {callback_context.agent_name}: "
+                    f"{len(contents)} -> {len(compacted)} contents, ~{before} -> ~{sent} tokens"
+                )
+
+        try:
+            session_id = callback_context._invocation_context.session.id
+        except AttributeError:
+            session_id = callback_context.invocation_id
+        stats = _record(session_id, before, sent)
+
+        span = trace.get_current_span()
+        span.set_attribute("careflow.context.tokens_estimated", before)
+        span.set_attribute("careflow.context.tokens_sent", sent)
+        span.set_attribute("careflow.context.step", stats["steps"])
+        return None
@@ -9,6 +9,7 @@ from a2a.types import (
     AgentProvider
 )
 from app.app_utils.config_loader import SERVICE_URL
+from app.core.a2a import skill_latency
 
 def get_pulse_agent_card() -> AgentCard:
     """
@@ -27,6 +28,9 @@ def get_pulse_agent_card() -> AgentCard:
             streaming=True,
             pushNotifications=True,
             stateTransitionHistory=True,
+            # Measured p50/p90/p99 per skill; the served card is refreshed on
+            # every request by `skill_latency.apply` (card_modifier)
+            extensions=[skill_latency.extension(["patient_monitoring"])],
         ),
         defaultInputModes=["text"],
         defaultOutputModes=["text", "task-status"],
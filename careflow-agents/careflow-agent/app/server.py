@@ -2,14 +2,15 @@
 CareFlow Pulse Server
 A2A Protocol Backend Entry Point with Scheduler Support.
 """
-import os
 import logging
 import httpx
 import uvicorn
 import argparse
 import sys
 import json
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
 from a2a.server.tasks import InMemoryTaskStore
@@ -18,20 +19,42 @@ from a2a.server.tasks.base_push_notification_sender import BasePushNotificationS
 from a2a.types import Message, Role, Part, TextPart
 
 # Modularized Imports
-from app.app_utils.config_loader import PORT, AGENT_NAME
+from app.app_utils.config_loader import PORT, AGENT_NAME, A2A_PUSH_TOKEN, SUPPORTS_LATENCY_TASK_UPDATES
 from app.app_utils.telemetry import setup_telemetry
 from app.agent import root_agent
 from app.app_utils.executor.careflow_executor import CareFlowAgentExecutor
 from app.schemas.agent_card.v1.careflow_card import get_pulse_agent_card
-from app.app_utils.run_patient_rounds import trigger_agent_rounds, schedule_retry_task
+from app.app_utils.run_patient_rounds import trigger_agent_rounds, schedule_retry_task, rounds_reports
 from app.app_utils.retry_utils import get_schedule_slot_key
+from app.app_utils import clinical_record
+from app.app_utils import firestore_client
+from app.app_utils.patient_cache import patient_cache
+from app.tools import mcp__tool_loader
+from app.plugins import session_compaction_plugin
+from app.app_utils import session_store
+from app.app_utils import slot_index
+from app.app_utils.dispatch_tracker import dispatch_tracker
+from app.core.a2a import a2a_client, skill_latency
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared clients on startup and close them on shutdown."""
+    firestore_client.get_db()
+    # MCP toolset loads in the background; startup does not wait for it
+    mcp__tool_loader.start_mcp_tools_load()
+    yield
+    await mcp__tool_loader.close_mcp_tools()
+    await a2a_client.close()
+    patient_cache.close()
+    await firestore_client.close_db()
+
+
 # Create Main FastAPI App
-app = FastAPI(title="CareFlow Pulse Agent", version="1.0.0")
+app = FastAPI(title="CareFlow Pulse Agent", version="1.0.0", lifespan=lifespan)
 
 def create_a2a_app():
     """
@@ -55,9 +78,12 @@ def create_a2a_app():
     )
 
     # 4. Create App with Agent Card
+    # Card served with live per-skill latency percentiles
+    skill_latency.configure(task_updates=SUPPORTS_LATENCY_TASK_UPDATES)
     a2a_app = A2AStarletteApplication(
         agent_card=get_pulse_agent_card(),
-        http_handler=request_handler
+        http_handler=request_handler,
+        card_modifier=skill_latency.apply,
     ).build()
     
     # 5. Configure Telemetry for A2A
@@ -176,6 +202,10 @@ async def retry_rounds(request: Request):
         MAX_RETRIES = 3
         if retry_count >= MAX_RETRIES:
             logger.warning(f"⚠️ Max retries ({MAX_RETRIES}) reached for {patient_id}")
+            await slot_index.set_patient_state(
+                firestore_client.get_db(), patient_id, schedule_slot, slot_index.STATE_FAILED,
+                retryCount=retry_count, reason=reason,
+            )
             await _create_max_retry_alert(patient_id, schedule_slot, retry_count)
             return {
                 "status": "max_retries_reached",
@@ -184,6 +214,11 @@ async def retry_rounds(request: Request):
                 "action": "critical_alert_created"
             }
         
+        await slot_index.set_patient_state(
+            firestore_client.get_db(), patient_id, schedule_slot, slot_index.retry_state(retry_count),
+            retryCount=retry_count, reason=reason,
+        )
+        
         # Trigger single patient call via agent
         prompt = (
             f"RETRY_PATIENT: Call patient ID {patient_id} now. "
@@ -205,55 +240,94 @@ async def retry_rounds(request: Request):
         return {"status": "error", "message": str(e)}
 
 
+@app.post("/a2a/task-updates")
+async def caller_task_update(request: Request):
+    """
+    Push notification webhook for Caller tasks dispatched with a non-blocking
+    `message/send` (CALLER_DISPATCH_MODE=async).
+
+    Receives the Caller's Task JSON on every task update; finished tasks are
+    resolved by the dispatch tracker.
+    """
+    if A2A_PUSH_TOKEN and request.headers.get("X-A2A-Notification-Token") != A2A_PUSH_TOKEN:
+        logger.warning("🚫 Rejected Caller task update with a missing or wrong notification token")
+        return JSONResponse({"status": "unauthorized"}, status_code=401)
+
+    try:
+        task = await request.json()
+    except Exception:
+        return JSONResponse({"status": "invalid"}, status_code=400)
+
+    state = await dispatch_tracker.on_task_update(task)
+    return {"status": "ok", "taskId": task.get("id"), "state": state}
+
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "agent": AGENT_NAME}
 
 
+@app.get("/metrics")
+async def metrics():
+    """Operational metrics (Firestore latency, patient cache, MCP load time, LLM context size, sessions, A2A client, Caller dispatches, skill latency)."""
+    return {
+        "firestore": firestore_client.get_metrics(),
+        "patientCache": patient_cache.get_metrics(),
+        "mcpToolbox": {
+            "tools": len(mcp__tool_loader.all_tools),
+            "loadMs": round(mcp__tool_loader.load_seconds * 1000, 1) if mcp__tool_loader.load_seconds else None,
+        },
+        "sessionContext": session_compaction_plugin.get_metrics(),
+        "sessionStore": session_store.get_metrics(),
+        "a2aClient": a2a_client.get_metrics(),
+        "callerDispatch": dispatch_tracker.get_metrics(),
+        "skillLatency": skill_latency.get_metrics(),
+    }
+
+
+@app.get("/rounds-report")
+async def rounds_report():
+    """Reports from recent direct-dispatch rounds, newest first."""
+    return {"reports": [r.to_dict() for r in reversed(rounds_reports.values())]}
+
+
 # Mount A2A sub-app AFTER defining specialized routes to avoid shadowing
 app.mount("/", a2a_subapp)
 
 
 async def _create_max_retry_alert(patient_id: str, schedule_slot: str, retry_count: int):
-    """Create a CRITICAL alert when max retries reached."""
+    """Raise the patient's active alert to CRITICAL when max retries reached."""
     try:
-        from google.cloud import firestore
         from datetime import datetime, timezone
         
-        db = firestore.AsyncClient(
-            project=os.environ.get("GOOGLE_CLOUD_PROJECT", "careflow-478811"),
-            database=os.environ.get("FIRESTORE_DATABASE", "careflow-db")
-        )
+        db = firestore_client.get_db()
         
-        # Get patient name for alert
-        patient_ref = db.collection("patients").document(patient_id)
-        patient_doc = await patient_ref.get()
-        patient_name = patient_doc.to_dict().get("name", "Unknown") if patient_doc.exists else "Unknown"
-        
-        # Create CRITICAL alert
-        alert_data = {
-            "patientId": patient_id,
-            "patientName": patient_name,
-            "riskLevel": "RED",
-            "priority": "critical",
-            "trigger": f"Patient unreachable after {retry_count} attempts",
-            "aiBrief": f"URGENT: Unable to reach {patient_name} after {retry_count} call attempts for schedule slot {schedule_slot}. Manual follow-up required immediately.",
-            "status": "active",
-            "createdAt": datetime.now(timezone.utc),
-            "scheduleSlot": schedule_slot,
-            "retryCount": retry_count,
-            "hospitalId": os.environ.get("HOSPITAL_ID", "HOSP001"),
-        }
+        # Patient name for the alert text (cached read)
+        async with firestore_client.track("patients.get"):
+            patient = await patient_cache.get(db, patient_id)
+        patient_name = (patient or {}).get("name", "Unknown")
         
-        await db.collection("alerts").add(alert_data)
-        logger.info(f"🚨 Created CRITICAL alert for unreachable patient {patient_id}")
+        # Patient risk to RED + CRITICAL alert, committed together. The
+        # message goes to the alert only: the patient keeps its last
+        # clinical summary (aiBrief)
+        async with firestore_client.track("clinical.record_assessment"):
+            result = await clinical_record.record_assessment(
+                db,
+                patient_id,
+                "RED",
+                f"URGENT: Unable to reach {patient_name} after {retry_count} call attempts for schedule slot "
+                f"{schedule_slot}. Manual follow-up required immediately.",
+                trigger=f"Patient unreachable after {retry_count} attempts",
+                patient_fields={"lastRetryCount": retry_count, "updatedAt": datetime.now(timezone.utc)},
+                alert_fields={"riskLevel": "RED", "scheduleSlot": schedule_slot, "retryCount": retry_count},
+                update_patient_brief=False,
+            )
         
-        # Update patient risk level to RED
-        await patient_ref.update({
-            "riskLevel": "RED",
-            "lastRetryCount": retry_count,
-            "updatedAt": datetime.now(timezone.utc)
-        })
+        patient_cache.invalidate(patient_id)
+        if result is None:
+            logger.error(f"❌ Cannot create max retry alert: patient {patient_id} not found")
+            return
+        logger.info(f"🚨 CRITICAL alert {result.alert_id} for unreachable patient {patient_id}")
         
     except Exception as e:
         logger.error(f"❌ Failed to create max retry alert: {e}", exc_info=True)
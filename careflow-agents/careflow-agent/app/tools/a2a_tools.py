@@ -1,13 +1,16 @@
-import os
 import re
 import time
 import uuid
-import json
-import aiohttp
+import asyncio
 import logging
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Dict, List
+
+import aiohttp
 from traceloop.sdk.decorators import workflow, task
-from a2a.types import AgentCard, Message, Role, Part, TextPart
-from ..app_utils.config_loader import CAREFLOW_CALLER_URL
+from ..app_utils.config_loader import A2A_PUSH_TOKEN, CAREFLOW_CALLER_URL, PULSE_WEBHOOK_URL
+from ..app_utils.dispatch_tracker import dispatch_tracker
+from ..core.a2a import A2ARpcError, a2a_client, rpc_request
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +19,65 @@ logger = logging.getLogger(__name__)
 _SENT_TASKS: dict[str, float] = {}
 _TASK_DEDUP_WINDOW = 300  # 5 minutes
 
+# Prefix of handoff errors where the Caller provably never started on the
+# request, so the patient can safely be dispatched again
+NOT_DELIVERED = "ERROR: Not Delivered"
+
+
+def handoff_not_delivered(error: BaseException) -> bool:
+    """
+    True if a handoff never reached the Caller: no connection could be made,
+    or the Caller answered with an HTTP or JSON-RPC error before starting.
+    """
+    if isinstance(error, A2ARpcError):
+        return not error.mid_stream
+    return isinstance(error, (aiohttp.ClientConnectorError, aiohttp.ClientResponseError))
+
+
+def _extract_text(result) -> str:
+    """Text of an A2A stream result (status message, text or message)."""
+    if isinstance(result, str):
+        return result
+    if not isinstance(result, dict):
+        return ""
+    if result.get("status", {}).get("message", {}).get("parts"):
+        parts = result["status"]["message"]["parts"]
+        return parts[0].get("text") or "" if parts else ""
+    if result.get("text"):
+        return result["text"]
+    return result.get("message", {}).get("text") or ""
+
+
+def _check_duplicate(task: str) -> str | None:
+    """Dedup: refuse a task for a patient already sent one within the window."""
+    patient_id_match = re.search(r'\(ID:\s*([^)]+)\)', task)
+    if not patient_id_match:
+        return None
+    pid = patient_id_match.group(1).strip()
+    now = time.time()
+    # Cleanup stale entries
+    stale = [k for k, ts in _SENT_TASKS.items() if now - ts > _TASK_DEDUP_WINDOW * 2]
+    for k in stale:
+        del _SENT_TASKS[k]
+    # Check dedup
+    if pid in _SENT_TASKS and (now - _SENT_TASKS[pid]) < _TASK_DEDUP_WINDOW:
+        elapsed = int(now - _SENT_TASKS[pid])
+        logger.warning(f"🚫 Duplicate task for patient {pid} blocked ({elapsed}s ago)")
+        return f"Task for patient {pid} already sent {elapsed}s ago. Do NOT send again."
+    _SENT_TASKS[pid] = now
+    return None
+
+
+def _task_message(task: str) -> dict:
+    message_id = f"task_{int(uuid.uuid1().int >> 64)}_{uuid.uuid4().hex[:9]}"
+    return {
+        "messageId": message_id,
+        "kind": "message",
+        "role": "user",
+        "parts": [{"kind": "text", "text": task}]
+    }
+
+
 @task(name="list_remote_agents")
 async def list_remote_agents() -> str:
     """
@@ -26,16 +88,10 @@ async def list_remote_agents() -> str:
     a2a_servers = [CAREFLOW_CALLER_URL] 
     
     agent_cards = []
-    async with aiohttp.ClientSession() as session:
-        for server_url in a2a_servers:
-            try:
-                agent_card_url = f"{server_url}/.well-known/agent-card.json"
-                async with session.get(agent_card_url, headers={"Accept": "application/json"}) as response:
-                    if response.ok:
-                        card_data = await response.json()
-                        agent_cards.append(AgentCard.model_validate(card_data))
-            except Exception as e:
-                logger.error(f"Error fetching card from {server_url}: {e}")
+    for server_url in a2a_servers:
+        card = await a2a_client.get_agent_card(server_url)
+        if card:
+            agent_cards.append(card)
 
     if not agent_cards:
         return "No remote A2A servers are currently available."
@@ -51,89 +107,159 @@ async def list_remote_agents() -> str:
 async def send_remote_agent_task(task: str, server_url: str = None) -> str:
     """
     Send a task to a specified remote agent for processing using SSE streaming.
-    The tool waits for the complete response and only returns the final result.
+    The tool waits for the final event of the stream and only returns its result.
     If server_url is not provided, it defaults to the CAREFLOW_CALLER_URL.
     """
     try:
         if not server_url:
             server_url = CAREFLOW_CALLER_URL
 
-        # Dedup: extract patient ID from task and check if recently sent
-        patient_id_match = re.search(r'\(ID:\s*([^)]+)\)', task)
-        if patient_id_match:
-            pid = patient_id_match.group(1).strip()
-            now = time.time()
-            # Cleanup stale entries
-            stale = [k for k, ts in _SENT_TASKS.items() if now - ts > _TASK_DEDUP_WINDOW * 2]
-            for k in stale:
-                del _SENT_TASKS[k]
-            # Check dedup
-            if pid in _SENT_TASKS and (now - _SENT_TASKS[pid]) < _TASK_DEDUP_WINDOW:
-                elapsed = int(now - _SENT_TASKS[pid])
-                logger.warning(f"🚫 Duplicate task for patient {pid} blocked ({elapsed}s ago)")
-                return f"Task for patient {pid} already sent {elapsed}s ago. Do NOT send again."
-            _SENT_TASKS[pid] = now
-
-        # Generate IDs
+        duplicate = _check_duplicate(task)
+        if duplicate:
+            return duplicate
+
         request_id = int(uuid.uuid1().int >> 64)
-        task_id = f"task_{int(uuid.uuid1().int >> 64)}_{uuid.uuid4().hex[:9]}"
-
-        rpc_request = {
-            "jsonrpc": "2.0",
-            "method": "message/stream",
-            "id": request_id,
-            "params": {
-                "message": {
-                    "messageId": task_id,
-                    "kind": "message",
-                    "role": "user",
-                    "parts": [{"kind": "text", "text": task}]
-                }
-            }
-        }
+        rpc = rpc_request("message/stream", {"message": _task_message(task)}, request_id)
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                server_url,
-                headers={"Content-Type": "application/json", "Accept": "text/event-stream"},
-                json=rpc_request
-            ) as response:
-                if not response.ok:
-                    return f"Error: HTTP {response.status} {response.reason}"
-
-                final_text = ""
-                print(f"\n[CAREFLOW -> CALLER]: Task sent: {task}")
-                
-                async for line in response.content:
-                    line = line.decode('utf-8').strip()
-                    if line.startswith("data:"):
-                        data_str = line[5:].strip()
-                        try:
-                            data = json.loads(data_str)
-                            if data.get("result"):
-                                res = data["result"]
-                                if isinstance(res, dict):
-                                    if res.get("status", {}).get("message", {}).get("parts"):
-                                        parts = res["status"]["message"]["parts"]
-                                        if parts and parts[0].get("text"):
-                                            final_text = parts[0]["text"]
-                                    elif res.get("text"):
-                                        final_text = res["text"]
-                                    elif res.get("message", {}).get("text"):
-                                        final_text = res["message"]["text"]
-                                elif isinstance(res, str):
-                                    final_text = res
-                        except:
-                            pass
-                
-                    if final_text:
-                        print(f"[CALLER -> CAREFLOW]: Response: {final_text}\n")
-                        return final_text
-                    
-                print(f"[CALLER -> CAREFLOW]: No text response received.\n")
-                return "ERROR: Patient Unreachable - No response text received from Caller Agent."
+        print(f"\n[CAREFLOW -> CALLER]: Task sent: {task}")
+        # Read the whole stream: intermediate `working` updates (e.g. "Processing
+        # your request...") are logged, only the final result is returned
+        final_text = ""
+        try:
+            async with aclosing(a2a_client.stream_task(server_url, rpc)) as results:
+                async for result in results:
+                    text = _extract_text(result)
+                    if isinstance(result, dict) and result.get("final") is False:
+                        logger.debug(f"Caller progress: {text}")
+                        continue
+                    if text:
+                        final_text = text
+        except aiohttp.ClientResponseError as e:
+            return f"{NOT_DELIVERED} - HTTP {e.status} {e.message}"
+        except A2ARpcError as e:
+            return f"{NOT_DELIVERED} - {e.message}" if handoff_not_delivered(e) else f"Error: {e.message}"
+        except aiohttp.ClientConnectorError as e:
+            return f"{NOT_DELIVERED} - {e}"
+        except asyncio.TimeoutError as e:
+            return f"ERROR: Caller Agent timed out - {str(e) or 'no final response'}"
+
+        if final_text:
+            print(f"[CALLER -> CAREFLOW]: Response: {final_text}\n")
+            return final_text
+
+        print(f"[CALLER -> CAREFLOW]: No text response received.\n")
+        return "ERROR: Patient Unreachable - No response text received from Caller Agent."
 
     except Exception as e:
         return f"ERROR: Connection Failed - {str(e)}"
 
+
+@task(name="dispatch_remote_agent_task")
+async def dispatch_remote_agent_task(
+    task: str,
+    schedule_slot: str = None,
+    hospital_id: str = None,
+    server_url: str = None,
+) -> str:
+    """
+    Hand a task to the Caller without waiting for it to be processed.
+
+    Sends a non-blocking `message/send` carrying a push notification config
+    for PULSE_WEBHOOK_URL. The Caller answers with the task ID at once; the
+    finished task is pushed to the webhook and resolved by the dispatch
+    tracker, so no connection stays open per in-flight patient.
+
+    Returns:
+        "Dispatched: TaskId <id> (<state>)" or an "ERROR: ..." message
+        ("ERROR: Not Delivered - ..." when the Caller never accepted it)
+    """
+    try:
+        if not server_url:
+            server_url = CAREFLOW_CALLER_URL
+
+        duplicate = _check_duplicate(task)
+        if duplicate:
+            return duplicate
+
+        push_config = {"url": PULSE_WEBHOOK_URL}
+        if A2A_PUSH_TOKEN:
+            push_config["token"] = A2A_PUSH_TOKEN
+        rpc = rpc_request("message/send", {
+            "message": _task_message(task),
+            "configuration": {
+                "blocking": False,
+                "acceptedOutputModes": ["text"],
+                "pushNotificationConfig": push_config,
+            },
+        }, int(uuid.uuid1().int >> 64))
+
+        try:
+            response = await a2a_client.post_rpc(server_url, rpc)
+        except aiohttp.ClientResponseError as e:
+            return f"{NOT_DELIVERED} - HTTP {e.status} {e.message}"
+        except aiohttp.ClientConnectorError as e:
+            return f"{NOT_DELIVERED} - {e}"
+
+        if response.get("error"):
+            return f"{NOT_DELIVERED} - {response['error'].get('message', 'Unknown error')}"
+        result = response.get("result") or {}
+        task_id = result.get("id") if result.get("kind", "task") == "task" else result.get("taskId")
+        if not task_id:
+            return "ERROR: Dispatch Failed - Caller Agent returned no task ID."
+
+        patient_id_match = re.search(r'\(ID:\s*([^)]+)\)', task)
+        dispatch_tracker.register(
+            task_id,
+            patient_id_match.group(1).strip() if patient_id_match else None,
+            schedule_slot,
+            hospital_id,
+        )
+        state = (result.get("status") or {}).get("state", "submitted")
+        logger.info(f"📤 Dispatched to Caller: task {task_id} ({state})")
+        return f"Dispatched: TaskId {task_id} ({state})"
+
+    except Exception as e:
+        return f"ERROR: Connection Failed - {str(e)}"
+
+
+async def dispatch_call_batch(
+    patients: List[Dict[str, Any]],
+    schedule_slot: str = None,
+    server_url: str = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Send structured patient briefs to the Caller's `dispatch_calls` skill.
+
+    One request covers the whole batch and the Caller starts the calls
+    without an LLM turn. Yields each patient's acceptance
+    ({patientId, status, callSid, detail}) as the Caller streams it.
+
+    Raises:
+        A2ARpcError, aiohttp.ClientResponseError, asyncio.TimeoutError
+        (see `handoff_not_delivered` for which mean the batch never started)
+    """
+    rpc = rpc_request("message/stream", {
+        "message": {
+            "messageId": f"batch_{uuid.uuid4().hex}",
+            "kind": "message",
+            "role": "user",
+            "parts": [{
+                "kind": "data",
+                "data": {"skill": "dispatch_calls", "scheduleSlot": schedule_slot, "patients": patients},
+            }],
+        }
+    }, int(uuid.uuid1().int >> 64))
+
+    # The Caller paces call starts, so a large batch may legitimately run
+    # for minutes; only the idle timeout applies.
+    stream = a2a_client.stream_task(server_url or CAREFLOW_CALLER_URL, rpc, timeout=None)
+    async with aclosing(stream) as results:
+        async for result in results:
+            if not isinstance(result, dict) or result.get("final"):
+                continue
+            for part in ((result.get("status") or {}).get("message") or {}).get("parts") or []:
+                if part.get("kind") == "data" and (part.get("data") or {}).get("patientId"):
+                    yield part["data"]
+
+
 a2a_tools = [list_remote_agents, send_remote_agent_task]
\ No newline at end of file
@@ -8,6 +8,9 @@ from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
+# Interaction types recorded as a failed attempt in the slot index
+FAILED_INTERACTION_TYPES = {"call_failed", "call_failure", "failed_call"}
+
 
 async def log_interaction_subcollection(
     patient_id: str,
@@ -33,14 +36,13 @@ async def log_interaction_subcollection(
         Success/error message
     """
     try:
-        from google.cloud.firestore import AsyncClient
-        import os
-        
-        project_id = os.environ.get("GOOGLE_CLOUD_PROJECT", "careflow-478811")
-        database_id = os.environ.get("FIRESTORE_DATABASE", "careflow-db")
+        from app.app_utils.firestore_client import get_db, track
+        from app.app_utils.slot_index import (
+            SLOTS_COLLECTION, STATE_COMPLETED, STATE_FAILED, default_hospital_id, patient_state_update, slot_doc_id,
+        )
         
-        # Create AsyncClient (does NOT support 'async with')
-        db = AsyncClient(project=project_id, database=database_id)
+        # Shared Firestore client
+        db = get_db()
         
         # Reference to subcollection
         interactions_ref = db.collection("patients").document(patient_id).collection("interactions")
@@ -59,8 +61,22 @@ async def log_interaction_subcollection(
         if schedule_slot:
             interaction_data["scheduleSlot"] = schedule_slot
         
-        # Add to subcollection (AsyncClient returns tuple: (update_time, doc_ref))
-        update_time, doc_ref = await interactions_ref.add(interaction_data)
+        # Interaction + slot index entry in one batch: pending-patient lookups
+        # trust the index, so it must never miss a logged interaction
+        doc_ref = interactions_ref.document()
+        batch = db.batch()
+        batch.set(doc_ref, interaction_data)
+        if schedule_slot:
+            hospital_id = default_hospital_id()
+            state = STATE_FAILED if interaction_type in FAILED_INTERACTION_TYPES else STATE_COMPLETED
+            details = {"callSid": call_sid} if call_sid else {}
+            batch.set(
+                db.collection(SLOTS_COLLECTION).document(slot_doc_id(hospital_id, schedule_slot)),
+                patient_state_update(patient_id, schedule_slot, state, hospital_id, **details),
+                merge=True,
+            )
+        async with track("interactions.log"):
+            await batch.commit()
         
         logger.info(f"✅ Logged interaction for patient {patient_id} (Doc ID: {doc_ref.id}, Slot: {schedule_slot})")
         
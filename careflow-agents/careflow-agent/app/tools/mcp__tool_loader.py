@@ -1,23 +1,118 @@
+"""
+CareFlow Pulse - MCP Tool Loader
+Loads the MCP Toolbox "patient_tools" toolset with the async toolbox client.
+
+The toolset is fetched in the background (started from the server lifespan,
+or lazily by the first agent run) under MCP_TOOLBOX_LOAD_TIMEOUT_SECONDS, so
+startup never blocks on MCP_TOOLBOX_URL. Tools are appended to every
+attached agent once they arrive. One client (and its HTTP session) serves
+every invocation, and invocations are awaited on the event loop instead of
+blocking it.
+"""
+import time
+import asyncio
 import logging
-from toolbox_core import ToolboxSyncClient
-from ..app_utils.config_loader import MCP_TOOLBOX_URL
+from typing import Any, List, Optional
+
+from toolbox_core import ToolboxClient
+from ..app_utils.config_loader import MCP_TOOLBOX_URL, MCP_TOOLBOX_LOAD_TIMEOUT_SECONDS
 
 logger = logging.getLogger(__name__)
 
+TOOLSET_NAME = "patient_tools"
+
+# Toolset tools the agent must not use. log_patient_interaction writes an
+# interaction without its /slots entry; log_interaction_subcollection and
+# update_patient_risk write both.
+EXCLUDED_TOOLS = frozenset({"log_patient_interaction"})
+
+# Wait before retrying after a failed load
+RETRY_BACKOFF_SECONDS = 60.0
+
 # Shared state for toolbox client and tools
-toolbox_client = None
-all_tools = []
+toolbox_client: Optional[ToolboxClient] = None
+all_tools: List[Any] = []
+load_seconds: Optional[float] = None
+
+_agents: List[Any] = []
+_load_task: Optional[asyncio.Task] = None
+_retry_after = 0.0
+
+
+def attach(agent) -> None:
+    """Add the MCP tools to `agent.tools` now, or as soon as they are loaded."""
+    _agents.append(agent)
+    if all_tools:
+        _register(agent)
+
+
+def _register(agent) -> None:
+    names = {getattr(t, "__name__", None) for t in agent.tools}
+    agent.tools.extend(t for t in all_tools if getattr(t, "__name__", None) not in names)
 
-def init_mcp_tools():
-    global toolbox_client, all_tools
+
+async def _load() -> List[Any]:
+    global toolbox_client, load_seconds, _retry_after
+    start = time.perf_counter()
+    client = ToolboxClient(MCP_TOOLBOX_URL)
     try:
-        # Don't use 'with' - we need to keep the session open
-        toolbox_client = ToolboxSyncClient(MCP_TOOLBOX_URL)
-        # Load our custom toolset
-        all_tools = toolbox_client.load_toolset("patient_tools")
-        print(f"Total tools available: {len(all_tools)} MCP tools")
-    except Exception as e:
-        logger.warning(f"⚠️ Warning: Could not load MCP tools from {MCP_TOOLBOX_URL}. Is toolbox running? Error: {e}")
+        tools = await asyncio.wait_for(client.load_toolset(TOOLSET_NAME), MCP_TOOLBOX_LOAD_TIMEOUT_SECONDS)
+    except BaseException as e:
+        await client.close()
+        _retry_after = time.monotonic() + RETRY_BACKOFF_SECONDS
+        if isinstance(e, asyncio.TimeoutError):
+            logger.warning(f"⚠️ MCP toolset load from {MCP_TOOLBOX_URL} timed out after {MCP_TOOLBOX_LOAD_TIMEOUT_SECONDS}s")
+        elif isinstance(e, Exception):
+            logger.warning(f"⚠️ Warning: Could not load MCP tools from {MCP_TOOLBOX_URL}. Is toolbox running? Error: {e}")
+        else:
+            raise
         logger.warning("Agent will run with internal tools only.")
-    except BaseException as e: # Catch EVERYTHING just in case
-        print(f"CRITICAL ERROR IN MCP LOADER: {e}", flush=True)
\ No newline at end of file
+        return []
+
+    toolbox_client = client
+    all_tools[:] = [t for t in tools if getattr(t, "__name__", None) not in EXCLUDED_TOOLS]
+    load_seconds = time.perf_counter() - start
+    for agent in _agents:
+        _register(agent)
+    logger.info(f"🔌 Loaded {len(all_tools)} MCP tools in {load_seconds * 1000:.0f}ms")
+    return all_tools
+
+
+def start_mcp_tools_load() -> Optional[asyncio.Task]:
+    """Start loading the toolset in the background (idempotent, non-blocking)."""
+    global _load_task
+    if all_tools:
+        return _load_task
+    if _load_task is not None and not _load_task.done():
+        return _load_task
+    if time.monotonic() < _retry_after:
+        return None
+    _load_task = asyncio.get_running_loop().create_task(_load())
+    return _load_task
+
+
+async def ensure_mcp_tools(timeout: float = MCP_TOOLBOX_LOAD_TIMEOUT_SECONDS) -> List[Any]:
+    """
+    Wait up to `timeout` for the toolset; the load keeps running if it expires.
+
+    Returns:
+        The MCP tools loaded so far (empty while unavailable)
+    """
+    task = start_mcp_tools_load()
+    if task is not None and not task.done():
+        try:
+            await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            logger.info("⏳ MCP tools not ready yet, continuing with internal tools")
+    return all_tools
+
+
+async def close_mcp_tools() -> None:
+    """Cancel a pending load and close the toolbox client's HTTP session."""
+    global toolbox_client, _load_task
+    if _load_task is not None and not _load_task.done():
+        _load_task.cancel()
+    _load_task = None
+    if toolbox_client is not None:
+        await toolbox_client.close()
+        toolbox_client = None
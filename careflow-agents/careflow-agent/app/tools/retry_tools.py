@@ -11,95 +11,93 @@ logger = logging.getLogger(__name__)
 
 async def get_pending_patients(
     scheduleHour: int,
-    hospitalId: str
+    hospitalId: str,
+    cursor: Optional[str] = None
 ) -> str:
     """
     Get ONLY patients who have NOT been successfully contacted yet for this schedule slot today.
     
-    Uses Firestore SDK directly to:
+    Uses the batched schedule loader to:
     1. Query patients collection for the given schedule and hospital
-    2. Check each patient's interactions subcollection
+    2. Check the slot index (or each patient's interactions if the slot is not indexed yet)
     3. Return only those without a logged interaction for today's slot
     
+    Results are compact records returned one page at a time. If 'nextCursor'
+    in the result is not null, call again with cursor=nextCursor.
+    
     Args:
         scheduleHour: The hour of the schedule (8, 12, or 20)
         hospitalId: The hospital ID to filter by
+        cursor: Value of 'nextCursor' from the previous page (omit for the first page)
         
     Returns:
-        JSON string containing the list of pending patients
+        JSON page of pending patients: {total, count, nextCursor, tokens, patients | columns+rows}
     """
-    from google.cloud.firestore import AsyncClient, Query
+    from app.app_utils.firestore_client import get_db, track
+    from app.app_utils.patient_cache import patient_cache
     from app.app_utils.retry_utils import get_schedule_slot_key
-    import os
-    
-    project_id = os.environ.get("GOOGLE_CLOUD_PROJECT", "careflow-478811")
-    database_id = os.environ.get("FIRESTORE_DATABASE", "careflow-db")
+    from app.app_utils.schedule_loader import load_schedule, query_schedule_patients
+    from app.app_utils.schedule_projection import SCHEDULE_PAGE_SIZE, estimate_tokens, page_of, render_page
+    from app.app_utils.slot_index import done_patient_ids, read_slot_states
     
     try:
-        # Initialize Firestore client
-        db = AsyncClient(project=project_id, database=database_id)
+        # Shared Firestore client
+        db = get_db()
         
         # Get today's schedule slot (e.g., "2026-01-23_08")
         schedule_slot = get_schedule_slot_key(scheduleHour)
         
-        # Query patients collection
-        patients_ref = db.collection("patients")
-        query = patients_ref.where("hospitalId", "==", hospitalId) \
-                            .where("status", "==", "active") \
-                            .where("scheduleHour", "==", scheduleHour)
+        # Completion comes from the slot index (one read); history is only
+        # fetched for pending patients on the requested page
+        async with track("slots.read"):
+            slot_states = await read_slot_states(db, hospitalId, schedule_slot)
+        done_ids = done_patient_ids(slot_states)
         
-        # Fetch all matching patients
-        patients_docs = query.stream()
+        patients = patient_cache.hospital_patients(hospitalId, scheduleHour)
+        if patients is None:
+            async with track("schedule.query"):
+                patients = await query_schedule_patients(db, scheduleHour, hospitalId)
         
-        pending_patients = []
-        skipped_count = 0
+        if done_ids is not None:
+            # Slot indexed: page first, then enrich only that page
+            pending = [(pid, data) for pid, data in patients if pid not in done_ids]
+            skipped_count = len(patients) - len(pending)
+            page, next_cursor = page_of(pending, cursor, SCHEDULE_PAGE_SIZE, key=lambda p: p[0])
+            async with track("schedule.load_pending"):
+                scheduled = await load_schedule(
+                    db, scheduleHour, hospitalId, schedule_slot,
+                    completed_ids=done_ids, patients=page,
+                )
+            total = len(pending)
+        else:
+            # Not indexed: completion needs each patient's interactions
+            async with track("schedule.load_pending"):
+                scheduled = await load_schedule(
+                    db, scheduleHour, hospitalId, schedule_slot,
+                    history_for_completed=False, patients=patients,
+                )
+            pending_all = [p for p in scheduled if not p.completed]
+            skipped_count = len(scheduled) - len(pending_all)
+            scheduled, next_cursor = page_of(pending_all, cursor, SCHEDULE_PAGE_SIZE, key=lambda p: p.id)
+            total = len(pending_all)
         
-        async for patient_doc in patients_docs:
-            patient_id = patient_doc.id
-            patient_data = patient_doc.to_dict()
-            
-            # Check if this patient has an interaction for today's slot
-            interactions_ref = db.collection(f"patients/{patient_id}/interactions")
-            interaction_query = interactions_ref.where("scheduleSlot", "==", schedule_slot).limit(1)
-            
-            interaction_docs = [doc async for doc in interaction_query.stream()]
-            
-            if interaction_docs:
-                # Patient already has an interaction logged - skip
-                skipped_count += 1
-                logger.info(f"⏭️ Skipping patient {patient_id} (already contacted in {schedule_slot})")
-            else:
-                # No interaction yet for THIS slot - fetch context from PAST slots
-                recent_history = []
-                try:
-                    # Fetch last 3 interactions for context continuity
-                    history_query = interactions_ref.order_by("timestamp", direction=Query.DESCENDING).limit(3)
-                    async for hist_doc in history_query.stream():
-                        h_data = hist_doc.to_dict()
-                        # Format timestamp nicely if present
-                        ts = h_data.get("timestamp")
-                        date_str = ts.isoformat() if hasattr(ts, 'isoformat') else str(ts)
-                        
-                        recent_history.append({
-                            "date": date_str,
-                            "brief": h_data.get("aiBrief", "No summary available"),
-                            "risk": h_data.get("riskLevel", "UNKNOWN")
-                        })
-                except Exception as ex:
-                    logger.warning(f"Failed to fetch history for {patient_id}: {ex}")
-
-                # Add enriched patient data to pending list
-                patient_info = {
-                    "id": patient_id,
-                    "preferredLanguage": patient_data.get("preferredLanguage", "en-US"), # Default to en-US
-                    "recentHistory": recent_history,
-                    **patient_data
-                }
-                pending_patients.append(patient_info)
+        pending_patients = [
+            {
+                "id": patient.id,
+                "preferredLanguage": patient.data.get("preferredLanguage", "en-US"), # Default to en-US
+                "recentHistory": patient.recent_history,
+                **patient.data
+            }
+            for patient in scheduled
+        ]
+        payload = render_page(pending_patients, total, next_cursor)
         
-        logger.info(f"📋 Found {len(pending_patients)} pending patients (skipped {skipped_count} already contacted)")
+        logger.info(
+            f"📋 Found {total} pending patients (skipped {skipped_count} already contacted in {schedule_slot}); "
+            f"page of {len(pending_patients)}, ~{estimate_tokens(payload)} tokens"
+        )
         
-        return json.dumps(pending_patients)
+        return payload
         
     except Exception as e:
         logger.error(f"❌ Error in get_pending_patients: {e}", exc_info=True)
@@ -5,108 +5,123 @@ Replaces limited MCP tools for complex join operations.
 """
 import logging
 import json
-import os
-from datetime import datetime, timezone
-from google.cloud.firestore import AsyncClient, Query, FieldFilter
+from typing import Any, Dict, Optional
+from app.app_utils.firestore_client import get_db, track
+from app.app_utils.patient_cache import patient_cache
 from app.app_utils.retry_utils import get_schedule_slot_key
+from app.app_utils.schedule_loader import ScheduledPatient, load_schedule, query_schedule_patients
+from app.app_utils.schedule_projection import SCHEDULE_PAGE_SIZE, estimate_tokens, page_of, render_page
+from app.app_utils.slot_index import done_patient_ids, read_slot_states
 
 logger = logging.getLogger(__name__)
 
+
+def _enrich(patient: ScheduledPatient) -> Dict[str, Any]:
+    """Build Enriched Object (Unified Structure)"""
+    p_data = patient.data
+    return {
+        "id": patient.id,
+        "name": p_data.get("name"),
+        "preferredLanguage": p_data.get("preferredLanguage", "en-US"),
+        "completionStatus": "completed" if patient.completed else "pending",
+        "riskLevel": p_data.get("riskLevel", "GREEN"),
+        "contact": {
+            "phone": p_data.get("contact", {}).get("phone"),
+            "preferredMethod": p_data.get("contact", {}).get("preferredMethod", "phone")
+        },
+        "dischargePlan": {
+            "diagnosis": p_data.get("dischargePlan", {}).get("diagnosis"),
+            "medications": p_data.get("dischargePlan", {}).get("medications", []),
+            "criticalSymptoms": p_data.get("dischargePlan", {}).get("criticalSymptoms", []),
+            "warningSymptoms": p_data.get("dischargePlan", {}).get("warningSymptoms", [])
+        },
+        "nextAppointment": p_data.get("nextAppointment", {}),
+        "assignedNurse": p_data.get("assignedNurse", {}),
+        "recentHistory": patient.recent_history
+    }
+
+
+async def load_enriched_schedule(
+    scheduleHour: int,
+    hospitalId: str,
+    cursor: Optional[str] = None,
+    pageSize: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Load a slot's patients as full enriched records (used by the direct dispatcher).
+
+    When pageSize is given only that page (ordered by patient ID, after
+    `cursor`) is enriched, so history lookups scale with the page.
+
+    Returns:
+        {"patients": [...], "total": int, "nextCursor": Optional[str]}
+    """
+    db = get_db()
+
+    # Get today's schedule slot key (e.g., "2026-01-27_08")
+    schedule_slot = get_schedule_slot_key(scheduleHour)
+    logger.info(f"📅 Fetching schedule for slot: {schedule_slot} (Hospital: {hospitalId})")
+
+    # Completion comes from the slot index (one read); history is
+    # looked up concurrently
+    async with track("slots.read"):
+        slot_states = await read_slot_states(db, hospitalId, schedule_slot)
+
+    patients = patient_cache.hospital_patients(hospitalId, scheduleHour)
+    if patients is None:
+        async with track("schedule.query"):
+            patients = await query_schedule_patients(db, scheduleHour, hospitalId)
+    total, next_cursor = len(patients), None
+    if pageSize:
+        patients, next_cursor = page_of(patients, cursor, pageSize, key=lambda p: p[0])
+
+    async with track("schedule.load"):
+        scheduled = await load_schedule(
+            db, scheduleHour, hospitalId, schedule_slot,
+            completed_ids=done_patient_ids(slot_states),
+            patients=patients,
+        )
+
+    return {
+        "patients": [_enrich(patient) for patient in scheduled],
+        "total": total,
+        "nextCursor": next_cursor,
+    }
+
+
 async def fetch_daily_schedule(
     scheduleHour: int,
-    hospitalId: str
+    hospitalId: str,
+    cursor: Optional[str] = None
 ) -> str:
     """
-    Retrieves ALL patients active and scheduled for a specific hour.
-    Enriches each patient record with:
+    Retrieves the patients active and scheduled for a specific hour, one page at a time.
+    Each patient is a compact record with:
     1. 'completionStatus': 'completed' or 'pending' (based on today's interactions)
     2. 'preferredLanguage': Patient's preferred language (default: en-US)
-    3. 'recentHistory': Summary of last 3 interactions for context awareness.
-    
+    3. 'history': Short summaries of the last 3 interactions for context awareness.
+
+    If 'nextCursor' in the result is not null, call again with cursor=nextCursor
+    to get the next page of patients.
+
     Args:
         scheduleHour: The hour slot (8, 12, 20)
         hospitalId: The hospital ID
-        
+        cursor: Value of 'nextCursor' from the previous page (omit for the first page)
+
     Returns:
-        JSON string list of enriched patient objects.
+        JSON page: {total, count, nextCursor, tokens, patients | columns+rows}
     """
-    project_id = os.environ.get("GOOGLE_CLOUD_PROJECT", "careflow-478811")
-    database_id = os.environ.get("FIRESTORE_DATABASE", "careflow-db")
-    
     try:
-        db = AsyncClient(project=project_id, database=database_id)
-        
-        # Get today's schedule slot key (e.g., "2026-01-27_08")
-        schedule_slot = get_schedule_slot_key(scheduleHour)
-        logger.info(f"📅 Fetching schedule for slot: {schedule_slot} (Hospital: {hospitalId})")
-        
-        # Query active patients for this slot
-        patients_ref = db.collection("patients")
-        query = patients_ref.where(filter=FieldFilter("hospitalId", "==", hospitalId)) \
-                            .where(filter=FieldFilter("status", "==", "active")) \
-                            .where(filter=FieldFilter("scheduleHour", "==", scheduleHour))
-        
-        patients_docs = query.stream()
-        
-        enriched_patients = []
-        
-        async for patient_doc in patients_docs:
-            p_data = patient_doc.to_dict()
-            p_id = patient_doc.id
-            
-            # 1. Check Completion Status
-            interactions_ref = db.collection(f"patients/{p_id}/interactions")
-            # Check for interaction with same scheduleSlot
-            todays_interaction = await interactions_ref.where(filter=FieldFilter("scheduleSlot", "==", schedule_slot)).limit(1).get()
-            
-            status = "completed" if todays_interaction else "pending"
-            
-            # 2. Fetch Recent History (Last 3 interactions)
-            recent_history = []
-            try:
-                # Order by timestamp desc
-                history_query = interactions_ref.order_by("timestamp", direction=Query.DESCENDING).limit(3)
-                async for hist_doc in history_query.stream():
-                    h_data = hist_doc.to_dict()
-                    ts = h_data.get("timestamp")
-                    date_str = ts.isoformat() if hasattr(ts, 'isoformat') else str(ts)
-                    
-                    recent_history.append({
-                        "date": date_str,
-                        "brief": h_data.get("aiBrief", "No summary available"),
-                        "risk": h_data.get("riskLevel", "UNKNOWN"),
-                        "type": h_data.get("type", "unknown")
-                    })
-            except Exception as ex:
-                logger.warning(f"Failed to fetch history for {p_id}: {ex}")
-            
-            # 3. Build Enriched Object (Unified Structure)
-            enriched_p = {
-                "id": p_id,
-                "name": p_data.get("name"),
-                "preferredLanguage": p_data.get("preferredLanguage", "en-US"),
-                "completionStatus": status,
-                "riskLevel": p_data.get("riskLevel", "GREEN"),
-                "contact": {
-                    "phone": p_data.get("contact", {}).get("phone"),
-                    "preferredMethod": p_data.get("contact", {}).get("preferredMethod", "phone")
-                },
-                "dischargePlan": {
-                    "diagnosis": p_data.get("dischargePlan", {}).get("diagnosis"),
-                    "medications": p_data.get("dischargePlan", {}).get("medications", []),
-                    "criticalSymptoms": p_data.get("dischargePlan", {}).get("criticalSymptoms", []),
-                    "warningSymptoms": p_data.get("dischargePlan", {}).get("warningSymptoms", [])
-                },
-                "nextAppointment": p_data.get("nextAppointment", {}),
-                "assignedNurse": p_data.get("assignedNurse", {}),
-                "recentHistory": recent_history
-            }
-            
-            enriched_patients.append(enriched_p)
-            
-        logger.info(f"✅ Found {len(enriched_patients)} patients for schedule {scheduleHour} ({hospitalId})")
-        return json.dumps(enriched_patients)
-        
+        page = await load_enriched_schedule(scheduleHour, hospitalId, cursor, SCHEDULE_PAGE_SIZE)
+        payload = render_page(page["patients"], page["total"], page["nextCursor"])
+
+        logger.info(
+            f"✅ Schedule page for {scheduleHour} ({hospitalId}): {len(page['patients'])}/{page['total']} patients, "
+            f"~{estimate_tokens(payload)} tokens"
+        )
+        return payload
+
     except Exception as e:
         logger.error(f"❌ Error in get_patients_for_schedule: {e}", exc_info=True)
         return json.dumps({"error": str(e)})
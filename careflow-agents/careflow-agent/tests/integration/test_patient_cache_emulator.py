@@ -0,0 +1,60 @@
+"""
+Patient cache invalidation against the Firestore emulator.
+
+Skipped unless FIRESTORE_EMULATOR_HOST is set:
+
+    gcloud emulators firestore start --host-port=localhost:8086
+    export FIRESTORE_EMULATOR_HOST=localhost:8086
+"""
+import asyncio
+import os
+import uuid
+
+import pytest
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("FIRESTORE_EMULATOR_HOST"),
+    reason="FIRESTORE_EMULATOR_HOST not set",
+)
+
+
+async def _eventually(predicate, timeout=10.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while asyncio.get_running_loop().time() < deadline:
+        if predicate():
+            return True
+        await asyncio.sleep(0.05)
+    return predicate()
+
+
+@pytest.mark.asyncio
+async def test_external_write_invalidates_cached_patient():
+    from google.cloud.firestore import AsyncClient
+    from app.app_utils.patient_cache import PatientCache
+
+    db = AsyncClient(project=os.environ.get("GOOGLE_CLOUD_PROJECT", "careflow-478811"),
+                     database=os.environ.get("FIRESTORE_DATABASE", "careflow-db"))
+    hospital_id = f"cache_test_{uuid.uuid4().hex[:6]}"
+    ref = db.collection("patients").document(f"{hospital_id}_p1")
+    await ref.set({"hospitalId": hospital_id, "status": "active", "scheduleHour": 8, "riskLevel": "GREEN"})
+
+    cache = PatientCache(max_size=100)
+    try:
+        assert await cache.warm(hospital_id)
+        assert cache.hospital_patients(hospital_id, 8)[0][1]["riskLevel"] == "GREEN"
+
+        # A write from outside this cache (dashboard, MCP, another instance)
+        await ref.update({"riskLevel": "RED"})
+        assert await _eventually(lambda: (cache.peek(ref.id) or {}).get("riskLevel") == "RED")
+
+        # Cached reads now serve the new value without a Firestore read
+        hits = cache.hits
+        assert (await cache.get(db, ref.id))["riskLevel"] == "RED"
+        assert cache.hits == hits + 1
+
+        # Deletes drop the entry and the hospital membership
+        await ref.delete()
+        assert await _eventually(lambda: cache.peek(ref.id) is None)
+        assert cache.hospital_patients(hospital_id) == []
+    finally:
+        cache.close()
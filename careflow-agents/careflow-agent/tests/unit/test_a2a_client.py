@@ -0,0 +1,210 @@
+import asyncio
+import base64
+import json
+import time
+
+import pytest
+
+from app.core.a2a import auth
+from app.core.a2a import A2AClient, A2ARpcError, IdTokenCache, SSEParser, StreamIdleTimeout, audience_for, iter_sse_data
+
+
+def make_token(expires_in: float) -> str:
+    claims = base64.urlsafe_b64encode(json.dumps({"exp": time.time() + expires_in}).encode()).decode().rstrip("=")
+    return f"header.{claims}.signature"
+
+
+class FakeContent:
+    def __init__(self, chunks, delay=0.0):
+        self.chunks = chunks
+        self.delay = delay
+
+    async def iter_any(self):
+        for chunk in self.chunks:
+            await asyncio.sleep(self.delay)
+            yield chunk
+
+
+def fake_response(chunks, delay=0.0):
+    response = type("Response", (), {})()
+    response.content = FakeContent(chunks, delay)
+    return response
+
+
+STREAM = (
+    ": keep-alive\r\n\r\n"
+    'data: {"result": {"kind": "status-update",\r\n'
+    'data:  "final": false, "text": "Processing your request..."}}\r\n\r\n'
+    'event: message\nid: 7\ndata: {"result": {"final": true, "text": "Call to José initiated"}}\n\n'
+).encode()
+STREAM_EVENTS = [
+    {"result": {"kind": "status-update", "final": False, "text": "Processing your request..."}},
+    {"result": {"final": True, "text": "Call to José initiated"}},
+]
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    calls = []
+
+    def fake_fetch(audience):
+        calls.append(audience)
+        time.sleep(0.01)
+        return make_token(fake_fetch.lifetime)
+
+    fake_fetch.lifetime = 3600
+    monkeypatch.setattr(auth, "_fetch", fake_fetch)
+    return calls, fake_fetch
+
+
+def test_audience_strips_rpc_suffix():
+    assert audience_for("https://pulse-abc.a.run.app/rpc") == "https://pulse-abc.a.run.app"
+    assert audience_for("https://pulse-abc.a.run.app/") == "https://pulse-abc.a.run.app"
+
+
+@pytest.mark.asyncio
+async def test_tokens_are_cached_per_audience(fetches):
+    calls, _ = fetches
+    cache = IdTokenCache()
+
+    tokens = await asyncio.gather(*[cache.get("https://pulse.a.run.app") for _ in range(5)])
+    assert len(set(tokens)) == 1
+    assert calls == ["https://pulse.a.run.app"]  # concurrent misses share one fetch
+
+    await cache.get("https://pulse.a.run.app")
+    await cache.get("https://caller.a.run.app")
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_token_near_expiry_is_served_while_refreshed(fetches):
+    calls, fake_fetch = fetches
+    cache = IdTokenCache(refresh_ahead_seconds=300, expiry_margin_seconds=60)
+
+    fake_fetch.lifetime = 120  # inside the refresh window
+    first = await cache.get("aud")
+    fake_fetch.lifetime = 3600
+    assert await cache.get("aud") == first  # no wait for the refresh
+    await asyncio.sleep(0.05)
+    assert len(calls) == 2
+    assert await cache.get("aud") != first
+
+
+@pytest.mark.asyncio
+async def test_expired_token_is_not_served(fetches):
+    calls, fake_fetch = fetches
+    cache = IdTokenCache(refresh_ahead_seconds=300, expiry_margin_seconds=60)
+
+    fake_fetch.lifetime = 30
+    first = await cache.get("aud")
+    fake_fetch.lifetime = 3600
+    assert await cache.get("aud") != first
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_sse_events_are_parsed():
+    response = fake_response([
+        b": keep-alive\n",
+        b"\n",
+        b'data: {"result": {"kind": "status-update",\n',
+        b'data:  "final": false}}\n',
+        b"\n",
+        b"event: message\n",
+        b"data: not json\n",
+        b"\n",
+        b'data: {"result": {"final": true}}\n\n',
+        b'data: {"id": 3}',
+    ])
+
+    events = [event async for event in iter_sse_data(response)]
+    assert events == [
+        {"result": {"kind": "status-update", "final": False}},
+        {"result": {"final": True}},
+        {"id": 3},
+    ]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 16, 64, len(STREAM)])
+def test_sse_parser_is_independent_of_chunk_boundaries(size):
+    # Splits land inside CRLFs, multi-byte characters and `data:` prefixes
+    parser = SSEParser()
+    events = []
+    for i in range(0, len(STREAM), size):
+        events.extend(parser.feed(STREAM[i:i + size]))
+    events.extend(parser.close())
+    assert events == STREAM_EVENTS
+
+
+def test_sse_parser_yields_events_as_soon_as_complete():
+    parser = SSEParser()
+    end_of_first = STREAM.index(b"}}\r\n\r\n") + 4
+    assert parser.feed(STREAM[:end_of_first]) == []
+    assert parser.feed(STREAM[end_of_first:end_of_first + 2]) == STREAM_EVENTS[:1]
+    assert parser.feed(STREAM[end_of_first + 2:]) == STREAM_EVENTS[1:]
+
+
+def test_sse_parser_throughput():
+    event = b'data: {"result": {"final": false, "text": "' + b"x" * 200 + b'"}}\n\n'
+    stream = event * 5000
+    parser = SSEParser()
+    start = time.perf_counter()
+    count = 0
+    for i in range(0, len(stream), 1024):
+        count += len(parser.feed(stream[i:i + 1024]))
+    elapsed = time.perf_counter() - start
+    assert count == 5000
+    # ~1.2 MB; generous bound so the test only catches quadratic behaviour
+    assert elapsed < 2.0
+
+
+@pytest.mark.asyncio
+async def test_sse_idle_timeout():
+    response = fake_response([b'data: {"id": 1}\n\n', b'data: {"id": 2}\n\n'], delay=0.2)
+    with pytest.raises(StreamIdleTimeout):
+        async for _ in iter_sse_data(response, idle_timeout=0.05):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_stream_task_stops_after_final_result(monkeypatch):
+    client = A2AClient()
+
+    async def fake_stream_rpc(url, payload, timeout=None, idle_timeout=None):
+        for event in [*STREAM_EVENTS, {"result": {"text": "after final"}}]:
+            yield event
+
+    monkeypatch.setattr(client, "stream_rpc", fake_stream_rpc)
+    results = [result async for result in client.stream_task("http://caller", {})]
+    assert results == [event["result"] for event in STREAM_EVENTS]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("events, mid_stream", [
+    ([], False),
+    (STREAM_EVENTS[:1], True),
+])
+async def test_stream_task_flags_errors_after_the_stream_started(monkeypatch, events, mid_stream):
+    client = A2AClient()
+
+    async def fake_stream_rpc(url, payload, timeout=None, idle_timeout=None):
+        for event in [*events, {"error": {"code": -32603, "message": "Internal error"}}]:
+            yield event
+
+    monkeypatch.setattr(client, "stream_rpc", fake_stream_rpc)
+    with pytest.raises(A2ARpcError) as raised:
+        async for _ in client.stream_task("http://caller", {}):
+            pass
+    assert raised.value.mid_stream is mid_stream
+
+
+@pytest.mark.asyncio
+async def test_one_session_per_origin():
+    client = A2AClient()
+    try:
+        first = client.session("http://localhost:8080/rpc")
+        assert client.session("http://localhost:8080/") is first
+        assert client.session("http://localhost:8000") is not first
+        assert client.get_metrics()["pools"] == 2
+    finally:
+        await client.close()
@@ -0,0 +1,99 @@
+import random
+
+from a2a.types import AgentCapabilities, AgentCard, AgentSkill
+
+from app.core.a2a import LATENCY_EXTENSION_URI, LatencyHistogram, SkillLatencyTracker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _card():
+    return AgentCard(
+        name="Test Agent",
+        description="test",
+        url="http://localhost:8080/",
+        version="1.0.0",
+        capabilities=AgentCapabilities(streaming=True),
+        defaultInputModes=["text"],
+        defaultOutputModes=["text"],
+        skills=[
+            AgentSkill(id="fast", name="Fast", description="fast", tags=[]),
+            AgentSkill(id="slow", name="Slow", description="slow", tags=[]),
+        ],
+    )
+
+
+def test_histogram_percentiles_within_bucket_error():
+    rng = random.Random(7)
+    samples = [rng.lognormvariate(8, 0.6) for _ in range(20000)]
+    histogram = LatencyHistogram()
+    for ms in samples:
+        histogram.record(ms)
+
+    ordered = sorted(samples)
+    for q in (0.5, 0.9, 0.99):
+        exact = ordered[int(q * len(ordered))]
+        assert abs(histogram.percentile(q) - exact) / exact < 0.04
+    assert histogram.count == 20000
+    assert len(histogram.counts) < 300
+
+
+def test_expected_remaining_uses_tasks_slower_than_elapsed():
+    tracker = SkillLatencyTracker(min_samples=5)
+    for ms in range(1000, 11000, 1000):
+        tracker.record("slow", ms)
+
+    assert 4500 < tracker.expected_remaining_ms("slow") < 5500
+    # A task already running 6s is one of the 7-10s ones
+    assert 1500 < tracker.expected_remaining_ms("slow", elapsed_ms=6000) < 2500
+    assert tracker.expected_remaining_ms("unknown") is None
+
+
+def test_static_latency_until_enough_samples():
+    tracker = SkillLatencyTracker(min_samples=3)
+    tracker.configure(static=[{"skill": "fast", "p50": 200, "p90": 400, "p99": 900}])
+
+    tracker.record("fast", 50)
+    assert tracker.percentiles("fast") == {"p50": 200, "p90": 400, "p99": 900}
+    assert tracker.expected_remaining_ms("fast", elapsed_ms=150) == 50
+
+    tracker.record("fast", 50)
+    tracker.record("fast", 50)
+    assert tracker.percentiles("fast") == {"p50": 50, "p90": 50, "p99": 50}
+
+
+def test_old_samples_age_out():
+    clock = FakeClock()
+    tracker = SkillLatencyTracker(window_seconds=60, min_samples=1, clock=clock)
+    tracker.record("fast", 100)
+
+    clock.now = 90
+    assert tracker.histogram("fast").count == 1
+    clock.now = 160
+    assert tracker.histogram("fast").count == 0
+    assert tracker.percentiles("fast") is None
+
+
+def test_card_modifier_publishes_live_percentiles():
+    tracker = SkillLatencyTracker(min_samples=1)
+    tracker.configure(task_updates=True)
+    card = _card()
+    tracker.record("fast", 120)
+    tracker.record("slow", 8000)
+
+    served = tracker.apply(card)
+    served = tracker.apply(served)
+
+    extensions = [e for e in served.capabilities.extensions if e.uri == LATENCY_EXTENSION_URI]
+    assert len(extensions) == 1
+    params = extensions[0].params
+    assert params["supportsLatencyTaskUpdates"] is True
+    assert set(params["skills"]) == {"fast", "slow"}
+    assert params["skillLatency"] == params["skills"]["slow"]
+    assert card.capabilities.extensions is None
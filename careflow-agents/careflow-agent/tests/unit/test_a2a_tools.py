@@ -2,7 +2,14 @@ import pytest
 import aiohttp
 import json
 from unittest.mock import AsyncMock, MagicMock, patch, mock_open
-from app.tools.a2a_tools import list_remote_agents, send_remote_agent_task
+from app.app_utils.dispatch_tracker import dispatch_tracker
+from app.core.a2a import A2ARpcError, a2a_client
+from app.tools.a2a_tools import (
+    dispatch_remote_agent_task,
+    handoff_not_delivered,
+    list_remote_agents,
+    send_remote_agent_task,
+)
 
 # Helper for async context managers
 class AsyncContextManager:
@@ -31,7 +38,7 @@ async def test_list_remote_agents_success():
         "capabilities": ["phone"]
     })
     
-    # Mock the session: session.get() returns a CM that yields mock_response
+    # Mock the pooled session: session.get() returns a CM that yields mock_response
     mock_session = MagicMock()
     mock_session.get.return_value = AsyncContextManager(return_value=mock_response)
     # Mock AgentCard to avoid strict validation issues during unit test
@@ -40,8 +47,8 @@ async def test_list_remote_agents_success():
     mock_agent_card.url = "http://localhost:8000"
     mock_agent_card.description = "Handles voice calls"
     
-    with patch("aiohttp.ClientSession", return_value=AsyncContextManager(return_value=mock_session)), \
-         patch("app.tools.a2a_tools.AgentCard.model_validate", return_value=mock_agent_card):
+    with patch.object(a2a_client, "session", return_value=mock_session), \
+         patch("app.core.a2a.client.AgentCard.model_validate", return_value=mock_agent_card):
         result = await list_remote_agents()
         assert "Caller Agent" in result
         assert "http://localhost:8000" in result
@@ -55,7 +62,7 @@ async def test_list_remote_agents_failure():
     mock_session = MagicMock()
     mock_session.get.return_value = AsyncContextManager(return_value=mock_response)
     
-    with patch("aiohttp.ClientSession", return_value=AsyncContextManager(return_value=mock_session)):
+    with patch.object(a2a_client, "session", return_value=mock_session):
         result = await list_remote_agents()
         assert "No remote A2A servers are currently available" in result
 
@@ -74,21 +81,47 @@ async def test_send_remote_agent_task_success():
     mock_response = MagicMock()
     mock_response.ok = True
     
-    # Correctly mock async iterator for response.content
+    # Correctly mock the raw chunk iterator of response.content
     async def async_iter():
         for line in sse_lines:
             yield line
             
-    mock_response.content = AsyncMock()
-    mock_response.content.__aiter__ = MagicMock(return_value=async_iter())
+    mock_response.content = MagicMock()
+    mock_response.content.iter_any = MagicMock(return_value=async_iter())
     
     mock_session = MagicMock()
     mock_session.post.return_value = AsyncContextManager(return_value=mock_response)
     
-    with patch("aiohttp.ClientSession", return_value=AsyncContextManager(return_value=mock_session)):
+    with patch.object(a2a_client, "session", return_value=mock_session):
         result = await send_remote_agent_task("Call patient", "http://fake-url")
         assert result == "Task Completed"
 
+@pytest.mark.asyncio
+async def test_send_remote_agent_task_waits_for_final_event():
+    """A non-final working status is not returned as the Caller's answer."""
+    working = {"result": {"final": False, "status": {"state": "working",
+               "message": {"parts": [{"kind": "text", "text": "Processing your request..."}]}}}}
+    completed = {"result": {"final": True, "status": {"state": "completed",
+                 "message": {"parts": [{"kind": "text", "text": "Call to John initiated"}]}}}}
+    stream = f"data: {json.dumps(working)}\n\ndata: {json.dumps(completed)}\n\n".encode()
+
+    async def async_iter():
+        # Chunk boundaries fall mid-line
+        for i in range(0, len(stream), 7):
+            yield stream[i:i + 7]
+
+    mock_response = MagicMock()
+    mock_response.ok = True
+    mock_response.content = MagicMock()
+    mock_response.content.iter_any = MagicMock(return_value=async_iter())
+
+    mock_session = MagicMock()
+    mock_session.post.return_value = AsyncContextManager(return_value=mock_response)
+
+    with patch.object(a2a_client, "session", return_value=mock_session):
+        result = await send_remote_agent_task("Call patient", "http://fake-url")
+        assert result == "Call to John initiated"
+
 @pytest.mark.asyncio
 async def test_send_remote_agent_task_failure():
     """Test handling of HTTP failure."""
@@ -100,6 +133,48 @@ async def test_send_remote_agent_task_failure():
     mock_session = MagicMock()
     mock_session.post.return_value = AsyncContextManager(return_value=mock_response)
     
-    with patch("aiohttp.ClientSession", return_value=AsyncContextManager(return_value=mock_session)):
+    with patch.object(a2a_client, "session", return_value=mock_session):
         result = await send_remote_agent_task("Call patient")
-        assert "Error: HTTP 500 Server Error" in result
+        assert result == "ERROR: Not Delivered - HTTP 500 Server Error"
+
+
+# --- Test dispatch_remote_agent_task ---
+
+@pytest.mark.asyncio
+async def test_dispatch_remote_agent_task_returns_task_id():
+    """Non-blocking dispatch returns the Caller's task ID and tracks it."""
+    post_rpc = AsyncMock(return_value={
+        "jsonrpc": "2.0",
+        "id": 1,
+        "result": {"kind": "task", "id": "caller-task-1", "contextId": "ctx", "status": {"state": "submitted"}},
+    })
+
+    with patch.object(a2a_client, "post_rpc", post_rpc), \
+         patch.object(dispatch_tracker, "register") as register:
+        result = await dispatch_remote_agent_task(
+            "Interview Task: Jane (ID: dispatch-p1) at +1555", schedule_slot="2026-01-23_08", hospital_id="HOSP001"
+        )
+
+    assert result == "Dispatched: TaskId caller-task-1 (submitted)"
+    rpc = post_rpc.call_args.args[1]
+    assert rpc["method"] == "message/send"
+    assert rpc["params"]["configuration"]["blocking"] is False
+    assert rpc["params"]["configuration"]["pushNotificationConfig"]["url"].endswith("/a2a/task-updates")
+    register.assert_called_once_with("caller-task-1", "dispatch-p1", "2026-01-23_08", "HOSP001")
+
+
+@pytest.mark.asyncio
+async def test_dispatch_remote_agent_task_reports_rpc_error():
+    post_rpc = AsyncMock(return_value={"jsonrpc": "2.0", "id": 1, "error": {"code": -32001, "message": "Busy"}})
+
+    with patch.object(a2a_client, "post_rpc", post_rpc):
+        result = await dispatch_remote_agent_task("Interview Task: Joe (ID: dispatch-p2)")
+    assert result == "ERROR: Not Delivered - Busy"
+
+
+def test_only_errors_before_the_caller_started_count_as_not_delivered():
+    error = {"code": -32603, "message": "Internal error"}
+    assert handoff_not_delivered(A2ARpcError(error))
+    assert not handoff_not_delivered(A2ARpcError(error, mid_stream=True))
+    assert not handoff_not_delivered(TimeoutError())
+    assert not handoff_not_delivered(aiohttp.ServerDisconnectedError())
@@ -0,0 +1,221 @@
+import itertools
+from datetime import datetime, timezone
+
+import pytest
+
+from app.app_utils import clinical_record
+
+_auto_ids = itertools.count()
+
+
+class FakeSnapshot:
+    def __init__(self, ref, data):
+        self.id = ref.id
+        self.reference = ref
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+
+class FakeRef:
+    def __init__(self, db, path):
+        self.db = db
+        self.path = path
+        self.id = path.rsplit("/", 1)[-1]
+
+    def collection(self, name):
+        return FakeCollection(self.db, f"{self.path}/{name}")
+
+
+class FakeQuery:
+    def __init__(self, db, path, filters=()):
+        self.db = db
+        self.path = path
+        self.filters = filters
+
+    def where(self, filter):
+        return FakeQuery(self.db, self.path, self.filters + ((filter.field_path, filter.value),))
+
+    def limit(self, n):
+        return self
+
+    async def get(self, transaction=None):
+        self.db.round_trips += 1
+        return [
+            FakeSnapshot(FakeRef(self.db, path), data)
+            for path, data in self.db.docs.items()
+            if path.rsplit("/", 1)[0] == self.path
+            and all(data.get(field) == value for field, value in self.filters)
+        ][:1]
+
+
+class FakeCollection(FakeQuery):
+    def document(self, doc_id=None):
+        doc_id = doc_id or f"auto{next(_auto_ids)}"
+        return FakeRef(self.db, f"{self.path}/{doc_id}")
+
+
+class FakeDB:
+    def __init__(self, docs):
+        self.docs = docs
+        self.round_trips = 0
+
+    def collection(self, name):
+        return FakeCollection(self, name)
+
+    async def get_all(self, refs, transaction=None):
+        self.round_trips += 1
+        for ref in refs:
+            yield FakeSnapshot(ref, self.docs.get(ref.path))
+
+
+class FakeTransaction:
+    def __init__(self):
+        self.writes = []
+
+    def set(self, ref, data, merge=False):
+        self.writes.append(("set", ref.path, data))
+
+    def update(self, ref, data):
+        self.writes.append(("update", ref.path, data))
+
+    def written(self, prefix):
+        return [w for w in self.writes if w[1].startswith(prefix)]
+
+    def doc(self, path):
+        (data,) = [w[2] for w in self.writes if w[1] == path]
+        return data
+
+    def alerts(self):
+        """Top-level alert documents written (excluding update history)."""
+        return [w for w in self.written("alerts/") if w[1].count("/") == 1]
+
+
+PATIENT = {"name": "Jane Doe", "hospitalId": "H1"}
+
+
+@pytest.mark.asyncio
+async def test_new_assessment_stages_all_writes():
+    db = FakeDB({"patients/p1": PATIENT})
+    txn = FakeTransaction()
+
+    result = await clinical_record.apply_assessment(
+        txn, db, "p1", "yellow", "Missed two doses", trigger="Missed doses",
+        call_sid="CA1", interaction_summary="Patient reports missed doses",
+    )
+
+    assert result.alert_id == "active_p1"
+    assert result.alert_created
+    assert result.risk_level == "YELLOW"
+    patient = txn.doc("patients/p1")
+    assert patient["riskLevel"] == "YELLOW" and patient["lastCallSid"] == "CA1"
+    alert = txn.doc("alerts/active_p1")
+    assert alert["priority"] == "warning" and alert["status"] == "active"
+    assert alert["updateCount"] == 1 and len(alert["recentUpdates"]) == 1
+    (_, _, update), = txn.written("alerts/active_p1/updates/")
+    assert update["aiBrief"] == "Missed two doses"
+    (_, _, interaction), = txn.written("patients/p1/interactions/")
+    assert interaction["content"] == "Patient reports missed doses"
+    # Patient + alert in one read, plus the one-off legacy alert lookup
+    assert db.round_trips == 2
+
+
+@pytest.mark.asyncio
+async def test_existing_active_alert_is_merged_and_escalated():
+    db = FakeDB({
+        "patients/p1": PATIENT,
+        "alerts/active_p1": {"status": "active", "priority": "critical", "trigger": "Chest pain", "aiBrief": "Old"},
+    })
+    txn = FakeTransaction()
+
+    result = await clinical_record.apply_assessment(txn, db, "p1", "YELLOW", "New", trigger="Missed doses")
+
+    assert not result.alert_created
+    alert = txn.doc("alerts/active_p1")
+    assert alert["priority"] == "critical"
+    assert alert["trigger"] == "Chest pain | Missed doses"
+    assert alert["aiBrief"] == "New"
+    assert db.round_trips == 1
+
+
+@pytest.mark.asyncio
+async def test_resolved_alert_is_archived():
+    resolved = {"status": "resolved", "priority": "warning", "trigger": "Old", "aiBrief": "Old"}
+    db = FakeDB({"patients/p1": PATIENT, "alerts/active_p1": resolved})
+    txn = FakeTransaction()
+
+    await clinical_record.apply_assessment(txn, db, "p1", "RED", "Chest pain", trigger="Chest pain")
+
+    archived, active = txn.alerts()
+    assert archived[1] != "alerts/active_p1" and archived[2]["status"] == "resolved"
+    assert archived[2]["updatesPath"] == "alerts/active_p1/updates" and "archivedAt" in archived[2]
+    assert active[1] == "alerts/active_p1"
+    assert active[2]["trigger"] == "Chest pain" and active[2]["status"] == "active"
+    assert active[2]["updateCount"] == 1
+
+
+@pytest.mark.asyncio
+async def test_legacy_alert_is_folded_in():
+    db = FakeDB({
+        "patients/p1": PATIENT,
+        "alerts/old123": {"patientId": "p1", "status": "active", "priority": "warning", "trigger": "T1", "aiBrief": "B1"},
+    })
+    txn = FakeTransaction()
+
+    await clinical_record.apply_assessment(txn, db, "p1", "YELLOW", "B2", trigger="T2")
+
+    legacy = txn.doc("alerts/old123")
+    assert legacy["status"] == "resolved" and legacy["supersededBy"] == "active_p1"
+    assert txn.doc("alerts/active_p1")["trigger"] == "T1 | T2"
+
+
+@pytest.mark.asyncio
+async def test_missing_patient_writes_nothing():
+    db = FakeDB({})
+    txn = FakeTransaction()
+    assert await clinical_record.apply_assessment(txn, db, "nope", "RED", "x") is None
+    assert txn.writes == []
+
+
+@pytest.mark.asyncio
+async def test_operational_alert_keeps_patient_brief():
+    db = FakeDB({"patients/p1": PATIENT})
+    txn = FakeTransaction()
+
+    await clinical_record.apply_assessment(
+        txn, db, "p1", "RED", "URGENT: Unable to reach Jane Doe", update_patient_brief=False,
+    )
+
+    patient = txn.doc("patients/p1")
+    assert patient["riskLevel"] == "RED" and "aiBrief" not in patient
+    assert txn.doc("alerts/active_p1")["aiBrief"] == "URGENT: Unable to reach Jane Doe"
+
+
+@pytest.mark.asyncio
+async def test_slot_marked_completed_in_same_transaction():
+    db = FakeDB({"patients/p1": PATIENT})
+    txn = FakeTransaction()
+
+    await clinical_record.apply_assessment(
+        txn, db, "p1", "GREEN", "Stable", interaction_summary="Stable", schedule_slot="2026-01-23_08",
+    )
+
+    slot = txn.doc("slots/H1_2026-01-23_08")
+    assert slot["patients"]["p1"]["state"] == "completed"
+
+
+def test_alert_document_stays_bounded():
+    n = clinical_record.ALERT_RECENT_UPDATES
+    alert = None
+    for i in range(50):
+        new = {"trigger": f"T{i % (n + 2)}", "aiBrief": "x" * 5000, "priority": "warning" if i else "critical"}
+        alert = clinical_record.merge_alert(alert, new, datetime.now(timezone.utc))
+
+    assert alert["updateCount"] == 50
+    assert len(alert["recentUpdates"]) == n
+    assert len(alert["triggers"]) == n
+    assert all(len(u["aiBrief"]) == clinical_record.RECENT_BRIEF_CHARS for u in alert["recentUpdates"])
+    assert alert["aiBrief"] == "x" * 5000
+    assert alert["priority"] == "critical" and alert["peakPriority"] == "critical"
@@ -0,0 +1,62 @@
+import pytest
+
+from app.app_utils.dispatch_tracker import DispatchTracker
+
+
+def _task(task_id, state, text=""):
+    task = {"id": task_id, "contextId": "ctx", "kind": "task", "status": {"state": state}}
+    if text:
+        task["status"]["message"] = {"role": "agent", "parts": [{"kind": "text", "text": text}]}
+    return task
+
+
+@pytest.fixture
+def failed():
+    return []
+
+
+@pytest.fixture
+def tracker(failed):
+    async def on_failed(dispatch, reason):
+        failed.append((dispatch.patient_id, dispatch.schedule_slot, reason))
+
+    return DispatchTracker(on_failed=on_failed)
+
+
+@pytest.mark.asyncio
+async def test_completed_task_is_resolved(tracker, failed):
+    tracker.register("t1", "P1", "2026-01-23_08", "HOSP001")
+
+    assert await tracker.on_task_update(_task("t1", "working", "Processing your request...")) == "working"
+    assert tracker.get_metrics()["inFlight"] == 1
+
+    assert await tracker.on_task_update(_task("t1", "completed", "Call to P1 initiated")) == "completed"
+    metrics = tracker.get_metrics()
+    assert metrics["inFlight"] == 0
+    assert metrics["completed"] == 1
+    assert failed == []
+
+
+@pytest.mark.asyncio
+async def test_failed_task_puts_patient_back_to_pending(tracker, failed):
+    tracker.register("t1", "P1", "2026-01-23_08", "HOSP001")
+
+    await tracker.on_task_update(_task("t1", "failed", "Error: Twilio unavailable"))
+    assert failed == [("P1", "2026-01-23_08", "caller-task-failed")]
+    assert tracker.get_metrics()["failed"] == 1
+
+    # A repeated push for a resolved task is ignored
+    await tracker.on_task_update(_task("t1", "failed"))
+    assert len(failed) == 1
+    assert tracker.get_metrics()["unknownUpdates"] == 1
+
+
+@pytest.mark.asyncio
+async def test_tracker_is_bounded(failed):
+    tracker = DispatchTracker(max_tracked=2)
+    for i in range(3):
+        tracker.register(f"t{i}", f"P{i}")
+    metrics = tracker.get_metrics()
+    assert metrics["inFlight"] == 2
+    assert metrics["expired"] == 1
+    assert await tracker.on_task_update({"unexpected": True}) is None
@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from app.app_utils import firestore_client
+
+
+class FakeAsyncClient:
+    instances = 0
+
+    def __init__(self, project=None, database=None):
+        FakeAsyncClient.instances += 1
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def fake_client(monkeypatch):
+    FakeAsyncClient.instances = 0
+    monkeypatch.setattr(firestore_client, "AsyncClient", FakeAsyncClient)
+    monkeypatch.setattr(firestore_client, "_clients", firestore_client.weakref.WeakKeyDictionary())
+    monkeypatch.setattr(firestore_client, "_operations", {})
+
+
+def test_one_client_per_event_loop():
+    async def two_lookups():
+        return firestore_client.get_db(), firestore_client.get_db()
+
+    first, second = asyncio.run(two_lookups())
+    assert first is second
+
+    other, _ = asyncio.run(two_lookups())
+    assert other is not first
+    assert FakeAsyncClient.instances == 2
+
+
+@pytest.mark.asyncio
+async def test_close_db_releases_client():
+    client = firestore_client.get_db()
+    await firestore_client.close_db()
+    assert client.closed
+    assert firestore_client.get_db() is not client
+
+
+@pytest.mark.asyncio
+async def test_track_records_latency_and_errors():
+    async with firestore_client.track("patients.get"):
+        await asyncio.sleep(0.01)
+    with pytest.raises(RuntimeError):
+        async with firestore_client.track("patients.get"):
+            raise RuntimeError("boom")
+
+    stats = firestore_client.get_metrics()["operations"]["patients.get"]
+    assert stats["count"] == 2
+    assert stats["errors"] == 1
+    assert stats["maxMs"] >= 10
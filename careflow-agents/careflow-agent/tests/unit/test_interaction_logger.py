@@ -0,0 +1,72 @@
+import pytest
+
+from app.app_utils import slot_index
+from app.tools.interaction_logger import log_interaction_subcollection
+
+
+class FakeRef:
+    def __init__(self, path):
+        self.path = path
+        self.id = path.rsplit("/", 1)[-1]
+
+    def collection(self, name):
+        return FakeCollection(f"{self.path}/{name}")
+
+
+class FakeCollection:
+    def __init__(self, path):
+        self.path = path
+
+    def document(self, doc_id="auto-id"):
+        return FakeRef(f"{self.path}/{doc_id}")
+
+
+class FakeBatch:
+    def __init__(self, db):
+        self.db = db
+        self.writes = []
+
+    def set(self, ref, data, merge=False):
+        self.writes.append((ref.path, data, merge))
+
+    async def commit(self):
+        self.db.commits.append(self.writes)
+
+
+class FakeDB:
+    def __init__(self):
+        self.commits = []
+
+    def collection(self, name):
+        return FakeCollection(name)
+
+    def batch(self):
+        return FakeBatch(self)
+
+
+@pytest.mark.asyncio
+async def test_interaction_and_slot_entry_commit_together(monkeypatch):
+    db = FakeDB()
+    monkeypatch.setattr("app.app_utils.firestore_client.get_db", lambda: db)
+    monkeypatch.setenv("HOSPITAL_ID", "H1")
+
+    result = await log_interaction_subcollection("p1", "Reached patient", "CA1", "2026-01-23_08", "call_failed")
+
+    assert result.startswith("SUCCESS")
+    assert len(db.commits) == 1
+    (interaction_path, interaction, _), (slot_path, entry, merge) = db.commits[0]
+    assert interaction_path == "patients/p1/interactions/auto-id"
+    assert interaction["scheduleSlot"] == "2026-01-23_08"
+    assert slot_path == f"{slot_index.SLOTS_COLLECTION}/H1_2026-01-23_08" and merge
+    assert entry["patients"]["p1"]["state"] == slot_index.STATE_FAILED
+    assert entry["patients"]["p1"]["callSid"] == "CA1"
+
+
+@pytest.mark.asyncio
+async def test_interaction_without_slot_skips_the_index(monkeypatch):
+    db = FakeDB()
+    monkeypatch.setattr("app.app_utils.firestore_client.get_db", lambda: db)
+
+    await log_interaction_subcollection("p1", "Inbound question")
+
+    assert [path for path, _, _ in db.commits[0]] == ["patients/p1/interactions/auto-id"]
@@ -0,0 +1,76 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.tools import mcp__tool_loader
+
+
+def make_tool(name):
+    async def tool():
+        return name
+    tool.__name__ = name
+    return tool
+
+
+class FakeToolboxClient:
+    delay = 0.0
+    fail = False
+    closed = 0
+
+    def __init__(self, url):
+        self.url = url
+
+    async def load_toolset(self, name):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("toolbox down")
+        return [make_tool("get_patient_by_phone"), make_tool("list_collections"), make_tool("log_patient_interaction")]
+
+    async def close(self):
+        FakeToolboxClient.closed += 1
+
+
+@pytest.fixture(autouse=True)
+def fake_toolbox(monkeypatch):
+    FakeToolboxClient.delay, FakeToolboxClient.fail, FakeToolboxClient.closed = 0.0, False, 0
+    monkeypatch.setattr(mcp__tool_loader, "ToolboxClient", FakeToolboxClient)
+    monkeypatch.setattr(mcp__tool_loader, "all_tools", [])
+    monkeypatch.setattr(mcp__tool_loader, "_agents", [])
+    monkeypatch.setattr(mcp__tool_loader, "_load_task", None)
+    monkeypatch.setattr(mcp__tool_loader, "_retry_after", 0.0)
+    monkeypatch.setattr(mcp__tool_loader, "toolbox_client", None)
+
+
+@pytest.mark.asyncio
+async def test_tools_are_attached_when_loaded():
+    agent = SimpleNamespace(tools=[make_tool("list_collections_internal")])
+    mcp__tool_loader.attach(agent)
+
+    task = mcp__tool_loader.start_mcp_tools_load()
+    assert len(agent.tools) == 1  # start does not block
+    await task
+
+    # log_patient_interaction is excluded: it would bypass the slot index
+    assert [t.__name__ for t in agent.tools][1:] == ["get_patient_by_phone", "list_collections"]
+    # A second load attempt is a no-op and does not duplicate tools
+    await mcp__tool_loader.ensure_mcp_tools()
+    assert len(agent.tools) == 3
+
+
+@pytest.mark.asyncio
+async def test_ensure_returns_at_deadline_and_load_continues():
+    FakeToolboxClient.delay = 0.2
+    assert await mcp__tool_loader.ensure_mcp_tools(timeout=0.01) == []
+
+    await mcp__tool_loader._load_task
+    assert len(mcp__tool_loader.all_tools) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_load_backs_off():
+    FakeToolboxClient.fail = True
+    assert await mcp__tool_loader.ensure_mcp_tools() == []
+    assert FakeToolboxClient.closed == 1
+    # Within the backoff window no new load is started
+    assert mcp__tool_loader.start_mcp_tools_load() is None
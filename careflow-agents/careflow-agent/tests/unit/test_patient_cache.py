@@ -0,0 +1,153 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from app.app_utils.patient_cache import CONSISTENCY_STRONG, PatientCache
+
+
+class FakeSnapshot:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data)
+
+
+class FakeDB:
+    def __init__(self, docs):
+        self.docs = docs
+        self.reads = 0
+
+    def collection(self, name):
+        return self
+
+    def document(self, doc_id):
+        return SimpleNamespace(get=lambda: self._get(doc_id))
+
+    async def _get(self, doc_id):
+        self.reads += 1
+        return FakeSnapshot(doc_id, self.docs.get(doc_id))
+
+
+def change(kind, doc_id, data=None):
+    return SimpleNamespace(type=SimpleNamespace(name=kind), document=FakeSnapshot(doc_id, data or {}))
+
+
+def watched(cache, hospital_id):
+    """Register a hospital as watched and return its listener callback."""
+    cache._watches[hospital_id] = SimpleNamespace(unsubscribe=lambda: None)
+    return cache._on_snapshot(hospital_id, threading.Event())
+
+
+@pytest.mark.asyncio
+async def test_read_through_and_hit_rate():
+    db = FakeDB({"p1": {"name": "A"}})
+    cache = PatientCache(max_size=10)
+
+    assert (await cache.get(db, "p1"))["name"] == "A"
+    assert (await cache.get(db, "p1"))["name"] == "A"
+    assert db.reads == 1
+    metrics = cache.get_metrics()
+    assert metrics["hits"] == 1 and metrics["misses"] == 1 and metrics["hitRate"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_strong_reads_bypass_cache():
+    db = FakeDB({"p1": {"name": "A"}})
+    cache = PatientCache(max_size=10)
+    await cache.get(db, "p1")
+    db.docs["p1"] = {"name": "B"}
+
+    assert (await cache.get(db, "p1", consistency=CONSISTENCY_STRONG))["name"] == "B"
+    assert (await cache.get(db, "p1"))["name"] == "B"
+    assert cache.get_metrics()["strongReads"] == 1
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction():
+    db = FakeDB({f"p{i}": {"name": str(i)} for i in range(3)})
+    cache = PatientCache(max_size=2)
+    await cache.get(db, "p0")
+    await cache.get(db, "p1")
+    await cache.get(db, "p0")  # p1 is now least recently used
+    await cache.get(db, "p2")
+
+    assert cache.peek("p1") is None
+    assert cache.peek("p0") is not None
+    assert cache.get_metrics()["evictions"] == 1
+
+
+def test_listener_changes_refresh_and_drop_entries():
+    cache = PatientCache(max_size=10)
+    on_snapshot = watched(cache, "H1")
+    active = {"status": "active", "scheduleHour": 8}
+
+    on_snapshot([], [change("ADDED", "p1", active), change("ADDED", "p2", {**active, "scheduleHour": 12})], None)
+    assert [pid for pid, _ in cache.hospital_patients("H1", 8)] == ["p1"]
+
+    on_snapshot([], [change("MODIFIED", "p1", {**active, "riskLevel": "RED"})], None)
+    assert cache.peek("p1")["riskLevel"] == "RED"
+
+    on_snapshot([], [change("REMOVED", "p2")], None)
+    assert cache.peek("p2") is None
+    assert cache.get_metrics()["invalidations"] == 2
+
+
+def test_hospital_patients_requires_complete_watch():
+    cache = PatientCache(max_size=10)
+    assert cache.hospital_patients("H1") is None
+
+    on_snapshot = watched(cache, "H1")
+    on_snapshot([], [change("ADDED", "p1", {"status": "active"})], None)
+    cache.invalidate("p1")
+    assert cache.hospital_patients("H1") is None
+
+
+@pytest.mark.asyncio
+async def test_strong_mode_disables_warmup():
+    cache = PatientCache(consistency=CONSISTENCY_STRONG)
+    assert await cache.warm("H1") is False
+    assert cache.hospital_patients("H1") is None
+
+
+class FakeListenerClient:
+    """Firestore client whose listeners deliver one snapshot immediately."""
+
+    def __init__(self, changes):
+        self.changes = changes
+        self.subscriptions = 0
+
+    def collection(self, name):
+        return self
+
+    def where(self, filter=None):
+        return self
+
+    def on_snapshot(self, callback):
+        self.subscriptions += 1
+        callback([], self.changes, None)
+        return SimpleNamespace(is_active=True, unsubscribe=lambda: None)
+
+
+@pytest.mark.asyncio
+async def test_closed_listener_drops_hospital_and_rewarms():
+    cache = PatientCache(max_size=10)
+    client = FakeListenerClient([change("ADDED", "p1", {"status": "active"})])
+    cache._listener_client = client
+
+    assert await cache.warm("H1") is True
+    assert await cache.warm("H1") is True
+    assert client.subscriptions == 1
+
+    # The stream died with a non-retryable error: nothing is pushed any more
+    cache._watches["H1"].is_active = False
+    assert cache.hospital_patients("H1") is None
+    assert cache.peek("p1") is None
+    assert cache.get_metrics()["watchedHospitals"] == []
+
+    assert await cache.warm("H1") is True
+    assert client.subscriptions == 2
+    assert [pid for pid, _ in cache.hospital_patients("H1")] == ["p1"]
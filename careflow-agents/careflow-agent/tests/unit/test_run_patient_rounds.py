@@ -0,0 +1,239 @@
+import asyncio
+
+import pytest
+
+from app.core.a2a import A2ARpcError
+from app.app_utils.run_patient_rounds import (
+    build_patient_brief,
+    dispatch_patient_rounds,
+    rounds_reports,
+)
+
+
+def _patient(pid, history=None):
+    return {
+        "id": pid,
+        "name": f"Patient {pid}",
+        "preferredLanguage": "fr-FR",
+        "completionStatus": "pending",
+        "contact": {"phone": "+15550000000"},
+        "dischargePlan": {
+            "diagnosis": "Heart failure",
+            "medications": [{"name": "Furosemide", "dosage": "40mg", "frequency": "daily"}],
+            "criticalSymptoms": ["Chest pain"],
+            "warningSymptoms": ["Ankle swelling"],
+        },
+        "nextAppointment": {"date": "2026-02-01"},
+        "recentHistory": history or [],
+    }
+
+
+async def _no_mark(patient_id, schedule_slot, hospital_id):
+    return None
+
+
+async def _no_unmark(patient_id, schedule_slot, hospital_id, reason):
+    return None
+
+
+def test_brief_follows_caller_template():
+    brief = build_patient_brief(_patient("P1"), hospital_id="HOSP001")
+    assert brief.startswith("Interview Task: Patient P1 (ID: P1) at +15550000000")
+    assert "- History Status: FIRST TIME CALL" in brief
+    assert "- Preferred Language: fr" in brief
+    assert "Furosemide 40mg daily" in brief
+    assert "Chest pain, Ankle swelling" in brief
+    assert "- Recent History: No history found" in brief
+
+
+def test_brief_uses_recent_history():
+    history = [{"date": "2026-01-20T08:00:00", "brief": "Mild swelling", "risk": "YELLOW"}]
+    brief = build_patient_brief(_patient("P1", history))
+    assert "FOLLOW-UP CALL" in brief
+    assert "2026-01-20 [YELLOW] Mild swelling" in brief
+    assert "last YELLOW interaction" in brief
+
+
+@pytest.mark.asyncio
+async def test_dispatch_respects_concurrency_cap():
+    in_flight = {"now": 0, "max": 0}
+
+    async def send(brief, schedule_slot, hospital_id):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        return "Call initiated"
+
+    marked = []
+
+    async def mark(patient_id, schedule_slot, hospital_id):
+        marked.append((patient_id, schedule_slot))
+
+    report = await dispatch_patient_rounds(
+        8, "2026-01-23_08",
+        pending_patients=[_patient(f"P{i}") for i in range(10)],
+        concurrency=3,
+        send_task=send,
+        mark_dispatched=mark,
+        mark_undispatched=_no_unmark,
+    )
+    assert in_flight["max"] == 3
+    assert report.count("dispatched") == 10
+    assert sorted(marked) == sorted((f"P{i}", "2026-01-23_08") for i in range(10))
+    assert report.patients_per_minute > 0
+    assert rounds_reports["2026-01-23_08"] is report
+
+
+@pytest.mark.asyncio
+async def test_dispatch_records_timeouts_and_errors():
+    async def send(brief, schedule_slot, hospital_id):
+        if "(ID: slow)" in brief:
+            await asyncio.sleep(1)
+        if "(ID: down)" in brief:
+            return "ERROR: Connection Failed - Server disconnected"
+        if "(ID: busy)" in brief:
+            return "ERROR: Not Delivered - HTTP 503 Service Unavailable"
+        if "(ID: invalid)" in brief:
+            raise A2ARpcError({"code": -32602, "message": "Invalid params"})
+        return "Call initiated"
+
+    async def load(hour, hospital_id):
+        return [_patient(pid) for pid in ("ok", "slow", "down", "busy", "invalid")]
+
+    reset = {}
+
+    async def unmark(patient_id, schedule_slot, hospital_id, reason):
+        reset[patient_id] = reason
+
+    report = await dispatch_patient_rounds(
+        8, "2026-01-23_12",
+        patient_timeout=0.05,
+        load_patients=load,
+        send_task=send,
+        mark_dispatched=_no_mark,
+        mark_undispatched=unmark,
+    )
+    summary = report.to_dict()
+    assert summary["dispatched"] == 1
+    assert summary["timedOut"] == 1
+    assert summary["failed"] == 3
+    assert {f["patientId"] for f in summary["failures"]} == {"slow", "down", "busy", "invalid"}
+    # Only handoffs that never reached the Caller go back to pending; the
+    # rest stay in-call until the slot index treats them as stale
+    assert reset == {"busy": "handoff-failed", "invalid": "handoff-failed"}
+
+
+@pytest.mark.asyncio
+async def test_in_call_is_written_before_the_handoff():
+    states = []
+
+    async def mark(patient_id, schedule_slot, hospital_id):
+        states.append("in-call")
+
+    async def send(brief, schedule_slot, hospital_id):
+        # A fast Caller failure pushed to the webhook while the send is in flight
+        states.append("pending")
+        return "Dispatched: TaskId t1 (submitted)"
+
+    await dispatch_patient_rounds(
+        8, "2026-01-23_20",
+        pending_patients=[_patient("P1")],
+        dispatch_mode="async",
+        send_task=send,
+        mark_dispatched=mark,
+        mark_undispatched=_no_unmark,
+    )
+    assert states == ["in-call", "pending"]
+
+
+@pytest.mark.asyncio
+async def test_batch_dispatch_sends_few_requests():
+    requests = []
+
+    async def send_batch(briefs, schedule_slot):
+        requests.append([b["patientId"] for b in briefs])
+        for brief in briefs:
+            if brief["patientId"] == "P3":
+                yield {"patientId": "P3", "status": "rejected", "detail": "patientPhone: invalid"}
+            elif brief["patientId"] != "P4":  # P4 never acknowledged
+                yield {"patientId": brief["patientId"], "status": "accepted", "callSid": "CA1"}
+
+    marked = []
+    reset = []
+
+    async def mark(patient_id, schedule_slot, hospital_id):
+        marked.append(patient_id)
+
+    async def unmark(patient_id, schedule_slot, hospital_id, reason):
+        reset.append(patient_id)
+
+    report = await dispatch_patient_rounds(
+        8, "2026-01-23_20",
+        pending_patients=[_patient(f"P{i}") for i in range(10)],
+        mark_dispatched=mark,
+        mark_undispatched=unmark,
+        dispatch_mode="batch",
+        batch_size=4,
+        send_batch=send_batch,
+    )
+    assert requests == [["P0", "P1", "P2", "P3"], ["P4", "P5", "P6", "P7"], ["P8", "P9"]]
+    summary = report.to_dict()
+    assert summary["dispatched"] == 8
+    assert {f["patientId"]: f["detail"] for f in summary["failures"]} == {
+        "P3": "patientPhone: invalid",
+        "P4": "No acceptance from Caller",
+    }
+    # The whole batch is in-call before the request; only the rejected
+    # patient goes back to pending, the unacknowledged one stays in-call
+    assert sorted(marked) == sorted(f"P{i}" for i in range(10))
+    assert reset == ["P3"]
+
+
+@pytest.mark.asyncio
+async def test_batch_bookkeeping_errors_do_not_fail_the_stream():
+    async def send_batch(briefs, schedule_slot):
+        for brief in briefs:
+            yield {"patientId": brief["patientId"], "status": "accepted", "callSid": "CA1"}
+
+    async def mark(patient_id, schedule_slot, hospital_id):
+        if patient_id == "P1":
+            raise RuntimeError("Firestore unavailable")
+
+    report = await dispatch_patient_rounds(
+        8, "2026-01-23_20",
+        pending_patients=[_patient(f"P{i}") for i in range(3)],
+        mark_dispatched=mark,
+        mark_undispatched=_no_unmark,
+        dispatch_mode="batch",
+        send_batch=send_batch,
+    )
+    assert report.to_dict()["dispatched"] == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("accepted, expected_reset", [
+    (0, ["P0", "P1"]),  # refused before starting: the whole batch is pending again
+    (1, []),  # cut off mid-stream: P1 may be mid-dial and stays in-call
+])
+async def test_batch_reset_when_the_caller_never_started(accepted, expected_reset):
+    async def send_batch(briefs, schedule_slot):
+        for brief in briefs[:accepted]:
+            yield {"patientId": brief["patientId"], "status": "accepted", "callSid": "CA1"}
+        raise A2ARpcError({"code": -32603, "message": "Internal error"}, mid_stream=accepted > 0)
+
+    reset = []
+
+    async def unmark(patient_id, schedule_slot, hospital_id, reason):
+        reset.append(patient_id)
+
+    report = await dispatch_patient_rounds(
+        8, "2026-01-23_20",
+        pending_patients=[_patient("P0"), _patient("P1")],
+        mark_dispatched=_no_mark,
+        mark_undispatched=unmark,
+        dispatch_mode="batch",
+        send_batch=send_batch,
+    )
+    assert report.to_dict()["failed"] == 2 - accepted
+    assert sorted(reset) == expected_reset
@@ -0,0 +1,104 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.app_utils.schedule_loader import load_schedule
+
+
+class FakeSnapshot:
+    def __init__(self, data):
+        self._data = data
+
+    def to_dict(self):
+        return self._data
+
+
+class FakeInteractions:
+    """patients/{id}/interactions: slot lookups and the history query."""
+
+    def __init__(self, db, patient_id):
+        self.db = db
+        self.patient_id = patient_id
+        self.slot = None
+
+    def collection(self, name):
+        assert name == "interactions"
+        return self
+
+    def where(self, filter):
+        self.slot = filter.value
+        return self
+
+    def order_by(self, field, direction=None):
+        return self
+
+    def limit(self, n):
+        return self
+
+    async def get(self):
+        self.db.completion_queries.append(self.patient_id)
+        if self.patient_id in self.db.failing:
+            raise RuntimeError("deadline exceeded")
+        return [doc for doc in self.db.interactions.get(self.patient_id, []) if doc["scheduleSlot"] == self.slot]
+
+    async def stream(self):
+        self.db.history_queries.append(self.patient_id)
+        for doc in self.db.interactions.get(self.patient_id, []):
+            yield FakeSnapshot(doc)
+
+
+class FakeDB:
+    def __init__(self, interactions, failing=()):
+        self.interactions = interactions
+        self.failing = set(failing)
+        self.completion_queries = []
+        self.history_queries = []
+
+    def collection(self, name):
+        assert name == "patients"
+        return self
+
+    def document(self, patient_id):
+        return FakeInteractions(self, patient_id)
+
+
+SLOT = "2026-01-27_08"
+PATIENTS = [("p1", {"name": "A"}), ("p2", {"name": "B"}), ("p3", {"name": "C"})]
+
+
+def _interaction(slot):
+    return {"scheduleSlot": slot, "timestamp": datetime(2026, 1, 27, 8, tzinfo=timezone.utc), "aiBrief": "ok"}
+
+
+@pytest.mark.asyncio
+async def test_history_only_for_pending_patients_when_asked():
+    db = FakeDB({"p1": [_interaction(SLOT)], "p2": [_interaction("2026-01-26_20")]})
+
+    loaded = await load_schedule(db, 8, "H1", SLOT, history_for_completed=False, patients=PATIENTS)
+
+    assert [(p.id, p.completed) for p in loaded] == [("p1", True), ("p2", False), ("p3", False)]
+    assert sorted(db.completion_queries) == ["p1", "p2", "p3"]
+    assert sorted(db.history_queries) == ["p2", "p3"]
+    assert loaded[0].recent_history == []
+    assert loaded[1].recent_history[0]["brief"] == "ok"
+
+
+@pytest.mark.asyncio
+async def test_known_completions_skip_completion_queries():
+    db = FakeDB({})
+
+    loaded = await load_schedule(db, 8, "H1", SLOT, completed_ids={"p2"}, patients=PATIENTS)
+
+    assert [p.completed for p in loaded] == [False, True, False]
+    assert db.completion_queries == []
+    assert sorted(db.history_queries) == ["p1", "p2", "p3"]
+
+
+@pytest.mark.asyncio
+async def test_failed_completion_check_skips_only_that_patient():
+    db = FakeDB({}, failing={"p2"})
+
+    loaded = await load_schedule(db, 8, "H1", SLOT, patients=PATIENTS)
+
+    assert [p.id for p in loaded] == ["p1", "p3"]
+    assert "p2" not in db.history_queries
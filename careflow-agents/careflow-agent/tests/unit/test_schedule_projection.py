@@ -0,0 +1,66 @@
+import json
+
+from app.app_utils import schedule_projection as sp
+
+
+def enriched(i, history=3):
+    return {
+        "id": f"p{i:03d}",
+        "name": f"Patient {i}",
+        "preferredLanguage": "fr-FR",
+        "completionStatus": "pending",
+        "riskLevel": "YELLOW",
+        "contact": {"phone": f"+1555000{i:04d}", "preferredMethod": "phone"},
+        "dischargePlan": {
+            "diagnosis": "CHF",
+            "medications": [{"name": "Furosemide", "dosage": "40mg", "frequency": "daily", "instructions": "morning"}],
+            "criticalSymptoms": ["chest pain"],
+            "warningSymptoms": ["ankle swelling"],
+        },
+        "nextAppointment": {"date": "2026-02-01T10:00:00Z", "location": "Cardiology"},
+        "assignedNurse": {"name": "Sam", "phone": "+15550001111"},
+        "recentHistory": [
+            {"date": "2026-01-2%dT08:00:00" % d, "brief": "x" * 600, "risk": "GREEN", "type": "call_summary"}
+            for d in range(history)
+        ],
+    }
+
+
+def test_projection_flattens_and_truncates():
+    row = sp.project_patient(enriched(1), sp.resolve_fields(), brief_chars=50)
+    assert row["phone"] == "+15550000001"
+    assert row["medications"] == "Furosemide 40mg daily"
+    assert row["redFlags"] == "chest pain; ankle swelling"
+    assert row["nextAppointment"] == "2026-02-01T10:00"
+    assert all(len(h) < 80 for h in row["history"])
+    assert "assignedNurse" not in row
+
+
+def test_field_whitelist_keeps_id_and_drops_unknown():
+    assert sp.resolve_fields(["name", "bogus"]) == ["id", "name"]
+
+
+def test_cursor_pages_cover_every_patient_once():
+    patients = [enriched(i) for i in reversed(range(7))]
+    seen, cursor = [], None
+    while True:
+        page, cursor = sp.page_of(patients, cursor, 3, key=lambda p: p["id"])
+        seen += [p["id"] for p in page]
+        if cursor is None:
+            break
+    assert seen == sorted(p["id"] for p in patients)
+
+
+def test_compact_page_is_much_smaller_than_full_payload():
+    patients = [enriched(i) for i in range(25)]
+    full = json.dumps(patients)
+    for encoding in (sp.ENCODING_JSON, sp.ENCODING_TABLE):
+        page = json.loads(sp.render_page(patients, 25, None, encoding=encoding))
+        assert page["count"] == 25 and page["nextCursor"] is None
+        assert page["tokens"] < sp.estimate_tokens(full) / 3
+
+
+def test_table_encoding_has_one_row_per_patient():
+    page = json.loads(sp.render_page([enriched(1), enriched(2)], 2, None, fields=["id", "name"], encoding="table"))
+    assert page["columns"] == ["id", "name"]
+    assert page["rows"] == [["p001", "Patient 1"], ["p002", "Patient 2"]]
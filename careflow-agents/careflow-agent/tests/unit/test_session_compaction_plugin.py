@@ -0,0 +1,110 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from google.genai import types as genai_types
+
+from app.plugins import session_compaction_plugin
+from app.plugins.session_compaction_plugin import (
+    ROSTER_HEADER,
+    SUMMARY_HEADER,
+    SessionCompactionPlugin,
+    compact_contents,
+    estimate_tokens,
+)
+
+
+def user(text):
+    return genai_types.Content(role="user", parts=[genai_types.Part.from_text(text=text)])
+
+
+def call(name, **args):
+    return genai_types.Content(role="model", parts=[genai_types.Part.from_function_call(name=name, args=args)])
+
+
+def result(name, **response):
+    return genai_types.Content(role="user", parts=[genai_types.Part.from_function_response(name=name, response=response)])
+
+
+def round_transcript(patients):
+    """Trigger message followed by one call/result pair per patient."""
+    contents = [user("Start rounds for slot 08")]
+    for i in range(patients):
+        contents.append(call("send_message", patient_id=f"p{i}", message="x" * 400))
+        contents.append(result("send_message", status="completed", detail="y" * 400))
+    return contents
+
+
+def test_short_transcript_is_not_compacted():
+    assert compact_contents(round_transcript(2), keep_steps=4) is None
+
+
+def test_compaction_keeps_trigger_and_recent_steps():
+    contents = round_transcript(10)
+    compacted = compact_contents(contents, keep_steps=3, summary_lines=50)
+
+    assert compacted[0] is contents[0]
+    assert compacted[2:] == contents[-6:]
+    # The kept window starts at a model step so calls stay paired with results
+    assert compacted[2].role == "model"
+
+    summary = compacted[1].parts[0].text
+    assert summary.startswith(SUMMARY_HEADER)
+    assert summary.count("- called send_message(") == 7
+    assert summary.count("-> send_message:") == 7
+
+
+def test_summary_is_capped():
+    compacted = compact_contents(round_transcript(40), keep_steps=2, summary_lines=10)
+    lines = compacted[1].parts[0].text.splitlines()
+    assert lines[1] == "- (66 earlier items omitted)"
+    assert len(lines) == 12
+
+
+def test_patient_roster_survives_compaction():
+    first = json.dumps({"total": 3, "count": 3, "nextCursor": None, "patients": [
+        {"id": f"p{i}", "name": f"Patient {i}", "completionStatus": "pending"} for i in range(3)
+    ]})
+    latest = first.replace('"pending"}]', '"completed"}]')
+    contents = [
+        user("Start rounds for slot 08"),
+        call("fetch_daily_schedule", scheduleHour=8, hospitalId="HOSP001"),
+        result("fetch_daily_schedule", result=first),
+        call("get_pending_patients", scheduleHour=8, hospitalId="HOSP001"),
+        result("get_pending_patients", result="{}"),
+        call("fetch_daily_schedule", scheduleHour=8, hospitalId="HOSP001"),
+        result("fetch_daily_schedule", result=latest),
+    ] + round_transcript(10)[1:]
+
+    compacted = compact_contents(contents, keep_steps=2, summary_lines=5)
+    summary = compacted[1].parts[0].text
+    roster = summary.split(ROSTER_HEADER + "\n")[1].splitlines()
+    # Only the latest page of each roster tool is kept, in full and in order
+    assert roster == ["get_pending_patients: {}", f"fetch_daily_schedule: {latest}"]
+    assert first not in summary
+
+
+@pytest.mark.asyncio
+async def test_plugin_bounds_context_per_step():
+    session_compaction_plugin._sessions.clear()
+    plugin = SessionCompactionPlugin(trigger_tokens=1000, keep_steps=3, summary_lines=10, enabled=True)
+    context = SimpleNamespace(
+        agent_name="careflow_pulse_agent",
+        invocation_id="inv-1",
+        _invocation_context=SimpleNamespace(session=SimpleNamespace(id="rounds-2026-01-27_08")),
+    )
+
+    sent = []
+    for patients in range(1, 30):
+        request = SimpleNamespace(contents=round_transcript(patients))
+        assert await plugin.before_model_callback(context, request) is None
+        sent.append(estimate_tokens(request.contents))
+
+    # Context stops growing with the round once compaction kicks in
+    assert max(sent) < 1500
+    assert sent[-1] == sent[15]
+
+    stats = session_compaction_plugin.get_metrics()["sessions"]["rounds-2026-01-27_08"]
+    assert stats["steps"] == 29
+    assert stats["compactedSteps"] > 0
+    assert stats["maxTokens"] > stats["maxSentTokens"]
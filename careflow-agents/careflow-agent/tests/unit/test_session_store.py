@@ -0,0 +1,101 @@
+import time
+
+import pytest
+from google.adk.artifacts import InMemoryArtifactService
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService
+from google.adk.sessions.sqlite_session_service import SqliteSessionService
+from google.genai import types as genai_types
+
+from app.app_utils.session_store import EvictingSessionService
+
+APP, USER = "careflow_pulse_agent", "a2a_caller"
+WAV = b"RIFF" + b"\0" * 4096
+
+
+def call_complete_event():
+    return Event(
+        author="user",
+        invocation_id="inv-1",
+        content=genai_types.Content(role="user", parts=[
+            genai_types.Part.from_text(text="CALL_COMPLETE for patient p1"),
+            genai_types.Part.from_bytes(data=WAV, mime_type="audio/wav"),
+        ]),
+    )
+
+
+def make_service(**kwargs):
+    artifacts = InMemoryArtifactService()
+    return EvictingSessionService(InMemorySessionService(), artifacts, **kwargs), artifacts
+
+
+@pytest.mark.asyncio
+async def test_audio_is_stored_as_artifact_but_kept_for_the_running_invocation():
+    service, artifacts = make_service()
+    session = await service.create_session(app_name=APP, user_id=USER, session_id="call-1")
+
+    event = call_complete_event()
+    await service.append_event(session, event)
+
+    # The in-flight session still carries the audio
+    assert session.events[-1] is event
+    assert session.events[-1].content.parts[1].inline_data.data == WAV
+
+    stored = await service.get_session(app_name=APP, user_id=USER, session_id="call-1")
+    parts = stored.events[-1].content.parts
+    assert parts[0].text == "CALL_COMPLETE for patient p1"
+    assert parts[1].inline_data is None
+    assert "stored as artifact 'call_audio_" in parts[1].text
+
+    keys = await artifacts.list_artifact_keys(app_name=APP, user_id=USER, session_id="call-1")
+    assert len(keys) == 1 and keys[0].endswith(".wav")
+    saved = await artifacts.load_artifact(app_name=APP, user_id=USER, session_id="call-1", filename=keys[0])
+    assert saved.inline_data.data == WAV
+    assert service.get_metrics()["audioBytesOffloaded"] == len(WAV)
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_sessions_are_evicted_with_their_artifacts():
+    service, artifacts = make_service(max_sessions=2)
+    first = await service.create_session(app_name=APP, user_id=USER, session_id="call-1")
+    await service.append_event(first, call_complete_event())
+    await service.create_session(app_name=APP, user_id=USER, session_id="call-2")
+    await service.get_session(app_name=APP, user_id=USER, session_id="call-1")  # touch
+    await service.create_session(app_name=APP, user_id=USER, session_id="call-3")
+
+    assert await service.get_session(app_name=APP, user_id=USER, session_id="call-2") is None
+    assert await service.get_session(app_name=APP, user_id=USER, session_id="call-1") is not None
+    assert service.get_metrics()["evictions"] == 1
+
+    await service.create_session(app_name=APP, user_id=USER, session_id="call-4")
+    await service.create_session(app_name=APP, user_id=USER, session_id="call-5")
+    assert await service.get_session(app_name=APP, user_id=USER, session_id="call-1") is None
+    assert await artifacts.list_artifact_keys(app_name=APP, user_id=USER, session_id="call-1") == []
+
+
+@pytest.mark.asyncio
+async def test_idle_sessions_expire(monkeypatch):
+    service, _ = make_service(ttl_seconds=60)
+    await service.create_session(app_name=APP, user_id=USER, session_id="rounds-2026-01-27_08")
+
+    later = time.time() + 120
+    monkeypatch.setattr(time, "time", lambda: later)
+    assert await service.get_session(app_name=APP, user_id=USER, session_id="rounds-2026-01-27_08") is None
+
+
+@pytest.mark.asyncio
+async def test_sqlite_sessions_survive_restart_and_stay_bounded(tmp_path):
+    db_path = str(tmp_path / "sessions.db")
+    service = EvictingSessionService(SqliteSessionService(db_path), InMemoryArtifactService(), max_sessions=3)
+    for i in range(3):
+        session = await service.create_session(app_name=APP, user_id=USER, session_id=f"call-{i}")
+        await service.append_event(session, call_complete_event())
+
+    # New process: existing sessions are indexed and still subject to the limit
+    restarted = EvictingSessionService(SqliteSessionService(db_path), InMemoryArtifactService(), max_sessions=3)
+    stored = await restarted.get_session(app_name=APP, user_id=USER, session_id="call-2")
+    assert stored.events[-1].content.parts[1].inline_data is None
+
+    await restarted.create_session(app_name=APP, user_id=USER, session_id="call-3")
+    listed = await restarted.list_sessions(app_name=APP, user_id=USER)
+    assert sorted(s.id for s in listed.sessions) == ["call-1", "call-2", "call-3"]
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.app_utils import slot_index
+
+
+class FakeDocument:
+    def __init__(self, store, doc_id):
+        self.store = store
+        self.doc_id = doc_id
+
+    async def set(self, data, merge=False):
+        self.store.setdefault(self.doc_id, {"patients": {}})
+        doc = self.store[self.doc_id]
+        for key, value in data.items():
+            if key == "patients":
+                for patient_id, entry in value.items():
+                    doc["patients"].setdefault(patient_id, {}).update(entry)
+            else:
+                doc[key] = value
+
+
+class FakeDB:
+    def __init__(self):
+        self.docs = {}
+
+    def collection(self, name):
+        assert name == slot_index.SLOTS_COLLECTION
+        return self
+
+    def document(self, doc_id):
+        return FakeDocument(self.docs, doc_id)
+
+
+def test_pending_states():
+    now = datetime.now(timezone.utc)
+    assert slot_index.is_pending(None)
+    assert slot_index.is_pending({"state": "pending"})
+    assert slot_index.is_pending({"state": slot_index.retry_state(2)})
+    assert not slot_index.is_pending({"state": "completed"})
+    assert not slot_index.is_pending({"state": "failed"})
+    assert not slot_index.is_pending({"state": "in-call", "updatedAt": now}, now)
+
+
+def test_stale_in_call_is_pending_again():
+    now = datetime.now(timezone.utc)
+    stale = now - timedelta(seconds=slot_index.IN_CALL_STALE_SECONDS + 1)
+    assert slot_index.is_pending({"state": "in-call", "updatedAt": stale}, now)
+
+
+def test_done_patient_ids():
+    assert slot_index.done_patient_ids(None) is None
+    states = {
+        "p1": {"state": "completed"},
+        "p2": {"state": "retry-1"},
+        "p3": {"state": "failed"},
+    }
+    assert slot_index.done_patient_ids(states) == {"p1", "p3"}
+
+
+@pytest.mark.asyncio
+async def test_set_patient_state_merges_entries():
+    db = FakeDB()
+    await slot_index.set_patient_state(db, "p1", "2026-01-23_08", "in-call", hospital_id="H1", callSid="CA1")
+    await slot_index.set_patient_state(db, "p2", "2026-01-23_08", "retry-1", hospital_id="H1")
+    await slot_index.set_patient_state(db, "p1", "2026-01-23_08", "completed", hospital_id="H1")
+
+    doc = db.docs["H1_2026-01-23_08"]
+    assert doc["hospitalId"] == "H1"
+    assert doc["patients"]["p1"]["state"] == "completed"
+    assert doc["patients"]["p1"]["callSid"] == "CA1"
+    assert doc["patients"]["p2"]["state"] == "retry-1"
+
+
+@pytest.mark.asyncio
+async def test_set_patient_state_without_slot_is_noop():
+    db = FakeDB()
+    await slot_index.set_patient_state(db, "p1", None, "completed")
+    assert db.docs == {}
@@ -55,6 +55,8 @@ export function useAlerts(hospitalId: string = "HOSP001") {
                         brief: data.aiBrief || "", // Map aiBrief to brief
                         callSid: data.callSid,
                         resolutionNote: data.resolutionNote,
+                        summary: data.summary,
+                        updateCount: data.updateCount,
                         createdAt: createdDate.toISOString(),
                     };
                 });
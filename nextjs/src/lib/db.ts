@@ -9,9 +9,10 @@ import {
     orderBy,
     limit,
     getCountFromServer,
-    DocumentSnapshot
+    DocumentSnapshot,
+    QueryConstraint
 } from "firebase/firestore";
-import { Patient, Alert, Interaction, RiskLevel } from "@/types/patient";
+import { Patient, Alert, AlertUpdate, Interaction, RiskLevel } from "@/types/patient";
 
 // Helper to map Firestore risk levels to frontend RiskLevel type
 const mapRiskLevel = (level: string): RiskLevel => {
@@ -144,10 +145,18 @@ const convertAlert = (doc: DocumentSnapshot): Alert => {
         ...raw,
         priority: mapRiskLevel(rawLevel),
         createdAt: date.toISOString(), // Always convert to ISO string for React safety
-        callSid: raw.callSid // Map callSid
+        callSid: raw.callSid, // Map callSid
+        recentUpdates: raw.recentUpdates?.map((u: any) => toAlertUpdate(u))
     };
 };
 
+const toAlertUpdate = (u: any, id?: string): AlertUpdate => ({
+    ...u,
+    id,
+    priority: mapRiskLevel(u.priority || 'GREEN'),
+    timestamp: u.timestamp instanceof Date ? u.timestamp.toISOString() : String(u.timestamp)
+});
+
 export interface UserContext {
     hospitalId?: string;
     role?: string;
@@ -261,6 +270,41 @@ export async function getPatientAlerts(patientId: string, user: UserContext): Pr
     return snapshot.docs.map(doc => convertAlert(doc));
 }
 
+// Pages an alert's update history (alerts/{id}/updates), newest first.
+// The alert document itself only carries the last few updates; pass the
+// returned cursor back as `before` to load older ones.
+export async function getAlertUpdates(
+    alertId: string,
+    user: UserContext,
+    pageSize: number = 10,
+    before?: string
+): Promise<{ updates: AlertUpdate[]; nextCursor: string | null }> {
+    const empty = { updates: [], nextCursor: null };
+    if (!user || !user.hospitalId) return empty;
+
+    const alertSnap = await getDoc(firestoreDoc(db, "alerts", alertId));
+    if (!alertSnap.exists()) return empty;
+    const alert = convertTimestamps(alertSnap.data());
+    if (alert.hospitalId !== user.hospitalId) {
+        console.warn(`Attempted to access alert ${alertId} updates from hospital ${alert.hospitalId} by user from ${user.hospitalId}`);
+        return empty;
+    }
+
+    // Archived alerts share the active alert's history: bound by their lifetime
+    const constraints: QueryConstraint[] = [];
+    if (alert.createdAt instanceof Date) constraints.push(where("timestamp", ">=", alert.createdAt));
+    const upper = before ? new Date(before) : alert.archivedAt;
+    if (upper instanceof Date) constraints.push(where("timestamp", "<", upper));
+
+    const updatesRef = collection(db, alert.updatesPath || `alerts/${alertId}/updates`);
+    const q = query(updatesRef, ...constraints, orderBy("timestamp", "desc"), limit(pageSize));
+    const snapshot = await getDocs(q);
+
+    const updates = snapshot.docs.map(doc => toAlertUpdate(convertTimestamps(doc.data()), doc.id));
+    const nextCursor = updates.length === pageSize ? updates[updates.length - 1].timestamp : null;
+    return { updates, nextCursor };
+}
+
 export async function getInteractions(patientId: string, user: UserContext): Promise<Interaction[]> {
     if (!user || !user.hospitalId) return [];
 
@@ -375,3 +419,31 @@ export async function getDashboardStats(user: UserContext) {
         }
     };
 }
+
+export type SlotPatientState = 'pending' | 'in-call' | 'completed' | 'failed' | `retry-${number}`;
+
+export interface SlotStatus {
+    scheduleSlot: string;
+    patients: Record<string, { state: SlotPatientState; updatedAt?: Date; callSid?: string; retryCount?: number }>;
+    counts: Record<string, number>;
+}
+
+// Per-slot completion index maintained by the Pulse agent (/slots/{hospitalId}_{slot}).
+// One read answers "who is still pending" for a whole rounds slot.
+export async function getSlotStatus(scheduleSlot: string, user: UserContext): Promise<SlotStatus | null> {
+    if (!user || !user.hospitalId) return null;
+
+    const docSnap = await getDoc(firestoreDoc(db, "slots", `${user.hospitalId}_${scheduleSlot}`));
+    if (!docSnap.exists()) return null;
+
+    const data = convertTimestamps(docSnap.data());
+    const patients: SlotStatus["patients"] = data.patients || {};
+
+    const counts: Record<string, number> = {};
+    for (const entry of Object.values(patients)) {
+        const key = entry.state?.startsWith('retry-') ? 'retry' : entry.state;
+        counts[key] = (counts[key] || 0) + 1;
+    }
+
+    return { scheduleSlot, patients, counts };
+}
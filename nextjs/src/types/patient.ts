@@ -57,6 +57,19 @@ export interface Alert {
   status: 'active' | 'resolved' | 'in_progress';
   resolutionNote?: string;
   callSid?: string;
+  // Rolling summary kept by the Pulse agent; full history is in alerts/{id}/updates
+  summary?: string;
+  updateCount?: number;
+  recentUpdates?: AlertUpdate[];
+}
+
+export interface AlertUpdate {
+  id?: string;
+  timestamp: string;
+  priority: RiskLevel;
+  trigger: string;
+  aiBrief: string;
+  callSid?: string;
 }
 
 export interface Interaction {